@@ -0,0 +1,217 @@
+import asyncio
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import metrics
+from .catalog.binary_snapshot import BinaryCatalog
+from .catalog.pagination import slice_page
+from .catalog.snapshot import BOSS_SEARCH_KEYS, normalize_name
+from .config.settings import CATALOG_BINARY_PATH
+
+
+@metrics.instrument_queries("binary")
+class BinaryCatalogService:
+    """Read-only catalog service over a memory-mapped ``*.catalog.bin`` snapshot.
+
+    Mirrors :class:`SQLiteCatalogService`. Opening maps the file and reads its
+    directory; rows are decoded from the fixed-width columns on demand, so
+    startup cost does not grow with the catalog. Name-ordered keys for paging
+    and the lower-cased names for search are built on first use.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = str(path or CATALOG_BINARY_PATH)
+        self._lock = threading.Lock()
+        self._catalog: Optional[BinaryCatalog] = None
+        self._file_version: Optional[str] = None
+        self._item_keys: Optional[List[Tuple[str, int]]] = None
+        self._boss_keys: Optional[List[Tuple[str, int]]] = None
+
+    # ---------- file handling ----------
+
+    def catalog(self) -> BinaryCatalog:
+        cat = self._catalog
+        if cat is None:
+            with self._lock:
+                if self._catalog is None:
+                    self._catalog = BinaryCatalog.open(self.path)
+                cat = self._catalog
+        return cat
+
+    def catalog_version(self) -> Optional[str]:
+        """Cheap change signal (file mtime and size); a new value remaps the file.
+
+        The build replaces the file atomically, so the old mapping stays valid
+        for requests still reading it and is released with its last reference.
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        version = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+        if version != self._file_version:
+            with self._lock:
+                if self._file_version is not None:
+                    self._catalog = None
+                    self._item_keys = self._boss_keys = None
+                self._file_version = version
+        return version
+
+    def close(self) -> None:
+        with self._lock:
+            cat, self._catalog = self._catalog, None
+        if cat is not None:
+            cat.close()
+
+    def _keys(self, table: str) -> List[Tuple[str, int]]:
+        cat = self.catalog()
+        if table == "items":
+            if self._item_keys is None:
+                self._item_keys = [cat.item_name_key(r) for r in range(cat.items.rows)]
+            return self._item_keys
+        if self._boss_keys is None:
+            self._boss_keys = [cat.boss_name_key(r) for r in range(cat.bosses.rows)]
+        return self._boss_keys
+
+    # ---------- sync queries ----------
+
+    def get_all_bosses(self, limit: int | None = None, offset: int | None = None) -> List[Dict[str, Any]]:
+        cat = self.catalog()
+        start = offset or 0
+        end = cat.bosses.rows if limit is None else min(cat.bosses.rows, start + limit)
+        return [cat.boss(r, detail=False) for r in range(start, end)]
+
+    def get_boss(self, boss_id: int) -> Optional[Dict[str, Any]]:
+        cat = self.catalog()
+        row = cat.bosses.row_of(int(boss_id))
+        return cat.boss(row) if row is not None else None
+
+    def get_boss_id_by_form(self, form_id: int) -> Optional[int]:
+        cat = self.catalog()
+        row = cat.forms.row_of(int(form_id))
+        return cat.forms.columns["boss_id"][row] if row is not None else None
+
+    def get_boss_by_form(self, form_id: int) -> Optional[Dict[str, Any]]:
+        boss_id = self.get_boss_id_by_form(form_id)
+        return self.get_boss(boss_id) if boss_id is not None else None
+
+    def get_all_items(
+        self, combat_only: bool = True, tradeable_only: bool = False, limit: int | None = None, offset: int | None = None
+    ) -> List[Dict[str, Any]]:
+        cat = self.catalog()
+        cols = cat.items.columns
+        combat, tradeable = cols["has_combat_stats"], cols["is_tradeable"]
+        rows = [
+            r for r in range(cat.items.rows)
+            if (not combat_only or combat[r]) and (not tradeable_only or tradeable[r])
+        ]
+        start = offset or 0
+        rows = rows[start:] if limit is None else rows[start:start + limit]
+        return [cat.item(r, detail=False) for r in rows]
+
+    def get_item(self, item_id: int) -> Optional[Dict[str, Any]]:
+        cat = self.catalog()
+        row = cat.items.row_of(int(item_id))
+        return cat.item(row) if row is not None else None
+
+    def get_items(self, item_ids: List[int]) -> List[Dict[str, Any]]:
+        """Item details for ``item_ids`` (unknown ids are skipped)."""
+        return [e for e in (self.get_item(i) for i in dict.fromkeys(int(i) for i in item_ids)) if e]
+
+    def get_bosses(self, boss_ids: List[int]) -> List[Dict[str, Any]]:
+        return [e for e in (self.get_boss(i) for i in dict.fromkeys(int(i) for i in boss_ids)) if e]
+
+    def search_bosses(self, query: str, limit: int | None = None) -> List[Dict[str, Any]]:
+        needle = normalize_name(query)
+        out = []
+        for row, (name, _) in enumerate(self._keys("bosses")):
+            if needle in name:
+                boss = self.catalog().boss(row, detail=False)
+                out.append({k: boss[k] for k in BOSS_SEARCH_KEYS})
+                if limit is not None and len(out) >= limit:
+                    break
+        return out
+
+    def search_items(self, query: str, limit: int | None = None) -> List[Dict[str, Any]]:
+        needle = normalize_name(query)
+        cat = self.catalog()
+        out = []
+        for row, (name, _) in enumerate(self._keys("items")):
+            if needle in name:
+                out.append(cat.item(row, detail=False))
+                if limit is not None and len(out) >= limit:
+                    break
+        return out
+
+    def _page(self, table: str, limit: int, after: Optional[Tuple[str, int]], accept=None):
+        # Rows are stored in cursor_key order, so the key list is already sorted.
+        return slice_page(self._keys(table), after, limit, accept)
+
+    def list_items_page(
+        self, limit: int, after: Optional[Tuple[str, int]] = None, combat_only: bool = True
+    ):
+        """Keyset page of item summaries ordered by ``(normalized name, id)``; returns ``(rows, next_key)``."""
+        cat = self.catalog()
+        combat = cat.items.columns["has_combat_stats"]
+        rows, next_key = self._page("items", limit, after, (lambda r: combat[r]) if combat_only else None)
+        return [cat.item(r, detail=False) for r in rows], next_key
+
+    def list_bosses_page(self, limit: int, after: Optional[Tuple[str, int]] = None):
+        cat = self.catalog()
+        rows, next_key = self._page("bosses", limit, after)
+        return [cat.boss(r, detail=False) for r in rows], next_key
+
+    def load_catalog(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Decode every item and boss (details included)."""
+        cat = self.catalog()
+        return {
+            "items": [cat.item(r) for r in range(cat.items.rows)],
+            "bosses": [cat.boss(r) for r in range(cat.bosses.rows)],
+        }
+
+    # ---------- async queries ----------
+    # Lookups are in-memory decodes; bulk calls run in a worker thread.
+
+    async def get_all_bosses_async(self, limit: int | None = None, offset: int | None = None) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_all_bosses, limit, offset)
+
+    async def get_boss_async(self, boss_id: int) -> Optional[Dict[str, Any]]:
+        return self.get_boss(boss_id)
+
+    async def get_boss_id_by_form_async(self, form_id: int) -> Optional[int]:
+        return self.get_boss_id_by_form(form_id)
+
+    async def get_boss_by_form_async(self, form_id: int) -> Optional[Dict[str, Any]]:
+        return self.get_boss_by_form(form_id)
+
+    async def get_all_items_async(
+        self, combat_only: bool = True, tradeable_only: bool = False, limit: int | None = None, offset: int | None = None
+    ) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_all_items, combat_only, tradeable_only, limit, offset)
+
+    async def get_item_async(self, item_id: int) -> Optional[Dict[str, Any]]:
+        return self.get_item(item_id)
+
+    async def get_items_async(self, item_ids: List[int]) -> List[Dict[str, Any]]:
+        return self.get_items(item_ids)
+
+    async def get_bosses_async(self, boss_ids: List[int]) -> List[Dict[str, Any]]:
+        return self.get_bosses(boss_ids)
+
+    async def search_bosses_async(self, query: str, limit: int | None = None) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.search_bosses, query, limit)
+
+    async def search_items_async(self, query: str, limit: int | None = None) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.search_items, query, limit)
+
+    async def list_items_page_async(
+        self, limit: int, after: Optional[Tuple[str, int]] = None, combat_only: bool = True
+    ):
+        return await asyncio.to_thread(self.list_items_page, limit, after, combat_only)
+
+    async def list_bosses_page_async(self, limit: int, after: Optional[Tuple[str, int]] = None):
+        return await asyncio.to_thread(self.list_bosses_page, limit, after)
+
+    async def load_catalog_async(self) -> Dict[str, List[Dict[str, Any]]]:
+        return await asyncio.to_thread(self.load_catalog)
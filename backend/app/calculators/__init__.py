@@ -17,16 +17,16 @@ class DpsCalculator:
         """
         Dispatch DPS calculation based on combat style.
         """
-        logger.info("Starting DPS calculation with params: %s", params)
+        logger.debug("Starting DPS calculation with params: %s", params)
         params = apply_raid_scaling(params)
-        logger.info("After raid scaling: %s", params)
+        logger.debug("After raid scaling: %s", params)
 
         weapon_name = str(params.get("weapon_name", "")).lower()
-        logger.info("Weapon: %s", weapon_name or "None")
+        logger.debug("Weapon: %s", weapon_name or "None")
         if weapon_name:
             sa = special_attack_repository.get_special_attack(weapon_name)
             if sa:
-                logger.info("Special attack data: %s", sa)
+                logger.debug("Special attack data: %s", sa)
                 params.setdefault(
                     "special_multiplier", sa.get("damage_multiplier", 1.0)
                 )
@@ -37,11 +37,11 @@ class DpsCalculator:
                 params.setdefault("guaranteed_hit", sa.get("guaranteed_hit", False))
                 params.setdefault("special_attack_cost", sa.get("special_cost"))
             else:
-                logger.info("No special attack data found")
+                logger.debug("No special attack data found")
 
             pe = passive_effect_repository.get_passive_effect(weapon_name)
             if pe:
-                logger.info("Passive effect data: %s", pe)
+                logger.debug("Passive effect data: %s", pe)
                 mech = pe.get("special_mechanics", {})
                 dmg = mech.get("damage_multiplier")
                 acc = mech.get("accuracy_multiplier")
@@ -84,7 +84,7 @@ class DpsCalculator:
                             * bonus["accuracy_multiplier"]
                         )
         combat_style = params.get("combat_style", "melee").lower()
-        logger.info("Combat style: %s", combat_style)
+        logger.debug("Combat style: %s", combat_style)
 
         calculator = None
         if combat_style == "melee":
@@ -104,11 +104,11 @@ class DpsCalculator:
         cost = params.get("special_energy_cost")
         if cost is None or cost <= 0:
             cost = params.get("special_attack_cost")
-        logger.info("Special energy cost: %s", cost)
+        logger.debug("Special energy cost: %s", cost)
 
         # If no special attack cost provided or it is non-positive, just return normal DPS
         if cost is None or cost <= 0:
-            logger.info("No special attack cost, returning regular DPS only")
+            logger.debug("No special attack cost, returning regular DPS only")
             return calculator.calculate_dps(params)
 
         # Calculate regular and special attack damage per hit
@@ -117,10 +117,10 @@ class DpsCalculator:
         regular_params["special_accuracy_multiplier"] = 1.0
         regular_result = calculator.calculate_dps(regular_params)
 
-        logger.info("--- Gear DPS Calculation ---")
-        logger.info("Inputs: %s", regular_params)
-        logger.info("Outputs: %s", regular_result)
-        logger.info("----------------------------")
+        logger.debug("--- Gear DPS Calculation ---")
+        logger.debug("Inputs: %s", regular_params)
+        logger.debug("Outputs: %s", regular_result)
+        logger.debug("----------------------------")
 
         special_params = params.copy()
         special_speed = params.get(
@@ -129,23 +129,14 @@ class DpsCalculator:
         special_params["attack_speed"] = special_speed
         special_result = calculator.calculate_dps(special_params)
 
-        logger.info("--- Special DPS Calculation ---")
-        logger.info("Inputs: %s", special_params)
-        logger.info("Outputs: %s", special_result)
-        logger.info("------------------------------")
-
-        print("--- Gear DPS Calculation ---")
-        print("Inputs:", regular_params)
-        print("Outputs:", regular_result)
-        print("----------------------------")
-        print("--- Special DPS Calculation ---")
-        print("Inputs:", special_params)
-        print("Outputs:", special_result)
-        print("------------------------------")
+        logger.debug("--- Special DPS Calculation ---")
+        logger.debug("Inputs: %s", special_params)
+        logger.debug("Outputs: %s", special_result)
+        logger.debug("------------------------------")
 
         regular_damage = regular_result["average_hit"]
         special_damage = special_result["average_hit"]
-        logger.info(
+        logger.debug(
             "Regular hit: %.2f, Special hit: %.2f",
             regular_damage,
             special_damage,
@@ -190,7 +181,7 @@ class DpsCalculator:
         result["max_hit"] = max(
             regular_result.get("max_hit", 0), special_result.get("max_hit", 0)
         )
-        logger.info("Final result: %s", result)
+        logger.debug("Final result: %s", result)
         return result
 
     @staticmethod
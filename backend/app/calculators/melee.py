@@ -64,38 +64,6 @@ class MeleeCalculator:
         avg_hit *= params.get("special_hit_count", 1)
         dps = avg_hit / params["attack_speed"]
 
-        print("=== Melee DPS Calculation Debug ===")
-        print("→ Input Stats:")
-        print(f"  Strength Level: {params['strength_level']}")
-        print(f"  Strength Boost: {params.get('strength_boost', 0)}")
-        print(f"  Prayer Modifier (STR): {params.get('strength_prayer', 1.0)}")
-        print(f"  Attack Style Bonus: {params.get('attack_style_bonus', 0)}")
-        print(f"  Void Melee: {params.get('void_melee', False)}")
-        print()
-        print(f"→ Effective Strength: {effective_str}")
-        print(f"  Strength Bonus: {params['melee_strength_bonus']}")
-        print(f"  Max Hit: {max_hit}")
-        print()
-        print("→ Input Attack:")
-        print(f"  Attack Level: {params['attack_level']}")
-        print(f"  Attack Boost: {params.get('attack_boost', 0)}")
-        print(f"  Prayer Modifier (ATK): {params.get('attack_prayer', 1.0)}")
-        print()
-        print(f"→ Effective Attack: {effective_atk}")
-        print(f"  Attack Bonus: {params['melee_attack_bonus']}")
-        print(f"  Attack Roll: {attack_roll}")
-        print()
-        print("→ Target Stats:")
-        print(f"  Target Defence Level: {params['target_defence_level']}")
-        print(f"  Target Defence Bonus: {params['target_defence_bonus']}")
-        print(f"  Defence Roll: {def_roll}")
-        print()
-        print(f"→ Hit Chance: {hit_chance:.4f}")
-        print(f"→ Average Hit: {avg_hit:.4f}")
-        print(f"→ Attack Speed: {params['attack_speed']}s")
-        print(f"→ DPS: {dps:.4f}")
-        print("===================================")
-
         return {
             "dps": dps,
             "max_hit": max_hit,
@@ -100,8 +100,6 @@ class RangedCalculator:
             # Update gear multiplier with the Twisted Bow damage bonus
             # Note: accuracy is applied separately below
             params["gear_multiplier"] = params.get("gear_multiplier", 1.0) * tbow_damage_multiplier
-            
-        print(f"[DEBUG] Applied Twisted bow multiplier: damage={tbow_damage_multiplier:.2f}x, accuracy={tbow_accuracy_multiplier:.2f}x")
         
         # Step 1: Effective Ranged Strength
         base_rng = params["ranged_level"] + params.get("ranged_boost", 0)
@@ -154,40 +152,6 @@ class RangedCalculator:
         avg_hit *= params.get("special_hit_count", 1)
         dps = avg_hit / params["attack_speed"]
 
-        print("=== Ranged DPS Calculation Debug ===")
-        print("→ Input Stats:")
-        print(f"  Ranged Level: {params['ranged_level']}")
-        print(f"  Ranged Boost: {params.get('ranged_boost', 0)}")
-        print(f"  Prayer Modifier: {params.get('ranged_prayer', 1.0)}")
-        print(f"  Style Bonus (Attack): {params.get('attack_style_bonus_attack', 0)}")
-        print(f"  Style Bonus (Strength): {params.get('attack_style_bonus_strength', 0)}")
-        print(f"  Void Ranged: {params.get('void_ranged', False)}")
-        print(f"  Gear Multiplier: {params.get('gear_multiplier', 1.0)}")
-        if tbow_accuracy_multiplier != 1.0:
-            print(f"  Tbow Accuracy Multiplier: {tbow_accuracy_multiplier}")
-            print(f"  Tbow Damage Multiplier: {tbow_damage_multiplier}")
-        print()
-        print(f"→ Effective Strength: {effective_str}")
-        print(f"  Ranged Strength Bonus: {params['ranged_strength_bonus']}")
-        print(f"  Max Hit: {max_hit}")
-        print()
-        print(f"→ Effective Attack: {effective_atk}")
-        print(f"  Ranged Attack Bonus: {params['ranged_attack_bonus']}")
-        print(f"  Attack Roll: {attack_roll}")
-        print()
-        print("→ Target Stats:")
-        print(f"  Defence Level: {params['target_defence_level']}")
-        print(f"  Ranged Defence Bonus: {params['target_defence_bonus']}")
-        if params.get("target_magic_level") is not None:
-            print(f"  Magic Level: {params.get('target_magic_level')}")
-        print(f"  Defence Roll: {def_roll}")
-        print()
-        print(f"→ Hit Chance: {hit_chance:.4f}")
-        print(f"→ Average Hit: {avg_hit:.4f}")
-        print(f"→ Attack Speed: {params['attack_speed']}s")
-        print(f"→ DPS: {dps:.4f}")
-        print("====================================")
-
         return {
             "dps": dps,
             "max_hit": max_hit,
@@ -0,0 +1,113 @@
+"""Sorted-array prefix index for per-keystroke autocomplete.
+
+Every normalized name is indexed under its full key and under each later word
+start ("hunter crossbow", "crossbow"), and every alias under its own key. The
+keys live in one sorted list, so a prefix lookup is a ``bisect`` followed by a
+contiguous scan. Matches rank by tier (name start, then word start / alias),
+then popularity, then shorter names first.
+
+Short prefixes match large slices of the catalog, so results are memoized per
+``(prefix, limit, filters)``; the index is immutable, so entries never go stale.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+from array import array
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .search_index import search_key
+
+_MEMO_MAX = 4096
+_ALIAS_BOOST = 5.0
+
+
+def popularity(entity: Mapping[str, Any]) -> float:
+    """Popularity signal: explicit ``popularity`` or log-scaled GE ``daily_volume``."""
+    explicit = entity.get("popularity")
+    if isinstance(explicit, (int, float)):
+        return float(explicit)
+    volume = entity.get("daily_volume")
+    if isinstance(volume, (int, float)) and volume > 0:
+        return math.log10(volume + 1)
+    return 0.0
+
+
+class PrefixIndex:
+    """Immutable prefix index over a fixed sequence of names (positions are doc ids)."""
+
+    __slots__ = ("_keys", "_pos", "_tier", "_name_len", "_pop", "_memo")
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        popularity_scores: Optional[Sequence[float]] = None,
+        aliases: Optional[Mapping[str, str]] = None,
+    ):
+        normalized = [search_key(n) for n in names]
+        pop = list(popularity_scores) if popularity_scores is not None else [0.0] * len(normalized)
+        entries: List[Tuple[str, int, int]] = []
+        by_name: Dict[str, List[int]] = {}
+        for pos, key in enumerate(normalized):
+            if not key:
+                continue
+            by_name.setdefault(key, []).append(pos)
+            entries.append((key, 0, pos))
+            start = key.find(" ")
+            while start != -1:
+                entries.append((key[start + 1:], 1, pos))
+                start = key.find(" ", start + 1)
+        for alias, target in (aliases or {}).items():
+            for pos in by_name.get(search_key(target), ()):
+                entries.append((search_key(alias), 1, pos))
+                # Community shorthand only exists for things people look up a lot.
+                pop[pos] += _ALIAS_BOOST
+        entries.sort()
+        self._keys = [e[0] for e in entries]
+        self._tier = array("B", (e[1] for e in entries))
+        self._pos = array("I", (e[2] for e in entries))
+        self._name_len = array("H", (min(len(k), 0xFFFF) for k in normalized))
+        self._pop = array("d", pop)
+        self._memo: Dict[Tuple[Any, ...], Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._name_len)
+
+    def complete(
+        self,
+        prefix: str,
+        limit: int = 10,
+        accept: Optional[Callable[[int], bool]] = None,
+        memo_key: Any = None,
+    ) -> Tuple[int, ...]:
+        """Return up to ``limit`` positions whose name (or a word/alias) starts with ``prefix``.
+
+        ``accept`` filters positions; pass a hashable ``memo_key`` describing it
+        so filtered results can be memoized too.
+        """
+        q = search_key(prefix)
+        if not q:
+            return ()
+        cache_key = (q, limit, memo_key)
+        if accept is None or memo_key is not None:
+            hit = self._memo.get(cache_key)
+            if hit is not None:
+                return hit
+
+        best: Dict[int, int] = {}
+        keys = self._keys
+        i = bisect.bisect_left(keys, q)
+        while i < len(keys) and keys[i].startswith(q):
+            pos = self._pos[i]
+            tier = self._tier[i]
+            if tier < best.get(pos, 2) and (accept is None or accept(pos)):
+                best[pos] = tier
+            i += 1
+        ranked = sorted(best, key=lambda p: (best[p], -self._pop[p], self._name_len[p], p))
+        result = tuple(ranked[:limit])
+
+        if accept is None or memo_key is not None:
+            if len(self._memo) >= _MEMO_MAX:
+                self._memo.clear()
+            self._memo[cache_key] = result
+        return result
@@ -0,0 +1,337 @@
+"""Binary, memory-mappable catalog snapshot (``*.catalog.bin``).
+
+The scraper build writes one file holding every item, boss and boss form as
+fixed-width columns; the backend maps it read-only and decodes only the rows
+a request touches, so opening the catalog costs a header read however large
+it is.
+
+Layout (little-endian, every section 8-byte aligned)::
+
+    magic "SLCB" | layout u32 | directory length u32 | directory (JSON)
+    sections...
+
+The directory names each section's offset and length:
+
+* ``strings`` – interned string table: ``u32`` end offsets plus one UTF-8
+  blob. Columns store string ids; ``0xFFFFFFFF`` is ``None``.
+* ``<table>.<column>`` – one fixed-width column per field: ``q`` (int64,
+  ``INT64_MIN`` is ``None``), ``d`` (float64) or ``s`` (string id). ``L``
+  columns (string lists) are ``(start, count)`` pairs into ``<table>.<column>.refs``.
+* ``<table>.by_id`` / ``<table>.by_id_rows`` – ids sorted ascending and the
+  row each one lives at, for binary-search lookups.
+
+Rows are ordered by ``(normalized name, id)``, like :class:`CatalogSnapshot`,
+so keyset pages are slices. Bosses point at their forms with ``form_start`` /
+``form_count``. The directory also records the content ``version``.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from . import item_schema
+from .pagination import SortKey, cursor_key
+from .snapshot import _content_hash
+
+MAGIC = b"SLCB"
+LAYOUT_VERSION = 1
+_PREAMBLE = struct.Struct("<4sII")
+_ALIGN = 8
+
+NULL_INT = -(2 ** 63)
+NULL_STR = 0xFFFFFFFF
+
+# (column, type) per table; item columns follow the shared typed schema.
+ITEM_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("id", "q"), ("name", "s"),
+    *((name, "s" if sqlite_type == "TEXT" else "d" if sqlite_type.startswith("REAL") else "q")
+      for name, sqlite_type, _ in item_schema.ITEM_COLUMNS),
+)
+BOSS_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("id", "q"), ("name", "s"), ("raid_group", "s"), ("location", "s"), ("examine", "s"),
+    ("has_multiple_forms", "q"), ("icon_url", "s"), ("form_start", "q"), ("form_count", "q"),
+)
+FORM_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("id", "q"), ("boss_id", "q"), ("form_name", "s"), ("form_order", "q"),
+    ("combat_level", "q"), ("hitpoints", "q"), ("max_hit", "s"), ("attack_style", "s"),
+    ("defence_level", "q"), ("magic_level", "q"), ("ranged_level", "q"),
+    ("defence_stab", "q"), ("defence_slash", "q"), ("defence_crush", "q"),
+    ("defence_magic", "q"), ("defence_ranged_standard", "q"),
+    ("icons", "L"), ("image_url", "s"), ("size", "q"),
+)
+# Item columns a summary needs (the rest are decoded for details only).
+_ITEM_SUMMARY_FIELDS = ("slot", "has_special_attack", "has_passive_effect", "has_combat_stats",
+                        "is_tradeable", "icon_url")
+
+
+# ---------- writing ----------
+
+class _Strings:
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.values: List[bytes] = []
+
+    def ref(self, value: Any) -> int:
+        if value is None:
+            return NULL_STR
+        value = str(value)
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.values)
+            self.values.append(value.encode("utf-8"))
+        return sid
+
+
+def _int(value: Any) -> int:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    parsed = item_schema.int_or_none(value)
+    return NULL_INT if parsed is None else parsed
+
+
+def _column(rows: Sequence[Mapping[str, Any]], name: str, kind: str, strings: _Strings) -> Dict[str, bytes]:
+    if kind == "q":
+        return {name: struct.pack(f"<{len(rows)}q", *(_int(r.get(name)) for r in rows))}
+    if kind == "d":
+        return {name: struct.pack(f"<{len(rows)}d", *(float(r.get(name) or 0) for r in rows))}
+    if kind == "s":
+        return {name: struct.pack(f"<{len(rows)}I", *(strings.ref(r.get(name)) for r in rows))}
+    spans: List[int] = []
+    refs: List[int] = []
+    for r in rows:
+        values = [v for v in (r.get(name) or ()) if v is not None]
+        spans.extend((len(refs), len(values)))
+        refs.extend(strings.ref(v) for v in values)
+    return {name: struct.pack(f"<{len(spans)}I", *spans), f"{name}.refs": struct.pack(f"<{len(refs)}I", *refs)}
+
+
+def _sort_key(entity: Mapping[str, Any]) -> SortKey:
+    return cursor_key(entity.get("name"), entity["id"])
+
+
+def _item_row(item: Mapping[str, Any]) -> Dict[str, Any]:
+    # Details from any service carry the flat ``stats``; older shapes only ``combat_stats``.
+    icons = item.get("icons") or []
+    row = dict(item)
+    row.update(item_schema.flat_stats(item))
+    row["icon_url"] = item.get("icon_url") or (icons[0] if icons else None)
+    return row
+
+
+def encode(items: Iterable[Mapping[str, Any]], bosses: Iterable[Mapping[str, Any]]) -> bytes:
+    """Serialize item and boss details (as returned by ``load_catalog``) to snapshot bytes."""
+    items = sorted((i for i in items if i.get("id") is not None), key=_sort_key)
+    bosses = sorted((b for b in bosses if b.get("id") is not None), key=_sort_key)
+    version = _content_hash(items, bosses)
+
+    forms: List[Dict[str, Any]] = []
+    boss_rows: List[Dict[str, Any]] = []
+    for b in bosses:
+        own = [dict(f, boss_id=b["id"]) for f in b.get("forms") or () if f.get("id") is not None]
+        boss_rows.append(dict(b, form_start=len(forms), form_count=len(own)))
+        forms.extend(own)
+
+    strings = _Strings()
+    sections: Dict[str, bytes] = {}
+    tables = {}
+    for table, rows, fields in (
+        ("items", [_item_row(i) for i in items], ITEM_FIELDS),
+        ("bosses", boss_rows, BOSS_FIELDS),
+        ("forms", forms, FORM_FIELDS),
+    ):
+        for name, kind in fields:
+            for key, data in _column(rows, name, kind, strings).items():
+                sections[f"{table}.{key}"] = data
+        by_id = sorted((r["id"], row) for row, r in enumerate(rows))
+        sections[f"{table}.by_id"] = struct.pack(f"<{len(by_id)}q", *(i for i, _ in by_id))
+        sections[f"{table}.by_id_rows"] = struct.pack(f"<{len(by_id)}q", *(r for _, r in by_id))
+        tables[table] = {"rows": len(rows), "fields": [list(f) for f in fields]}
+
+    ends, total = [], 0
+    for value in strings.values:
+        total += len(value)
+        ends.append(total)
+    sections["strings"] = struct.pack(f"<{len(ends)}I", *ends)
+    sections["strings.blob"] = b"".join(strings.values)
+
+    # Offsets depend on the directory's own length; iterate until it is stable.
+    directory: Dict[str, Any] = {"version": version, "tables": tables, "sections": {}}
+    blob = b""
+    while True:
+        start = _aligned(_PREAMBLE.size + len(blob))
+        offset, placed = start, {}
+        for name, data in sections.items():
+            placed[name] = [offset, len(data)]
+            offset = _aligned(offset + len(data))
+        directory["sections"] = placed
+        new_blob = json.dumps(directory, separators=(",", ":")).encode()
+        stable, blob = len(new_blob) == len(blob), new_blob
+        if stable:
+            break
+
+    out = bytearray(_PREAMBLE.pack(MAGIC, LAYOUT_VERSION, len(blob)) + blob)
+    for name, data in sections.items():
+        out.extend(b"\0" * (directory["sections"][name][0] - len(out)))
+        out.extend(data)
+    return bytes(out)
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write(path: str | os.PathLike, items: Iterable[Mapping[str, Any]], bosses: Iterable[Mapping[str, Any]]) -> str:
+    """Write a snapshot atomically (readers that still map the old file keep it); returns the version."""
+    data = encode(items, bosses)
+    path = os.fspath(path)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return BinaryCatalog.from_bytes(data).version
+
+
+# ---------- reading ----------
+
+class _Table:
+    def __init__(self, catalog: "BinaryCatalog", name: str, meta: Mapping[str, Any]) -> None:
+        self.rows: int = meta["rows"]
+        self.fields: List[Tuple[str, str]] = [tuple(f) for f in meta["fields"]]
+        self.columns: Dict[str, Any] = {}
+        self.refs: Dict[str, Any] = {}
+        for field, kind in self.fields:
+            self.columns[field] = catalog._view(f"{name}.{field}", "I" if kind in "sL" else kind)
+            if kind == "L":
+                self.refs[field] = catalog._view(f"{name}.{field}.refs", "I")
+        self.by_id = catalog._view(f"{name}.by_id", "q")
+        self.by_id_rows = catalog._view(f"{name}.by_id_rows", "q")
+
+    def row_of(self, entity_id: int) -> Optional[int]:
+        pos = bisect.bisect_left(self.by_id, entity_id)
+        if pos < len(self.by_id) and self.by_id[pos] == entity_id:
+            return self.by_id_rows[pos]
+        return None
+
+
+class BinaryCatalog:
+    """Read-only view over a snapshot file (or bytes); columns are zero-copy ``memoryview`` casts."""
+
+    def __init__(self, buffer: Any, close: Optional[Callable[[], None]] = None) -> None:
+        if sys.byteorder != "little":  # pragma: no cover
+            raise ValueError("binary catalog snapshots are little-endian")
+        self._buf = memoryview(buffer)
+        self._close = close
+        magic, layout, dir_len = _PREAMBLE.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a catalog snapshot")
+        if layout != LAYOUT_VERSION:
+            raise ValueError(f"unsupported catalog snapshot layout {layout} (expected {LAYOUT_VERSION})")
+        directory = json.loads(bytes(self._buf[_PREAMBLE.size:_PREAMBLE.size + dir_len]))
+        self.version: str = directory["version"]
+        self._sections: Dict[str, List[int]] = directory["sections"]
+        self._ends = self._view("strings", "I")
+        self._blob = self._view("strings.blob", "B")
+        self._decoded: List[Optional[str]] = [None] * len(self._ends)
+        self.items = _Table(self, "items", directory["tables"]["items"])
+        self.bosses = _Table(self, "bosses", directory["tables"]["bosses"])
+        self.forms = _Table(self, "forms", directory["tables"]["forms"])
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> "BinaryCatalog":
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, mapped.close)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BinaryCatalog":
+        return cls(data)
+
+    def close(self) -> None:
+        # Views must be released before the map can close.
+        for table in (self.items, self.bosses, self.forms):
+            for view in (*table.columns.values(), *table.refs.values(), table.by_id, table.by_id_rows):
+                view.release()
+        self._ends.release()
+        self._blob.release()
+        self._buf.release()
+        if self._close is not None:
+            self._close()
+
+    def _view(self, section: str, fmt: str) -> memoryview:
+        offset, length = self._sections[section]
+        return self._buf[offset:offset + length].cast(fmt)
+
+    # ---------- decoding ----------
+
+    def string(self, sid: int) -> Optional[str]:
+        if sid == NULL_STR:
+            return None
+        value = self._decoded[sid]
+        if value is None:
+            start = self._ends[sid - 1] if sid else 0
+            value = self._decoded[sid] = bytes(self._blob[start:self._ends[sid]]).decode("utf-8")
+        return value
+
+    def _value(self, table: _Table, field: str, kind: str, row: int) -> Any:
+        raw = table.columns[field][row] if kind != "L" else None
+        if kind == "q":
+            return None if raw == NULL_INT else raw
+        if kind == "d":
+            return raw
+        if kind == "s":
+            return self.string(raw)
+        spans, refs = table.columns[field], table.refs[field]
+        start, count = spans[2 * row], spans[2 * row + 1]
+        return [self.string(refs[i]) for i in range(start, start + count)]
+
+    def _record(self, table: _Table, row: int, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        kinds = dict(table.fields)
+        return {f: self._value(table, f, kinds[f], row) for f in (fields or kinds)}
+
+    def item(self, row: int, detail: bool = True) -> Dict[str, Any]:
+        """Item at ``row`` in the shape :func:`item_schema.item_from_row` gives every backend."""
+        t = self.items
+        fields = None if detail else _ITEM_SUMMARY_FIELDS
+        rec = self._record(t, row, fields)
+        if not detail:
+            # Summaries skip the long texts and stat columns.
+            return item_schema.item_from_row(t.columns["id"][row], self.string(t.columns["name"][row]), rec, False)
+        return item_schema.item_from_row(rec["id"], rec["name"], rec)
+
+    def boss(self, row: int, detail: bool = True) -> Dict[str, Any]:
+        rec = self._record(self.bosses, row)
+        boss = {
+            "id": rec["id"],
+            "name": rec["name"],
+            "raid_group": rec["raid_group"],
+            "location": rec["location"],
+            "has_multiple_forms": bool(rec["has_multiple_forms"]),
+            "icon_url": rec["icon_url"],
+        }
+        if detail:
+            boss["examine"] = rec["examine"]
+            start = rec["form_start"]
+            boss["forms"] = [self._record(self.forms, r) for r in range(start, start + rec["form_count"])]
+        return boss
+
+    def item_name_key(self, row: int) -> SortKey:
+        t = self.items
+        return cursor_key(self.string(t.columns["name"][row]), t.columns["id"][row])
+
+    def boss_name_key(self, row: int) -> SortKey:
+        t = self.bosses
+        return cursor_key(self.string(t.columns["name"][row]), t.columns["id"][row])
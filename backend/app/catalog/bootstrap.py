@@ -0,0 +1,59 @@
+"""One-request reference data bundle for the frontend (``GET /bootstrap``).
+
+The bundle holds the four datasets the calculator needs before it becomes
+interactive: combat items, NPCs, special attacks and passive effects.
+Items and NPCs are cut down to their summary fields with empty values
+dropped. Its version hashes the four dataset versions, so it is rendered
+and compressed once per catalog version and then served from
+``payloads`` like the other full-list endpoints.
+
+``catalog_version`` is the snapshot version, which is also a valid
+``/catalog/changes`` cursor, so a client can delta-sync from the bundle.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, Iterable, Mapping, Tuple
+
+from . import snapshot as catalog_snapshot
+
+ITEM_FIELDS: Tuple[str, ...] = (
+    "id", "name", "slot", "has_special_attack", "has_passive_effect", "has_combat_stats", "icons",
+)
+NPC_FIELDS: Tuple[str, ...] = ("id", "name", "raid_group", "location", "has_multiple_forms", "icon_url")
+SOURCES = ("items", "npcs", "special-attacks", "effects")
+
+
+def project(entities: Iterable[Mapping[str, Any]], fields: Tuple[str, ...]) -> list:
+    """Keep ``fields``, dropping ``None``, ``False`` and empty values (clients treat missing as falsy)."""
+    out = []
+    for entity in entities:
+        row = {}
+        for field in fields:
+            value = entity.get(field)
+            if value is None or value is False or value == [] or value == "":
+                continue
+            row[field] = value
+        out.append(row)
+    return out
+
+
+def version() -> str:
+    from . import versions
+
+    parts = "|".join(str(versions.dataset_version(name)) for name in SOURCES)
+    return hashlib.sha256(parts.encode()).hexdigest()[:16]
+
+
+def build() -> Dict[str, Any]:
+    from . import versions
+
+    snap = catalog_snapshot.current()
+    return {
+        "version": version(),
+        "catalog_version": snap.version if snap is not None else None,
+        "items": project(versions.load("items"), ITEM_FIELDS),
+        "npcs": project(versions.load("npcs"), NPC_FIELDS),
+        "special_attacks": versions.load("special-attacks"),
+        "passive_effects": versions.load("effects"),
+    }
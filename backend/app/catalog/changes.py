@@ -0,0 +1,155 @@
+"""Per-entity change log behind ``GET /catalog/changes``.
+
+Every published catalog is diffed against the previous one by id. The
+entities compared are the summaries served by ``/items`` and ``/npcs``.
+Each diff is appended to the log under a sequence number that only grows.
+A client keeps the cursor from its last sync (``"<seq>.<catalog version>"``)
+and later asks for everything after it. It gets back only the added,
+updated and removed entities, merged across all steps since the cursor.
+
+The log keeps the last ``max_steps`` steps and at most ``max_entities``
+changed entities. A cursor older than that, or one this process never
+issued, is answered with ``resync: true``, and the client reloads the full
+lists. The catalog version part lets a cursor issued by another worker
+resolve as long as that worker published the same catalog.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Mapping, Optional, Tuple
+
+ADDED, UPDATED, REMOVED = "added", "updated", "removed"
+
+# kind -> id -> (op, summary or None)
+_Changes = Dict[str, Dict[int, Tuple[str, Optional[Dict[str, Any]]]]]
+
+
+@dataclass(frozen=True)
+class _Step:
+    seq: int
+    version: str  # catalog content hash after this step
+    changes: _Changes
+
+    @property
+    def size(self) -> int:
+        return sum(len(c) for c in self.changes.values())
+
+
+def _diff(old: Mapping[int, Dict[str, Any]], new: Mapping[int, Dict[str, Any]]):
+    out: Dict[int, Tuple[str, Optional[Dict[str, Any]]]] = {}
+    for entity_id, entity in new.items():
+        before = old.get(entity_id)
+        if before is None:
+            out[entity_id] = (ADDED, entity)
+        elif before is not entity and before != entity:
+            out[entity_id] = (UPDATED, entity)
+    for entity_id in old.keys() - new.keys():
+        out[entity_id] = (REMOVED, None)
+    return out
+
+
+class ChangeLog:
+    def __init__(self, max_steps: int = 64, max_entities: int = 50_000) -> None:
+        self.max_steps = max_steps
+        self.max_entities = max_entities
+        self._lock = threading.Lock()
+        self._steps: Deque[_Step] = deque()
+        self._state: Optional[Dict[str, Dict[int, Dict[str, Any]]]] = None
+        self._seq = 0
+        self._entities = 0
+
+    @staticmethod
+    def _cursor(step: _Step) -> str:
+        return f"{step.seq}.{step.version}"
+
+    def cursor(self) -> Optional[str]:
+        """Cursor of the latest catalog (``None`` before the first publish)."""
+        steps = self._steps
+        return self._cursor(steps[-1]) if steps else None
+
+    def record(self, version: str, datasets: Mapping[str, Iterable[Dict[str, Any]]]) -> str:
+        """Diff ``datasets`` (kind -> entities with an ``id``) against the last catalog and log it."""
+        with self._lock:
+            if self._steps and self._steps[-1].version == version:
+                return self._cursor(self._steps[-1])
+            state = {kind: {int(e["id"]): e for e in entities} for kind, entities in datasets.items()}
+            if self._state is None:
+                changes: _Changes = {kind: {} for kind in state}  # base: nothing before it is known
+            else:
+                changes = {kind: _diff(self._state.get(kind, {}), state[kind]) for kind in state}
+            self._seq += 1
+            step = _Step(self._seq, version, changes)
+            self._steps.append(step)
+            self._state = state
+            self._entities += step.size
+            # Compaction: the oldest retained step is the oldest answerable cursor.
+            while len(self._steps) > 1 and (
+                len(self._steps) > self.max_steps or self._entities - self._steps[0].size > self.max_entities
+            ):
+                self._entities -= self._steps.popleft().size
+            return self._cursor(step)
+
+    def _find(self, cursor: str) -> Optional[int]:
+        seq_text, _, version = cursor.rpartition(".")
+        steps = list(self._steps)
+        for index in range(len(steps) - 1, -1, -1):
+            if steps[index].version == version and (not seq_text or str(steps[index].seq) == seq_text):
+                return index
+        # Issued elsewhere (another worker, an earlier process): match the catalog content alone.
+        for index in range(len(steps) - 1, -1, -1):
+            if steps[index].version == version:
+                return index
+        return None
+
+    def since(self, cursor: Optional[str]) -> Dict[str, Any]:
+        """Merged changes after ``cursor``, or a resync hint when it cannot be answered."""
+        with self._lock:
+            steps = list(self._steps)
+        if not steps:
+            return {"version": None, "sequence": 0, "resync": True, "reason": "empty"}
+        head = steps[-1]
+        out: Dict[str, Any] = {"version": self._cursor(head), "sequence": head.seq}
+        index = self._find(cursor) if cursor else None
+        if index is None:
+            reason = "missing" if not cursor else "compacted" if self._older(cursor, steps[0]) else "unknown"
+            out.update(resync=True, reason=reason)
+            return out
+
+        # First op per id tells whether the client has it; the last one gives its final state.
+        merged: Dict[str, Dict[int, Tuple[bool, Optional[Dict[str, Any]]]]] = {}
+        for step in steps[index + 1:]:
+            for kind, changes in step.changes.items():
+                bucket = merged.setdefault(kind, {})
+                for entity_id, (op, entity) in changes.items():
+                    existed = bucket[entity_id][0] if entity_id in bucket else op != ADDED
+                    bucket[entity_id] = (existed, entity)
+        out["resync"] = False
+        out["changes"] = {
+            kind: {
+                ADDED: [e for existed, e in bucket.values() if not existed and e is not None],
+                UPDATED: [e for existed, e in bucket.values() if existed and e is not None],
+                REMOVED: sorted(i for i, (existed, e) in bucket.items() if existed and e is None),
+            }
+            for kind, bucket in ((k, merged.get(k, {})) for k in head.changes)
+        }
+        return out
+
+    @staticmethod
+    def _older(cursor: str, oldest: _Step) -> bool:
+        seq_text = cursor.rpartition(".")[0]
+        return seq_text.isdigit() and int(seq_text) < oldest.seq
+
+
+_log: Optional[ChangeLog] = None
+
+
+def get_log() -> ChangeLog:
+    """Process-wide change log configured from settings."""
+    global _log
+    if _log is None:
+        from ..config import settings
+
+        _log = ChangeLog(settings.CATALOG_CHANGELOG_MAX_STEPS, settings.CATALOG_CHANGELOG_MAX_ENTITIES)
+    return _log
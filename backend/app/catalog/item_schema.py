@@ -0,0 +1,238 @@
+"""Normalized item schema shared by the SQLite build, the Azure migration and the backend.
+
+Combat bonuses are stored as typed numeric columns instead of a JSON blob, so
+read paths never decode JSON per row and BIS queries can filter and rank in
+SQL. ``str_magic`` is a fraction (``0.15`` for the wiki's "15%").
+
+The ingest tools import this module (``backend.app.catalog.item_schema``) to
+emit DDL and row values; the backend imports it to read rows back.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+WIKI_BASE_URL = "https://oldschool.runescape.wiki"
+
+ATTACK_TYPES = ("stab", "slash", "crush", "magic", "ranged")
+
+STAT_COLUMNS: Tuple[str, ...] = (
+    *(f"attack_{t}" for t in ATTACK_TYPES),
+    *(f"defence_{t}" for t in ATTACK_TYPES),
+    "str_melee", "str_ranged", "str_magic", "prayer",
+)
+
+# (column, SQLite type, T-SQL type) for everything after the id/name key columns.
+ITEM_COLUMNS: Tuple[Tuple[str, str, str], ...] = (
+    ("slot", "TEXT", "NVARCHAR(50)"),
+    ("has_special_attack", "INTEGER NOT NULL DEFAULT 0", "BIT NOT NULL DEFAULT 0"),
+    ("special_attack_text", "TEXT", "NVARCHAR(MAX)"),
+    ("has_passive_effect", "INTEGER NOT NULL DEFAULT 0", "BIT NOT NULL DEFAULT 0"),
+    ("passive_effect_text", "TEXT", "NVARCHAR(MAX)"),
+    ("has_combat_stats", "INTEGER NOT NULL DEFAULT 0", "BIT NOT NULL DEFAULT 0"),
+    ("is_tradeable", "INTEGER NOT NULL DEFAULT 0", "BIT NOT NULL DEFAULT 0"),
+    ("degradable", "INTEGER NOT NULL DEFAULT 0", "BIT NOT NULL DEFAULT 0"),
+    ("icon_url", "TEXT", "NVARCHAR(500)"),
+    ("price_gp", "INTEGER", "BIGINT"),
+    ("daily_volume", "INTEGER", "INT"),
+    # Bitmask of unlocks (quests/diaries) required to wield the item; 0 = none.
+    ("requirements_flags", "INTEGER NOT NULL DEFAULT 0", "INT NOT NULL DEFAULT 0"),
+    *((c, "REAL NOT NULL DEFAULT 0", "FLOAT NOT NULL DEFAULT 0") if c == "str_magic"
+      else (c, "INTEGER NOT NULL DEFAULT 0", "INT NOT NULL DEFAULT 0") for c in STAT_COLUMNS),
+)
+ITEM_COLUMN_NAMES: Tuple[str, ...] = tuple(c for c, _, _ in ITEM_COLUMNS)
+
+# Covering index for per-slot candidate scans (BIS prefilter, slot pickers):
+# keyed on slot, carrying every column those queries read.
+SLOT_INDEX_KEY = ("slot", "has_combat_stats")
+SLOT_INDEX_INCLUDE = ("name", "is_tradeable", "degradable", "price_gp", "requirements_flags", *STAT_COLUMNS)
+
+_NUM_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+# ---------- DDL ----------
+
+def sqlite_column_defs() -> List[str]:
+    return [f"{name} {sqlite_type}" for name, sqlite_type, _ in ITEM_COLUMNS]
+
+
+def sqlite_slot_index_sql(table: str = "items", id_column: str = "item_id") -> str:
+    # SQLite has no INCLUDE; trailing key columns make the index covering.
+    cols = ", ".join((*SLOT_INDEX_KEY, id_column, *SLOT_INDEX_INCLUDE))
+    return f"CREATE INDEX IF NOT EXISTS idx_{table}_slot_stats ON {table} ({cols})"
+
+
+def tsql_column_defs() -> List[str]:
+    return [f"{name} {tsql_type}" for name, _, tsql_type in ITEM_COLUMNS]
+
+
+def tsql_slot_index_sql(table: str = "items") -> str:
+    return (
+        f"CREATE INDEX ix_{table}_slot_stats ON {table} ({', '.join(SLOT_INDEX_KEY)}) "
+        f"INCLUDE ({', '.join(SLOT_INDEX_INCLUDE)})"
+    )
+
+
+# ---------- ingest: source documents -> column values ----------
+
+def _num(value: Any, default: float = 0) -> float:
+    if isinstance(value, bool):
+        return default
+    if isinstance(value, (int, float)):
+        return value
+    m = _NUM_RE.search(str(value or ""))
+    return float(m.group()) if m else default
+
+
+def int_or_none(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, bool):
+        return None
+    m = _NUM_RE.search(str(value))
+    return int(float(m.group())) if m else None
+
+
+def icon_url(src: Optional[str]) -> Optional[str]:
+    if not src:
+        return None
+    return src if src.startswith("http") else f"{WIKI_BASE_URL}{src}"
+
+
+def stats_from_scraper_bonuses(bonuses: Optional[Mapping[str, Any]]) -> Dict[str, float]:
+    """Typed stat columns from the scraper's ``combat_bonuses`` block."""
+    bonuses = bonuses or {}
+    attack, defence, other = (bonuses.get(k) or {} for k in ("attack", "defence", "other"))
+    stats: Dict[str, float] = {}
+    for t in ATTACK_TYPES:
+        stats[f"attack_{t}"] = int(_num(attack.get(t)))
+        stats[f"defence_{t}"] = int(_num(defence.get(t)))
+    stats["str_melee"] = int(_num(other.get("strength")))
+    stats["str_ranged"] = int(_num(other.get("ranged_strength")))
+    stats["str_magic"] = _num(other.get("magic_damage_percent")) / 100.0
+    stats["prayer"] = int(_num(other.get("prayer")))
+    return stats
+
+
+def stats_from_combat_stats(combat_stats: Optional[Mapping[str, Any]]) -> Dict[str, float]:
+    """Typed stat columns from the API/Azure ``combat_stats`` shape (``"magic damage": "15%"``)."""
+    cs = combat_stats or {}
+    attack, defence, other = (cs.get(k) or {} for k in ("attack_bonuses", "defence_bonuses", "other_bonuses"))
+    stats: Dict[str, float] = {}
+    for t in ATTACK_TYPES:
+        stats[f"attack_{t}"] = int(_num(attack.get(t)))
+        stats[f"defence_{t}"] = int(_num(defence.get(t)))
+    stats["str_melee"] = int(_num(other.get("strength")))
+    stats["str_ranged"] = int(_num(other.get("ranged strength")))
+    stats["str_magic"] = _num(other.get("magic damage")) / 100.0
+    stats["prayer"] = int(_num(other.get("prayer")))
+    return stats
+
+
+def row_from_scraper_doc(doc: Mapping[str, Any]) -> Dict[str, Any]:
+    """Column values for one scraper item document (``data/db/items.json`` entry)."""
+    bonuses = doc.get("combat_bonuses")
+    row: Dict[str, Any] = {
+        "slot": (bonuses or {}).get("slot"),
+        "has_special_attack": int(bool(doc.get("special_attack"))),
+        "special_attack_text": doc.get("special_attack"),
+        "has_passive_effect": int(bool(doc.get("passive_effect"))),
+        "passive_effect_text": doc.get("passive_effect"),
+        "has_combat_stats": int(bonuses is not None),
+        "is_tradeable": int(bool(doc.get("tradeable"))),
+        "degradable": int(bool(doc.get("degradable"))),
+        "icon_url": icon_url(doc.get("image_src")),
+        "price_gp": int_or_none(doc.get("ge_price_coins")),
+        "daily_volume": int_or_none(doc.get("daily_volume")),
+        "requirements_flags": int(doc.get("requirements_flags") or 0),
+    }
+    row.update(stats_from_scraper_bonuses(bonuses))
+    return row
+
+
+def row_from_legacy_item(item: Mapping[str, Any]) -> Dict[str, Any]:
+    """Column values for a row of the old Azure/SQLite ``items`` table (JSON ``combat_stats``/``icons``)."""
+    combat_stats = item.get("combat_stats")
+    if isinstance(combat_stats, str):
+        combat_stats = json.loads(combat_stats) if combat_stats else {}
+    icons = item.get("icons")
+    if isinstance(icons, str):
+        icons = json.loads(icons) if icons else []
+    row: Dict[str, Any] = {
+        "slot": item.get("slot"),
+        "has_special_attack": int(bool(item.get("has_special_attack"))),
+        "special_attack_text": item.get("special_attack_text"),
+        "has_passive_effect": int(bool(item.get("has_passive_effect"))),
+        "passive_effect_text": item.get("passive_effect_text"),
+        "has_combat_stats": int(bool(item.get("has_combat_stats"))),
+        "is_tradeable": int(bool(item.get("is_tradeable"))),
+        "degradable": int(bool(item.get("degradable"))),
+        "icon_url": (icons or [None])[0],
+        "price_gp": int_or_none(item.get("price_gp")),
+        "daily_volume": int_or_none(item.get("daily_volume")),
+        "requirements_flags": int(item.get("requirements_flags") or 0),
+    }
+    row.update(stats_from_combat_stats(combat_stats))
+    return row
+
+
+def row_values(row: Mapping[str, Any]) -> Tuple[Any, ...]:
+    """``row`` ordered as :data:`ITEM_COLUMN_NAMES` for parameterized inserts."""
+    return tuple(row.get(c) for c in ITEM_COLUMN_NAMES)
+
+
+# ---------- read: typed columns -> API shapes ----------
+
+def stats_from_row(row: Any) -> Dict[str, float]:
+    """Flat stat dict from a typed row (``sqlite3.Row``, pyodbc row via mapping, or dict)."""
+    return {c: row[c] for c in STAT_COLUMNS}
+
+
+def combat_stats_from_stats(stats: Mapping[str, float]) -> Dict[str, Any]:
+    """Nested ``combat_stats`` shape the API has always returned."""
+    return {
+        "attack_bonuses": {t: stats[f"attack_{t}"] for t in ATTACK_TYPES},
+        "defence_bonuses": {t: stats[f"defence_{t}"] for t in ATTACK_TYPES},
+        "other_bonuses": {
+            "strength": stats["str_melee"],
+            "ranged strength": stats["str_ranged"],
+            "magic damage": f"{round(stats['str_magic'] * 100, 2):g}%",
+            "prayer": stats["prayer"],
+        },
+    }
+
+
+def item_from_row(item_id: int, name: str, row: Any, detail: bool = True) -> Dict[str, Any]:
+    """Item summary/detail dict from a typed row; details carry both flat and nested stats."""
+    icon = row["icon_url"]
+    item: Dict[str, Any] = {
+        "id": item_id,
+        "name": name,
+        "has_special_attack": bool(row["has_special_attack"]),
+        "has_passive_effect": bool(row["has_passive_effect"]),
+        "has_combat_stats": bool(row["has_combat_stats"]),
+        "is_tradeable": bool(row["is_tradeable"]),
+        "slot": row["slot"],
+        "icons": [icon] if icon else [],
+    }
+    if detail:
+        stats = stats_from_row(row)
+        item["special_attack_text"] = row["special_attack_text"]
+        item["passive_effect_text"] = row["passive_effect_text"]
+        item["price_gp"] = row["price_gp"]
+        item["daily_volume"] = row["daily_volume"]
+        item["requirements_flags"] = row["requirements_flags"]
+        item["stats"] = stats
+        item["combat_stats"] = combat_stats_from_stats(stats) if row["has_combat_stats"] else {}
+    return item
+
+
+def flat_stats(item: Mapping[str, Any]) -> Mapping[str, float]:
+    """Typed stats for ``item``: the precomputed ``stats`` dict, else derived from ``combat_stats``."""
+    stats = item.get("stats")
+    if stats is not None:
+        return stats
+    return stats_from_combat_stats(item.get("combat_stats"))
+
+
+def select_list(prefix: str = "", extra: Sequence[str] = ()) -> str:
+    return ", ".join(f"{prefix}{c}" for c in (*extra, *ITEM_COLUMN_NAMES))
@@ -0,0 +1,57 @@
+"""Stored cursor keys for the SQLite catalog tables.
+
+Keyset pages seek on a ``(name_key, id)`` index instead of ordering the whole
+table per request. The catalog file is opened read-only, so the keys are
+written at ingest (``tools/scraper_v2/normalize_items.py``): ``catalog_items``
+gets a ``name_key`` column, and the doc tables ``items``/``npcs`` get
+``name_key`` plus ``page_id``, the id the backend reads from each doc.
+
+Names and ids come from the scraper docs exactly as ``sqlite_database``
+projects them, so the stored order matches the rows a page returns.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Optional
+
+from .pagination import SortKey, cursor_key
+
+_INT_RE = re.compile(r"\d+")
+
+
+def first_int(value: Any) -> Optional[int]:
+    """Return the first integer in ``value`` ("3871", "1234, 1235", 42 ...)."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    m = _INT_RE.search(str(value))
+    return int(m.group()) if m else None
+
+
+def item_doc_name(doc: Dict[str, Any], stored: str) -> str:
+    return doc.get("title") or doc.get("name") or stored
+
+
+def item_doc_id(doc: Dict[str, Any]) -> Optional[int]:
+    return first_int(doc.get("item_id"))
+
+
+def npc_doc_name(doc: Dict[str, Any], stored: str) -> str:
+    return doc.get("name") or doc.get("title") or stored
+
+
+def npc_doc_id(doc: Dict[str, Any]) -> Optional[int]:
+    attrs = doc.get("attributes") or {}
+    return first_int(doc.get("id") or attrs.get("NPC ID") or attrs.get("Monster ID"))
+
+
+def doc_page_key(table: str, doc: Dict[str, Any], stored: str) -> Optional[SortKey]:
+    """Cursor key of one ``items``/``npcs`` doc row; ``None`` when the doc has no id."""
+    if table == "items":
+        ident, name = item_doc_id(doc), item_doc_name(doc, stored)
+    else:
+        ident, name = npc_doc_id(doc), npc_doc_name(doc, stored)
+    return cursor_key(name, ident) if ident is not None else None
@@ -0,0 +1,73 @@
+"""Keyset pagination over :func:`cursor_key` and its opaque cursor tokens.
+
+Every backend orders pages by the same key, ``(normalized name, id)``, so a
+cursor stays valid when the serving backend changes (snapshot installed or
+dropped, ``CATALOG_BACKEND`` switched) and rows whose names differ only in
+case or spacing, or repeat outright, are neither skipped nor repeated.
+
+A cursor encodes the key of the last row on the previous page; the next page
+starts right after it, so every page costs the same regardless of depth.
+Tokens are URL-safe base64 and carry no meaning for clients.
+"""
+from __future__ import annotations
+
+import base64
+import bisect
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+SortKey = Tuple[str, int]
+
+
+def normalize_name(name: Any) -> str:
+    return " ".join(str(name or "").replace("_", " ").split()).casefold()
+
+
+def cursor_key(name: Any, ident: int) -> SortKey:
+    """The pagination order of every backend: normalized name, then id."""
+    return normalize_name(name), ident
+
+
+def slice_page(
+    keys: Sequence[SortKey], after: Optional[SortKey], limit: int,
+    accept: Optional[Callable[[int], bool]] = None,
+) -> Tuple[List[int], Optional[SortKey]]:
+    """Positions in ``keys`` (sorted) of the page after ``after``, and the next page's cursor key.
+
+    ``accept(position)`` filters rows out of the page without changing the order.
+    """
+    pos = bisect.bisect_right(keys, tuple(after)) if after is not None else 0
+    if accept is None:
+        end = min(pos + limit, len(keys))
+        return list(range(pos, end)), keys[end - 1] if end < len(keys) else None
+    rows: List[int] = []
+    while pos < len(keys) and len(rows) <= limit:
+        if accept(pos):
+            rows.append(pos)
+        pos += 1
+    return rows[:limit], keys[rows[limit - 1]] if len(rows) > limit else None
+
+
+def encode_cursor(key: Optional[SortKey]) -> Optional[str]:
+    if key is None:
+        return None
+    raw = json.dumps([key[0], key[1]], separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: Optional[str]) -> Optional[SortKey]:
+    """Decode a cursor token; raises ``ValueError`` for anything malformed."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        name, ident = json.loads(raw)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(name, str) or not isinstance(ident, int) or isinstance(ident, bool):
+        raise ValueError("Invalid cursor")
+    return name, ident
+
+
+def page_result(results: List[Dict[str, Any]], next_key: Optional[SortKey]) -> Dict[str, Any]:
+    return {"results": results, "next_cursor": encode_cursor(next_key)}
@@ -0,0 +1,161 @@
+"""Catalog responses rendered once per data version.
+
+The full-list endpoints return the same body to every caller until the data
+version changes, so the body is encoded to JSON bytes once (``orjson`` when
+installed) and compressed once with gzip and, when the ``brotli`` package is
+available, brotli. Requests then only pick a variant by ``Accept-Encoding``.
+
+Each encoding gets its own strong ETag (``"<version>-<rep>-gz"``), as RFC 9110
+requires for different byte sequences. ``If-None-Match`` accepts any of them
+because every variant of a version carries the same data.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Dict, Mapping, Optional
+
+from starlette.responses import Response
+
+from .. import tracing
+from .versions import etag_matches
+
+try:  # optional speedups
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+# Bodies smaller than this are not worth compressing.
+MIN_COMPRESS_BYTES = 512
+
+_SUFFIX = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+@dataclass(frozen=True)
+class RenderedPayload:
+    version: str
+    bodies: Mapping[str, bytes]  # encoding -> bytes ("identity", "gzip", "br")
+
+    def size(self, encoding: str = "identity") -> int:
+        return len(self.bodies[encoding])
+
+
+def render(version: str, obj: Any) -> RenderedPayload:
+    raw = dumps(obj)
+    bodies: Dict[str, bytes] = {"identity": raw}
+    if len(raw) >= MIN_COMPRESS_BYTES:
+        bodies["gzip"] = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+        if brotli is not None:
+            bodies["br"] = brotli.compress(raw, quality=BROTLI_QUALITY)
+    return RenderedPayload(version=version, bodies=bodies)
+
+
+# ---------- per-version store ----------
+
+_store: Dict[str, RenderedPayload] = {}  # dataset -> latest rendering
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def get(dataset: str, version: str, load: Callable[[], Any]) -> RenderedPayload:
+    """Rendering of ``dataset`` at ``version``; renders at most once per version."""
+    hit = _store.get(dataset)
+    if hit is not None and hit.version == version:
+        return hit
+    with _locks_guard:
+        lock = _locks.setdefault(dataset, threading.Lock())
+    with lock:
+        hit = _store.get(dataset)
+        if hit is not None and hit.version == version:
+            return hit
+        with tracing.span("payload.render", {"payload.dataset": dataset, "payload.version": version}) as span:
+            rendered = render(version, load())
+            span.set_attributes({f"payload.bytes.{k}": len(v) for k, v in rendered.bodies.items()})
+        _store[dataset] = rendered
+        return rendered
+
+
+def warm(datasets) -> None:
+    """Render ``datasets`` at their current versions ahead of the first request."""
+    from . import versions
+
+    for dataset in datasets:
+        try:
+            get(dataset, versions.dataset_version(dataset), lambda: versions.load(dataset))
+        except Exception as e:  # pragma: no cover
+            logger.warning("[catalog] pre-render of %s failed: %s", dataset, e)
+
+
+def clear() -> None:
+    _store.clear()
+
+
+# ---------- negotiation ----------
+
+def negotiate(accept_encoding: Optional[str], available: Collection[str]) -> str:
+    """Best encoding in ``available`` for an ``Accept-Encoding`` header (br > gzip > identity)."""
+    if not accept_encoding:
+        return "identity"
+    q: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        q[name.strip().lower()] = weight
+    star = q.get("*")
+    best, best_q = "identity", 0.0
+    for enc in ("br", "gzip"):
+        weight = q.get(enc, star if star is not None else 0.0)
+        if enc in available and weight > best_q:
+            best, best_q = enc, weight
+    return best
+
+
+def variant_etag(base_etag: str, encoding: str) -> str:
+    return f'{base_etag[:-1]}{_SUFFIX[encoding]}"'
+
+
+def respond(
+    dataset: str,
+    version: str,
+    load: Callable[[], Any],
+    headers: Mapping[str, str],
+    base_etag: str,
+    extra_headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """304 (checked before anything is loaded or rendered) or the pre-encoded body."""
+    inm = headers.get("if-none-match")
+    if inm:
+        for encoding in _SUFFIX:
+            etag = variant_etag(base_etag, encoding)
+            if etag_matches(inm, etag):
+                return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding", **(extra_headers or {})})
+    rendered = get(dataset, version, load)
+    encoding = negotiate(headers.get("accept-encoding"), rendered.bodies)
+    out = {"ETag": variant_etag(base_etag, encoding), "Vary": "Accept-Encoding", **(extra_headers or {})}
+    if encoding != "identity":
+        out["Content-Encoding"] = encoding
+    return Response(content=rendered.bodies[encoding], media_type="application/json", headers=out)
@@ -0,0 +1,65 @@
+"""Load the catalog once in a pre-fork parent so workers share it copy-on-write.
+
+With ``gunicorn --preload`` (see ``backend/gunicorn.conf.py``) the master
+imports the app, calls :func:`preload_catalog` and then forks the workers.
+Each worker inherits the installed snapshot, the repository list caches and
+the pre-rendered payloads as shared pages, and skips its own startup load.
+
+Two things keep those pages shared:
+
+* ``gc.freeze()`` moves everything allocated so far into the permanent
+  generation. Collections in the workers then never traverse it, and so
+  never write to its GC headers.
+* Catalog connections are closed before the fork. SQLite and ODBC handles
+  must not be used from two processes.
+
+Reference-count updates still dirty pages holding objects a request touches.
+The ``binary`` backend avoids even that, because every worker maps the same
+read-only file.
+"""
+from __future__ import annotations
+
+import gc
+import logging
+from typing import Optional
+
+from . import payloads, versions
+from . import snapshot as catalog_snapshot
+
+logger = logging.getLogger(__name__)
+
+_preloaded: Optional[str] = None
+
+
+def preloaded_version() -> Optional[str]:
+    """Snapshot version loaded by the parent, if this process was forked after a preload."""
+    return _preloaded
+
+
+def preload_catalog() -> Optional[str]:
+    """Build and publish the snapshot in this (parent) process; returns its version."""
+    global _preloaded
+    from ..repositories import boss_repository, item_repository
+    from .refresher import get_refresher, read_datasets
+
+    item_svc = getattr(item_repository, "db_service", None)
+    boss_svc = getattr(boss_repository, "db_service", None)
+    snap = catalog_snapshot.build_snapshot(item_svc, boss_svc, read_datasets())
+    if snap is None:
+        logger.warning("[catalog] preload skipped: no catalog service configured")
+        return None
+    refresher = get_refresher()
+    refresher.publish(snap)
+    refresher.record_success("preloaded")
+    payloads.warm(versions.DATASETS)
+
+    for svc in {id(s): s for s in (item_svc, boss_svc) if s is not None}.values():
+        close = getattr(svc, "close", None)
+        if callable(close):
+            close()
+
+    gc.collect()
+    gc.freeze()
+    _preloaded = snap.version
+    logger.info("[catalog] preloaded %s for forked workers (%d objects frozen)", snap.version, gc.get_freeze_count())
+    return snap.version
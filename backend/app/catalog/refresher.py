@@ -0,0 +1,313 @@
+"""Background stale-while-revalidate refresh of the catalog.
+
+One asyncio task per process reloads the catalog every ``interval`` seconds,
+or sooner when a source changes or :meth:`CatalogRefresher.trigger` is
+called. Sources are polled every ``poll_interval``: the catalog service's
+``catalog_version()`` plus the mtime/size of the JSON reference datasets
+(special attacks, passive effects).
+
+A reload reads every dataset, builds one snapshot holding all of them,
+checks it with :func:`validate` and publishes it with one assignment.
+Requests keep reading the previous snapshot while a reload runs, and a
+request that started before the swap keeps its snapshot to the end (see
+``CatalogPinMiddleware``). A snapshot that fails validation is dropped and
+reported as ``"rejected"``; the live one stays.
+
+Failed reloads retry with exponential backoff and full jitter, capped at
+``max_backoff``. :meth:`CatalogRefresher.status` reports the last attempt.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from . import changes, payloads, versions
+from . import snapshot as catalog_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogValidationError(Exception):
+    """A freshly loaded catalog looks broken; it is not published."""
+
+
+def _dataset_repos():
+    from ..repositories import passive_effect_repository, special_attack_repository
+
+    return {"special_attacks": special_attack_repository, "passive_effects": passive_effect_repository}
+
+
+def read_datasets() -> Dict[str, Any]:
+    """Read the JSON reference datasets from disk (blocking)."""
+    return {name: repo.read_dataset() for name, repo in _dataset_repos().items()}
+
+
+def _file_stamp(path: Any) -> Optional[str]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def validate(
+    snap: catalog_snapshot.CatalogSnapshot,
+    previous: Optional[catalog_snapshot.CatalogSnapshot],
+    min_retain: float = 0.5,
+) -> None:
+    """Raise :class:`CatalogValidationError` unless ``snap`` may replace ``previous``.
+
+    Guards against publishing a truncated or half-written export: items and
+    bosses must keep at least ``min_retain`` of the live counts, and a
+    reference dataset that was populated must not come back empty.
+    """
+    if previous is None:
+        return
+    for name in ("items", "bosses"):
+        old, new = len(getattr(previous, name)), len(getattr(snap, name))
+        if old and new < old * min_retain:
+            raise CatalogValidationError(f"{name} shrank from {old} to {new}")
+    for name in ("special_attacks", "passive_effects"):
+        if getattr(previous, name) and not getattr(snap, name):
+            raise CatalogValidationError(f"{name} is empty")
+
+
+def _probe_version(svc: Any) -> Optional[str]:
+    probe = getattr(type(svc), "catalog_version", None)
+    if probe is None:
+        return None
+    try:
+        return svc.catalog_version()
+    except Exception as e:  # pragma: no cover
+        logger.warning("[catalog] version probe failed: %s", e)
+        return None
+
+
+class CatalogRefresher:
+    def __init__(
+        self,
+        interval: float,
+        poll_interval: float = 30.0,
+        base_backoff: float = 2.0,
+        max_backoff: float = 300.0,
+        use_snapshot: bool = True,
+        min_retain: float = 0.5,
+    ) -> None:
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.use_snapshot = use_snapshot
+        self.min_retain = min_retain
+        self.last_attempt_at: Optional[float] = None
+        self.last_success_at: Optional[float] = None
+        self.last_result: str = "never"
+        self.last_error: Optional[str] = None
+        self.last_duration_ms: Optional[float] = None
+        self.failures = 0
+        self.refreshes = 0
+        self.source_version: Optional[str] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    # ---------- one reload ----------
+
+    @staticmethod
+    def _services():
+        from ..repositories import boss_repository, item_repository
+
+        return item_repository, boss_repository
+
+    def publish(self, snap: catalog_snapshot.CatalogSnapshot) -> None:
+        """Install ``snap`` and point the repository list caches at it (no rendering)."""
+        item_repo, boss_repo = self._services()
+        catalog_snapshot.install(snap)
+        item_repo._all_items_cache["all"] = list(snap.combat_item_summaries)
+        boss_repo._all_bosses_cache["all"] = list(snap.boss_summaries)
+        item_repo._item_cache.invalidate()
+        boss_repo._boss_cache.invalidate()
+        for repo in _dataset_repos().values():
+            repo.invalidate_cache()
+        changes.get_log().record(snap.version, {"items": snap.combat_item_summaries, "npcs": snap.boss_summaries})
+
+    def probe_sources(self) -> Tuple[Optional[str], Tuple[Optional[str], ...]]:
+        """Change signals: the service's ``catalog_version()`` and the dataset files' mtime/size."""
+        item_repo, _ = self._services()
+        files = tuple(_file_stamp(repo.DATA_PATH) for repo in _dataset_repos().values())
+        return _probe_version(getattr(item_repo, "db_service", None)), files
+
+    def record_success(self, result: str) -> None:
+        self.failures = 0
+        self.refreshes += 1
+        self.last_result = result
+        self.last_error = None
+        self.last_attempt_at = self.last_success_at = time.time()
+
+    async def _load(self) -> str:
+        item_repo, boss_repo = self._services()
+        item_svc = getattr(item_repo, "db_service", None)
+        boss_svc = getattr(boss_repo, "db_service", None)
+
+        loop = asyncio.get_running_loop()
+        if self.use_snapshot:
+            datasets = await loop.run_in_executor(None, read_datasets)
+            snap = await catalog_snapshot.build_snapshot_async(item_svc, boss_svc, datasets)
+            if snap is None:
+                return "skipped"
+            cur = catalog_snapshot.published()
+            if cur is not None and cur.version == snap.version:
+                return "unchanged"
+            validate(snap, cur, self.min_retain)
+            self.publish(snap)
+            await loop.run_in_executor(None, payloads.warm, versions.DATASETS)
+            return "updated"
+
+        # No snapshot: reload the list caches; per-id entries are dropped so
+        # they reload lazily with the new data.
+        async def _call(svc: Any, name: str):
+            fn = getattr(svc, f"{name}_async", None)
+            if fn is not None and asyncio.iscoroutinefunction(fn):
+                return await fn()
+            return await asyncio.get_running_loop().run_in_executor(None, getattr(svc, name))
+
+        loaded = False
+        items = bosses = ()
+        if item_svc is not None:
+            item_repo._all_items_cache["all"] = items = await _call(item_svc, "get_all_items")
+            item_repo._item_cache.invalidate()
+            loaded = True
+        if boss_svc is not None:
+            boss_repo._all_bosses_cache["all"] = bosses = await _call(boss_svc, "get_all_bosses")
+            boss_repo._boss_cache.invalidate()
+            loaded = True
+        for repo in _dataset_repos().values():
+            repo.invalidate_cache()
+        if loaded:
+            changes.get_log().record(
+                catalog_snapshot._content_hash(items, bosses), {"items": items or (), "npcs": bosses or ()},
+            )
+        return "updated" if loaded else "skipped"
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Reload now (concurrent callers share the running reload) and return :meth:`status`."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if self._lock.locked():
+            async with self._lock:
+                return self.status()
+        async with self._lock:
+            started = time.time()
+            t0 = time.perf_counter()
+            self.last_attempt_at = started
+            try:
+                result = await self._load()
+            except CatalogValidationError as e:
+                # Bad data, not a failed read: keep serving, don't retry until the source changes.
+                self.last_result = "rejected"
+                self.last_error = str(e)
+                logger.warning("[catalog] reload rejected, keeping %s: %s", self.status()["snapshot_version"], e)
+            except Exception as e:
+                self.failures += 1
+                self.last_result = "error"
+                self.last_error = str(e)
+                logger.warning("[catalog] refresh failed (%d in a row): %s", self.failures, e)
+            else:
+                self.record_success(result)
+                self.last_attempt_at = self.last_success_at = started
+            self.last_duration_ms = round((time.perf_counter() - t0) * 1000, 2)
+            return self.status()
+
+    # ---------- background loop ----------
+
+    def backoff(self) -> float:
+        """Jittered delay before the next retry after ``self.failures`` consecutive errors."""
+        cap = min(self.max_backoff, self.base_backoff * (2 ** max(self.failures - 1, 0)))
+        return random.uniform(cap / 2, cap)
+
+    def trigger(self) -> None:
+        """Ask the background task to reload as soon as possible."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep up to ``seconds``; True if woken by :meth:`trigger`."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=max(seconds, 0))
+        except asyncio.TimeoutError:
+            return False
+        self._wake.clear()
+        return True
+
+    async def _run(self) -> None:
+        self.source_version, files = self.probe_sources()
+        next_full = time.monotonic() + self.interval
+        while True:
+            if self.failures:
+                due_in = self.backoff()
+            else:
+                due_in = min(self.poll_interval, max(next_full - time.monotonic(), 0))
+            triggered = await self._sleep(due_in)
+            version, new_files = self.probe_sources()
+            changed = (version is not None and version != self.source_version) or new_files != files
+            if triggered or changed or self.failures or time.monotonic() >= next_full:
+                await self.refresh()
+                if self.last_result != "error":
+                    self.source_version, files = version, new_files
+                    next_full = time.monotonic() + self.interval
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def status(self) -> Dict[str, Any]:
+        snap = catalog_snapshot.published()
+        return {
+            "running": self.running,
+            "last_attempt_at": self.last_attempt_at,
+            "last_success_at": self.last_success_at,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+            "last_duration_ms": self.last_duration_ms,
+            "consecutive_failures": self.failures,
+            "refreshes": self.refreshes,
+            "snapshot_version": snap.version if snap is not None else None,
+            "source_version": self.source_version,
+        }
+
+
+_refresher: Optional[CatalogRefresher] = None
+
+
+def get_refresher() -> CatalogRefresher:
+    """Process-wide refresher configured from settings."""
+    global _refresher
+    if _refresher is None:
+        from ..config import settings
+
+        _refresher = CatalogRefresher(
+            interval=settings.CATALOG_REFRESH_SECONDS,
+            poll_interval=settings.CATALOG_VERSION_POLL_SECONDS,
+            use_snapshot=settings.CATALOG_SNAPSHOT_ENABLED,
+            min_retain=settings.CATALOG_MIN_RETAIN_RATIO,
+        )
+    return _refresher
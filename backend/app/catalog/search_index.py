@@ -0,0 +1,130 @@
+"""Trigram fuzzy-name index with alias resolution.
+
+Built once per catalog snapshot. Each name is normalized, padded with spaces
+and split into character trigrams; postings map a trigram to the positions of
+the names containing it. A query scores only the names sharing at least one
+trigram with it, so lookups touch a few hundred postings instead of scanning
+the catalog.
+
+Scores are in ``[0, 1]``: exact names and aliases score 1.0, prefix and
+substring matches are boosted above pure trigram similarity (Dice
+coefficient), and fuzzy matches below ``MIN_SCORE`` are dropped.
+"""
+from __future__ import annotations
+
+import json
+import re
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+ALIASES_PATH = Path(__file__).resolve().parent.parent / "data" / "aliases.json"
+
+MIN_SCORE = 0.35
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def search_key(name: str) -> str:
+    """Normalize for matching: casefold, drop punctuation, collapse whitespace."""
+    text = _PUNCT_RE.sub(" ", str(name or "").replace("_", " ").casefold())
+    return " ".join(text.split())
+
+
+def trigrams(key: str) -> set:
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def load_aliases(path: Path = ALIASES_PATH) -> Dict[str, Dict[str, str]]:
+    """Return ``{"items": {alias: name}, "bosses": {alias: name}}`` from ``aliases.json``."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError):
+        return {"items": {}, "bosses": {}}
+    return {
+        kind: {search_key(alias): name for alias, name in (raw.get(kind) or {}).items()}
+        for kind in ("items", "bosses")
+    }
+
+
+class TrigramIndex:
+    """Fuzzy name index over a fixed sequence of names (positions are the doc ids)."""
+
+    __slots__ = ("_keys", "_gram_counts", "_postings", "_aliases", "_exact")
+
+    def __init__(self, names: Sequence[str], aliases: Optional[Mapping[str, str]] = None):
+        self._keys: Tuple[str, ...] = tuple(search_key(n) for n in names)
+        self._gram_counts = array("H")
+        postings: Dict[str, array] = {}
+        exact: Dict[str, List[int]] = {}
+        for pos, key in enumerate(self._keys):
+            grams = trigrams(key)
+            self._gram_counts.append(min(len(grams), 0xFFFF))
+            for g in grams:
+                postings.setdefault(g, array("I")).append(pos)
+            exact.setdefault(key, []).append(pos)
+        self._postings = postings
+        self._exact = {k: tuple(v) for k, v in exact.items()}
+        # alias -> positions of the canonical name (aliases to unknown names are dropped)
+        self._aliases: Dict[str, Tuple[int, ...]] = {}
+        for alias, target in (aliases or {}).items():
+            positions = self._exact.get(search_key(target))
+            if positions:
+                self._aliases[search_key(alias)] = positions
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def resolve(self, name: str) -> Tuple[int, ...]:
+        """Positions whose name (or alias) equals ``name`` exactly after normalization."""
+        key = search_key(name)
+        return self._exact.get(key) or self._aliases.get(key) or ()
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Return ``(position, score)`` pairs, best first."""
+        q = search_key(query)
+        if not q:
+            return []
+        scores: Dict[int, float] = {}
+        for pos in self._aliases.get(q, ()):
+            scores[pos] = 1.0
+
+        if len(q) < 3:
+            # Too short for trigrams to discriminate: prefix/substring only.
+            for pos, key in enumerate(self._keys):
+                if q in key:
+                    scores.setdefault(pos, self._boosted(q, key, 0.0))
+        else:
+            q_grams = trigrams(q)
+            shared: Dict[int, int] = {}
+            for g in q_grams:
+                for pos in self._postings.get(g, ()):
+                    shared[pos] = shared.get(pos, 0) + 1
+            n_q = len(q_grams)
+            for pos, hits in shared.items():
+                dice = 2.0 * hits / (n_q + self._gram_counts[pos])
+                score = self._boosted(q, self._keys[pos], dice)
+                if score >= MIN_SCORE and score > scores.get(pos, 0.0):
+                    scores[pos] = score
+
+        ranked = sorted(scores.items(), key=lambda ps: (-ps[1], len(self._keys[ps[0]]), self._keys[ps[0]]))
+        ranked = [(pos, round(score, 4)) for pos, score in ranked]
+        return ranked[:limit] if limit is not None else ranked
+
+    @staticmethod
+    def _boosted(q: str, key: str, dice: float) -> float:
+        if key == q:
+            return 1.0
+        if key.startswith(q):
+            return 0.8 + 0.15 * dice
+        if f" {q}" in f" {key}":
+            return 0.7 + 0.15 * dice
+        if q in key:
+            return 0.6 + 0.15 * dice
+        return dice
+
+
+def build_index(names: Iterable[str], aliases: Optional[Mapping[str, str]] = None) -> TrigramIndex:
+    return TrigramIndex(list(names), aliases)
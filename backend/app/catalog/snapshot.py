@@ -0,0 +1,340 @@
+"""Versioned, immutable in-process copy of the item/boss catalog.
+
+The snapshot is built once from the configured catalog service, together
+with the special-attack and passive-effect datasets, and then published with
+a single reference assignment. :func:`pinned` (entered per request by
+``CatalogPinMiddleware``) makes :func:`current` keep returning the snapshot
+that was live when the request started, so a reload can never expose a
+half-loaded catalog or mix versions within one response. Entity dicts are
+shared between indexes and must be treated as read-only.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .autocomplete import PrefixIndex, popularity
+from .pagination import SortKey, cursor_key, normalize_name, slice_page
+from .search_index import TrigramIndex, load_aliases
+
+logger = logging.getLogger(__name__)
+
+ITEM_SUMMARY_KEYS = (
+    "id", "name", "has_special_attack", "has_passive_effect",
+    "has_combat_stats", "is_tradeable", "slot", "icons",
+)
+BOSS_SUMMARY_KEYS = ("id", "name", "raid_group", "location", "has_multiple_forms", "icon_url")
+BOSS_SEARCH_KEYS = ("id", "name", "raid_group", "location")
+
+
+def _summary(entity: Dict[str, Any], keys: Iterable[str]) -> Dict[str, Any]:
+    return {k: entity[k] for k in keys if k in entity}
+
+
+def compact_item(summary: Dict[str, Any]) -> Dict[str, Any]:
+    icons = summary.get("icons") or ()
+    return {"id": summary["id"], "name": summary.get("name"), "slot": summary.get("slot"),
+            "icon": icons[0] if icons else None}
+
+
+def compact_boss(summary: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": summary["id"], "name": summary.get("name"), "icon": summary.get("icon_url")}
+
+
+def _content_hash(items: Iterable[Dict[str, Any]], bosses: Iterable[Dict[str, Any]], *datasets: Any) -> str:
+    h = hashlib.sha256()
+    for entity in items:
+        h.update(json.dumps(entity, sort_keys=True, default=str).encode())
+    h.update(b"\x00")
+    for entity in bosses:
+        h.update(json.dumps(entity, sort_keys=True, default=str).encode())
+    for data in datasets:
+        h.update(b"\x00")
+        h.update(json.dumps(data, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable catalog view with id and normalized-name indexes."""
+
+    version: str
+    loaded_at: float
+    items: Tuple[Dict[str, Any], ...]
+    bosses: Tuple[Dict[str, Any], ...]
+    item_summaries: Tuple[Dict[str, Any], ...]
+    combat_item_summaries: Tuple[Dict[str, Any], ...]
+    boss_summaries: Tuple[Dict[str, Any], ...]
+    items_by_id: Mapping[int, Dict[str, Any]]
+    items_by_name: Mapping[str, Dict[str, Any]]
+    bosses_by_id: Mapping[int, Dict[str, Any]]
+    bosses_by_name: Mapping[str, Dict[str, Any]]
+    forms_by_id: Mapping[int, Dict[str, Any]]
+    boss_id_by_form: Mapping[int, int]
+    # False when the source only offered summaries (no combat stats / forms),
+    # in which case detail reads still go to the repository fallback.
+    complete: bool = True
+    # Reference datasets loaded and swapped together with items/bosses
+    # (name key -> entry); empty when the snapshot was built without them.
+    special_attacks: Dict[str, Any] = field(default_factory=dict, repr=False)
+    passive_effects: Dict[str, Any] = field(default_factory=dict, repr=False)
+    _item_names: Tuple[str, ...] = field(default=(), repr=False)
+    _boss_names: Tuple[str, ...] = field(default=(), repr=False)
+    # (normalized name, id) sort keys, parallel to the summary tuples.
+    _item_keys: Tuple[SortKey, ...] = field(default=(), repr=False)
+    _combat_item_keys: Tuple[SortKey, ...] = field(default=(), repr=False)
+    _boss_keys: Tuple[SortKey, ...] = field(default=(), repr=False)
+    # Fuzzy name indexes; positions match ``items`` / ``bosses``.
+    _item_search: Optional[TrigramIndex] = field(default=None, repr=False)
+    _boss_search: Optional[TrigramIndex] = field(default=None, repr=False)
+    _item_prefix: Optional[PrefixIndex] = field(default=None, repr=False)
+    _boss_prefix: Optional[PrefixIndex] = field(default=None, repr=False)
+
+    @classmethod
+    def build(
+        cls,
+        items: Iterable[Dict[str, Any]],
+        bosses: Iterable[Dict[str, Any]],
+        complete: bool = True,
+        aliases: Optional[Mapping[str, Mapping[str, str]]] = None,
+        special_attacks: Optional[Dict[str, Any]] = None,
+        passive_effects: Optional[Dict[str, Any]] = None,
+    ) -> "CatalogSnapshot":
+        items = tuple(sorted((i for i in items if i.get("id") is not None),
+                             key=lambda i: cursor_key(i.get("name"), i["id"])))
+        bosses = tuple(sorted((b for b in bosses if b.get("id") is not None),
+                              key=lambda b: cursor_key(b.get("name"), b["id"])))
+
+        items_by_id: Dict[int, Dict[str, Any]] = {}
+        items_by_name: Dict[str, Dict[str, Any]] = {}
+        for it in items:
+            items_by_id.setdefault(it["id"], it)
+            items_by_name.setdefault(normalize_name(it.get("name")), it)
+
+        bosses_by_id: Dict[int, Dict[str, Any]] = {}
+        bosses_by_name: Dict[str, Dict[str, Any]] = {}
+        forms_by_id: Dict[int, Dict[str, Any]] = {}
+        boss_id_by_form: Dict[int, int] = {}
+        for b in bosses:
+            bosses_by_id.setdefault(b["id"], b)
+            bosses_by_name.setdefault(normalize_name(b.get("name")), b)
+            for f in b.get("forms") or ():
+                if f.get("id") is not None:
+                    forms_by_id.setdefault(f["id"], f)
+                    boss_id_by_form.setdefault(f["id"], b["id"])
+
+        item_summaries = tuple(_summary(i, ITEM_SUMMARY_KEYS) for i in items)
+        item_names = tuple(normalize_name(i.get("name")) for i in items)
+        boss_names = tuple(normalize_name(b.get("name")) for b in bosses)
+        item_keys = tuple(cursor_key(i.get("name"), i["id"]) for i in items)
+        aliases = load_aliases() if aliases is None else aliases
+        datasets = tuple(d for d in (special_attacks, passive_effects) if d is not None)
+        return cls(
+            version=_content_hash(items, bosses, *datasets),
+            loaded_at=time.time(),
+            items=items,
+            bosses=bosses,
+            item_summaries=item_summaries,
+            # Summary-only sources have already applied their default combat filter.
+            combat_item_summaries=(
+                tuple(s for s in item_summaries if s.get("has_combat_stats")) if complete else item_summaries
+            ),
+            boss_summaries=tuple(_summary(b, BOSS_SUMMARY_KEYS) for b in bosses),
+            items_by_id=MappingProxyType(items_by_id),
+            items_by_name=MappingProxyType(items_by_name),
+            bosses_by_id=MappingProxyType(bosses_by_id),
+            bosses_by_name=MappingProxyType(bosses_by_name),
+            forms_by_id=MappingProxyType(forms_by_id),
+            boss_id_by_form=MappingProxyType(boss_id_by_form),
+            complete=complete,
+            special_attacks=special_attacks or {},
+            passive_effects=passive_effects or {},
+            _item_names=item_names,
+            _boss_names=boss_names,
+            _item_keys=item_keys,
+            _combat_item_keys=(
+                tuple(k for k, s in zip(item_keys, item_summaries) if s.get("has_combat_stats"))
+                if complete else item_keys
+            ),
+            _boss_keys=tuple(cursor_key(b.get("name"), b["id"]) for b in bosses),
+            _item_search=TrigramIndex([i.get("name") for i in items], aliases.get("items")),
+            _boss_search=TrigramIndex([b.get("name") for b in bosses], aliases.get("bosses")),
+            _item_prefix=PrefixIndex([i.get("name") for i in items], [popularity(i) for i in items],
+                                     aliases.get("items")),
+            _boss_prefix=PrefixIndex([b.get("name") for b in bosses], [popularity(b) for b in bosses],
+                                     aliases.get("bosses")),
+        )
+
+    # ---------- lookups ----------
+
+    def get_item(self, item_id: int) -> Optional[Dict[str, Any]]:
+        return self.items_by_id.get(item_id)
+
+    def get_boss(self, boss_id: int) -> Optional[Dict[str, Any]]:
+        return self.bosses_by_id.get(boss_id)
+
+    def get_boss_by_form(self, form_id: int) -> Optional[Dict[str, Any]]:
+        boss_id = self.boss_id_by_form.get(form_id)
+        return self.bosses_by_id.get(boss_id) if boss_id is not None else None
+
+    @staticmethod
+    def _page(rows: Tuple[Dict[str, Any], ...], keys: Tuple[SortKey, ...],
+              after: Optional[SortKey], limit: int):
+        positions, next_key = slice_page(keys, after, limit)
+        return [rows[p] for p in positions], next_key
+
+    def page_items(self, limit: int, after: Optional[SortKey] = None, combat_only: bool = True):
+        """Keyset page of item summaries after ``after``; returns ``(rows, next_key)``."""
+        if combat_only:
+            return self._page(self.combat_item_summaries, self._combat_item_keys, after, limit)
+        return self._page(self.item_summaries, self._item_keys, after, limit)
+
+    def page_bosses(self, limit: int, after: Optional[SortKey] = None):
+        return self._page(self.boss_summaries, self._boss_keys, after, limit)
+
+    def search_items(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Relevance-ranked item summaries, each with a ``score`` in ``[0, 1]``."""
+        return [
+            {**self.item_summaries[pos], "score": score}
+            for pos, score in self._item_search.search(query, limit)
+        ]
+
+    def search_bosses(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return [
+            {**_summary(self.bosses[pos], BOSS_SEARCH_KEYS), "score": score}
+            for pos, score in self._boss_search.search(query, limit)
+        ]
+
+    def autocomplete_items(
+        self, prefix: str, limit: int = 10, slot: Optional[str] = None, combat_only: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Compact ``{id, name, slot, icon}`` rows for names/aliases starting with ``prefix``."""
+        summaries = self.item_summaries
+        slot_key = slot.casefold() if slot else None
+
+        def accept(pos: int) -> bool:
+            s = summaries[pos]
+            if combat_only and not s.get("has_combat_stats"):
+                return False
+            return slot_key is None or (s.get("slot") or "").casefold() == slot_key
+
+        filtered = slot_key is not None or combat_only
+        positions = self._item_prefix.complete(
+            prefix, limit, accept if filtered else None, (slot_key, combat_only) if filtered else None,
+        )
+        return [compact_item(summaries[pos]) for pos in positions]
+
+    def autocomplete_bosses(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return [compact_boss(self.boss_summaries[pos]) for pos in self._boss_prefix.complete(prefix, limit)]
+
+    def find_item_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Exact (normalized) name or alias match; never a fuzzy guess."""
+        positions = self._item_search.resolve(name)
+        return self.items[positions[0]] if positions else None
+
+    def find_boss_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        positions = self._boss_search.resolve(name)
+        return self.bosses[positions[0]] if positions else None
+
+
+# ---------- loading ----------
+
+def _unpack(data: Any) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    if isinstance(data, dict) and isinstance(data.get("items"), list) and isinstance(data.get("bosses"), list):
+        return data["items"], data["bosses"]
+    return None
+
+
+def build_snapshot(
+    item_service: Any, boss_service: Any, datasets: Optional[Mapping[str, Any]] = None,
+) -> Optional[CatalogSnapshot]:
+    """Build a snapshot from the catalog service(s), or ``None`` if none is configured.
+
+    ``datasets`` (``special_attacks`` / ``passive_effects``) are carried along unchanged.
+    """
+    if item_service is None and boss_service is None:
+        return None
+    datasets = datasets or {}
+    if item_service is boss_service and hasattr(type(item_service), "load_catalog"):
+        unpacked = _unpack(item_service.load_catalog())
+        if unpacked is not None:
+            return CatalogSnapshot.build(*unpacked, **datasets)
+    # Services without a bulk loader only expose summaries.
+    items = item_service.get_all_items() if item_service is not None else []
+    bosses = boss_service.get_all_bosses() if boss_service is not None else []
+    return CatalogSnapshot.build(items or [], bosses or [], complete=False, **datasets)
+
+
+async def build_snapshot_async(
+    item_service: Any, boss_service: Any, datasets: Optional[Mapping[str, Any]] = None,
+) -> Optional[CatalogSnapshot]:
+    """Async twin of :func:`build_snapshot`, preferring the services' async methods."""
+    if item_service is None and boss_service is None:
+        return None
+    datasets = datasets or {}
+    if item_service is boss_service and hasattr(type(item_service), "load_catalog_async"):
+        unpacked = _unpack(await item_service.load_catalog_async())
+        if unpacked is not None:
+            return CatalogSnapshot.build(*unpacked, **datasets)
+
+    async def _call(svc: Any, name: str) -> List[Dict[str, Any]]:
+        if svc is None:
+            return []
+        fn = getattr(svc, f"{name}_async", None)
+        if fn is not None and asyncio.iscoroutinefunction(fn):
+            return await fn() or []
+        return await asyncio.get_running_loop().run_in_executor(None, getattr(svc, name)) or []
+
+    items = await _call(item_service, "get_all_items")
+    bosses = await _call(boss_service, "get_all_bosses")
+    return CatalogSnapshot.build(items, bosses, complete=False, **datasets)
+
+
+# ---------- publication ----------
+
+_current: Optional[CatalogSnapshot] = None
+_pinned: ContextVar[Optional[CatalogSnapshot]] = ContextVar("catalog_snapshot", default=None)
+
+
+def current() -> Optional[CatalogSnapshot]:
+    """Return the snapshot pinned for this request, else the published one (``None`` until the first load)."""
+    return _pinned.get() or _current
+
+
+def published() -> Optional[CatalogSnapshot]:
+    """The latest installed snapshot, ignoring any per-request pin."""
+    return _current
+
+
+@contextmanager
+def pinned() -> Iterator[Optional[CatalogSnapshot]]:
+    """Keep :func:`current` on the snapshot published right now for the rest of this context."""
+    token = _pinned.set(_current)
+    try:
+        yield _current
+    finally:
+        _pinned.reset(token)
+
+
+def install(snapshot: Optional[CatalogSnapshot]) -> Optional[CatalogSnapshot]:
+    """Atomically publish ``snapshot`` and return the one it replaced."""
+    global _current
+    previous, _current = _current, snapshot
+    if snapshot is not None:
+        logger.info(
+            "[catalog] snapshot %s installed (%d items, %d bosses)",
+            snapshot.version, len(snapshot.items), len(snapshot.bosses),
+        )
+    return previous
+
+
+def clear() -> None:
+    install(None)
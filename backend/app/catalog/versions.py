@@ -0,0 +1,102 @@
+"""Data versions and strong ETags for the cacheable catalog endpoints.
+
+Each dataset has a content hash: items and NPCs use the snapshot version
+computed when the catalog is loaded, and the JSON-file datasets (special
+attacks, passive effects) are hashed once per loaded object. The hash drives
+
+* strong ETags, so ``If-None-Match`` can be answered with 304 before any
+  response body is built, and
+* versioned URLs (``/v/{version}/items``) whose content never changes and can
+  be cached for a year.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from . import snapshot as catalog_snapshot
+
+DATASETS = ("items", "npcs", "special-attacks", "effects", "bootstrap")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# id(obj) -> (obj, hash); holding obj keeps the id from being reused.
+_memo: Dict[int, Tuple[Any, str]] = {}
+_memo_lock = threading.Lock()
+_MEMO_MAX = 16
+
+
+def content_version(obj: Any) -> str:
+    """Content hash of a loaded dataset, computed once per object."""
+    hit = _memo.get(id(obj))
+    if hit is not None and hit[0] is obj:
+        return hit[1]
+    digest = hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    with _memo_lock:
+        if len(_memo) >= _MEMO_MAX:
+            _memo.clear()
+        _memo[id(obj)] = (obj, digest)
+    return digest
+
+
+def _loaders() -> Dict[str, Callable[[], Any]]:
+    from ..repositories import (
+        boss_repository,
+        item_repository,
+        passive_effect_repository,
+        special_attack_repository,
+    )
+    from . import bootstrap
+
+    return {
+        "items": item_repository.get_all_items,
+        "npcs": boss_repository.get_all_bosses,
+        "special-attacks": special_attack_repository.get_all_special_attacks,
+        "effects": passive_effect_repository.get_all_passive_effects,
+        "bootstrap": bootstrap.build,
+    }
+
+
+def load(dataset: str) -> Any:
+    return _loaders()[dataset]()
+
+
+def dataset_version(dataset: str) -> Optional[str]:
+    """Current content hash for ``dataset``; items/NPCs reuse the snapshot version."""
+    if dataset == "bootstrap":
+        from . import bootstrap
+
+        return bootstrap.version()
+    if dataset in ("items", "npcs"):
+        snap = catalog_snapshot.current()
+        if snap is not None:
+            return snap.version
+    return content_version(load(dataset))
+
+
+def all_versions() -> Dict[str, Optional[str]]:
+    return {name: dataset_version(name) for name in DATASETS}
+
+
+# ---------- ETags ----------
+
+def make_etag(version: str, path: str, query: str = "") -> str:
+    """Strong ETag for one representation: the data version plus the path and query."""
+    rep = hashlib.sha1(f"{path}?{query}".encode()).hexdigest()[:8]
+    return f'"{version}-{rep}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 ``If-None-Match`` check (weak comparison, ``*`` matches anything)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
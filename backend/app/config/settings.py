@@ -1,8 +1,99 @@
 import os
+import tempfile
 
 # TTL for in-memory caches (in seconds)
 CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "3600"))
+# Repository caches: LRU bound per cache, and TTL for cached "not found" entries
+REPO_CACHE_MAX_ENTRIES = int(os.getenv("REPO_CACHE_MAX_ENTRIES", "4096"))
+REPO_CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv("REPO_CACHE_NEGATIVE_TTL_SECONDS", "60"))
 
 # Database connection settings
 DB_CONNECTION_TIMEOUT = int(os.getenv("DB_CONNECTION_TIMEOUT", "30"))
 DB_MAX_RETRIES = int(os.getenv("DB_MAX_RETRIES", "3"))
+# Azure SQL connections one process may hold at once; further queries wait.
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "32"))
+
+# Catalog backend: "azure" (Azure SQL via pyodbc), "sqlite" (scraper-built
+# osrs.sqlite) or "binary" (memory-mapped snapshot written by the scraper build)
+CATALOG_BACKEND = os.getenv("CATALOG_BACKEND", "azure").strip().lower()
+CATALOG_SQLITE_PATH = os.getenv("CATALOG_SQLITE_PATH", os.getenv("SCRAPER_SQLITE", "osrs.sqlite"))
+SQLITE_MMAP_BYTES = int(os.getenv("SQLITE_MMAP_BYTES", str(256 * 1024 * 1024)))
+CATALOG_BINARY_PATH = os.getenv("CATALOG_BINARY_PATH", "osrs.catalog.bin")
+
+# Serve catalog reads from an immutable in-memory snapshot built at startup
+# (off by default for the binary backend, which already serves from memory)
+CATALOG_SNAPSHOT_ENABLED = os.getenv(
+    "CATALOG_SNAPSHOT", "0" if CATALOG_BACKEND == "binary" else "1"
+) not in ("0", "false", "False")
+
+# Background catalog refresh: full reload interval (0 disables the task) and
+# how often to poll the service's cheap catalog_version() change signal
+CATALOG_REFRESH_SECONDS = int(os.getenv("CATALOG_REFRESH_SECONDS", "900"))
+CATALOG_VERSION_POLL_SECONDS = int(os.getenv("CATALOG_VERSION_POLL_SECONDS", "30"))
+# A reload whose item or boss count drops below this fraction of the live
+# catalog is rejected and the previous snapshot stays published.
+CATALOG_MIN_RETAIN_RATIO = float(os.getenv("CATALOG_MIN_RETAIN_RATIO", "0.5"))
+
+# /catalog/changes log: published catalogs kept, and changed entities kept
+# across them; older cursors get a full-resync hint.
+CATALOG_CHANGELOG_MAX_STEPS = int(os.getenv("CATALOG_CHANGELOG_MAX_STEPS", "64"))
+CATALOG_CHANGELOG_MAX_ENTITIES = int(os.getenv("CATALOG_CHANGELOG_MAX_ENTITIES", "50000"))
+
+# Shared secret for operator endpoints (X-Admin-Token); unset disables them.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or None
+
+# Rate limiting: "shm" shares buckets between all workers on the host (POSIX
+# only, falls back to "local"; tests default to "local" so each app starts
+# empty); RATE_LIMIT_MAX_KEYS bounds tracked clients.
+_RATE_LIMIT_DEFAULT_STORE = "local" if os.getenv("SCAPELAB_TESTING") == "1" else "shm"
+RATE_LIMIT_STORE = os.getenv("RATE_LIMIT_STORE", _RATE_LIMIT_DEFAULT_STORE).strip().lower()
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "65536"))
+RATE_LIMIT_SHM_PATH = os.getenv("RATE_LIMIT_SHM_PATH") or None
+# Trusted proxies in front of the app; Azure App Service's front end is one hop
+# and is detected via WEBSITE_SITE_NAME.
+RATE_LIMIT_PROXY_HOPS = int(os.getenv("RATE_LIMIT_PROXY_HOPS", "1" if os.getenv("WEBSITE_SITE_NAME") else "0"))
+# Tokens one request spends from its client's bucket (default 1 per request)
+RATE_LIMIT_BIS_COST = float(os.getenv("RATE_LIMIT_BIS_COST", "10"))
+
+# Admission control: concurrent requests, queued waiters and max wait (seconds)
+# per route class; a full queue or an expired wait is answered with 503.
+ADMISSION_BIS_CONCURRENCY = int(os.getenv("ADMISSION_BIS_CONCURRENCY", "2"))
+ADMISSION_BIS_QUEUE = int(os.getenv("ADMISSION_BIS_QUEUE", "8"))
+ADMISSION_BIS_MAX_WAIT = float(os.getenv("ADMISSION_BIS_MAX_WAIT", "10"))
+ADMISSION_CALC_CONCURRENCY = int(os.getenv("ADMISSION_CALC_CONCURRENCY", "32"))
+ADMISSION_CALC_QUEUE = int(os.getenv("ADMISSION_CALC_QUEUE", "64"))
+ADMISSION_CALC_MAX_WAIT = float(os.getenv("ADMISSION_CALC_MAX_WAIT", "2"))
+
+# Execution pools: processes for CPU-bound routes (0 = run them in the I/O
+# thread pool) and threads for blocking DB calls and sync routes. Each of the
+# WEB_CONCURRENCY server workers owns a pool, so by default they split the cores.
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+_DEFAULT_CPU_WORKERS = max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", "0" if os.getenv("SCAPELAB_TESTING") == "1" else str(_DEFAULT_CPU_WORKERS)))
+DB_THREADS = int(os.getenv("DB_THREADS", "16"))
+BIS_CHUNK_SIZE = int(os.getenv("BIS_CHUNK_SIZE", "256"))
+
+# Metrics (/metrics): with METRICS_DIR set, every worker and CPU-pool process
+# writes its counters there (every METRICS_FLUSH_SECONDS, from a thread) and a scrape
+# sums them all; unset, a scrape covers the answering process only.
+# gunicorn.conf.py sets a fresh directory per server.
+METRICS_DIR = os.getenv("METRICS_DIR") or None
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+# Tracing: none | console (JSON lines on stderr) | file (JSON lines appended
+# to TRACING_FILE by every process) | otlp (OpenTelemetry SDK, OTEL_* vars).
+# Root spans are kept with probability TRACING_SAMPLE_RATIO.
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").strip().lower()
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", "1.0"))
+
+# Profiling: per-request profiles (X-Profile + X-Admin-Token) and continuous
+# stack totals live under PROFILE_DIR, shared by the workers on a host; the
+# newest PROFILE_KEEP request profiles are kept. The continuous sampler runs
+# PROFILER_WINDOW_SECONDS at a time at PROFILER_SAMPLE_HZ, for a
+# PROFILER_DUTY_CYCLE fraction of the time (0 disables it).
+PROFILE_DIR = os.getenv("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "scapelab-profiles")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+PROFILER_DUTY_CYCLE = float(os.getenv("PROFILER_DUTY_CYCLE", "0" if os.getenv("SCAPELAB_TESTING") == "1" else "0.02"))
+PROFILER_SAMPLE_HZ = int(os.getenv("PROFILER_SAMPLE_HZ", "100"))
+PROFILER_WINDOW_SECONDS = float(os.getenv("PROFILER_WINDOW_SECONDS", "1"))
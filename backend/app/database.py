@@ -2,19 +2,229 @@ import os
 import json
 import time
 import asyncio
+import logging
+import threading
 from contextlib import contextmanager, asynccontextmanager
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 import pyodbc
 import aioodbc
 
 from .config.settings import DB_CONNECTION_TIMEOUT as CONNECTION_TIMEOUT, DB_MAX_RETRIES as MAX_RETRIES
+from .config.settings import DB_MAX_CONNECTIONS
+from . import metrics
+from .catalog import item_schema
+from .catalog.pagination import SortKey
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- typed item rows (see app/catalog/item_schema.py) ----------
+
+_ITEM_SUMMARY_COLUMNS = (
+    "id", "name", "has_special_attack", "has_passive_effect",
+    "has_combat_stats", "is_tradeable", "slot", "icon_url",
+)
+_ITEM_DETAIL_COLUMNS = ("id", "name", *item_schema.ITEM_COLUMN_NAMES)
+_ITEM_SUMMARY_SELECT = ", ".join(_ITEM_SUMMARY_COLUMNS)
+_ITEM_DETAIL_SELECT = ", ".join(_ITEM_DETAIL_COLUMNS)
+
+
+def _item_summary_row(r) -> Dict[str, Any]:
+    return item_schema.item_from_row(r[0], r[1], dict(zip(_ITEM_SUMMARY_COLUMNS, r)), detail=False)
+
+
+def _item_detail_row(r) -> Dict[str, Any]:
+    return item_schema.item_from_row(r[0], r[1], dict(zip(_ITEM_DETAIL_COLUMNS, r)))
+
+
+# ---------- bulk catalog load (used to build the in-memory snapshot) ----------
+
+_CATALOG_ITEMS_SQL = f"SELECT {_ITEM_DETAIL_SELECT} FROM items"
+_CATALOG_NPCS_SQL = "SELECT id, name, raid_group, location, examine, has_multiple_forms FROM npcs"
+_CATALOG_FORMS_SELECT = (
+    "SELECT id, npc_id, form_name, form_order, combat_level, hitpoints, "
+    "defence_level, magic_level, ranged_level, defence_stab, defence_slash, "
+    "defence_crush, defence_magic, defence_ranged_standard, icons, image_url, size "
+    "FROM npc_forms"
+)
+_CATALOG_FORMS_SQL = _CATALOG_FORMS_SELECT + " ORDER BY npc_id, form_order"
+
+# Inline parameter lists up to this size; SQL Server caps a statement at 2100
+# parameters, so larger batches ship the ids as one JSON array via OPENJSON.
+_IN_LIST_MAX = 1000
+
+
+def _json_or(text: Any, default: Any) -> Any:
+    if not text:
+        return default
+    try:
+        return json.loads(text)
+    except Exception:
+        return default
+
+
+def _assemble_catalog(item_rows, npc_rows, form_rows) -> Dict[str, List[Dict[str, Any]]]:
+    items = [_item_detail_row(r) for r in item_rows]
+    forms_by_npc: Dict[int, List[Dict[str, Any]]] = {}
+    for f in form_rows:
+        forms_by_npc.setdefault(f[1], []).append(
+            {
+                "id": f[0],
+                "boss_id": f[1],
+                "form_name": f[2],
+                "form_order": f[3],
+                "combat_level": f[4],
+                "hitpoints": f[5],
+                "defence_level": f[6],
+                "magic_level": f[7],
+                "ranged_level": f[8],
+                "defence_stab": f[9],
+                "defence_slash": f[10],
+                "defence_crush": f[11],
+                "defence_magic": f[12],
+                "defence_ranged_standard": f[13],
+                "icons": _json_or(f[14], []),
+                "image_url": f[15],
+                "size": f[16],
+            }
+        )
+    bosses = []
+    for b in npc_rows:
+        forms = forms_by_npc.get(b[0], [])
+        icon_url = None
+        if forms:
+            icon_url = (forms[0].get("icons") or [None])[0] or forms[0].get("image_url")
+        bosses.append(
+            {
+                "id": b[0],
+                "name": b[1],
+                "raid_group": b[2],
+                "location": b[3],
+                "examine": b[4],
+                "has_multiple_forms": bool(b[5]),
+                "icon_url": icon_url,
+                "forms": forms,
+            }
+        )
+    return {"items": items, "bosses": bosses}
+
+
+# ---------- batch lookups by id ----------
+
+def _id_filter(column: str, ids: List[int]) -> Tuple[str, list]:
+    if len(ids) <= _IN_LIST_MAX:
+        return f"{column} IN ({', '.join('?' * len(ids))})", list(ids)
+    return f"{column} IN (SELECT CAST([value] AS INT) FROM OPENJSON(?))", [json.dumps(ids)]
+
+
+def _items_batch_query(ids: List[int]) -> Tuple[str, list]:
+    clause, params = _id_filter("id", ids)
+    return f"{_CATALOG_ITEMS_SQL} WHERE {clause}", params
+
+
+def _bosses_batch_query(ids: List[int]) -> Tuple[str, list]:
+    """Both result sets (npcs, then their forms) in a single batch/round trip."""
+    npc_clause, npc_params = _id_filter("id", ids)
+    form_clause, form_params = _id_filter("npc_id", ids)
+    sql = (
+        f"SET NOCOUNT ON; {_CATALOG_NPCS_SQL} WHERE {npc_clause}; "
+        f"{_CATALOG_FORMS_SELECT} WHERE {form_clause} ORDER BY npc_id, form_order"
+    )
+    return sql, npc_params + form_params
+
+
+# ---------- keyset pagination on the stored cursor key ----------
+# ``name_key`` holds cursor_key's normalized name under a binary collation,
+# written by the migration, and (name_key, id) is indexed. Pages seek that
+# index; ``name_key`` is selected last so the next cursor can be read back.
+
+_ITEMS_PAGE_SQL = f"SELECT TOP (?) {_ITEM_SUMMARY_SELECT}, name_key FROM items WHERE 1=1"
+_BOSSES_PAGE_SQL = (
+    "SELECT TOP (?) n.id, n.name, n.raid_group, n.location, n.has_multiple_forms, f.icons, f.image_url, n.name_key "
+    "FROM npcs n OUTER APPLY ("
+    "SELECT TOP 1 icons, image_url FROM npc_forms WHERE npc_id = n.id ORDER BY form_order"
+    ") f WHERE 1=1"
+)
+
+
+def _keyset_predicate(key: str, ident: str) -> str:
+    # The leading range term lets the optimizer seek; the OR only trims ties.
+    return f" AND {key} >= ? AND ({key} > ? OR {ident} > ?)"
+
+
+def _items_page_query(limit: int, after: Optional[SortKey], combat_only: bool) -> Tuple[str, list]:
+    query, params = _ITEMS_PAGE_SQL, [limit + 1]
+    if combat_only:
+        query += " AND has_combat_stats = 1"
+    if after is not None:
+        query += _keyset_predicate("name_key", "id")
+        params.extend([after[0], after[0], after[1]])
+    return query + " ORDER BY name_key, id", params
+
+
+def _bosses_page_query(limit: int, after: Optional[SortKey]) -> Tuple[str, list]:
+    query, params = _BOSSES_PAGE_SQL, [limit + 1]
+    if after is not None:
+        query += _keyset_predicate("n.name_key", "n.id")
+        params.extend([after[0], after[0], after[1]])
+    return query + " ORDER BY n.name_key, n.id", params
+
+
+def _boss_summary_row(r) -> Dict[str, Any]:
+    icons = _json_or(r[5], [])
+    return {
+        "id": r[0],
+        "name": r[1],
+        "raid_group": r[2],
+        "location": r[3],
+        "has_multiple_forms": bool(r[4]),
+        "icon_url": (icons or [None])[0] or r[6],
+    }
+
+
+def _keyset_page(rows, limit: int, summary) -> Tuple[List[Dict[str, Any]], Optional[SortKey]]:
+    """Map the ``limit + 1`` probe rows; the next key is the last kept row's ``(name_key, id)``."""
+    next_key = (rows[limit - 1][-1], rows[limit - 1][0]) if len(rows) > limit else None
+    return [summary(r) for r in rows[:limit]], next_key
+
+
+class _ConnectionSlots:
+    """At most ``capacity`` connections per process, shared by sync and async callers."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._sem = threading.BoundedSemaphore(self.capacity)
+        metrics.DB_CONNECTIONS_CAPACITY.set(self.capacity, "azure")
+
+    def acquire(self) -> None:
+        self._sem.acquire()
+
+    async def acquire_async(self) -> None:
+        if self._sem.acquire(blocking=False):
+            return
+        # Wait on the I/O pool; a cancelled waiter hands its late slot back.
+        waiting = asyncio.get_running_loop().run_in_executor(None, self._sem.acquire)
+        try:
+            await asyncio.shield(waiting)
+        except asyncio.CancelledError:
+            def give_back(f: asyncio.Future) -> None:
+                if not f.cancelled() and f.exception() is None:
+                    self._sem.release()
+
+            waiting.add_done_callback(give_back)
+            raise
+
+    def release(self) -> None:
+        self._sem.release()
 
 
+@metrics.instrument_queries("azure", include_async=True)
 class AzureSQLDatabaseService:
     """Service for handling database operations using Azure SQL Database."""
 
     def __init__(self):
+        self._slots = _ConnectionSlots(DB_MAX_CONNECTIONS)
         # Prefer full Azure connection string from secret
         connection_string = os.environ.get("SQLAZURECONNSTR_DefaultConnection")
 
@@ -61,48 +271,58 @@ class AzureSQLDatabaseService:
     @contextmanager
     def connection(self):
         """Sync connection with retries and guaranteed close."""
-        for attempt in range(MAX_RETRIES):
-            conn = None
-            try:
-                conn = self._get_connection()
-                yield conn
-                return
-            except Exception:
-                if conn:
-                    try:
-                        conn.close()
-                    except Exception:
-                        pass
-                if attempt == MAX_RETRIES - 1:
-                    raise
-                time.sleep(2 ** attempt)
-            finally:
-                if conn:
-                    try:
-                        conn.close()
-                    except Exception:
-                        pass
+        self._slots.acquire()
+        try:
+            for attempt in range(MAX_RETRIES):
+                conn = None
+                try:
+                    conn = self._get_connection()
+                    metrics.DB_CONNECTIONS_IN_USE.inc("azure")
+                    yield conn
+                    return
+                except Exception:
+                    if conn:
+                        try:
+                            conn.close()
+                        except Exception:
+                            pass
+                    if attempt == MAX_RETRIES - 1:
+                        raise
+                    time.sleep(2 ** attempt)
+                finally:
+                    if conn:
+                        metrics.DB_CONNECTIONS_IN_USE.dec("azure")
+                        try:
+                            conn.close()
+                        except Exception:
+                            pass
+        finally:
+            self._slots.release()
 
     @asynccontextmanager
     async def connection_async(self):
         """Async connection with retries and guaranteed close (fixes 'Unclosed connection')."""
+        await self._slots.acquire_async()
         conn = None
-        for attempt in range(MAX_RETRIES):
-            try:
-                conn = await self._get_connection_async()
-                break
-            except Exception:
-                if attempt == MAX_RETRIES - 1:
-                    raise
-                await asyncio.sleep(2 ** attempt)
         try:
+            for attempt in range(MAX_RETRIES):
+                try:
+                    conn = await self._get_connection_async()
+                    metrics.DB_CONNECTIONS_IN_USE.inc("azure")
+                    break
+                except Exception:
+                    if attempt == MAX_RETRIES - 1:
+                        raise
+                    await asyncio.sleep(2 ** attempt)
             yield conn
         finally:
             if conn:
+                metrics.DB_CONNECTIONS_IN_USE.dec("azure")
                 try:
                     await conn.close()
                 except Exception:
                     pass
+            self._slots.release()
 
     # ---------- sync queries ----------
 
@@ -241,11 +461,7 @@ class AzureSQLDatabaseService:
         try:
             with self.connection() as conn:
                 cursor = conn.cursor()
-                query = (
-                    "SELECT id, name, has_special_attack, has_passive_effect, "
-                    "has_combat_stats, is_tradeable, slot, icons "
-                    "FROM items WHERE 1=1"
-                )
+                query = f"SELECT {_ITEM_SUMMARY_SELECT} FROM items WHERE 1=1"
                 params: list[Any] = []
                 if combat_only:
                     query += " AND has_combat_stats = 1"
@@ -257,28 +473,7 @@ class AzureSQLDatabaseService:
                     query += " OFFSET ? ROWS FETCH NEXT ? ROWS ONLY"
                     params.extend([off, limit])
                 cursor.execute(query, params)
-                rows = cursor.fetchall()
-                out = []
-                for r in rows:
-                    icons = []
-                    if r[7]:
-                        try:
-                            icons = json.loads(r[7])
-                        except Exception:
-                            pass
-                    out.append(
-                        {
-                            "id": r[0],
-                            "name": r[1],
-                            "has_special_attack": bool(r[2]),
-                            "has_passive_effect": bool(r[3]),
-                            "has_combat_stats": bool(r[4]),
-                            "is_tradeable": bool(r[5]),
-                            "slot": r[6],
-                            "icons": icons,
-                        }
-                    )
-                return out
+                return [_item_summary_row(r) for r in cursor.fetchall()]
         except Exception as e:
             print(f"Error getting items: {e}")
             raise
@@ -287,41 +482,9 @@ class AzureSQLDatabaseService:
         try:
             with self.connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT id, name, has_special_attack, special_attack_text, "
-                    "has_passive_effect, passive_effect_text, has_combat_stats, "
-                    "is_tradeable, slot, combat_stats, icons "
-                    "FROM items WHERE id = ?",
-                    (item_id,),
-                )
+                cursor.execute(f"SELECT {_ITEM_DETAIL_SELECT} FROM items WHERE id = ?", (item_id,))
                 r = cursor.fetchone()
-                if not r:
-                    return None
-                combat_stats = {}
-                if r[9]:
-                    try:
-                        combat_stats = json.loads(r[9])
-                    except Exception:
-                        pass
-                icons = []
-                if r[10]:
-                    try:
-                        icons = json.loads(r[10])
-                    except Exception:
-                        pass
-                return {
-                    "id": r[0],
-                    "name": r[1],
-                    "has_special_attack": bool(r[2]),
-                    "special_attack_text": r[3],
-                    "has_passive_effect": bool(r[4]),
-                    "passive_effect_text": r[5],
-                    "has_combat_stats": bool(r[6]),
-                    "is_tradeable": bool(r[7]),
-                    "slot": r[8],
-                    "combat_stats": combat_stats,
-                    "icons": icons,
-                }
+                return _item_detail_row(r) if r else None
         except Exception as e:
             print(f"Error getting item {item_id}: {e}")
             raise
@@ -351,46 +514,80 @@ class AzureSQLDatabaseService:
             with self.connection() as conn:
                 cursor = conn.cursor()
                 if limit is not None:
-                    sql = (
-                        "SELECT TOP (?) id, name, has_special_attack, has_passive_effect, "
-                        "has_combat_stats, is_tradeable, slot, icons "
-                        "FROM items WHERE name LIKE ? ORDER BY name"
-                    )
+                    sql = f"SELECT TOP (?) {_ITEM_SUMMARY_SELECT} FROM items WHERE name LIKE ? ORDER BY name"
                     params = [limit, f"%{query}%"]
                 else:
-                    sql = (
-                        "SELECT id, name, has_special_attack, has_passive_effect, "
-                        "has_combat_stats, is_tradeable, slot, icons "
-                        "FROM items WHERE name LIKE ? ORDER BY name"
-                    )
+                    sql = f"SELECT {_ITEM_SUMMARY_SELECT} FROM items WHERE name LIKE ? ORDER BY name"
                     params = [f"%{query}%"]
                 cursor.execute(sql, params)
-                rows = cursor.fetchall()
-                out: list[dict[str, Any]] = []
-                for r in rows:
-                    icons = []
-                    if r[7]:
-                        try:
-                            icons = json.loads(r[7])
-                        except Exception:
-                            pass
-                    out.append(
-                        {
-                            "id": r[0],
-                            "name": r[1],
-                            "has_special_attack": bool(r[2]),
-                            "has_passive_effect": bool(r[3]),
-                            "has_combat_stats": bool(r[4]),
-                            "is_tradeable": bool(r[5]),
-                            "slot": r[6],
-                            "icons": icons,
-                        }
-                    )
-                return out
+                return [_item_summary_row(r) for r in cursor.fetchall()]
         except Exception as e:
             print(f"Error searching items: {e}")
             raise
 
+    def list_items_page(
+        self, limit: int, after: Optional[Tuple[str, int]] = None, combat_only: bool = True
+    ):
+        """Keyset page ordered by ``(name_key, id)``; returns ``(rows, next_key)``."""
+        query, params = _items_page_query(limit, after, combat_only)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        return _keyset_page(rows, limit, _item_summary_row)
+
+    def list_bosses_page(self, limit: int, after: Optional[Tuple[str, int]] = None):
+        query, params = _bosses_page_query(limit, after)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        return _keyset_page(rows, limit, _boss_summary_row)
+
+    def load_catalog(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch every item and boss (with forms) in three set-based queries."""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_CATALOG_ITEMS_SQL)
+            items = cursor.fetchall()
+            cursor.execute(_CATALOG_NPCS_SQL)
+            npcs = cursor.fetchall()
+            cursor.execute(_CATALOG_FORMS_SQL)
+            forms = cursor.fetchall()
+        return _assemble_catalog(items, npcs, forms)
+
+    def get_items(self, item_ids: List[int]) -> List[Dict[str, Any]]:
+        """Item details for ``item_ids`` in one query (unknown ids are skipped)."""
+        ids = sorted({int(i) for i in item_ids})
+        if not ids:
+            return []
+        try:
+            query, params = _items_batch_query(ids)
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+            return _assemble_catalog(rows, [], [])["items"]
+        except Exception:
+            logger.exception("Error getting items %s", ids)
+            raise
+
+    def get_bosses(self, boss_ids: List[int]) -> List[Dict[str, Any]]:
+        ids = sorted({int(i) for i in boss_ids})
+        if not ids:
+            return []
+        try:
+            query, params = _bosses_batch_query(ids)
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                npcs = cursor.fetchall()
+                forms = cursor.fetchall() if cursor.nextset() else []
+            return _assemble_catalog([], npcs, forms)["bosses"]
+        except Exception:
+            logger.exception("Error getting bosses %s", ids)
+            raise
+
     # ---------- async queries ----------
 
     async def get_all_bosses_async(self, limit: int | None = None, offset: int | None = None) -> List[Dict[str, Any]]:
@@ -530,11 +727,7 @@ class AzureSQLDatabaseService:
         try:
             async with self.connection_async() as conn:
                 async with conn.cursor() as cursor:
-                    query = (
-                        "SELECT id, name, has_special_attack, has_passive_effect, "
-                        "has_combat_stats, is_tradeable, slot, icons "
-                        "FROM items WHERE 1=1"
-                    )
+                    query = f"SELECT {_ITEM_SUMMARY_SELECT} FROM items WHERE 1=1"
                     params: list[Any] = []
                     if combat_only:
                         query += " AND has_combat_stats = 1"
@@ -545,30 +738,8 @@ class AzureSQLDatabaseService:
                         off = offset or 0
                         query += " OFFSET ? ROWS FETCH NEXT ? ROWS ONLY"
                         params.extend([off, limit])
-
                     await cursor.execute(query, params)
-                    rows = await cursor.fetchall()
-                    out = []
-                    for r in rows:
-                        icons = []
-                        if r[7]:
-                            try:
-                                icons = json.loads(r[7])
-                            except Exception:
-                                pass
-                        out.append(
-                            {
-                                "id": r[0],
-                                "name": r[1],
-                                "has_special_attack": bool(r[2]),
-                                "has_passive_effect": bool(r[3]),
-                                "has_combat_stats": bool(r[4]),
-                                "is_tradeable": bool(r[5]),
-                                "slot": r[6],
-                                "icons": icons,
-                            }
-                        )
-                    return out
+                    return [_item_summary_row(r) for r in await cursor.fetchall()]
         except Exception as e:
             print(f"Error getting items: {e}")
             raise
@@ -577,41 +748,9 @@ class AzureSQLDatabaseService:
         try:
             async with self.connection_async() as conn:
                 async with conn.cursor() as cursor:
-                    await cursor.execute(
-                        "SELECT id, name, has_special_attack, special_attack_text, "
-                        "has_passive_effect, passive_effect_text, has_combat_stats, "
-                        "is_tradeable, slot, combat_stats, icons "
-                        "FROM items WHERE id = ?",
-                        (item_id,),
-                    )
+                    await cursor.execute(f"SELECT {_ITEM_DETAIL_SELECT} FROM items WHERE id = ?", (item_id,))
                     r = await cursor.fetchone()
-                    if not r:
-                        return None
-                    combat_stats = {}
-                    if r[9]:
-                        try:
-                            combat_stats = json.loads(r[9])
-                        except Exception:
-                            pass
-                    icons = []
-                    if r[10]:
-                        try:
-                            icons = json.loads(r[10])
-                        except Exception:
-                            pass
-                    return {
-                        "id": r[0],
-                        "name": r[1],
-                        "has_special_attack": bool(r[2]),
-                        "special_attack_text": r[3],
-                        "has_passive_effect": bool(r[4]),
-                        "passive_effect_text": r[5],
-                        "has_combat_stats": bool(r[6]),
-                        "is_tradeable": bool(r[7]),
-                        "slot": r[8],
-                        "combat_stats": combat_stats,
-                        "icons": icons,
-                    }
+                    return _item_detail_row(r) if r else None
         except Exception as e:
             print(f"Error getting item {item_id}: {e}")
             raise
@@ -641,46 +780,77 @@ class AzureSQLDatabaseService:
             async with self.connection_async() as conn:
                 async with conn.cursor() as cursor:
                     if limit is not None:
-                        sql = (
-                            "SELECT TOP (?) id, name, has_special_attack, has_passive_effect, "
-                            "has_combat_stats, is_tradeable, slot, icons "
-                            "FROM items WHERE name LIKE ? ORDER BY name"
-                        )
+                        sql = f"SELECT TOP (?) {_ITEM_SUMMARY_SELECT} FROM items WHERE name LIKE ? ORDER BY name"
                         params = [limit, f"%{query}%"]
                     else:
-                        sql = (
-                            "SELECT id, name, has_special_attack, has_passive_effect, "
-                            "has_combat_stats, is_tradeable, slot, icons "
-                            "FROM items WHERE name LIKE ? ORDER BY name"
-                        )
+                        sql = f"SELECT {_ITEM_SUMMARY_SELECT} FROM items WHERE name LIKE ? ORDER BY name"
                         params = [f"%{query}%"]
                     await cursor.execute(sql, params)
-                    rows = await cursor.fetchall()
-                    out: list[dict[str, Any]] = []
-                    for r in rows:
-                        icons = []
-                        if r[7]:
-                            try:
-                                icons = json.loads(r[7])
-                            except Exception:
-                                pass
-                        out.append(
-                            {
-                                "id": r[0],
-                                "name": r[1],
-                                "has_special_attack": bool(r[2]),
-                                "has_passive_effect": bool(r[3]),
-                                "has_combat_stats": bool(r[4]),
-                                "is_tradeable": bool(r[5]),
-                                "slot": r[6],
-                                "icons": icons,
-                            }
-                        )
-                    return out
+                    return [_item_summary_row(r) for r in await cursor.fetchall()]
         except Exception as e:
             print(f"Error searching items: {e}")
             raise
 
+    async def list_items_page_async(
+        self, limit: int, after: Optional[Tuple[str, int]] = None, combat_only: bool = True
+    ):
+        query, params = _items_page_query(limit, after, combat_only)
+        async with self.connection_async() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                rows = await cursor.fetchall()
+        return _keyset_page(rows, limit, _item_summary_row)
+
+    async def list_bosses_page_async(self, limit: int, after: Optional[Tuple[str, int]] = None):
+        query, params = _bosses_page_query(limit, after)
+        async with self.connection_async() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                rows = await cursor.fetchall()
+        return _keyset_page(rows, limit, _boss_summary_row)
+
+    async def load_catalog_async(self) -> Dict[str, List[Dict[str, Any]]]:
+        async with self.connection_async() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(_CATALOG_ITEMS_SQL)
+                items = await cursor.fetchall()
+                await cursor.execute(_CATALOG_NPCS_SQL)
+                npcs = await cursor.fetchall()
+                await cursor.execute(_CATALOG_FORMS_SQL)
+                forms = await cursor.fetchall()
+        return _assemble_catalog(items, npcs, forms)
+
+    async def get_items_async(self, item_ids: List[int]) -> List[Dict[str, Any]]:
+        ids = sorted({int(i) for i in item_ids})
+        if not ids:
+            return []
+        try:
+            query, params = _items_batch_query(ids)
+            async with self.connection_async() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(query, params)
+                    rows = await cursor.fetchall()
+            return _assemble_catalog(rows, [], [])["items"]
+        except Exception:
+            logger.exception("Error getting items %s", ids)
+            raise
+
+    async def get_bosses_async(self, boss_ids: List[int]) -> List[Dict[str, Any]]:
+        ids = sorted({int(i) for i in boss_ids})
+        if not ids:
+            return []
+        try:
+            query, params = _bosses_batch_query(ids)
+            async with self.connection_async() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(query, params)
+                    npcs = await cursor.fetchall()
+                    forms = await cursor.fetchall() if await cursor.nextset() else []
+            return _assemble_catalog([], npcs, forms)["bosses"]
+        except Exception:
+            logger.exception("Error getting bosses %s", ids)
+            raise
+
 
 # legacy export used elsewhere
 DatabaseService = AzureSQLDatabaseService
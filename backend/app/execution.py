@@ -0,0 +1,191 @@
+"""Where request work runs.
+
+* CPU-bound work (DPS, BIS, simulations) goes to a process pool of
+  ``CPU_WORKERS`` processes, so it never holds the event loop or the GIL that
+  other requests need. ``CPU_WORKERS=0`` runs it in the I/O thread pool
+  instead (tests, single-core hosts).
+* Blocking I/O (pyodbc/sqlite calls from sync routes and the repositories'
+  ``run_in_executor(None, ...)``) shares one pool of ``DB_THREADS`` threads:
+  :func:`configure` installs it as the loop's default executor and caps
+  Starlette's sync-route thread limiter to the same size.
+
+Both :func:`run_cpu` and :func:`map_cpu` take the ``Request`` and stop when
+the client disconnects: queued work is cancelled, and :func:`map_cpu`
+submits no further chunks, so an abandoned request frees the pool at the
+next chunk boundary. The caller sees :class:`ClientDisconnected`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from contextlib import contextmanager
+from contextvars import ContextVar
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ClientDisconnected(Exception):
+    """The client went away before the work finished; nothing to send."""
+
+
+_cpu_pool: Optional[Executor] = None
+_io_pool: Optional[ThreadPoolExecutor] = None
+# Set for profiled requests: their CPU work stays in this process, where the sampler sees it.
+_local_cpu: ContextVar[bool] = ContextVar("local_cpu", default=False)
+# map_cpu chunks submitted and not yet finished (this worker's share of the CPU pool)
+_cpu_inflight = 0
+
+
+def _settings():
+    from .config import settings
+
+    return settings
+
+
+def cpu_workers() -> int:
+    return max(0, _settings().CPU_WORKERS)
+
+
+def io_executor() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=_settings().DB_THREADS, thread_name_prefix="io")
+    return _io_pool
+
+
+def cpu_executor() -> Executor:
+    """Process pool (created on first use); the I/O pool when ``CPU_WORKERS=0``."""
+    global _cpu_pool
+    if cpu_workers() == 0:
+        return io_executor()
+    if _cpu_pool is None:
+        # forkserver/spawn: forking a process that already runs threads can deadlock
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        from .profiling import start_background
+
+        # Pool processes run the continuous profiler too (when enabled)
+        _cpu_pool = ProcessPoolExecutor(max_workers=cpu_workers(), mp_context=ctx, initializer=start_background)
+        logger.info("[startup] CPU pool: %d processes", cpu_workers())
+    return _cpu_pool
+
+
+@contextmanager
+def local_cpu() -> Iterator[None]:
+    """Within this block, ``run_cpu``/``map_cpu`` use the I/O thread pool instead of the process pool."""
+    token = _local_cpu.set(True)
+    try:
+        yield
+    finally:
+        _local_cpu.reset(token)
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """Size, busy and queued work of the pools created so far (for ``/metrics``)."""
+    out: Dict[str, Dict[str, int]] = {}
+    io = _io_pool
+    if io is not None:
+        size = len(getattr(io, "_threads", ()))
+        idle = getattr(getattr(io, "_idle_semaphore", None), "_value", 0)
+        out["io"] = {"size": io._max_workers, "busy": max(0, size - idle), "queued": io._work_queue.qsize()}
+    if _cpu_pool is not None:
+        out["cpu"] = {"size": cpu_workers(), "busy": min(_cpu_inflight, cpu_workers())}
+    return out
+
+
+def configure(loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+    """Route blocking I/O through the sized thread pool (call from startup)."""
+    loop = loop or asyncio.get_running_loop()
+    loop.set_default_executor(io_executor())
+    try:
+        import anyio.to_thread
+
+        anyio.to_thread.current_default_thread_limiter().total_tokens = _settings().DB_THREADS
+    except Exception as e:  # pragma: no cover
+        logger.warning("[startup] Could not size the sync-route thread limiter: %s", e)
+
+
+def shutdown() -> None:
+    global _cpu_pool, _io_pool
+    pool, _cpu_pool = _cpu_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+    io, _io_pool = _io_pool, None
+    if io is not None:
+        io.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------- cancellation on disconnect ----------
+
+async def _wait_disconnect(request: Any) -> None:
+    # The body has been read by now, so receive() only returns on disconnect.
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+def _watch(request: Any) -> Optional[asyncio.Task]:
+    if request is None:
+        return None
+    return asyncio.get_running_loop().create_task(_wait_disconnect(request))
+
+
+def _apply(call):
+    fn, args = call
+    return fn(*args)
+
+
+async def run_cpu(fn: Callable[..., Any], *args: Any, request: Any = None) -> Any:
+    """``fn(*args)`` on the CPU pool; ``fn`` and its arguments must be picklable."""
+    (result,) = await map_cpu(_apply, [(fn, args)], request=request)
+    return result
+
+
+async def map_cpu(
+    fn: Callable[..., Any],
+    chunks: Iterable[Any],
+    *args: Any,
+    request: Any = None,
+) -> List[Any]:
+    """``[fn(chunk, *args) for chunk in chunks]`` on the CPU pool, in order.
+
+    At most one chunk per pool worker is outstanding, so a disconnect stops
+    the request after the chunks already running.
+    """
+    global _cpu_inflight
+    loop = asyncio.get_running_loop()
+    executor = io_executor() if _local_cpu.get() else cpu_executor()
+    width = max(1, cpu_workers() or 1)
+    source = iter(enumerate(chunks))
+    pending: Dict[asyncio.Future, int] = {}
+    results: Dict[int, Any] = {}
+    watcher = _watch(request)
+    try:
+        while True:
+            while len(pending) < width:
+                nxt = next(source, None)
+                if nxt is None:
+                    break
+                index, chunk = nxt
+                pending[loop.run_in_executor(executor, fn, chunk, *args)] = index
+                _cpu_inflight += 1
+            if not pending:
+                break
+            waiting = set(pending) | ({watcher} if watcher is not None else set())
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if watcher is not None and watcher in done:
+                raise ClientDisconnected()
+            for call in done:
+                _cpu_inflight -= 1
+                results[pending.pop(call)] = call.result()
+    finally:
+        _cpu_inflight -= len(pending)
+        for call in pending:
+            call.cancel()  # only not-yet-started work can be cancelled
+        if watcher is not None:
+            watcher.cancel()
+    return [results[i] for i in range(len(results))]
@@ -4,7 +4,7 @@ import base64
 import json
 from typing import Iterable, Optional, List, Literal
 
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.routing import APIRouter
@@ -23,10 +23,16 @@ from .repositories import (
 from .config.settings import CACHE_TTL_SECONDS  # if unused, you can remove
 from .models import DpsResult, Boss, BossSummary, Item, ItemSummary, DpsParameters
 from .services import calculation_service, seed_service, bis_service
+from . import execution, metrics, service_factory
 
 # Middleware
 from .middleware.cache_headers import CacheHeadersMiddleware
 from .middleware.rate_limit import RateLimitMiddleware
+from .middleware.admission import AdmissionControlMiddleware, default_classes
+from .middleware.catalog_pin import CatalogPinMiddleware
+from .middleware.request_metrics import MetricsMiddleware
+from .middleware.tracing import TracingMiddleware
+from .middleware.profiling import ProfilingMiddleware
 
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
@@ -76,18 +82,34 @@ def create_app() -> FastAPI:
         version="1.0.0",
     )
 
-    # CORS
+    # Catalog backend (CATALOG_BACKEND=azure|sqlite). Tests patch their own
+    # services, so only wire one there when a backend is requested explicitly.
+    if os.getenv("SCAPELAB_TESTING") != "1" or os.getenv("CATALOG_BACKEND"):
+        try:
+            service_factory.configure_repositories()
+        except Exception as e:
+            logging.warning("[startup] Catalog backend unavailable: %s", e)
+
+    from .config import settings
+
+    # Admission control: bounded concurrency + wait queue per expensive route
+    # class (inside the rate limiter, so rejected clients never queue)
+    app.add_middleware(AdmissionControlMiddleware, classes=default_classes(settings))
+
+    # Rate limiting (token bucket per client IP, shared across workers)
+    from .middleware.rate_limit_store import create_store
+
+    try:
+        rl_store = create_store(settings.RATE_LIMIT_STORE, settings.RATE_LIMIT_MAX_KEYS, settings.RATE_LIMIT_SHM_PATH)
+    except OSError as e:
+        logging.warning("[startup] Shared rate-limit store unavailable, using per-process buckets: %s", e)
+        rl_store = create_store("local", settings.RATE_LIMIT_MAX_KEYS)
     app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],  # tighten in prod
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        RateLimitMiddleware, rate=10, per_seconds=1, burst=30,
+        store=rl_store, proxy_hops=settings.RATE_LIMIT_PROXY_HOPS,
+        costs={"/bis": settings.RATE_LIMIT_BIS_COST},
     )
 
-    # Rate limiting (simple token bucket per-IP)
-    app.add_middleware(RateLimitMiddleware, rate=10, per_seconds=1, burst=30)
-
     # Default cache headers (only for whitelisted routes)
     app.add_middleware(
         CacheHeadersMiddleware,
@@ -95,13 +117,36 @@ def create_app() -> FastAPI:
             "/items": 86400,
             "/npcs": 86400,
             "/effects": 3600,
+            "/bootstrap": 3600,
             "/search/items": 600,
             "/search/npcs": 600,
+            "/autocomplete": 600,
             "/special-attacks": 3600,  # ensure middleware matches the tests' path
         },
         default_ttl=None,
     )
 
+    # Admin-requested per-request profiles (X-Profile: 1 + X-Admin-Token)
+    app.add_middleware(ProfilingMiddleware)
+
+    # The whole request reads one catalog snapshot, even across a reload
+    app.add_middleware(CatalogPinMiddleware)
+
+    # Server span per request (a no-op unless TRACING_EXPORTER is set)
+    app.add_middleware(TracingMiddleware, router=app.router)
+
+    # Count and time every request, including rate-limited and shed ones
+    app.add_middleware(MetricsMiddleware, router=app.router)
+
+    # CORS outermost, so 429/503 rejections carry the headers browsers need to read them
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # tighten in prod
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
     # Optional: serve /static if present
     BASE_DIR = os.path.dirname(
         os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -117,6 +162,9 @@ def create_app() -> FastAPI:
     except Exception:
         pass
 
+    from .routes.profiling import router as profiling_router
+    app.include_router(profiling_router)
+
     # === Include your catalog router if present ===
     discovered = _discover_router(catalog_mod)
     if discovered:
@@ -174,7 +222,7 @@ def create_app() -> FastAPI:
                 return []
 
     # Calculation endpoints: ensure specific response keys that tests assert on
-    from pydantic import BaseModel
+    from pydantic import BaseModel, ConfigDict
 
     class DpsPayload(BaseModel):
         combat_style: Literal["melee", "ranged", "magic"]
@@ -200,6 +248,9 @@ def create_app() -> FastAPI:
         target_magic_level: int
 
     class BisRequest(BaseModel):
+        # DPS parameters for the scoring ride along as extra fields.
+        model_config = ConfigDict(extra="allow")
+
         npc_id: Optional[int] = None
         combat_style: Optional[Literal["melee", "ranged", "magic"]] = None
         slot_whitelist: Optional[List[str]] = None
@@ -208,9 +259,11 @@ def create_app() -> FastAPI:
 
     if "/calculate/dps" not in present:
         @app.post("/calculate/dps")
-        def calculate_dps(payload: DpsPayload):
+        async def calculate_dps(payload: DpsPayload):
+            # One calculation takes microseconds, less than a hop to the CPU
+            # pool, so it runs inline; batch and BIS work use the pool.
             try:
-                out = calculation_service.calculate_dps(payload.model_dump())
+                out = calculation_service.calculate_dps(payload.model_dump(exclude_none=True))
                 # Ensure a dps key exists
                 if isinstance(out, dict) and "dps" in out:
                     return out
@@ -256,12 +309,14 @@ def create_app() -> FastAPI:
 
     if "/bis" not in present:
         @app.post("/bis")
-        async def bis(payload: BisRequest):
+        async def bis(payload: BisRequest, request: Request):
             try:
-                out = await bis_service.compute_bis_async(payload.model_dump())
+                out = await bis_service.compute_bis_async(payload.model_dump(exclude_none=True), request=request)
                 # Ensure 'best_dps' exists per tests
                 if isinstance(out, dict) and "best_dps" in out:
                     return out
+            except execution.ClientDisconnected:
+                return Response(status_code=499)
             except Exception:
                 pass
             return {"best_dps": 0, "items": []}
@@ -269,43 +324,41 @@ def create_app() -> FastAPI:
     # Startup (DB connect) guarded for tests/CI
     @app.on_event("startup")
     async def _startup():
-        # --- Cache warmup: prefer async service methods if available ---
-        try:
-            from .repositories import item_repository, boss_repository
-    
-            # Items
-            try:
-                svc = getattr(item_repository, "db_service", None)
-                if svc is not None:
-                    if hasattr(svc, "get_all_items_async"):
-                        items = await svc.get_all_items_async()
-                    elif hasattr(svc, "get_all_items"):
-                        items = svc.get_all_items()
-                    else:
-                        items = []
-                    # store the concrete list, not a MagicMock
-                    item_repository._all_items_cache["all"] = items
-            except Exception as e:  # pragma: no cover
-                logging.warning("[startup] Item cache warmup skipped: %s", e)
-    
-            # Bosses
-            try:
-                bsvc = getattr(boss_repository, "db_service", None)
-                if bsvc is not None:
-                    if hasattr(bsvc, "get_all_bosses_async"):
-                        bosses = await bsvc.get_all_bosses_async()
-                    elif hasattr(bsvc, "get_all_bosses"):
-                        bosses = bsvc.get_all_bosses()
-                    else:
-                        bosses = []
-                    boss_repository._all_bosses_cache["all"] = bosses
-            except Exception as e:  # pragma: no cover
-                logging.warning("[startup] Boss cache warmup skipped: %s", e)
-    
-            logging.info("[startup] Repository caches warmed")
-        except Exception as e:  # pragma: no cover
-            logging.warning("[startup] Cache warmup skipped: %s", e)
-    
+        # --- Catalog load: snapshot (or list-cache warmup), then background refresh ---
+        from .catalog.refresher import get_refresher
+        from .config import settings
+
+        # Blocking I/O on the sized thread pool; CPU work goes to execution.cpu_executor()
+        execution.configure()
+
+        from .catalog.preload import preloaded_version
+        from .memory import process_memory
+
+        refresher = get_refresher()
+        if preloaded_version() is not None:
+            # Forked from a preloading parent: the snapshot is already shared with us.
+            logging.info("[startup] Catalog %s preloaded by the parent process", preloaded_version())
+        else:
+            status = await refresher.refresh()
+            if status["last_result"] == "error":
+                logging.warning("[startup] Catalog load failed, retrying in background: %s", status["last_error"])
+            else:
+                logging.info("[startup] Catalog %s", status["last_result"])
+        if settings.CATALOG_REFRESH_SECONDS > 0:
+            refresher.start()
+        from .profiling import start_background
+
+        # Continuous low-duty-cycle sampling (PROFILER_DUTY_CYCLE=0 disables it)
+        start_background()
+        # Keep this worker's share of /metrics current, off the event loop
+        metrics.start_flusher()
+        mem = process_memory()
+        logging.info(
+            "[startup] Worker %s memory: rss=%s pss=%s shared=%s",
+            mem["pid"], mem.get("rss_bytes"), mem.get("pss_bytes"),
+            mem.get("shared_clean_bytes", 0) + mem.get("shared_dirty_bytes", 0),
+        )
+
         # --- Optional DB connectivity check (guarded in CI/tests) ---
         if os.getenv("DISABLE_STARTUP_DB_CONNECT") == "1" or os.getenv("SCAPELAB_TESTING") == "1":
             logging.info("[startup] Skipping DB init (DISABLE_STARTUP_DB_CONNECT/SCAPELAB_TESTING)")
@@ -325,6 +378,17 @@ def create_app() -> FastAPI:
         except Exception as e:  # pragma: no cover
             logging.exception("[startup] DB connection failed: %s", e)
 
+    @app.on_event("shutdown")
+    async def _shutdown():
+        from .catalog.refresher import get_refresher
+
+        await get_refresher().stop()
+        metrics.flush()
+        from .profiling import stop_background
+
+        stop_background()
+        execution.shutdown()
+
     return app
 
 
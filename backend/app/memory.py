@@ -0,0 +1,44 @@
+"""Resident memory of the current process, for comparing workers.
+
+On Linux ``/proc/self/smaps_rollup`` splits RSS into pages shared with other
+processes and pages private to this one; ``pss`` charges each shared page
+proportionally, so the sum of ``pss`` over all workers is their real
+footprint. Elsewhere only the peak RSS from ``getrusage`` is available.
+"""
+from __future__ import annotations
+
+import gc
+import os
+import sys
+from typing import Any, Dict
+
+_SMAPS_FIELDS = {
+    "Rss": "rss_bytes",
+    "Pss": "pss_bytes",
+    "Shared_Clean": "shared_clean_bytes",
+    "Shared_Dirty": "shared_dirty_bytes",
+    "Private_Clean": "private_clean_bytes",
+    "Private_Dirty": "private_dirty_bytes",
+}
+
+
+def process_memory() -> Dict[str, Any]:
+    out: Dict[str, Any] = {"pid": os.getpid(), "gc_frozen_objects": gc.get_freeze_count()}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                field = _SMAPS_FIELDS.get(key)
+                if field is not None:
+                    out[field] = int(rest.split()[0]) * 1024
+        return out
+    except OSError:
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        out["max_rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):  # pragma: no cover - Windows
+        pass
+    return out
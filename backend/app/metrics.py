@@ -0,0 +1,542 @@
+"""In-process metrics in the Prometheus text format (``GET /metrics``).
+
+Counters, gauges and histograms are plain dicts keyed by label values, each
+family guarded by its own lock, so recording from async tasks, sync routes
+and I/O threads is safe and costs a lock round-trip. Collectors read
+counters that other modules already keep (repository caches, admission
+gates, execution pools) at scrape time instead of duplicating them.
+
+Aggregation across processes: when ``METRICS_DIR`` is set, every process
+(gunicorn workers and CPU-pool processes alike) writes its values to
+``<METRICS_DIR>/<pid>.<token>.json`` every ``METRICS_FLUSH_SECONDS`` from a
+background thread (started by the first recording or at startup), and on
+every scrape, so recording never writes files on the event loop. The worker that answers ``/metrics``
+sums all files: counters and histograms include processes that have exited,
+gauges only live ones. Without ``METRICS_DIR`` the endpoint reports the
+answering process only.
+"""
+from __future__ import annotations
+
+import bisect
+import functools
+import glob
+import inspect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+COUNT_BUCKETS = (1, 10, 100, 500, 1000, 2500, 5000, 10000, 50000)
+
+Labels = Tuple[str, ...]
+# name -> {"type", "help", "labels", ["buckets"], "samples": [[labels, value]]}
+Dump = Dict[str, Dict[str, Any]]
+
+
+class _Family:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, Any] = {}
+        self._lock = threading.Lock()
+        _FAMILIES.append(self)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def dump(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = [[list(k), _copy(v)] for k, v in self._values.items()]
+        return {"type": self.kind, "help": self.help, "labels": list(self.labelnames), "samples": samples}
+
+
+def _copy(value: Any) -> Any:
+    return list(value) if isinstance(value, list) else value
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+        _ensure_flusher()
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+
+class Gauge(_Family):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = float(value)
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+
+class Histogram(_Family):
+    """Per label set: one count per bucket (last is ``+Inf``), then sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+        _ensure_flusher()
+
+    def count(self, *labels: str) -> int:
+        row = self._values.get(labels)
+        return row[-1] if row else 0
+
+    def dump(self) -> Dict[str, Any]:
+        out = super().dump()
+        out["buckets"] = list(self.buckets)
+        return out
+
+
+class timed:
+    """``with timed(HISTOGRAM, *labels):`` observes the block's wall time."""
+
+    __slots__ = ("hist", "labels", "start")
+
+    def __init__(self, hist: Histogram, *labels: str) -> None:
+        self.hist = hist
+        self.labels = labels
+
+    def __enter__(self) -> "timed":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.hist.observe(time.perf_counter() - self.start, *self.labels)
+
+
+_FAMILIES: List[_Family] = []
+# Each returns extra families in dump form, read at flush/scrape time.
+_COLLECTORS: List[Callable[[], Dump]] = []
+
+
+def register_collector(fn: Callable[[], Dump]) -> Callable[[], Dump]:
+    _COLLECTORS.append(fn)
+    return fn
+
+
+# ---------- application metrics ----------
+
+HTTP_REQUESTS = Counter(
+    "scapelab_http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"),
+)
+HTTP_LATENCY = Histogram(
+    "scapelab_http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"),
+)
+DB_QUERY_LATENCY = Histogram(
+    "scapelab_db_query_duration_seconds", "Catalog database query latency", ("backend", "query"),
+)
+DB_QUERY_ERRORS = Counter("scapelab_db_query_errors_total", "Catalog database queries that raised", ("backend", "query"))
+DB_CONNECTIONS_IN_USE = Gauge("scapelab_db_connections_in_use", "Database connections currently held", ("backend",))
+DB_CONNECTIONS_CAPACITY = Gauge(
+    "scapelab_db_connections_capacity", "Database connections a process may hold at once", ("backend",),
+)
+RATE_LIMITED = Counter("scapelab_rate_limit_rejections_total", "Requests rejected by the rate limiter with 429")
+CALC_LATENCY = Histogram(
+    "scapelab_calculator_duration_seconds", "Time for one DPS calculation", ("style",), buckets=FAST_BUCKETS,
+)
+BIS_LATENCY = Histogram("scapelab_bis_duration_seconds", "Time for one best-in-slot search", ("style",))
+BIS_COMBINATIONS = Histogram(
+    "scapelab_bis_combinations", "Candidate items scored per best-in-slot search", ("style",), buckets=COUNT_BUCKETS,
+)
+
+STYLES = ("melee", "ranged", "magic")
+
+
+def style_label(params: Dict[str, Any]) -> str:
+    style = str(params.get("combat_style") or "melee").lower()
+    return style if style in STYLES else "other"
+
+
+_QUERY_PREFIXES = ("get_", "search_", "list_", "load_")
+
+
+def _timed_query(fn: Callable[..., Any], backend: str, query: str) -> Callable[..., Any]:
+    attributes = {"db.system": backend, "db.operation": query}
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def run_async(*args: Any, **kwargs: Any) -> Any:
+            with tracing.span("db.query", attributes) as span:
+                start = time.perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                except BaseException:
+                    DB_QUERY_ERRORS.inc(backend, query)
+                    raise
+                finally:
+                    DB_QUERY_LATENCY.observe(time.perf_counter() - start, backend, query)
+                if span is not tracing.NOOP:
+                    span.set_attribute("db.rows", tracing.row_count(result))
+                return result
+        return run_async
+
+    @functools.wraps(fn)
+    def run(*args: Any, **kwargs: Any) -> Any:
+        with tracing.span("db.query", attributes) as span:
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                DB_QUERY_ERRORS.inc(backend, query)
+                raise
+            finally:
+                DB_QUERY_LATENCY.observe(time.perf_counter() - start, backend, query)
+            if span is not tracing.NOOP:
+                span.set_attribute("db.rows", tracing.row_count(result))
+            return result
+    return run
+
+
+def instrument_queries(backend: str, include_async: bool = False) -> Callable[[type], type]:
+    """Class decorator timing and tracing a catalog service's ``get_/search_/list_/load_`` methods.
+
+    The query label is the method name without ``_async``. Leave
+    ``include_async`` off when the async methods only hand the sync ones to a
+    thread, so each query is timed once.
+    """
+    def wrap(cls: type) -> type:
+        for name, fn in list(vars(cls).items()):
+            if not name.startswith(_QUERY_PREFIXES) or not inspect.isfunction(fn):
+                continue
+            if inspect.iscoroutinefunction(fn) and not include_async:
+                continue
+            query = name[: -len("_async")] if name.endswith("_async") else name
+            setattr(cls, name, _timed_query(fn, backend, query))
+        return cls
+    return wrap
+
+
+# ---------- collectors for counters kept elsewhere ----------
+
+def _family(kind: str, help: str, labels: Sequence[str], samples: List[list]) -> Dict[str, Any]:
+    return {"type": kind, "help": help, "labels": list(labels), "samples": samples}
+
+
+@register_collector
+def _cache_families() -> Dump:
+    from .repositories.cache import cache_stats
+
+    stats = cache_stats()
+    out: Dump = {}
+    for key, help in (
+        ("hits", "Repository cache hits"),
+        ("misses", "Repository cache misses"),
+        ("evictions", "Repository cache capacity evictions"),
+        ("coalesced", "Repository cache misses that joined an in-flight load"),
+    ):
+        out[f"scapelab_cache_{key}_total"] = _family(
+            "counter", help, ("cache",), [[[s["name"]], s[key]] for s in stats],
+        )
+    out["scapelab_cache_entries"] = _family(
+        "gauge", "Repository cache entries", ("cache",), [[[s["name"]], s["size"]] for s in stats],
+    )
+    return out
+
+
+@register_collector
+def _admission_families() -> Dump:
+    from .middleware import admission
+
+    stats = admission.stats()
+    return {
+        "scapelab_admission_admitted_total": _family(
+            "counter", "Requests admitted per route class", ("class",),
+            [[[name], s["admitted"]] for name, s in stats.items()],
+        ),
+        "scapelab_admission_shed_total": _family(
+            "counter", "Requests shed with 503 per route class", ("class", "reason"),
+            [[[name, reason], s[f"shed_{reason}"]] for name, s in stats.items() for reason in ("queue_full", "timeout")],
+        ),
+        "scapelab_admission_active": _family(
+            "gauge", "Requests holding an admission slot", ("class",),
+            [[[name], s["active"]] for name, s in stats.items()],
+        ),
+        "scapelab_admission_queue_depth": _family(
+            "gauge", "Requests waiting for an admission slot", ("class",),
+            [[[name], s["queue_depth"]] for name, s in stats.items()],
+        ),
+    }
+
+
+@register_collector
+def _pool_families() -> Dump:
+    from . import execution
+
+    stats = execution.pool_stats()
+    return {
+        f"scapelab_pool_{key}": _family(
+            "gauge", help, ("pool",), [[[pool], s[key]] for pool, s in stats.items() if key in s],
+        )
+        for key, help in (
+            ("size", "Threads or processes in the execution pool"),
+            ("busy", "Pool threads or processes running a task"),
+            ("queued", "Tasks waiting for a pool thread or process"),
+        )
+    }
+
+
+# ---------- export, files and merging ----------
+
+_pid = os.getpid()
+_token = uuid.uuid4().hex[:8]
+_flush_lock = threading.Lock()
+
+
+def _settings():
+    from .config import settings
+
+    return settings
+
+
+def directory() -> Optional[str]:
+    return _settings().METRICS_DIR
+
+
+# Whether this process writes a file; the first recording then starts the flush thread.
+_flush_wanted = bool(directory())
+_flusher: Optional[threading.Thread] = None
+_flusher_lock = threading.Lock()
+
+
+def snapshot() -> Dump:
+    """This process's families, including collector output."""
+    out: Dump = {f.name: f.dump() for f in _FAMILIES}
+    for collect in _COLLECTORS:
+        try:
+            out.update(collect())
+        except Exception as e:  # a broken collector must not break the scrape
+            logger.debug("metrics collector %s failed: %s", getattr(collect, "__name__", collect), e)
+    return out
+
+
+def _own_path(root: str) -> str:
+    return os.path.join(root, f"{_pid}.{_token}.json")
+
+
+def flush() -> None:
+    """Write this process's values to ``METRICS_DIR`` (no-op when unset)."""
+    root = directory()
+    if not root:
+        return
+    if not _flush_lock.acquire(blocking=False):
+        return  # another thread is writing the same data
+    try:
+        os.makedirs(root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"pid": _pid, "families": snapshot()}, f, separators=(",", ":"))
+            os.replace(tmp, _own_path(root))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+    except OSError as e:
+        logger.warning("[metrics] Could not write %s: %s", root, e)
+    finally:
+        _flush_lock.release()
+
+
+def _flush_forever() -> None:
+    while True:
+        time.sleep(_settings().METRICS_FLUSH_SECONDS)
+        flush()
+
+
+def start_flusher() -> bool:
+    """Flush this process's file every ``METRICS_FLUSH_SECONDS`` from a daemon thread.
+
+    Returns False without ``METRICS_DIR``. Safe to call repeatedly.
+    """
+    global _flusher
+    if not directory():
+        return False
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_forever, name="metrics-flush", daemon=True)
+            _flusher.start()
+    return True
+
+
+def _ensure_flusher() -> None:
+    if _flush_wanted and _flusher is None:
+        start_flusher()
+
+
+def _alive(pid: int) -> bool:
+    if pid == _pid:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_dumps(root: str) -> Iterable[Tuple[int, Dump]]:
+    own = _own_path(root)
+    for path in glob.glob(os.path.join(root, "*.json")):
+        if path == own:
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            yield int(data["pid"]), data["families"]
+        except (OSError, ValueError, KeyError, TypeError):
+            continue  # being replaced, or not ours
+
+
+def merge(dumps: Iterable[Tuple[int, Dump]]) -> Dump:
+    """Sum per label set; gauges only from processes that are still running."""
+    merged: Dump = {}
+    values: Dict[str, Dict[Labels, Any]] = {}
+    for pid, families in dumps:
+        live = None
+        for name, fam in families.items():
+            if fam["type"] == "gauge":
+                if live is None:
+                    live = _alive(pid)
+                if not live:
+                    continue
+            if name not in merged:
+                merged[name] = {k: v for k, v in fam.items() if k != "samples"}
+                values[name] = {}
+            acc = values[name]
+            for labels, value in fam["samples"]:
+                key = tuple(labels)
+                prev = acc.get(key)
+                if prev is None:
+                    acc[key] = _copy(value)
+                elif isinstance(value, list):
+                    if len(prev) == len(value):
+                        acc[key] = [a + b for a, b in zip(prev, value)]
+                else:
+                    acc[key] = prev + value
+    for name, fam in merged.items():
+        fam["samples"] = [[list(k), v] for k, v in values[name].items()]
+    return merged
+
+
+def collect() -> Dump:
+    """Values of every process sharing ``METRICS_DIR``, or this process alone."""
+    root = directory()
+    own = snapshot()
+    if not root:
+        return own
+    flush()
+    return merge([(_pid, own), *_read_dumps(root)])
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render(families: Optional[Dump] = None) -> str:
+    families = collect() if families is None else families
+    lines: List[str] = []
+    for name in sorted(families):
+        fam = families[name]
+        names = fam["labels"]
+        lines.append(f"# HELP {name} {fam['help']}")
+        lines.append(f"# TYPE {name} {fam['type']}")
+        for labels, value in sorted(fam["samples"], key=lambda s: s[0]):
+            if fam["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            bounds = list(fam["buckets"]) + [float("inf")]
+            for bound, count in zip(bounds, value):
+                cumulative += count
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{name}_bucket{_labels(names, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_number(value[-2])}")
+            lines.append(f"{name}_count{_labels(names, labels)} {_number(value[-1])}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------- process lifecycle ----------
+
+def reset() -> None:
+    """Zero every family in this process (tests, forked children)."""
+    for fam in _FAMILIES:
+        fam.clear()
+
+
+def _after_fork() -> None:
+    # A forked worker starts from zero under its own file; the parent keeps its counts.
+    # The parent's flush thread does not survive the fork; the child starts its own.
+    global _pid, _token, _flush_wanted, _flusher, _flusher_lock, _flush_lock
+    _pid = os.getpid()
+    _token = uuid.uuid4().hex[:8]
+    _flush_wanted = bool(directory())
+    _flusher, _flusher_lock, _flush_lock = None, threading.Lock(), threading.Lock()
+    reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
@@ -0,0 +1,160 @@
+"""Per-route admission control and load shedding (plain ASGI).
+
+Expensive routes are grouped into classes, each with a concurrency limit and a
+bounded FIFO wait queue. A request that finds the queue full, or waits longer
+than ``max_wait`` seconds, gets an immediate ``503`` with ``Retry-After``
+instead of piling up behind CPU-heavy work. Cheap routes are not gated, so a
+``/bis`` spike cannot push out ``/calculate/dps``.
+
+Gates are per worker process (one event loop each); ``stats()`` reports
+current queue depth and cumulative admit/shed counts for every class.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+@dataclass(frozen=True)
+class RouteClass:
+    name: str
+    paths: Iterable[str]
+    max_concurrency: int
+    max_queue: int
+    max_wait: float  # seconds a request may wait for a slot
+
+
+class _Gate:
+    def __init__(self, rc: RouteClass) -> None:
+        self.rc = rc
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self.max_queue_seen = 0
+        # EWMA of time spent holding a slot, used for Retry-After hints.
+        self.avg_service = 1.0
+
+    def retry_after(self) -> int:
+        backlog = len(self.waiters) + self.active
+        return max(1, math.ceil(self.avg_service * backlog / self.rc.max_concurrency))
+
+    async def acquire(self) -> bool:
+        if self.active < self.rc.max_concurrency and not self.waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if len(self.waiters) >= self.rc.max_queue:
+            self.shed_queue_full += 1
+            return False
+        fut = asyncio.get_running_loop().create_future()
+        self.waiters.append(fut)
+        self.max_queue_seen = max(self.max_queue_seen, len(self.waiters))
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), timeout=self.rc.max_wait)
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled():
+                return True  # slot handed over just as the wait expired
+            fut.cancel()
+            self.shed_timeout += 1
+            return False
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release(0.0)  # pass the slot on; this request is gone
+            else:
+                fut.cancel()
+            raise
+        finally:
+            try:
+                self.waiters.remove(fut)
+            except ValueError:
+                pass
+        return True
+
+    def release(self, held: float) -> None:
+        self.avg_service = 0.8 * self.avg_service + 0.2 * held if held else self.avg_service
+        while self.waiters:
+            fut = self.waiters.popleft()
+            if not fut.done():
+                # The slot moves straight to the next waiter; active stays unchanged.
+                self.admitted += 1
+                fut.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.rc.max_concurrency,
+            "max_queue": self.rc.max_queue,
+            "active": self.active,
+            "queue_depth": len(self.waiters),
+            "max_queue_depth": self.max_queue_seen,
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+            "avg_service_seconds": round(self.avg_service, 3),
+        }
+
+
+class AdmissionControlMiddleware:
+    def __init__(self, app: ASGIApp, classes: Iterable[RouteClass]) -> None:
+        self.app = app
+        self.gates: Dict[str, _Gate] = {}
+        self._by_path: Dict[str, _Gate] = {}
+        for rc in classes:
+            gate = self.gates[rc.name] = _Gate(rc)
+            for path in rc.paths:
+                self._by_path[path] = gate
+        global _current
+        _current = self
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        gate = self._by_path.get(scope["path"]) if scope["type"] == "http" else None
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await gate.acquire():
+            response = JSONResponse(
+                {"detail": "Server busy, retry shortly"}, status_code=503,
+                headers={"Retry-After": str(gate.retry_after())},
+            )
+            await response(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release(time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: gate.stats() for name, gate in self.gates.items()}
+
+
+_current: Optional[AdmissionControlMiddleware] = None
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of the most recently built middleware (the live app's)."""
+    return _current.stats() if _current is not None else {}
+
+
+def default_classes(settings: Any) -> List[RouteClass]:
+    return [
+        RouteClass(
+            "bis", ("/bis",),
+            settings.ADMISSION_BIS_CONCURRENCY, settings.ADMISSION_BIS_QUEUE, settings.ADMISSION_BIS_MAX_WAIT,
+        ),
+        RouteClass(
+            "calculate", ("/calculate/dps", "/calculate/seed", "/calculate/item-effect"),
+            settings.ADMISSION_CALC_CONCURRENCY, settings.ADMISSION_CALC_QUEUE, settings.ADMISSION_CALC_MAX_WAIT,
+        ),
+    ]
@@ -1,23 +1,46 @@
 from typing import Dict, Optional
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 
-class CacheHeadersMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, path_ttls: Dict[str, int], default_ttl: Optional[int] = None):
-        super().__init__(app)
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Only these are safe to cache; errors, 429s and 503s must not be replayed
+# by a CDN or browser after the condition clears.
+CACHEABLE_STATUSES = frozenset({200, 203, 304})
+NO_STORE = "no-store"
+
+
+class CacheHeadersMiddleware:
+    """Set ``Cache-Control: public, max-age=<ttl>`` for whitelisted paths.
+
+    Other statuses on those paths get ``no-store``. Plain ASGI: the header is rewritten on ``http.response.start`` and the
+    body messages pass straight through, so streaming responses are untouched.
+    """
+
+    def __init__(self, app: ASGIApp, path_ttls: Dict[str, int], default_ttl: Optional[int] = None):
+        self.app = app
         self.path_ttls = path_ttls
         self.default_ttl = default_ttl
+        # Header values are built once, not per request.
+        self._values = {path: f"public, max-age={ttl}" for path, ttl in path_ttls.items() if ttl}
+        self._default = f"public, max-age={default_ttl}" if default_ttl else None
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        response: Response = await call_next(request)
-        ttl = None
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
         # Exact-path matching; extend to prefix matching if needed
-        if request.url.path in self.path_ttls:
-            ttl = self.path_ttls[request.url.path]
-        elif self.default_ttl is not None:
-            ttl = self.default_ttl
-
-        if ttl:
-            response.headers["Cache-Control"] = f"public, max-age={ttl}"
-        return response
+        path = scope["path"]
+        value = self._values.get(path) if path in self.path_ttls else self._default
+        if value is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cache_control(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                cacheable = message["status"] in CACHEABLE_STATUSES
+                MutableHeaders(scope=message)["Cache-Control"] = value if cacheable else NO_STORE
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache_control)
@@ -0,0 +1,39 @@
+"""Pin one catalog snapshot per request (plain ASGI).
+
+Everything the request reads through ``snapshot.current()`` (repositories,
+payloads, ETags) comes from the snapshot that was live when it arrived, even
+if a reload publishes a new one halfway through. The version is echoed as
+``X-Catalog-Version`` so clients can tell which data answered them.
+
+The pin is a ``ContextVar``: it follows the request into sync routes (run in
+worker threads with a copy of the context) but not into bare
+``run_in_executor`` calls, which read the published snapshot instead.
+"""
+from __future__ import annotations
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..catalog import snapshot as catalog_snapshot
+
+
+class CatalogPinMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with catalog_snapshot.pinned() as snap:
+            if snap is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_version(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message)["X-Catalog-Version"] = snap.version
+                await send(message)
+
+            await self.app(scope, receive, send_with_version)
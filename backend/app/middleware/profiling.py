@@ -0,0 +1,97 @@
+"""Profile one request on demand (plain ASGI).
+
+An admin request with ``X-Profile: 1`` (or ``?profile=1``) and a valid
+``X-Admin-Token`` runs under a :class:`~app.profiling.Sampler`. Its CPU-pool
+work runs in this process so the profile includes it. The collapsed stacks
+are stored before the last body chunk is sent, and ``X-Profile-Id`` names
+them for ``GET /admin/profiles/{id}``. ``return`` instead of ``1`` answers
+with the profile itself, and the handler's status goes in
+``X-Profiled-Status``. Without a valid token the flag is ignored.
+
+Sampling covers every busy thread of the worker, so concurrent requests
+show up in the profile too. Profile on a quiet worker for clean results.
+"""
+from __future__ import annotations
+
+import time
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .. import execution, profiling
+from ..security import is_admin
+
+MODES = {"1": "store", "true": "store", "store": "store", "return": "return"}
+
+
+def _requested_mode(scope: Scope, headers: Headers) -> Optional[str]:
+    value = headers.get("x-profile")
+    if value is None and b"profile=" in scope.get("query_string", b""):
+        values = parse_qs(scope["query_string"].decode("latin-1")).get("profile")
+        value = values[0] if values else None
+    return MODES.get((value or "").strip().lower())
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, interval: float = 0.002) -> None:
+        self.app = app
+        self.interval = interval
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        mode = _requested_mode(scope, headers)
+        if mode is None or not is_admin(headers.get("x-admin-token")):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = profiling.new_profile_id()
+        sampler = profiling.Sampler(self.interval).start()
+        start = time.perf_counter()
+        status = 500
+        stored = False
+
+        def finish() -> None:
+            nonlocal stored
+            if stored:
+                return
+            stored = True
+            sampler.stop()
+            meta = {
+                "method": scope["method"], "path": scope["path"], "status": status,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "samples": sampler.samples, "created": time.time(),
+            }
+            profiling.store_request_profile(profile_id, meta, sampler.snapshot())
+
+        async def send_profiled(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if mode == "return":
+                    return
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            elif message["type"] == "http.response.body":
+                if mode == "return":
+                    return
+                if not message.get("more_body", False):
+                    finish()  # stored before the client can ask for it
+            await send(message)
+
+        try:
+            with execution.local_cpu():
+                await self.app(scope, receive, send_profiled)
+        finally:
+            finish()
+
+        if mode == "return":
+            response = PlainTextResponse(
+                profiling.read_request_profile(profile_id) or "",
+                headers={"X-Profile-Id": profile_id, "X-Profiled-Status": str(status)},
+            )
+            await response(scope, receive, send)
@@ -1,45 +1,70 @@
+import math
 import time
-from typing import Dict
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-
-class _Bucket:
-    __slots__ = ("tokens", "last")
-    def __init__(self, tokens: float, last: float):
-        self.tokens = tokens
-        self.last = last
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, rate: int = 10, per_seconds: int = 1, burst: int = 30):
+from typing import Dict, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .. import metrics
+from .rate_limit_store import LocalStore, RateLimitStore, client_key
+
+
+class RateLimitMiddleware:
+    """Per-client token bucket as plain ASGI; over-limit requests get a 429 directly.
+
+    Bucket state lives in ``store`` (see ``rate_limit_store``): bounded and
+    per-process by default, or shared by every worker on the host. ``costs``
+    maps paths to the tokens one request spends (default 1), so expensive
+    routes drain a client's budget faster.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate: int = 10,
+        per_seconds: int = 1,
+        burst: int = 30,
+        store: Optional[RateLimitStore] = None,
+        proxy_hops: int = 0,
+        costs: Optional[Dict[str, float]] = None,
+    ):
         """
         rate: tokens refilled every per_seconds
         burst: max bucket size
+        proxy_hops: trusted proxies in front of the app (client IP comes from X-Forwarded-For)
+        costs: path -> tokens per request
         """
-        super().__init__(app)
+        self.app = app
         self.rate = float(rate)
         self.per_seconds = float(per_seconds)
         self.burst = float(burst)
-        self.buckets: Dict[str, _Bucket] = {}
-
-    def _key(self, request: Request) -> str:
-        return request.client.host if request.client else "unknown"
-
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
-        key = self._key(request)
-        now = time.monotonic()
-        b = self.buckets.get(key)
-        if not b:
-            b = _Bucket(tokens=self.burst, last=now)
-            self.buckets[key] = b
-
-        # Refill
-        elapsed = now - b.last
-        b.tokens = min(self.burst, b.tokens + (elapsed * (self.rate / self.per_seconds)))
-        b.last = now
-
-        # Spend
-        if b.tokens < 1.0:
-            raise HTTPException(status_code=429, detail="Too many requests")
-        b.tokens -= 1.0
-
-        return await call_next(request)
+        self.refill_per_sec = self.rate / self.per_seconds
+        self.store = store if store is not None else LocalStore()
+        self.proxy_hops = proxy_hops
+        self.costs = dict(costs or {})
+        self.rejections = 0
+
+    def _key(self, scope: Scope) -> str:
+        client = scope.get("client")
+        return client_key(scope.get("headers") or [], client[0] if client else None, self.proxy_hops)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = self.store.take(
+            self._key(scope), time.monotonic(), self.refill_per_sec, self.burst,
+            self.costs.get(scope["path"], 1.0),
+        )
+        if not allowed:
+            self.rejections += 1
+            metrics.RATE_LIMITED.inc()
+            response = JSONResponse(
+                {"detail": "Too many requests"}, status_code=429,
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,225 @@
+"""Token-bucket state for :class:`RateLimitMiddleware`.
+
+A store only needs ``take(key, now, refill_per_sec, burst, cost=1.0)``, which
+atomically refills the bucket for ``key``, spends ``cost`` tokens if there are
+enough, and returns ``(allowed, retry_after_seconds)``. Two implementations ship:
+
+* :class:`LocalStore` – per-process and memory-bounded: an LRU of buckets
+  split into independently locked shards. Buckets idle long enough to have
+  refilled completely are dropped, because a fresh bucket is identical.
+* :class:`SharedMemoryStore` – a fixed-size table in a memory-mapped file
+  (``/dev/shm`` on Linux), so every worker on the host enforces one shared
+  limit. The table is split into stripes guarded by ``fcntl`` byte-range
+  locks, so only requests whose keys hash to the same stripe wait on each
+  other.
+
+Other backends (e.g. a network key-value store) implement the same method.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Protocol, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class RateLimitStore(Protocol):
+    def take(
+        self, key: str, now: float, refill_per_sec: float, burst: float, cost: float = 1.0,
+    ) -> Tuple[bool, float]:
+        ...
+
+
+def _spend(
+    tokens: float, last: float, now: float, refill_per_sec: float, burst: float, cost: float = 1.0,
+) -> Tuple[bool, float, float]:
+    """Refill then spend ``cost`` tokens; returns ``(allowed, tokens_after, retry_after)``."""
+    cost = min(cost, burst)  # a request costing more than the bucket holds could never pass
+    tokens = min(burst, tokens + max(0.0, now - last) * refill_per_sec)
+    if tokens < cost:
+        return False, tokens, (cost - tokens) / refill_per_sec
+    return True, tokens - cost, 0.0
+
+
+# ---------- per-process ----------
+
+class _Bucket:
+    __slots__ = ("tokens", "last")
+
+    def __init__(self, tokens: float, last: float):
+        self.tokens = tokens
+        self.last = last
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+
+
+class LocalStore:
+    def __init__(self, max_keys: int = 100_000, shards: int = 16) -> None:
+        self.shards = [_Shard() for _ in range(shards)]
+        self.max_per_shard = max(1, max_keys // shards)
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return sum(len(s.buckets) for s in self.shards)
+
+    def take(
+        self, key: str, now: float, refill_per_sec: float, burst: float, cost: float = 1.0,
+    ) -> Tuple[bool, float]:
+        shard = self.shards[hash(key) % len(self.shards)]
+        idle_after = burst / refill_per_sec  # time to refill completely
+        with shard.lock:
+            buckets = shard.buckets
+            b = buckets.get(key)
+            if b is None:
+                b = buckets[key] = _Bucket(burst, now)
+            else:
+                buckets.move_to_end(key)
+            allowed, b.tokens, retry_after = _spend(b.tokens, b.last, now, refill_per_sec, burst, cost)
+            b.last = now
+            # Oldest entries first: drop the ones that are full again, then enforce the bound.
+            while buckets:
+                oldest_key, oldest = next(iter(buckets.items()))
+                if oldest_key == key:
+                    break
+                if now - oldest.last >= idle_after:
+                    del buckets[oldest_key]
+                elif len(buckets) > self.max_per_shard:
+                    del buckets[oldest_key]
+                    self.evictions += 1
+                else:
+                    break
+        return allowed, retry_after
+
+
+# ---------- shared across workers ----------
+
+_MAGIC = b"SLRL"
+_HEADER = struct.Struct("<4sII")  # magic, layout version, slot count
+_SLOT = struct.Struct("<Qdd")  # key hash (0 = empty), tokens, last refill
+_LAYOUT_VERSION = 1
+_STRIPE_SLOTS = 16
+
+
+def default_shm_path() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "scapelab-ratelimit")
+
+
+class SharedMemoryStore:
+    def __init__(self, path: Optional[str] = None, slots: int = 65_536) -> None:
+        if fcntl is None:  # pragma: no cover
+            raise RuntimeError("SharedMemoryStore needs fcntl (POSIX)")
+        self.path = path or default_shm_path()
+        self.stripes = max(1, slots // _STRIPE_SLOTS)
+        self.slots = self.stripes * _STRIPE_SLOTS
+        size = _HEADER.size + self.slots * _SLOT.size
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        # Whole-file lock while (re)initializing so concurrent workers agree on the layout.
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) < _HEADER.size or _HEADER.unpack(header) != (_MAGIC, _LAYOUT_VERSION, self.slots):
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, _LAYOUT_VERSION, self.slots), 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+        # fcntl locks are per process; threads of one worker also need to exclude each other.
+        self._thread_locks = [threading.Lock() for _ in range(self.stripes)]
+        self.evictions = 0
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+    def take(
+        self, key: str, now: float, refill_per_sec: float, burst: float, cost: float = 1.0,
+    ) -> Tuple[bool, float]:
+        h = self._hash(key)
+        stripe = h % self.stripes
+        start = _HEADER.size + stripe * _STRIPE_SLOTS * _SLOT.size
+        length = _STRIPE_SLOTS * _SLOT.size
+        idle_after = burst / refill_per_sec
+        m = self._map
+        with self._thread_locks[stripe]:
+            return self._take_locked(m, h, start, length, now, refill_per_sec, burst, idle_after, cost)
+
+    def _take_locked(self, m, h, start, length, now, refill_per_sec, burst, idle_after, cost) -> Tuple[bool, float]:
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+        try:
+            target = free = None
+            oldest, oldest_last = start, math.inf
+            for off in range(start, start + length, _SLOT.size):
+                slot_hash, tokens, last = _SLOT.unpack_from(m, off)
+                if slot_hash == h:
+                    target = (off, tokens, last)
+                    break
+                if free is None and (slot_hash == 0 or now - last >= idle_after):
+                    free = off
+                if last < oldest_last:
+                    oldest, oldest_last = off, last
+            if target is None:
+                if free is None:
+                    free = oldest
+                    self.evictions += 1
+                target = (free, burst, now)
+            off, tokens, last = target
+            allowed, tokens, retry_after = _spend(tokens, last, now, refill_per_sec, burst, cost)
+            _SLOT.pack_into(m, off, h, tokens, now)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+        return allowed, retry_after
+
+
+def create_store(kind: str, max_keys: int, shm_path: Optional[str] = None) -> RateLimitStore:
+    """Store for ``RATE_LIMIT_STORE`` (``local`` or ``shm``; ``shm`` falls back to local without fcntl)."""
+    if kind == "shm" and fcntl is not None:
+        return SharedMemoryStore(shm_path, slots=max_keys)
+    return LocalStore(max_keys=max_keys)
+
+
+# ---------- client identity ----------
+
+def _strip_port(addr: str) -> str:
+    addr = addr.strip()
+    if addr.startswith("["):  # [v6]:port
+        return addr[1:addr.find("]")] if "]" in addr else addr
+    if addr.count(":") == 1:  # v4:port (Azure App Service appends the port)
+        return addr.split(":", 1)[0]
+    return addr
+
+
+def client_key(headers: Dict[bytes, bytes] | List[Tuple[bytes, bytes]], peer: Optional[str], proxy_hops: int) -> str:
+    """Client address, taken from ``X-Forwarded-For`` when behind ``proxy_hops`` trusted proxies.
+
+    Each trusted proxy appends the address it saw, so the client is the entry
+    ``proxy_hops`` from the right; anything further left is client-supplied.
+    """
+    if proxy_hops > 0:
+        values = [v for k, v in (headers.items() if isinstance(headers, dict) else headers) if k == b"x-forwarded-for"]
+        if values:
+            hops = [h for h in b",".join(values).decode("latin-1").split(",") if h.strip()]
+            if hops:
+                return _strip_port(hops[-min(proxy_hops, len(hops))])
+    return peer or "unknown"
@@ -0,0 +1,59 @@
+"""Request count and latency per route template (plain ASGI, outside all but CORS).
+
+Requests are labelled with the matched route's template (``/npc/{npc_id}``),
+never the raw path, so label cardinality stays bounded. Requests answered
+before routing (rate limited, shed, unmatched) are matched against the
+router here; anything that matches no route is ``<unmatched>``.
+"""
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+from starlette.routing import Match, Router
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .. import metrics
+
+UNMATCHED = "<unmatched>"
+
+
+def route_template(scope: Scope, router: Optional[Router]) -> str:
+    """The template of the route that handled (or would handle) this request."""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", UNMATCHED)
+    if router is not None:
+        for candidate in router.routes:
+            match, _ = candidate.matches(scope)
+            if match is not Match.NONE:
+                return getattr(candidate, "path", UNMATCHED) or UNMATCHED
+    return UNMATCHED
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, router: Optional[Router] = None) -> None:
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = route_template(scope, self.router)
+            method = scope["method"]
+            metrics.HTTP_REQUESTS.inc(method, route, str(status))
+            metrics.HTTP_LATENCY.observe(time.perf_counter() - start, method, route)
@@ -0,0 +1,51 @@
+"""One server span per request (plain ASGI).
+
+The span continues an incoming W3C ``traceparent`` and is named after the
+route template once routing is done (``POST /bis``). Spans opened while the
+request runs (cache lookups, queries, BIS phases) become its children.
+Sampled requests get an ``X-Trace-Id`` header for finding their spans.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Router
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .. import tracing
+from .request_metrics import route_template
+
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp, router: Optional[Router] = None) -> None:
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracing.enabled():
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        parent = Headers(scope=scope).get("traceparent")
+        attributes = {"http.request.method": method, "url.path": scope["path"]}
+        with tracing.span(method, attributes, kind="SERVER", parent=parent) as span:
+            trace_id = getattr(span, "trace_id", None)
+
+            async def send_traced(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if trace_id:
+                        MutableHeaders(scope=message)["X-Trace-Id"] = trace_id
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_traced)
+            finally:
+                route = route_template(scope, self.router)
+                span.set_attribute("http.route", route)
+                if isinstance(span, tracing.Span):
+                    span.name = f"{method} {route}"
+                elif hasattr(span, "update_name"):  # OpenTelemetry SDK span
+                    span.update_name(f"{method} {route}")
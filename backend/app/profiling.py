@@ -0,0 +1,309 @@
+"""Statistical profiling: one request on demand, or continuously at a low duty cycle.
+
+Both are built on :class:`Sampler`, a thread that reads every other thread's
+Python stack (``sys._current_frames``) at a fixed interval. It counts the
+stacks in the collapsed format (``root;caller;leaf <count>``), which
+flamegraph.pl, speedscope and inferno read directly. Threads that are idle
+on the selector, a queue or a lock are skipped, so the counts approximate
+on-CPU time.
+
+* Per request: an admin sends ``X-Profile: 1`` (or ``?profile=1``) with
+  ``X-Admin-Token``. ``ProfilingMiddleware`` samples while the request runs.
+  CPU-pool work for that request runs in-process so the sampler sees it.
+  The profile is stored under ``PROFILE_DIR`` and its id is returned in
+  ``X-Profile-Id``. With ``X-Profile: return`` the profile replaces the
+  response body.
+* Continuous: with ``PROFILER_DUTY_CYCLE`` > 0, every worker and CPU-pool
+  process samples for ``PROFILER_WINDOW_SECONDS`` at a time, for that
+  fraction of the time. It keeps only stacks that pass through
+  ``calculate_dps``, ``BISSearcher``, the BIS service or a repository, and
+  writes its totals under ``PROFILE_DIR`` after each window.
+  ``GET /admin/profile/stacks`` sums the processes that are still running.
+"""
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from types import FrameType
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A thread whose innermost frame is in one of these modules is waiting, not running.
+IDLE_MODULES = frozenset({"selectors", "threading", "queue", "concurrent.futures.thread", "multiprocessing.connection"})
+
+# Continuous profiling keeps stacks with a frame matching one of these.
+FOCUS_FUNCTIONS = frozenset({"calculate_dps"})
+FOCUS_MODULE_PREFIXES = ("app.repositories.", "app.services.", "app.calculators.")
+
+MAX_STACKS = 20000
+TRUNCATED = "[truncated]"
+
+
+def _label(frame: FrameType) -> Tuple[str, str, str]:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return module, getattr(code, "co_qualname", code.co_name), code.co_name
+
+
+def _stack(frame: Optional[FrameType]) -> List[Tuple[str, str, str]]:
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def in_focus(labels: Iterable[Tuple[str, str, str]]) -> bool:
+    for module, qualname, name in labels:
+        if name in FOCUS_FUNCTIONS or module.startswith(FOCUS_MODULE_PREFIXES):
+            return True
+    return False
+
+
+def collapse(labels: List[Tuple[str, str, str]]) -> str:
+    return ";".join(f"{module}:{qualname}" for module, qualname, _ in labels)
+
+
+class Sampler:
+    """Counts the stacks of the other threads every ``interval`` seconds."""
+
+    def __init__(
+        self,
+        interval: float,
+        keep: Optional[Callable[[List[Tuple[str, str, str]]], bool]] = None,
+        max_stacks: int = MAX_STACKS,
+    ) -> None:
+        self.interval = interval
+        self.keep = keep
+        self.max_stacks = max_stacks
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        taken = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            labels = _stack(frame)
+            if not labels or labels[-1][0] in IDLE_MODULES:
+                continue
+            if self.keep is not None and not self.keep(labels):
+                continue
+            taken.append(collapse(labels))
+        with self._lock:
+            self.samples += 1
+            for stack in taken:
+                if stack in self.counts or len(self.counts) < self.max_stacks:
+                    self.counts[stack] += 1
+                else:
+                    self.counts[TRUNCATED] += 1
+
+    def _run(self, duration: Optional[float]) -> None:
+        end = None if duration is None else time.monotonic() + duration
+        while not self._stop.wait(self.interval):
+            self.sample()
+            if end is not None and time.monotonic() >= end:
+                return
+
+    def start(self, duration: Optional[float] = None) -> "Sampler":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(duration,), name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+def render(counts: Dict[str, int]) -> str:
+    """Collapsed-stack text, most frequent first."""
+    rows = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    return "".join(f"{stack} {count}\n" for stack, count in rows)
+
+
+# ---------- storage ----------
+
+def _settings():
+    from .config import settings
+
+    return settings
+
+
+def _dir(kind: str) -> str:
+    path = os.path.join(_settings().PROFILE_DIR, kind)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _write_atomic(path: str, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def new_profile_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def store_request_profile(profile_id: str, meta: Dict[str, object], counts: Dict[str, int]) -> None:
+    """Save one request's profile; keeps the newest ``PROFILE_KEEP``."""
+    root = _dir("requests")
+    _write_atomic(os.path.join(root, f"{profile_id}.collapsed"), render(counts))
+    _write_atomic(os.path.join(root, f"{profile_id}.json"), json.dumps({"id": profile_id, **meta}))
+    metas = sorted(glob.glob(os.path.join(root, "*.json")), key=os.path.getmtime, reverse=True)
+    for stale in metas[_settings().PROFILE_KEEP:]:
+        for path in (stale, stale[: -len(".json")] + ".collapsed"):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def list_request_profiles() -> List[Dict[str, object]]:
+    out = []
+    root = _dir("requests")
+    for path in sorted(glob.glob(os.path.join(root, "*.json")), key=os.path.getmtime, reverse=True):
+        try:
+            with open(path, encoding="utf-8") as f:
+                out.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return out
+
+
+def read_request_profile(profile_id: str) -> Optional[str]:
+    if not profile_id.isalnum():
+        return None
+    try:
+        with open(os.path.join(_dir("requests"), f"{profile_id}.collapsed"), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+# ---------- continuous profiling ----------
+
+_background: Optional[Sampler] = None
+_background_thread: Optional[threading.Thread] = None
+_background_stop = threading.Event()
+_token = uuid.uuid4().hex[:8]
+
+
+def _stacks_path() -> str:
+    return os.path.join(_dir("stacks"), f"{os.getpid()}.{_token}.json")
+
+
+def _flush_background() -> None:
+    if _background is None:
+        return
+    try:
+        _write_atomic(_stacks_path(), json.dumps({"pid": os.getpid(), "counts": _background.snapshot()}))
+    except OSError as e:
+        logger.warning("[profiler] Could not write stacks: %s", e)
+
+
+def _duty_loop(sampler: Sampler, window: float, duty: float) -> None:
+    pause = window * (1.0 - duty) / duty
+    while not _background_stop.is_set():
+        deadline = time.monotonic() + window
+        while time.monotonic() < deadline and not _background_stop.wait(sampler.interval):
+            sampler.sample()
+        _flush_background()
+        _background_stop.wait(pause)
+
+
+def start_background() -> bool:
+    """Start continuous sampling in this process if ``PROFILER_DUTY_CYCLE`` > 0."""
+    global _background, _background_thread
+    settings = _settings()
+    duty = min(1.0, settings.PROFILER_DUTY_CYCLE)
+    if duty <= 0 or _background_thread is not None:
+        return False
+    _background = Sampler(1.0 / max(1, settings.PROFILER_SAMPLE_HZ), keep=in_focus)
+    _background_stop.clear()
+    _background_thread = threading.Thread(
+        target=_duty_loop, args=(_background, settings.PROFILER_WINDOW_SECONDS, duty),
+        name="profiler", daemon=True,
+    )
+    _background_thread.start()
+    return True
+
+
+def stop_background() -> None:
+    global _background_thread
+    _background_stop.set()
+    if _background_thread is not None:
+        _background_thread.join()
+        _background_thread = None
+    _flush_background()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def background_stacks() -> Dict[str, int]:
+    """Summed stacks of every running process sampling into ``PROFILE_DIR``; drops exited ones."""
+    _flush_background()
+    total: Counter = Counter()
+    for path in glob.glob(os.path.join(_dir("stacks"), "*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            pid = int(data["pid"])
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+        if pid != os.getpid() and not _alive(pid):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            continue
+        total.update(data["counts"])
+    return dict(total)
+
+
+def _after_fork() -> None:
+    # Sampler threads do not survive fork; the child starts its own at startup.
+    global _background, _background_thread, _token
+    _background, _background_thread = None, None
+    _token = uuid.uuid4().hex[:8]
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
@@ -3,75 +3,190 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 import asyncio
 
+from ..catalog import snapshot as catalog_snapshot
+from ..catalog.pagination import decode_cursor, page_result
+from ..catalog.search_index import search_key
+from ..config.settings import CACHE_TTL_SECONDS, REPO_CACHE_MAX_ENTRIES, REPO_CACHE_NEGATIVE_TTL_SECONDS
+from .cache import RepositoryCache
+
 # Tests patch THIS attribute:
 db_service: Any = None
 
 # Back-compat alias
 boss_service: Any = None
 
-_all_bosses_cache: Dict[str, List[Dict[str, Any]]] = {}
-_boss_cache: Dict[int, Dict[str, Any]] = {}
+_all_bosses_cache = RepositoryCache("bosses.all", 1, CACHE_TTL_SECONDS, REPO_CACHE_NEGATIVE_TTL_SECONDS)
+_boss_cache = RepositoryCache("bosses.by_id", REPO_CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS, REPO_CACHE_NEGATIVE_TTL_SECONDS)
 
 def _svc() -> Any:
     return db_service or boss_service
 
+def _snapshot(detail: bool = False) -> Optional[catalog_snapshot.CatalogSnapshot]:
+    """Published catalog snapshot, if any (``detail`` requires bosses with forms)."""
+    snap = catalog_snapshot.current()
+    if snap is None or (detail and not snap.complete):
+        return None
+    return snap
+
 def get_all_bosses() -> List[Dict[str, Any]]:
-    if "all" in _all_bosses_cache:
-        return _all_bosses_cache["all"]
+    snap = _snapshot()
+    if snap is not None:
+        return list(snap.boss_summaries)
     svc = _svc()
     if svc is None:
-        return []
-    bosses = svc.get_all_bosses()
-    _all_bosses_cache["all"] = bosses
-    return bosses
+        return _all_bosses_cache.get("all") or []
+    return _all_bosses_cache.get_or_load("all", svc.get_all_bosses)
 
 def get_boss(boss_id: int) -> Optional[Dict[str, Any]]:
-    if boss_id in _boss_cache:
-        return _boss_cache[boss_id]
+    snap = _snapshot(detail=True)
+    if snap is not None:
+        return snap.get_boss(boss_id)
+    svc = _svc()
+    if svc is None:
+        return _boss_cache.get(boss_id)
+    return _boss_cache.get_or_load(boss_id, lambda: svc.get_boss(boss_id))
+
+def get_boss_by_form(form_id: int) -> Optional[Dict[str, Any]]:
+    snap = _snapshot(detail=True)
+    if snap is not None:
+        return snap.get_boss_by_form(form_id)
     svc = _svc()
     if svc is None:
         return None
-    b = svc.get_boss(boss_id)
-    _boss_cache[boss_id] = b
-    return b
+    return svc.get_boss_by_form(form_id)
+
+def _fetch_many(svc: Any, ids: List[int]) -> List[Dict[str, Any]]:
+    # Services without a batch method fall back to one lookup per id.
+    if hasattr(svc, "get_bosses"):
+        return [e for e in svc.get_bosses(ids) or [] if e]
+    return [e for e in (svc.get_boss(i) for i in ids) if e]
+
+def get_bosses(boss_ids: List[int]) -> List[Dict[str, Any]]:
+    """Details for many ids in request order (duplicates collapsed, unknown ids skipped).
+
+    Cache hits are served locally; every miss is fetched in one service call.
+    """
+    ids = list(dict.fromkeys(int(i) for i in boss_ids))
+    snap = _snapshot(detail=True)
+    if snap is not None:
+        return [e for e in map(snap.get_boss, ids) if e is not None]
+    found, misses = _boss_cache.lookup_many(ids)
+    svc = _svc()
+    if misses and svc is not None:
+        generation = _boss_cache.generation
+        fetched = {e["id"]: e for e in _fetch_many(svc, misses)}
+        loaded = {i: fetched.get(i) for i in misses}
+        _boss_cache.store_many(loaded, generation)
+        found.update(loaded)
+    return [found[i] for i in ids if found.get(i) is not None]
 
 def search_bosses(query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    snap = _snapshot()
+    if snap is not None:
+        return snap.search_bosses(query, limit)
     svc = _svc()
     if svc is None:
         return []
     return svc.search_bosses(query, limit)
 
+def get_boss_by_name(name: str) -> Optional[Dict[str, Any]]:
+    """Resolve an exact boss name or alias (e.g. "vork") to the full boss."""
+    snap = _snapshot()
+    if snap is not None:
+        hit = snap.find_boss_by_name(name)
+        if hit is None:
+            return None
+        return hit if snap.complete else get_boss(hit["id"])
+    svc = _svc()
+    if svc is None:
+        return None
+    key = search_key(name)
+    for row in svc.search_bosses(name) or []:
+        if search_key(row.get("name")) == key:
+            return get_boss(row["id"])
+    return None
+
+def autocomplete_bosses(prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Compact prefix matches for the NPC picker."""
+    snap = _snapshot()
+    if snap is not None:
+        return snap.autocomplete_bosses(prefix, limit)
+    svc = _svc()
+    if svc is None:
+        return []
+    q = search_key(prefix)
+    rows = [r for r in svc.search_bosses(prefix) or [] if f" {q}" in f" {search_key(r.get('name'))}"]
+    return [catalog_snapshot.compact_boss(r) for r in rows[:limit]]
+
+def list_bosses_page(limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Keyset page of boss summaries ordered by ``cursor_key``; see ``list_items_page``."""
+    after = decode_cursor(cursor)
+    snap = _snapshot()
+    if snap is not None:
+        return page_result(*snap.page_bosses(limit, after))
+    svc = _svc()
+    if svc is None:
+        return page_result([], None)
+    return page_result(*svc.list_bosses_page(limit, after))
+
 # ---------------- Async variants ----------------
 
 async def get_all_bosses_async() -> List[Dict[str, Any]]:
-    if "all" in _all_bosses_cache:
-        return _all_bosses_cache["all"]
+    snap = _snapshot()
+    if snap is not None:
+        return list(snap.boss_summaries)
     svc = _svc()
     if svc is None:
-        return []
-    if hasattr(svc, "get_all_bosses_async"):
-        bosses = await svc.get_all_bosses_async()
-    else:
+        return _all_bosses_cache.get("all") or []
+
+    async def load():
+        if hasattr(svc, "get_all_bosses_async"):
+            return await svc.get_all_bosses_async()
         loop = asyncio.get_running_loop()
-        bosses = await loop.run_in_executor(None, svc.get_all_bosses)
-    _all_bosses_cache["all"] = bosses
-    return bosses
+        return await loop.run_in_executor(None, svc.get_all_bosses)
+
+    return await _all_bosses_cache.get_or_load_async("all", load)
 
 async def get_boss_async(boss_id: int) -> Optional[Dict[str, Any]]:
-    if boss_id in _boss_cache:
-        return _boss_cache[boss_id]
+    snap = _snapshot(detail=True)
+    if snap is not None:
+        return snap.get_boss(boss_id)
     svc = _svc()
     if svc is None:
-        return None
-    if hasattr(svc, "get_boss_async"):
-        b = await svc.get_boss_async(boss_id)
-    else:
+        return _boss_cache.get(boss_id)
+
+    async def load():
+        if hasattr(svc, "get_boss_async"):
+            return await svc.get_boss_async(boss_id)
         loop = asyncio.get_running_loop()
-        b = await loop.run_in_executor(None, svc.get_boss, boss_id)
-    _boss_cache[boss_id] = b
-    return b
+        return await loop.run_in_executor(None, svc.get_boss, boss_id)
+
+    return await _boss_cache.get_or_load_async(boss_id, load)
+
+async def get_bosses_async(boss_ids: List[int]) -> List[Dict[str, Any]]:
+    ids = list(dict.fromkeys(int(i) for i in boss_ids))
+    snap = _snapshot(detail=True)
+    if snap is not None:
+        return [e for e in map(snap.get_boss, ids) if e is not None]
+    found, misses = _boss_cache.lookup_many(ids)
+    svc = _svc()
+    if misses and svc is not None:
+        generation = _boss_cache.generation
+        if hasattr(svc, "get_bosses_async"):
+            rows = await svc.get_bosses_async(misses)
+        else:
+            loop = asyncio.get_running_loop()
+            rows = await loop.run_in_executor(None, _fetch_many, svc, misses)
+        fetched = {e["id"]: e for e in rows or [] if e}
+        loaded = {i: fetched.get(i) for i in misses}
+        _boss_cache.store_many(loaded, generation)
+        found.update(loaded)
+    return [found[i] for i in ids if found.get(i) is not None]
 
 async def search_bosses_async(query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    snap = _snapshot()
+    if snap is not None:
+        return snap.search_bosses(query, limit)
     svc = _svc()
     if svc is None:
         return []
@@ -80,6 +195,27 @@ async def search_bosses_async(query: str, limit: Optional[int] = None) -> List[D
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(None, svc.search_bosses, query, limit)
 
+async def list_bosses_page_async(limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+    after = decode_cursor(cursor)
+    snap = _snapshot()
+    if snap is not None:
+        return page_result(*snap.page_bosses(limit, after))
+    svc = _svc()
+    if svc is None:
+        return page_result([], None)
+    if hasattr(svc, "list_bosses_page_async"):
+        return page_result(*await svc.list_bosses_page_async(limit, after))
+    loop = asyncio.get_running_loop()
+    return page_result(*await loop.run_in_executor(None, svc.list_bosses_page, limit, after))
+
+def invalidate_cache(boss_id: Optional[int] = None) -> None:
+    """Drop one cached boss (or every cached boss and the list when ``boss_id`` is None)."""
+    if boss_id is None:
+        _all_bosses_cache.invalidate()
+        _boss_cache.invalidate()
+    else:
+        _boss_cache.invalidate(boss_id)
+
 def _warm_cache() -> None:
     bosses = get_all_bosses()
     _all_bosses_cache["all"] = bosses
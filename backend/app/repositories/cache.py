@@ -0,0 +1,268 @@
+"""Bounded repository caches with negative-entry TTLs and single-flight loading.
+
+``RepositoryCache`` wraps a ``cachetools.TLRUCache`` (LRU eviction, per-entry
+expiry). A cached ``None`` is a known miss and expires after ``negative_ttl``,
+so IDs added to the catalog later become visible without a restart.
+
+Concurrent misses for one key share a single load: threads wait on the
+first caller's result in ``get_or_load``, and tasks on the same event loop
+await a shared future in ``get_or_load_async``. Loader errors are re-raised
+to every waiter and never cached.
+
+The cache still behaves like a dict for callers that need to seed, inspect or
+clear it (``cache[k] = v``, ``k in cache``, ``cache.get(k)``, ``cache.clear()``).
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from cachetools import TLRUCache
+
+from .. import tracing
+
+_MISSING = object()
+
+
+class _Counting(TLRUCache):
+    """TLRUCache that reports capacity evictions (expiry is not an eviction)."""
+
+    def __init__(self, owner: "RepositoryCache", *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._owner = owner
+
+    def popitem(self):
+        item = super().popitem()
+        self._owner.evictions += 1
+        return item
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class RepositoryCache:
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+        self._data = _Counting(self, maxsize=maxsize, ttu=self._ttu, timer=timer)
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        # Bumped by clear()/invalidate() so loads that started earlier don't store stale values.
+        self._generation = 0
+        _REGISTRY.append(self)
+
+    def _ttu(self, _key: Hashable, value: Any, now: float) -> float:
+        return now + (self.negative_ttl if value is None else self.ttl)
+
+    # ---------- dict-style access ----------
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            return self._data[key]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.get(key, default)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def invalidate(self, key: Hashable = _MISSING) -> None:
+        """Drop ``key`` (or every entry when omitted); in-flight loads won't repopulate it."""
+        with self._lock:
+            self._generation += 1
+            if key is _MISSING:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    # ---------- counted lookups ----------
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """``(found, value)``; counts a hit or a miss. ``value`` may be a cached ``None``."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, value
+
+    def lookup_many(self, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, Any], List[Hashable]]:
+        """Cached entries for ``keys`` plus the keys that missed, in order."""
+        found: Dict[Hashable, Any] = {}
+        missing: List[Hashable] = []
+        with tracing.span("cache.lookup_many", {"cache.name": self.name}) as span:
+            with self._lock:
+                for key in keys:
+                    value = self._data.get(key, _MISSING)
+                    if value is _MISSING:
+                        self.misses += 1
+                        missing.append(key)
+                    else:
+                        self.hits += 1
+                        found[key] = value
+            span.set_attributes({"cache.hits": len(found), "cache.misses": len(missing)})
+        return found, missing
+
+    def store_many(self, values: Dict[Hashable, Any], generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            for key, value in values.items():
+                self._data[key] = value
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    # ---------- single-flight loading ----------
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with tracing.span("cache.get", {"cache.name": self.name}) as span:
+            return self._get_or_load(key, loader, span)
+
+    def _get_or_load(self, key: Hashable, loader: Callable[[], Any], span: Any) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                span.set_attribute("cache.result", "hit")
+                return value
+            self.misses += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                generation = self._generation
+            else:
+                self.coalesced += 1
+        span.set_attribute("cache.result", "miss" if leader else "coalesced")
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            self.store_many({key: flight.value}, generation)
+            return flight.value
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        with tracing.span("cache.get", {"cache.name": self.name}) as span:
+            return await self._get_or_load_async(key, loader, span)
+
+    async def _get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]], span: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                span.set_attribute("cache.result", "hit")
+                return value
+            self.misses += 1
+            task = self._async_flights.get(slot)
+            leader = task is None or task.get_loop() is not loop
+            if leader:
+                task = self._async_flights[slot] = loop.create_task(
+                    self._load_async(slot, key, loader, self._generation)
+                )
+                task.add_done_callback(_retrieve_exception)
+            else:
+                self.coalesced += 1
+        span.set_attribute("cache.result", "miss" if leader else "coalesced")
+        # The load is a detached task shared by every caller, leader included:
+        # cancelling any one of them (shield) leaves the others their value.
+        return await asyncio.shield(task)
+
+    async def _load_async(
+        self, slot: Hashable, key: Hashable, loader: Callable[[], Awaitable[Any]], generation: int
+    ) -> Any:
+        try:
+            value = await loader()
+            self.store_many({key: value}, generation)
+            return value
+        finally:
+            with self._lock:
+                if self._async_flights.get(slot) is asyncio.current_task():
+                    del self._async_flights[slot]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._data)
+        return {
+            "name": self.name,
+            "size": size,
+            "maxsize": self._data.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "coalesced": self.coalesced,
+        }
+
+
+_REGISTRY: List[RepositoryCache] = []
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # Mark a failed load retrieved even when every caller was cancelled.
+    if not task.cancelled():
+        task.exception()
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Counters for every repository cache in this process."""
+    return [c.stats() for c in _REGISTRY]
+
+
+def _reset_counters() -> None:
+    # A forked worker reports its own traffic; the parent's counts stay with the parent.
+    for c in _REGISTRY:
+        c.hits = c.misses = c.evictions = c.coalesced = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_counters)
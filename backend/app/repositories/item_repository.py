@@ -3,77 +3,215 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 import asyncio
 
+from ..catalog import snapshot as catalog_snapshot
+from ..catalog.pagination import decode_cursor, page_result
+from ..catalog.search_index import search_key
+from ..config.settings import CACHE_TTL_SECONDS, REPO_CACHE_MAX_ENTRIES, REPO_CACHE_NEGATIVE_TTL_SECONDS
+from .cache import RepositoryCache
+
 # Tests patch THIS attribute:
 db_service: Any = None
 
 # Back-compat alias if other code references item_service internally
 item_service: Any = None  # not used by tests, but we'll fall back to it
 
-# Simple module-level caches expected by tests
-_all_items_cache: Dict[str, List[Dict[str, Any]]] = {}
-_item_cache: Dict[int, Dict[str, Any]] = {}
+# Bounded LRU caches; a cached None is a known miss and expires after the negative TTL.
+_all_items_cache = RepositoryCache("items.all", 1, CACHE_TTL_SECONDS, REPO_CACHE_NEGATIVE_TTL_SECONDS)
+_item_cache = RepositoryCache("items.by_id", REPO_CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS, REPO_CACHE_NEGATIVE_TTL_SECONDS)
 
 def _svc() -> Any:
     # Prefer db_service (what tests patch); fall back to item_service if set.
     return db_service or item_service
 
+def _snapshot(detail: bool = False) -> Optional[catalog_snapshot.CatalogSnapshot]:
+    """Published catalog snapshot, if any (``detail`` requires full item rows)."""
+    snap = catalog_snapshot.current()
+    if snap is None or (detail and not snap.complete):
+        return None
+    return snap
+
 def get_all_items() -> List[Dict[str, Any]]:
-    if "all" in _all_items_cache:
-        return _all_items_cache["all"]
+    snap = _snapshot()
+    if snap is not None:
+        return list(snap.combat_item_summaries)
     svc = _svc()
     if svc is None:
-        return []
-    items = svc.get_all_items()
-    _all_items_cache["all"] = items
-    return items
+        return _all_items_cache.get("all") or []
+    return _all_items_cache.get_or_load("all", svc.get_all_items)
 
 def get_item(item_id: int) -> Optional[Dict[str, Any]]:
-    if item_id in _item_cache:
-        return _item_cache[item_id]
+    snap = _snapshot(detail=True)
+    if snap is not None:
+        return snap.get_item(item_id)
     svc = _svc()
     if svc is None:
-        return None
-    it = svc.get_item(item_id)
-    _item_cache[item_id] = it
-    return it
+        return _item_cache.get(item_id)
+    return _item_cache.get_or_load(item_id, lambda: svc.get_item(item_id))
+
+def _fetch_many(svc: Any, ids: List[int]) -> List[Dict[str, Any]]:
+    # Services without a batch method fall back to one lookup per id.
+    if hasattr(svc, "get_items"):
+        return [e for e in svc.get_items(ids) or [] if e]
+    return [e for e in (svc.get_item(i) for i in ids) if e]
+
+def get_items(item_ids: List[int]) -> List[Dict[str, Any]]:
+    """Details for many ids in request order (duplicates collapsed, unknown ids skipped).
+
+    Cache hits are served locally; every miss is fetched in one service call.
+    """
+    ids = list(dict.fromkeys(int(i) for i in item_ids))
+    snap = _snapshot(detail=True)
+    if snap is not None:
+        return [e for e in map(snap.get_item, ids) if e is not None]
+    found, misses = _item_cache.lookup_many(ids)
+    svc = _svc()
+    if misses and svc is not None:
+        generation = _item_cache.generation
+        fetched = {e["id"]: e for e in _fetch_many(svc, misses)}
+        loaded = {i: fetched.get(i) for i in misses}
+        _item_cache.store_many(loaded, generation)
+        found.update(loaded)
+    return [found[i] for i in ids if found.get(i) is not None]
+
+def get_combat_items() -> List[Dict[str, Any]]:
+    """Full details (with ``stats``) of every combat item, for scoring.
+
+    ``get_all_items`` returns summaries, which carry no combat bonuses.
+    """
+    snap = _snapshot(detail=True)
+    if snap is not None:
+        return [snap.items_by_id[s["id"]] for s in snap.combat_item_summaries]
+    return get_items([i["id"] for i in get_all_items()])
 
 def search_items(query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    snap = _snapshot()
+    if snap is not None:
+        return snap.search_items(query, limit)
     svc = _svc()
     if svc is None:
         return []
     return svc.search_items(query, limit)
 
+def get_item_by_name(name: str) -> Optional[Dict[str, Any]]:
+    """Resolve an exact item name or alias (e.g. "DHCB") to the full item."""
+    snap = _snapshot()
+    if snap is not None:
+        hit = snap.find_item_by_name(name)
+        if hit is None:
+            return None
+        return hit if snap.complete else get_item(hit["id"])
+    svc = _svc()
+    if svc is None:
+        return None
+    key = search_key(name)
+    for row in svc.search_items(name) or []:
+        if search_key(row.get("name")) == key:
+            return get_item(row["id"])
+    return None
+
+def autocomplete_items(
+    prefix: str, limit: int = 10, slot: Optional[str] = None, combat_only: bool = False,
+) -> List[Dict[str, Any]]:
+    """Compact prefix matches for pickers; ranked by popularity when served from the snapshot."""
+    snap = _snapshot()
+    if snap is not None:
+        return snap.autocomplete_items(prefix, limit, slot, combat_only)
+    svc = _svc()
+    if svc is None:
+        return []
+    q = search_key(prefix)
+    out = []
+    for row in svc.search_items(prefix) or []:
+        if combat_only and not row.get("has_combat_stats"):
+            continue
+        if slot and (row.get("slot") or "").casefold() != slot.casefold():
+            continue
+        if f" {q}" not in f" {search_key(row.get('name'))}":
+            continue
+        out.append(catalog_snapshot.compact_item(row))
+        if len(out) >= limit:
+            break
+    return out
+
+def list_items_page(limit: int, cursor: Optional[str] = None, combat_only: bool = True) -> Dict[str, Any]:
+    """Keyset page of item summaries ordered by ``cursor_key`` (normalized name, then id).
+
+    ``cursor`` is the ``next_cursor`` of the previous page; raises ``ValueError``
+    when it cannot be decoded.
+    """
+    after = decode_cursor(cursor)
+    snap = _snapshot()
+    if snap is not None:
+        return page_result(*snap.page_items(limit, after, combat_only))
+    svc = _svc()
+    if svc is None:
+        return page_result([], None)
+    return page_result(*svc.list_items_page(limit, after, combat_only))
+
 # ---------------- Async variants ----------------
 
 async def get_all_items_async() -> List[Dict[str, Any]]:
-    if "all" in _all_items_cache:
-        return _all_items_cache["all"]
+    snap = _snapshot()
+    if snap is not None:
+        return list(snap.combat_item_summaries)
     svc = _svc()
     if svc is None:
-        return []
-    if hasattr(svc, "get_all_items_async"):
-        items = await svc.get_all_items_async()
-    else:
+        return _all_items_cache.get("all") or []
+
+    async def load():
+        if hasattr(svc, "get_all_items_async"):
+            return await svc.get_all_items_async()
         loop = asyncio.get_running_loop()
-        items = await loop.run_in_executor(None, svc.get_all_items)
-    _all_items_cache["all"] = items
-    return items
+        return await loop.run_in_executor(None, svc.get_all_items)
+
+    return await _all_items_cache.get_or_load_async("all", load)
 
 async def get_item_async(item_id: int) -> Optional[Dict[str, Any]]:
-    if item_id in _item_cache:
-        return _item_cache[item_id]
+    snap = _snapshot(detail=True)
+    if snap is not None:
+        return snap.get_item(item_id)
     svc = _svc()
     if svc is None:
-        return None
-    if hasattr(svc, "get_item_async"):
-        it = await svc.get_item_async(item_id)
-    else:
+        return _item_cache.get(item_id)
+
+    async def load():
+        if hasattr(svc, "get_item_async"):
+            return await svc.get_item_async(item_id)
         loop = asyncio.get_running_loop()
-        it = await loop.run_in_executor(None, svc.get_item, item_id)
-    _item_cache[item_id] = it
-    return it
+        return await loop.run_in_executor(None, svc.get_item, item_id)
+
+    return await _item_cache.get_or_load_async(item_id, load)
+
+async def get_items_async(item_ids: List[int]) -> List[Dict[str, Any]]:
+    ids = list(dict.fromkeys(int(i) for i in item_ids))
+    snap = _snapshot(detail=True)
+    if snap is not None:
+        return [e for e in map(snap.get_item, ids) if e is not None]
+    found, misses = _item_cache.lookup_many(ids)
+    svc = _svc()
+    if misses and svc is not None:
+        generation = _item_cache.generation
+        if hasattr(svc, "get_items_async"):
+            rows = await svc.get_items_async(misses)
+        else:
+            loop = asyncio.get_running_loop()
+            rows = await loop.run_in_executor(None, _fetch_many, svc, misses)
+        fetched = {e["id"]: e for e in rows or [] if e}
+        loaded = {i: fetched.get(i) for i in misses}
+        _item_cache.store_many(loaded, generation)
+        found.update(loaded)
+    return [found[i] for i in ids if found.get(i) is not None]
+
+async def get_combat_items_async() -> List[Dict[str, Any]]:
+    snap = _snapshot(detail=True)
+    if snap is not None:
+        return [snap.items_by_id[s["id"]] for s in snap.combat_item_summaries]
+    return await get_items_async([i["id"] for i in await get_all_items_async()])
 
 async def search_items_async(query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    snap = _snapshot()
+    if snap is not None:
+        return snap.search_items(query, limit)
     svc = _svc()
     if svc is None:
         return []
@@ -82,6 +220,27 @@ async def search_items_async(query: str, limit: Optional[int] = None) -> List[Di
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(None, svc.search_items, query, limit)
 
+async def list_items_page_async(limit: int, cursor: Optional[str] = None, combat_only: bool = True) -> Dict[str, Any]:
+    after = decode_cursor(cursor)
+    snap = _snapshot()
+    if snap is not None:
+        return page_result(*snap.page_items(limit, after, combat_only))
+    svc = _svc()
+    if svc is None:
+        return page_result([], None)
+    if hasattr(svc, "list_items_page_async"):
+        return page_result(*await svc.list_items_page_async(limit, after, combat_only))
+    loop = asyncio.get_running_loop()
+    return page_result(*await loop.run_in_executor(None, svc.list_items_page, limit, after, combat_only))
+
+def invalidate_cache(item_id: Optional[int] = None) -> None:
+    """Drop one cached item (or every cached item and the list when ``item_id`` is None)."""
+    if item_id is None:
+        _all_items_cache.invalidate()
+        _item_cache.invalidate()
+    else:
+        _item_cache.invalidate(item_id)
+
 # Warmup used by tests on app startup
 def _warm_cache() -> None:
     items = get_all_items()
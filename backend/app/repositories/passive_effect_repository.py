@@ -4,6 +4,8 @@ import re
 from pathlib import Path
 from typing import Dict, Optional, Any, List
 
+from ..catalog import snapshot as catalog_snapshot
+
 DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "passive_effects.json"
 
 
@@ -26,8 +28,8 @@ def _parse_objects(text: str) -> List[Dict[str, Any]]:
     return objs
 
 
-@lru_cache(maxsize=1)
-def _load_data() -> Dict[str, Any]:
+def read_dataset() -> Dict[str, Any]:
+    """Read and key ``passive_effects.json`` (uncached; used by the catalog reload)."""
     with open(DATA_PATH, "r", encoding="utf-8") as f:
         raw = f.read()
     try:
@@ -45,6 +47,21 @@ def _load_data() -> Dict[str, Any]:
     return result
 
 
+_read_cached = lru_cache(maxsize=1)(read_dataset)
+
+
+def invalidate_cache() -> None:
+    _read_cached.cache_clear()
+
+
+def _load_data() -> Dict[str, Any]:
+    # The snapshot's copy wins so a reload swaps it with the rest of the catalog.
+    snap = catalog_snapshot.current()
+    if snap is not None and snap.passive_effects:
+        return snap.passive_effects
+    return _read_cached()
+
+
 def get_passive_effect(item_name: str) -> Optional[Dict[str, Any]]:
     data = _load_data()
     key = item_name.lower().replace(" ", "_")
@@ -4,6 +4,7 @@ from typing import Dict, Optional, Any, List
 
 from cachetools import TTLCache
 
+from ..catalog import snapshot as catalog_snapshot
 from ..config.settings import CACHE_TTL_SECONDS
 
 _data_cache: TTLCache[str, Dict[str, Any]] = TTLCache(maxsize=1, ttl=CACHE_TTL_SECONDS)
@@ -11,11 +12,8 @@ _data_cache: TTLCache[str, Dict[str, Any]] = TTLCache(maxsize=1, ttl=CACHE_TTL_S
 DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "special_attacks.json"
 
 
-def _load_data() -> Dict[str, Any]:
-    data = _data_cache.get("all")
-    if data is not None:
-        return data
-
+def read_dataset() -> Dict[str, Any]:
+    """Read and key ``special_attacks.json`` (uncached; used by the catalog reload)."""
     with open(DATA_PATH, "r", encoding="utf-8") as f:
         raw = json.load(f)
 
@@ -29,7 +27,25 @@ def _load_data() -> Dict[str, Any]:
             data[key] = entry
     else:
         data = raw
+    return data
+
+
+def invalidate_cache() -> None:
+    _data_cache.clear()
+
+
+def _load_data() -> Dict[str, Any]:
+    # Prefer the copy published with the catalog snapshot, so a reload swaps
+    # it together with items and bosses.
+    snap = catalog_snapshot.current()
+    if snap is not None and snap.special_attacks:
+        return snap.special_attacks
+
+    data = _data_cache.get("all")
+    if data is not None:
+        return data
 
+    data = read_dataset()
     _data_cache["all"] = data
     return data
 
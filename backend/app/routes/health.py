@@ -1,5 +1,5 @@
 import os
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -25,3 +25,24 @@ async def healthz():
         except Exception:
             db_ok = False
     return Health(ok=True, env=env, db_ok=db_ok)
+
+
+@router.get("/healthz/load")
+async def healthz_load():
+    # Per route class: active, queue depth and admit/shed counts (this worker)
+    from ..middleware import admission
+    return admission.stats()
+
+
+@router.get("/healthz/memory")
+async def healthz_memory():
+    # RSS/PSS of the worker that answers; compare across workers to see sharing
+    from ..memory import process_memory
+    return process_memory()
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics_text():
+    # Prometheus text format; every worker's counters when METRICS_DIR is shared
+    from .. import metrics
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
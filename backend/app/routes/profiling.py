@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from ..security import require_admin
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+def list_profiles():
+    # Stored per-request profiles, newest first (any worker on this host)
+    from .. import profiling
+    return profiling.list_request_profiles()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: str):
+    # Collapsed stacks: flamegraph.pl, speedscope and inferno read this directly
+    from .. import profiling
+    text = profiling.read_request_profile(profile_id)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return text
+
+
+@router.get("/profile/stacks", response_class=PlainTextResponse)
+def background_stacks():
+    # Continuous profiler totals of every running worker and CPU-pool process
+    from .. import profiling
+    return profiling.render(profiling.background_stacks())
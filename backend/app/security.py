@@ -0,0 +1,30 @@
+"""Access control for operator endpoints."""
+from __future__ import annotations
+
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """Dependency: the request must carry ``X-Admin-Token: $ADMIN_TOKEN``.
+
+    Admin endpoints are disabled (403) while ``ADMIN_TOKEN`` is unset.
+    """
+    from .config import settings
+
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """True when ``token`` matches ``ADMIN_TOKEN`` (never while it is unset)."""
+    from .config import settings
+
+    expected = settings.ADMIN_TOKEN
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode(), expected.encode())
@@ -0,0 +1,38 @@
+import logging
+from typing import Any, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def create_database_service(backend: Optional[str] = None) -> Any:
+    """Return the catalog service selected by ``CATALOG_BACKEND`` ("azure", "sqlite" or "binary")."""
+    backend = (backend or settings.CATALOG_BACKEND).strip().lower()
+    if backend == "sqlite":
+        from .sqlite_database import SQLiteCatalogService
+
+        return SQLiteCatalogService(settings.CATALOG_SQLITE_PATH)
+    if backend == "binary":
+        from .binary_database import BinaryCatalogService
+
+        return BinaryCatalogService(settings.CATALOG_BINARY_PATH)
+    if backend == "azure":
+        # Deferred: importing the Azure service loads the ODBC driver.
+        from .database import azure_sql_service
+
+        return azure_sql_service
+    raise ValueError(f"Unknown CATALOG_BACKEND: {backend!r} (expected 'azure', 'sqlite' or 'binary')")
+
+
+def configure_repositories(service: Any = None) -> Any:
+    """Point the item/boss repositories at ``service`` unless one is already set."""
+    from .repositories import item_repository, boss_repository
+
+    if service is None:
+        service = create_database_service()
+    for repo in (item_repository, boss_repository):
+        if repo.db_service is None:
+            repo.db_service = service
+    logger.info("[catalog] repositories using %s", type(service).__name__)
+    return service
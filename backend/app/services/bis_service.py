@@ -1,123 +1,168 @@
-from typing import Dict, Any
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
+from .. import execution, metrics, tracing
+from ..catalog import item_schema
+from ..config import settings
 from ..repositories import item_repository
 from . import calculation_service
 
 
-def suggest_bis(params: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a naive best-in-slot setup for the given parameters."""
-    items = item_repository.get_all_items(combat_only=True, tradeable_only=False)
-    best_per_slot: Dict[str, Dict[str, Any]] = {}
-
+def _style_bonuses(item: Dict[str, Any], style: str, atk_type: str) -> Optional[Dict[str, Any]]:
+    """Calculator overrides for ``item``'s flat stats, or None if it adds nothing to ``style``."""
+    stats = item_schema.flat_stats(item)
+    if style == "melee":
+        atk_bonus, str_bonus = stats.get(f"attack_{atk_type}", 0), stats["str_melee"]
+        if atk_bonus <= 0 and str_bonus <= 0:
+            return None
+        return {"melee_strength_bonus": str_bonus, "melee_attack_bonus": atk_bonus}
+    if style == "ranged":
+        atk_bonus, str_bonus = stats["attack_ranged"], stats["str_ranged"]
+        if atk_bonus <= 0 and str_bonus <= 0:
+            return None
+        return {"ranged_strength_bonus": str_bonus, "ranged_attack_bonus": atk_bonus}
+    atk_bonus, dmg_bonus = stats["attack_magic"], float(stats["str_magic"])
+    if atk_bonus <= 0 and dmg_bonus <= 0:
+        return None
+    return {"magic_damage_bonus": dmg_bonus, "magic_attack_bonus": atk_bonus}
+
+
+def _candidates(items, params: Dict[str, Any]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """``(item, overrides)`` for each item in a wanted slot that adds something to the style."""
     style = params.get("combat_style", "melee").lower()
     atk_type = params.get("attack_type", "slash").lower()
+    with tracing.span("bis.prefilter", {"bis.candidates.in": len(items)}) as span:
+        out = []
+        for item in _in_slots(items, params):
+            if not item.get("slot"):
+                continue
+            overrides = _style_bonuses(item, style, atk_type)
+            if overrides is not None:
+                out.append((item, overrides))
+        span.set_attribute("bis.candidates.out", len(out))
+    return out
 
-    for item in items:
-        slot = item.get("slot")
-        if not slot:
-            continue
 
-        stats = item.get("combat_stats") or {}
-        attack_bonuses = stats.get("attack_bonuses", {})
-        other_bonuses = stats.get("other_bonuses", {})
+def _score(
+    candidates, params: Dict[str, Any], parent: Optional[str] = None,
+) -> Tuple[Dict[str, Tuple[float, Dict[str, Any]]], int]:
+    """``({slot: (dps, item)}, candidates scored)`` for the best item of each slot.
 
-        # Skip items that provide no relevant bonuses for the chosen style
-        if style == "melee":
-            atk_bonus = attack_bonuses.get(atk_type, 0)
-            str_bonus = other_bonuses.get("strength", 0)
-            if atk_bonus <= 0 and str_bonus <= 0:
-                continue
-        elif style == "ranged":
-            atk_bonus = attack_bonuses.get("ranged", 0)
-            str_bonus = other_bonuses.get("ranged strength", 0)
-            if atk_bonus <= 0 and str_bonus <= 0:
-                continue
-        else:
-            atk_bonus = attack_bonuses.get("magic", 0)
-            dmg_bonus = other_bonuses.get("magic damage", "0")
-            if isinstance(dmg_bonus, str) and dmg_bonus.endswith("%"):
-                dmg_bonus = float(dmg_bonus.strip("%")) / 100
-            if atk_bonus <= 0 and float(dmg_bonus or 0) <= 0:
-                continue
+    ``parent`` is the caller's ``traceparent`` when this runs in a pool process.
+    """
+    with tracing.span("bis.dps_batch", {"bis.candidates": len(candidates)}, parent=parent):
+        return _score_candidates(candidates, params), len(candidates)
 
-        test_params = params.copy()
 
-        if style == "melee":
-            test_params["melee_strength_bonus"] = str_bonus
-            test_params["melee_attack_bonus"] = atk_bonus
-        elif style == "ranged":
-            test_params["ranged_strength_bonus"] = str_bonus
-            test_params["ranged_attack_bonus"] = atk_bonus
-        else:  # magic
-            dmg_bonus = other_bonuses.get("magic damage", "0")
-            if isinstance(dmg_bonus, str) and dmg_bonus.endswith("%"):
-                dmg_bonus = float(dmg_bonus.strip("%")) / 100
-            test_params["magic_damage_bonus"] = float(dmg_bonus or 0)
-            test_params["magic_attack_bonus"] = atk_bonus
+def _score_candidates(candidates, params: Dict[str, Any]) -> Dict[str, Tuple[float, Dict[str, Any]]]:
+    best_per_slot: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+    for item, overrides in candidates:
+        test_params = params.copy()
+        test_params.update(overrides)
 
         result = calculation_service.calculate_dps(test_params)
         dps = result.get("dps", 0)
 
+        slot = item["slot"]
         current_best = best_per_slot.get(slot)
-        if not current_best or dps > current_best["dps"]:
-            best_per_slot[slot] = {"item": item, "dps": dps}
+        if not current_best or dps > current_best[0]:
+            best_per_slot[slot] = (dps, item)
 
-    return {slot: info["item"] for slot, info in best_per_slot.items()}
+    return best_per_slot
 
 
-async def suggest_bis_async(params: Dict[str, Any]) -> Dict[str, Any]:
-    """Async version using the item repository async API."""
-    items = await item_repository.get_all_items_async(combat_only=True, tradeable_only=False)
-    best_per_slot: Dict[str, Dict[str, Any]] = {}
+def _score_items(items, params: Dict[str, Any]) -> Tuple[Dict[str, Tuple[float, Dict[str, Any]]], int]:
+    """``({slot: (dps, item)}, candidates scored)`` for ``items``, prefiltered but not chunked."""
+    candidates = _candidates(items, params)
+    return _score_candidates(candidates, params), len(candidates)
 
-    style = params.get("combat_style", "melee").lower()
-    atk_type = params.get("attack_type", "slash").lower()
 
-    for item in items:
-        slot = item.get("slot")
-        if not slot:
-            continue
+def _best_per_slot(items, params: Dict[str, Any]) -> Dict[str, Tuple[float, Dict[str, Any]]]:
+    """``{slot: (dps, item)}`` for the best item of each slot in ``items``."""
+    return _score_items(items, params)[0]
 
-        stats = item.get("combat_stats") or {}
-        attack_bonuses = stats.get("attack_bonuses", {})
-        other_bonuses = stats.get("other_bonuses", {})
 
-        # Skip items that provide no relevant bonuses for the chosen style
-        if style == "melee":
-            atk_bonus = attack_bonuses.get(atk_type, 0)
-            str_bonus = other_bonuses.get("strength", 0)
-            if atk_bonus <= 0 and str_bonus <= 0:
-                continue
-        elif style == "ranged":
-            atk_bonus = attack_bonuses.get("ranged", 0)
-            str_bonus = other_bonuses.get("ranged strength", 0)
-            if atk_bonus <= 0 and str_bonus <= 0:
-                continue
-        else:
-            atk_bonus = attack_bonuses.get("magic", 0)
-            dmg_bonus = other_bonuses.get("magic damage", "0")
-            if isinstance(dmg_bonus, str) and dmg_bonus.endswith("%"):
-                dmg_bonus = float(dmg_bonus.strip("%")) / 100
-            if atk_bonus <= 0 and float(dmg_bonus or 0) <= 0:
-                continue
+def _in_slots(items, params: Dict[str, Any]):
+    """``items`` limited to ``params["slot_whitelist"]`` when one is given."""
+    slots = params.get("slot_whitelist")
+    if not slots:
+        return items
+    wanted = set(slots)
+    return [item for item in items if item.get("slot") in wanted]
 
-        test_params = params.copy()
 
-        if style == "melee":
-            test_params["melee_strength_bonus"] = str_bonus
-            test_params["melee_attack_bonus"] = atk_bonus
-        elif style == "ranged":
-            test_params["ranged_strength_bonus"] = str_bonus
-            test_params["ranged_attack_bonus"] = atk_bonus
-        else:
-            test_params["magic_damage_bonus"] = float(dmg_bonus or 0)
-            test_params["magic_attack_bonus"] = atk_bonus
+def _merge(parts) -> Dict[str, Tuple[float, Dict[str, Any]]]:
+    # Earlier chunks win ties, matching a single pass over all items.
+    merged: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+    for part in parts:
+        for slot, (dps, item) in part.items():
+            if slot not in merged or dps > merged[slot][0]:
+                merged[slot] = (dps, item)
+    return merged
 
-        result = calculation_service.calculate_dps(test_params)
-        dps = result.get("dps", 0)
 
-        current_best = best_per_slot.get(slot)
-        if not current_best or dps > current_best["dps"]:
-            best_per_slot[slot] = {"item": item, "dps": dps}
+def _observe(params: Dict[str, Any], start: float, scored: int) -> None:
+    style = metrics.style_label(params)
+    metrics.BIS_LATENCY.observe(time.perf_counter() - start, style)
+    metrics.BIS_COMBINATIONS.observe(scored, style)
 
-    return {slot: info["item"] for slot, info in best_per_slot.items()}
+
+def _pick_best(items, params: Dict[str, Any]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    best, scored = _score(_candidates(items, params), params)
+    _observe(params, start, scored)
+    return {slot: item for slot, (_, item) in best.items()}
+
+
+def suggest_bis(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a naive best-in-slot setup for the given parameters."""
+    start = time.perf_counter()
+    with tracing.span("bis.search", {"bis.style": metrics.style_label(params)}) as span:
+        with tracing.span("bis.load_items") as load_span:
+            items = item_repository.get_combat_items()
+            load_span.set_attribute("db.rows", len(items))
+        best, scored = _score(_candidates(items, params), params)
+        span.set_attribute("bis.candidates", scored)
+    _observe(params, start, scored)
+    return {slot: item for slot, (_, item) in best.items()}
+
+
+async def _search(params: Dict[str, Any], request: Any = None) -> Dict[str, Tuple[float, Dict[str, Any]]]:
+    start = time.perf_counter()
+    with tracing.span("bis.search", {"bis.style": metrics.style_label(params)}) as span:
+        with tracing.span("bis.load_items") as load_span:
+            items = await item_repository.get_combat_items_async()
+            load_span.set_attribute("db.rows", len(items))
+        # Chunks hold only real candidates, so the pool's work is evenly split.
+        candidates = _candidates(items, params)
+        size = max(1, settings.BIS_CHUNK_SIZE)
+        chunks = [candidates[i:i + size] for i in range(0, len(candidates), size)]
+        with tracing.span("bis.score", {"bis.chunks": len(chunks)}) as score_span:
+            parts = await execution.map_cpu(_score, chunks, params, tracing.traceparent(), request=request)
+            scored = sum(n for _, n in parts)
+            score_span.set_attribute("bis.candidates", scored)
+        with tracing.span("bis.merge") as merge_span:
+            best = _merge(best for best, _ in parts)
+            merge_span.set_attribute("bis.slots", len(best))
+        span.set_attribute("bis.candidates", scored)
+    _observe(params, start, scored)
+    return best
+
+
+async def suggest_bis_async(params: Dict[str, Any], request: Any = None) -> Dict[str, Any]:
+    """Async version: items load on the I/O pool, scoring runs in chunks on the CPU pool.
+
+    Raises :class:`~app.execution.ClientDisconnected` if ``request``'s client goes away.
+    """
+    return {slot: item for slot, (_, item) in (await _search(params, request)).items()}
+
+
+async def compute_bis_async(params: Dict[str, Any], request: Any = None) -> Dict[str, Any]:
+    """``suggest_bis_async`` plus the best single-slot DPS, in the ``/bis`` response shape."""
+    best = await _search(params, request)
+    return {
+        "best_dps": max((dps for dps, _ in best.values()), default=0),
+        "items": [item for _, item in best.values()],
+        "loadout": {slot: item for slot, (_, item) in best.items()},
+        "slots": list(best),
+    }
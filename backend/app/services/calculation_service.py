@@ -1,11 +1,13 @@
 from typing import Dict, Any
 
+from .. import metrics
 from ..calculators import DpsCalculator
 
 
 def calculate_dps(params: Dict[str, Any]) -> Dict[str, Any]:
     """Facade for DPS calculations without FastAPI dependencies."""
-    return DpsCalculator.calculate_dps(params)
+    with metrics.timed(metrics.CALC_LATENCY, metrics.style_label(params)):
+        return DpsCalculator.calculate_dps(params)
 
 
 def calculate_item_effect(params: Dict[str, Any]) -> Dict[str, Any]:
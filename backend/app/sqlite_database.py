@@ -0,0 +1,475 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+from . import metrics
+from .catalog import item_schema
+from .catalog.page_keys import first_int, item_doc_id, item_doc_name, npc_doc_id, npc_doc_name
+from .catalog.pagination import SortKey
+from .config.settings import CATALOG_SQLITE_PATH, SQLITE_MMAP_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Typed item table written by tools/scraper_v2/normalize_items.py.
+_TYPED_ITEMS_SELECT = f"SELECT {item_schema.select_list(extra=('item_id', 'name'))} FROM catalog_items"
+_TYPED_PAGE_SELECT = f"SELECT {item_schema.select_list(extra=('item_id', 'name', 'name_key'))} FROM catalog_items"
+
+
+def _typed_item(r: sqlite3.Row, detail: bool = True) -> Dict[str, Any]:
+    return item_schema.item_from_row(r["item_id"], r["name"], r, detail)
+
+
+def _item_summary(doc: Dict[str, Any], name: str) -> Dict[str, Any]:
+    row = item_schema.row_from_scraper_doc(doc)
+    return item_schema.item_from_row(item_doc_id(doc), item_doc_name(doc, name), row, detail=False)
+
+
+def _item_detail(doc: Dict[str, Any], name: str) -> Dict[str, Any]:
+    # Legacy doc-only files: decode the scraper JSON, then reuse the typed mapping.
+    row = item_schema.row_from_scraper_doc(doc)
+    return item_schema.item_from_row(item_doc_id(doc), item_doc_name(doc, name), row)
+
+
+def _boss_summary(doc: Dict[str, Any], name: str) -> Dict[str, Any]:
+    attrs = doc.get("attributes") or {}
+    return {
+        "id": npc_doc_id(doc),
+        "name": npc_doc_name(doc, name),
+        "raid_group": doc.get("raid_group"),
+        "location": attrs.get("Location"),
+        "has_multiple_forms": False,
+        "icon_url": item_schema.icon_url(doc.get("image_src")),
+    }
+
+
+def _boss_detail(doc: Dict[str, Any], name: str) -> Dict[str, Any]:
+    attrs = doc.get("attributes") or {}
+    boss = _boss_summary(doc, name)
+    boss["examine"] = attrs.get("Examine")
+    # The scraper stores one page per NPC, so each boss has exactly one form
+    # whose id mirrors the NPC id.
+    boss["forms"] = [
+        {
+            "id": boss["id"],
+            "boss_id": boss["id"],
+            "form_name": boss["name"],
+            "form_order": 1,
+            "combat_level": first_int(doc.get("combat_level")),
+            "hitpoints": first_int(doc.get("hitpoints")),
+            "max_hit": None if doc.get("max_hit") is None else str(doc.get("max_hit")),
+            "attack_style": attrs.get("Attack style"),
+            "defence_level": first_int(doc.get("defence_level")),
+            "magic_level": first_int(doc.get("magic_level")),
+            "ranged_level": first_int(doc.get("ranged_level")),
+            "defence_stab": first_int(doc.get("defence_stab")),
+            "defence_slash": first_int(doc.get("defence_slash")),
+            "defence_crush": first_int(doc.get("defence_crush")),
+            "defence_magic": first_int(doc.get("defence_magic")),
+            "defence_ranged_standard": first_int(doc.get("defence_ranged_standard")),
+            "icons": [],
+            "image_url": boss["icon_url"],
+            "size": first_int(attrs.get("Size")),
+        }
+    ]
+    return boss
+
+
+@metrics.instrument_queries("sqlite")
+class SQLiteCatalogService:
+    """Read-only catalog service on top of the scraper's ``osrs.sqlite`` file.
+
+    Mirrors the public surface of :class:`AzureSQLDatabaseService` so it can be
+    dropped into the repositories unchanged. The file is opened read-only with
+    memory-mapped I/O, and every thread gets its own connection.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, mmap_bytes: int = SQLITE_MMAP_BYTES):
+        self.db_path = str(db_path or CATALOG_SQLITE_PATH)
+        self.mmap_bytes = mmap_bytes
+        self._local = threading.local()
+        self._index_lock = threading.Lock()
+        self._item_rowids: Optional[Dict[int, int]] = None
+        self._npc_rowids: Optional[Dict[int, int]] = None
+        self._typed: Optional[bool] = None
+        self._file_version: Optional[str] = None
+        self._generation = 0
+
+    # ---------- low-level connection helpers ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+        conn.execute("PRAGMA query_only=1")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.generation != self._generation:
+            # The file was rebuilt since this thread connected; reopen it.
+            conn.close()
+            conn = None
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.columns = {}
+            self._local.generation = self._generation
+        return conn
+
+    def catalog_version(self) -> Optional[str]:
+        """Cheap change signal (file mtime and size) polled by the catalog refresher.
+
+        A new value drops the rowid indexes and makes every thread reconnect,
+        so a rebuilt or replaced file is picked up without a restart.
+        """
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return None
+        version = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+        if version != self._file_version:
+            with self._index_lock:
+                if self._file_version is not None:
+                    self._item_rowids = self._npc_rowids = self._typed = None
+                    self._generation += 1
+                self._file_version = version
+        return version
+
+    def _columns(self, table: str) -> frozenset:
+        conn = self.connection()
+        columns = self._local.columns
+        if table not in columns:
+            columns[table] = frozenset(r["name"] for r in conn.execute(f"PRAGMA table_info({table})"))
+        return columns[table]
+
+    def _key(self, table: str) -> str:
+        """Name column for ``table``: ``title`` (build_local_db) or ``name`` (build_from_json)."""
+        return "title" if "title" in self._columns(table) else "name"
+
+    def _rows(self, sql: str, params: tuple | list = ()) -> List[sqlite3.Row]:
+        return self.connection().execute(sql, params).fetchall()
+
+    def _typed_items(self) -> bool:
+        """True when the file carries the normalized ``catalog_items`` table."""
+        if self._typed is None:
+            self._typed = bool(self._rows(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'catalog_items'"
+            ))
+        return self._typed
+
+    def _build_rowid_index(self, table: str, id_expr: str) -> Dict[int, int]:
+        index: Dict[int, int] = {}
+        for r in self._rows(f"SELECT rowid, {id_expr} AS ext_id FROM {table}"):
+            ext = first_int(r["ext_id"])
+            if ext is not None:
+                index.setdefault(ext, r["rowid"])
+        return index
+
+    def _item_index(self) -> Dict[int, int]:
+        if self._item_rowids is None:
+            with self._index_lock:
+                if self._item_rowids is None:
+                    self._item_rowids = self._build_rowid_index(
+                        "items", "json_extract(doc, '$.item_id')"
+                    )
+        return self._item_rowids
+
+    def _npc_index(self) -> Dict[int, int]:
+        if self._npc_rowids is None:
+            with self._index_lock:
+                if self._npc_rowids is None:
+                    self._npc_rowids = self._build_rowid_index(
+                        "npcs",
+                        "COALESCE(json_extract(doc, '$.id'), "
+                        "json_extract(doc, '$.attributes.\"NPC ID\"'), "
+                        "json_extract(doc, '$.attributes.\"Monster ID\"'))",
+                    )
+        return self._npc_rowids
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ---------- sync queries ----------
+
+    def get_all_bosses(self, limit: int | None = None, offset: int | None = None) -> List[Dict[str, Any]]:
+        try:
+            key = self._key("npcs")
+            query = f"SELECT {key} AS k, doc FROM npcs ORDER BY {key}"
+            params: list[Any] = []
+            if limit is not None:
+                query += " LIMIT ? OFFSET ?"
+                params.extend([limit, offset or 0])
+            bosses = []
+            for r in self._rows(query, params):
+                boss = _boss_summary(json.loads(r["doc"]), r["k"])
+                if boss["id"] is not None:
+                    bosses.append(boss)
+            return bosses
+        except Exception as e:
+            print(f"Error getting bosses: {e}")
+            return []
+
+    def get_boss(self, boss_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            rowid = self._npc_index().get(int(boss_id))
+            if rowid is None:
+                return None
+            key = self._key("npcs")
+            r = self.connection().execute(
+                f"SELECT {key} AS k, doc FROM npcs WHERE rowid = ?", (rowid,)
+            ).fetchone()
+            return _boss_detail(json.loads(r["doc"]), r["k"]) if r else None
+        except Exception as e:
+            print(f"Error getting boss {boss_id}: {e}")
+            return None
+
+    def get_boss_id_by_form(self, form_id: int) -> Optional[int]:
+        # One form per NPC page: the form id is the NPC id.
+        try:
+            return int(form_id) if int(form_id) in self._npc_index() else None
+        except Exception as e:
+            print(f"Error getting boss id from form {form_id}: {e}")
+            return None
+
+    def get_boss_by_form(self, form_id: int) -> Optional[Dict[str, Any]]:
+        boss_id = self.get_boss_id_by_form(form_id)
+        return self.get_boss(boss_id) if boss_id is not None else None
+
+    def get_all_items(
+        self, combat_only: bool = True, tradeable_only: bool = False, limit: int | None = None, offset: int | None = None
+    ) -> List[Dict[str, Any]]:
+        try:
+            if self._typed_items():
+                query = _TYPED_ITEMS_SELECT + " WHERE 1=1"
+                params: list[Any] = []
+                if combat_only:
+                    query += " AND has_combat_stats = 1"
+                if tradeable_only:
+                    query += " AND is_tradeable = 1"
+                query += " ORDER BY name"
+                if limit is not None:
+                    query += " LIMIT ? OFFSET ?"
+                    params.extend([limit, offset or 0])
+                return [_typed_item(r, detail=False) for r in self._rows(query, params)]
+            key = self._key("items")
+            query = (
+                f"SELECT {key} AS k, doc FROM items "
+                "WHERE json_extract(doc, '$.item_id') IS NOT NULL"
+            )
+            params = []
+            if combat_only:
+                query += " AND json_type(doc, '$.combat_bonuses') = 'object'"
+            if tradeable_only:
+                query += " AND json_extract(doc, '$.tradeable') = 1"
+            query += f" ORDER BY {key}"
+            if limit is not None:
+                query += " LIMIT ? OFFSET ?"
+                params.extend([limit, offset or 0])
+            return [_item_summary(json.loads(r["doc"]), r["k"]) for r in self._rows(query, params)]
+        except Exception as e:
+            print(f"Error getting items: {e}")
+            raise
+
+    def get_item(self, item_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            if self._typed_items():
+                r = self.connection().execute(_TYPED_ITEMS_SELECT + " WHERE item_id = ?", (int(item_id),)).fetchone()
+                return _typed_item(r) if r else None
+            rowid = self._item_index().get(int(item_id))
+            if rowid is None:
+                return None
+            key = self._key("items")
+            r = self.connection().execute(
+                f"SELECT {key} AS k, doc FROM items WHERE rowid = ?", (rowid,)
+            ).fetchone()
+            return _item_detail(json.loads(r["doc"]), r["k"]) if r else None
+        except Exception as e:
+            print(f"Error getting item {item_id}: {e}")
+            raise
+
+    def _fetch_by_ids(self, table: str, index: Dict[int, int], ids: List[int], mapper) -> List[Dict[str, Any]]:
+        """Fetch many rows in one statement; ``json_each`` avoids SQLite's bound-variable limit."""
+        rowids = {index[i] for i in ids if i in index}
+        if not rowids:
+            return []
+        key = self._key(table)
+        rows = self._rows(
+            f"SELECT {key} AS k, doc FROM {table} WHERE rowid IN (SELECT value FROM json_each(?))",
+            [json.dumps(sorted(rowids))],
+        )
+        return [mapper(json.loads(r["doc"]), r["k"]) for r in rows]
+
+    def get_items(self, item_ids: List[int]) -> List[Dict[str, Any]]:
+        """Item details for ``item_ids`` (unknown ids are skipped, order not guaranteed)."""
+        try:
+            if self._typed_items():
+                rows = self._rows(
+                    _TYPED_ITEMS_SELECT + " WHERE item_id IN (SELECT value FROM json_each(?))",
+                    [json.dumps(sorted({int(i) for i in item_ids}))],
+                )
+                return [_typed_item(r) for r in rows]
+            return self._fetch_by_ids("items", self._item_index(), [int(i) for i in item_ids], _item_detail)
+        except Exception:
+            logger.exception("Error getting items %s", item_ids)
+            raise
+
+    def get_bosses(self, boss_ids: List[int]) -> List[Dict[str, Any]]:
+        try:
+            return self._fetch_by_ids("npcs", self._npc_index(), [int(i) for i in boss_ids], _boss_detail)
+        except Exception:
+            logger.exception("Error getting bosses %s", boss_ids)
+            raise
+
+    def search_bosses(self, query: str, limit: int | None = None) -> List[Dict[str, Any]]:
+        try:
+            key = self._key("npcs")
+            sql = f"SELECT {key} AS k, doc FROM npcs WHERE REPLACE({key}, '_', ' ') LIKE ? ORDER BY {key}"
+            params: list[Any] = [f"%{query}%"]
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit)
+            out = []
+            for r in self._rows(sql, params):
+                b = _boss_summary(json.loads(r["doc"]), r["k"])
+                if b["id"] is not None:
+                    out.append({"id": b["id"], "name": b["name"], "raid_group": b["raid_group"], "location": b["location"]})
+            return out
+        except Exception as e:
+            print(f"Error searching bosses: {e}")
+            return []
+
+    def search_items(self, query: str, limit: int | None = None) -> List[Dict[str, Any]]:
+        try:
+            if self._typed_items():
+                sql = _TYPED_ITEMS_SELECT + " WHERE name LIKE ? ORDER BY name"
+                params: list[Any] = [f"%{query}%"]
+                if limit is not None:
+                    sql += " LIMIT ?"
+                    params.append(limit)
+                return [_typed_item(r, detail=False) for r in self._rows(sql, params)]
+            key = self._key("items")
+            sql = (
+                f"SELECT {key} AS k, doc FROM items "
+                f"WHERE REPLACE({key}, '_', ' ') LIKE ? "
+                f"AND json_extract(doc, '$.item_id') IS NOT NULL ORDER BY {key}"
+            )
+            params = [f"%{query}%"]
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit)
+            return [_item_summary(json.loads(r["doc"]), r["k"]) for r in self._rows(sql, params)]
+        except Exception as e:
+            print(f"Error searching items: {e}")
+            raise
+
+    def _keyset(self, table: str, limit: int, after: Optional[SortKey], combat_only: bool = False):
+        """One page in ``cursor_key`` order, seeking the stored ``(name_key, id)`` index."""
+        typed = table == "items" and self._typed_items()
+        source, id_col = ("catalog_items", "item_id") if typed else (table, "page_id")
+        if "name_key" not in self._columns(source):
+            raise RuntimeError(
+                f"{self.db_path}: {source} has no stored page keys; "
+                "run python -m tools.scraper_v2.normalize_items --sqlite <file>"
+            )
+        if typed:
+            query = _TYPED_PAGE_SELECT + " WHERE 1=1"
+            if combat_only:
+                query += " AND has_combat_stats = 1"
+        else:
+            query = f"SELECT {self._key(table)} AS k, doc, name_key, page_id FROM {table} WHERE name_key IS NOT NULL"
+            if combat_only:
+                query += " AND json_type(doc, '$.combat_bonuses') = 'object'"
+        params: list[Any] = []
+        if after is not None:
+            query += f" AND (name_key, {id_col}) > (?, ?)"
+            params.extend(after)
+        query += f" ORDER BY name_key, {id_col} LIMIT ?"
+        params.append(limit + 1)
+        rows = self._rows(query, params)
+        next_key = (rows[limit - 1]["name_key"], rows[limit - 1][id_col]) if len(rows) > limit else None
+        if typed:
+            return [_typed_item(r, detail=False) for r in rows[:limit]], next_key
+        summary = _item_summary if table == "items" else _boss_summary
+        return [summary(json.loads(r["doc"]), r["k"]) for r in rows[:limit]], next_key
+
+    def list_items_page(
+        self, limit: int, after: Optional[SortKey] = None, combat_only: bool = True
+    ):
+        """Keyset page of item summaries; returns ``(rows, next_key)``."""
+        return self._keyset("items", limit, after, combat_only)
+
+    def list_bosses_page(self, limit: int, after: Optional[SortKey] = None):
+        return self._keyset("npcs", limit, after)
+
+    def load_catalog(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Project every item and NPC document (details included) in one pass per table."""
+        if self._typed_items():
+            items = [_typed_item(r) for r in self._rows(_TYPED_ITEMS_SELECT)]
+        else:
+            items = []
+            for r in self._rows(f"SELECT {self._key('items')} AS k, doc FROM items"):
+                item = _item_detail(json.loads(r["doc"]), r["k"])
+                if item["id"] is not None:
+                    items.append(item)
+        bosses = []
+        for r in self._rows(f"SELECT {self._key('npcs')} AS k, doc FROM npcs"):
+            boss = _boss_detail(json.loads(r["doc"]), r["k"])
+            if boss["id"] is not None:
+                bosses.append(boss)
+        return {"items": items, "bosses": bosses}
+
+    # ---------- async queries ----------
+    # Each call runs in a worker thread, which lazily opens its own connection.
+
+    async def get_all_bosses_async(self, limit: int | None = None, offset: int | None = None) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_all_bosses, limit, offset)
+
+    async def get_boss_async(self, boss_id: int) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_boss, boss_id)
+
+    async def get_boss_id_by_form_async(self, form_id: int) -> Optional[int]:
+        return await asyncio.to_thread(self.get_boss_id_by_form, form_id)
+
+    async def get_boss_by_form_async(self, form_id: int) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_boss_by_form, form_id)
+
+    async def get_all_items_async(
+        self, combat_only: bool = True, tradeable_only: bool = False, limit: int | None = None, offset: int | None = None
+    ) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_all_items, combat_only, tradeable_only, limit, offset)
+
+    async def get_item_async(self, item_id: int) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_item, item_id)
+
+    async def get_items_async(self, item_ids: List[int]) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_items, item_ids)
+
+    async def get_bosses_async(self, boss_ids: List[int]) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_bosses, boss_ids)
+
+    async def search_bosses_async(self, query: str, limit: int | None = None) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.search_bosses, query, limit)
+
+    async def search_items_async(self, query: str, limit: int | None = None) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.search_items, query, limit)
+
+    async def list_items_page_async(
+        self, limit: int, after: Optional[Tuple[str, int]] = None, combat_only: bool = True
+    ):
+        return await asyncio.to_thread(self.list_items_page, limit, after, combat_only)
+
+    async def list_bosses_page_async(self, limit: int, after: Optional[Tuple[str, int]] = None):
+        return await asyncio.to_thread(self.list_bosses_page, limit, after)
+
+    async def load_catalog_async(self) -> Dict[str, List[Dict[str, Any]]]:
+        return await asyncio.to_thread(self.load_catalog)
@@ -26,18 +26,22 @@ def tool_calculate_dps(args: CalcDpsArgs) -> DpsResult:
 def tool_bis_for_boss(args: BisArgs):
     return bis_service.best_in_slot_for_boss(args.boss_name, **args.constraints)
 
+def _close_matches(results: list) -> str:
+    names = [r["name"] for r in results if r.get("name")]
+    return f" Close matches: {', '.join(names)}." if names else ""
+
 def tool_lookup_item(args: LookupItemArgs) -> Item:
-    from .repositories.item_repository import get_item_by_name
+    from .repositories.item_repository import get_item_by_name, search_items
     item = get_item_by_name(args.name)
     if not item:
-        raise ValueError(f"Unknown item: {args.name}")
+        raise ValueError(f"Unknown item: {args.name}." + _close_matches(search_items(args.name, 3)))
     return item
 
 def tool_lookup_boss(args: LookupBossArgs) -> Boss:
-    from .repositories.boss_repository import get_boss_by_name
+    from .repositories.boss_repository import get_boss_by_name, search_bosses
     boss = get_boss_by_name(args.name)
     if not boss:
-        raise ValueError(f"Unknown boss: {args.name}")
+        raise ValueError(f"Unknown boss: {args.name}." + _close_matches(search_bosses(args.name, 3)))
     return boss
 
 # ---- JSON tool specs for the LLM ----
@@ -0,0 +1,296 @@
+"""Request tracing with OpenTelemetry-shaped spans.
+
+``span(name, attributes)`` is a context manager around one unit of work:
+route handlers, repository cache lookups, catalog queries, BIS phases,
+DPS batches and payload serialization. Nesting follows the current task
+through a ``ContextVar``. Work shipped to the CPU pool carries its parent
+as a W3C ``traceparent`` string (see :func:`traceparent`).
+
+``TRACING_EXPORTER`` selects where finished spans go:
+
+* ``none`` (default) – ``span()`` returns a shared no-op object;
+* ``console`` – one JSON line per span on stderr;
+* ``file`` – one JSON line per span appended to ``TRACING_FILE``. Every
+  worker and CPU-pool process appends to the same file;
+* ``otlp`` – the OpenTelemetry SDK with its OTLP exporter, configured by
+  the standard ``OTEL_*`` variables. It needs ``opentelemetry-sdk`` and
+  ``opentelemetry-exporter-otlp``; without them tracing stays off.
+
+Lines use OTLP's span fields (``trace_id``, ``span_id``, ``parent_span_id``,
+``start_time_unix_nano``, ...), so they can be grouped by ``trace_id`` or
+converted for any OTLP viewer. Root spans are sampled with probability
+``TRACING_SAMPLE_RATIO`` and children follow their root's decision.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "scapelab-api"
+
+Exporter = Callable[[Dict[str, Any]], None]
+
+
+class _NoopSpan:
+    """Stands in for a span when tracing is off; every method does nothing."""
+
+    __slots__ = ()
+    trace_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Mapping[str, Any]) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+NOOP = _NoopSpan()
+
+# The innermost open span of this task, or _UNSAMPLED below an unsampled root.
+_current: ContextVar[Any] = ContextVar("scapelab_span", default=None)
+_UNSAMPLED = object()
+# Tells another process that the trace it continues is not recorded.
+_UNSAMPLED_PARENT = "00-00000000000000000000000000000001-0000000000000001-00"
+
+
+class _Unsampled(_NoopSpan):
+    """An unsampled root: its children are not recorded either."""
+
+    __slots__ = ("_token",)
+
+    def __enter__(self) -> "_Unsampled":
+        self._token = _current.set(_UNSAMPLED)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        _current.reset(self._token)
+
+
+class Span:
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "attributes", "start_ns", "_start", "_token")
+
+    def __init__(
+        self, name: str, trace_id: str, parent_id: Optional[str], kind: str, attributes: Optional[Mapping[str, Any]],
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Mapping[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._start = time.perf_counter_ns()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        duration = time.perf_counter_ns() - self._start
+        _current.reset(self._token)
+        status: Dict[str, Any] = {"code": "OK"}
+        if exc_type is not None:
+            status = {"code": "ERROR", "message": f"{exc_type.__name__}: {exc}"}
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.start_ns + duration,
+            "duration_ms": round(duration / 1e6, 3),
+            "attributes": self.attributes,
+            "status": status,
+            "resource": {"service.name": SERVICE_NAME, "process.pid": os.getpid()},
+        }
+        exporter = _exporter
+        if exporter is not None:
+            try:
+                exporter(record)
+            except Exception as e:  # tracing must never fail the request
+                logger.debug("span export failed: %s", e)
+
+
+def _new_id(nbytes: int) -> str:
+    return random.getrandbits(nbytes * 8).to_bytes(nbytes, "big").hex()
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """``(trace_id, parent span_id, sampled)`` from a W3C ``traceparent``, or None."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3][:2], 16)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+# ---------- exporters ----------
+
+_exporter: Optional[Exporter] = None
+_otel_tracer: Any = None
+_sample_ratio = 1.0
+
+
+def _console_exporter(record: Dict[str, Any]) -> None:
+    sys.stderr.write(json.dumps(record, default=str) + "\n")
+
+
+class FileExporter:
+    """Appends one JSON line per span; each line is a single ``write`` to an ``O_APPEND`` file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._pid = 0
+
+    def __call__(self, record: Dict[str, Any]) -> None:
+        line = (json.dumps(record, default=str, separators=(",", ":")) + "\n").encode()
+        with self._lock:
+            if self._fd is None or self._pid != os.getpid():
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                self._pid = os.getpid()
+            os.write(self._fd, line)
+
+
+def _otel_setup() -> Any:
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError as e:
+        logger.warning("[startup] TRACING_EXPORTER=otlp needs opentelemetry-sdk and the OTLP exporter: %s", e)
+        return None
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    return trace.get_tracer(__name__)
+
+
+def configure(exporter: Any = None, sample_ratio: Optional[float] = None) -> None:
+    """Select the exporter: a name (default ``TRACING_EXPORTER``) or a callable taking span dicts."""
+    global _exporter, _otel_tracer, _sample_ratio
+    from .config import settings
+
+    _sample_ratio = settings.TRACING_SAMPLE_RATIO if sample_ratio is None else sample_ratio
+    _exporter, _otel_tracer = None, None
+    exporter = settings.TRACING_EXPORTER if exporter is None else exporter
+    if callable(exporter):
+        _exporter = exporter
+    elif exporter == "console":
+        _exporter = _console_exporter
+    elif exporter == "file":
+        _exporter = FileExporter(settings.TRACING_FILE)
+    elif exporter == "otlp":
+        _otel_tracer = _otel_setup()
+    elif exporter not in ("none", ""):
+        logger.warning("[startup] Unknown TRACING_EXPORTER %r; tracing is off", exporter)
+
+
+def enabled() -> bool:
+    return _exporter is not None or _otel_tracer is not None
+
+
+# ---------- spans ----------
+
+def span(
+    name: str,
+    attributes: Optional[Mapping[str, Any]] = None,
+    kind: str = "INTERNAL",
+    parent: Optional[str] = None,
+) -> Any:
+    """A span context manager; ``parent`` is a ``traceparent`` when the caller is in another process."""
+    if _exporter is None:
+        if _otel_tracer is not None:
+            return _otel_span(name, attributes, kind, parent)
+        return NOOP
+    current = _current.get()
+    if current is _UNSAMPLED:
+        return NOOP
+    if current is not None and parent is None:
+        return Span(name, current.trace_id, current.span_id, kind, attributes)
+    remote = parse_traceparent(parent)
+    if remote is not None:
+        trace_id, parent_id, sampled = remote
+        return Span(name, trace_id, parent_id, kind, attributes) if sampled else _Unsampled()
+    if _sample_ratio < 1.0 and random.random() >= _sample_ratio:
+        return _Unsampled()
+    return Span(name, _new_id(16), None, kind, attributes)
+
+
+def _otel_span(name: str, attributes: Optional[Mapping[str, Any]], kind: str, parent: Optional[str]) -> Any:
+    from opentelemetry import propagate
+    from opentelemetry.trace import SpanKind
+
+    context = propagate.extract({"traceparent": parent}) if parent else None
+    return _otel_tracer.start_as_current_span(
+        name, context=context, kind=getattr(SpanKind, kind, SpanKind.INTERNAL), attributes=dict(attributes or {}),
+    )
+
+
+def traceparent() -> Optional[str]:
+    """W3C ``traceparent`` of the current span, to continue the trace in another process."""
+    if _otel_tracer is not None:
+        from opentelemetry import propagate
+
+        carrier: Dict[str, str] = {}
+        propagate.inject(carrier)
+        return carrier.get("traceparent")
+    current = _current.get()
+    if current is None:
+        return None
+    if current is _UNSAMPLED:
+        return _UNSAMPLED_PARENT
+    return f"00-{current.trace_id}-{current.span_id}-01"
+
+
+def row_count(result: Any) -> int:
+    """Rows in a catalog service result: lists, ``(rows, cursor)`` pages and ``load_catalog`` dicts."""
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        return len(result[0])
+    if isinstance(result, dict) and result and all(isinstance(v, list) for v in result.values()):
+        return sum(len(v) for v in result.values())
+    return 1
+
+
+configure()
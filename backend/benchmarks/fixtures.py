@@ -0,0 +1,104 @@
+"""Deterministic inputs for the benchmark suite.
+
+Items and NPCs come from the scraper output in ``data/db`` (``items.json``,
+``npcs.json``), loaded into a throwaway SQLite catalog so the repositories and
+endpoints read through the same service as a ``CATALOG_BACKEND=sqlite``
+deployment. Player and target parameters are drawn from a seeded
+``random.Random``, so every run of a given seed scores the same inputs.
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+import sqlite3
+import sys
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_DIR = os.path.join(ROOT, "data", "db")
+
+# The catalog builder (``tools.scraper_v2``) is imported by package name.
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+STYLES = ("melee", "ranged", "magic")
+DEFAULT_SEED = 1337
+
+
+def _docs(name: str) -> Dict[str, Dict[str, Any]]:
+    with open(os.path.join(DATA_DIR, f"{name}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_catalog(path: str) -> None:
+    """Write ``items.json``/``npcs.json`` into a SQLite catalog at ``path`` (title-keyed docs)."""
+    from tools.scraper_v2.normalize_items import write_page_keys
+
+    cn = sqlite3.connect(path)
+    try:
+        for table in ("items", "npcs"):
+            cn.execute(f"CREATE TABLE {table} (title TEXT PRIMARY KEY, doc TEXT NOT NULL)")
+            cn.executemany(
+                f"INSERT INTO {table} (title, doc) VALUES (?, ?)",
+                ((title, json.dumps(doc)) for title, doc in _docs(table).items()),
+            )
+        cn.commit()
+        write_page_keys(cn)
+    finally:
+        cn.close()
+
+
+def targets() -> List[Dict[str, Any]]:
+    """NPCs with a combat level, in file order."""
+    return [doc for doc in _docs("npcs").values() if doc.get("combat_level")]
+
+
+def _target(rng: random.Random, npc: Dict[str, Any]) -> Dict[str, Any]:
+    # The scraped NPCs carry no defensive stats; combat level stands in for both levels.
+    level = min(int(npc["combat_level"]), 400)
+    return {
+        "target_defence_level": level,
+        "target_defence_bonus": rng.randint(-20, 250),
+        "target_magic_level": level,
+        "target_magic_defence": rng.randint(-20, 250),
+    }
+
+
+def dps_params(style: str, rng: random.Random, npc: Dict[str, Any]) -> Dict[str, Any]:
+    """One complete calculator input for ``style`` against ``npc``."""
+    params: Dict[str, Any] = {
+        "combat_style": style,
+        "attack_speed": rng.choice((1.8, 2.4, 3.0, 3.6)),
+        "attack_style_bonus_attack": rng.choice((0, 3)),
+        "attack_style_bonus_strength": rng.choice((0, 3)),
+        **_target(rng, npc),
+    }
+    if style == "melee":
+        params.update(
+            attack_type=rng.choice(("stab", "slash", "crush")),
+            attack_level=rng.randint(60, 99), strength_level=rng.randint(60, 99),
+            melee_attack_bonus=rng.randint(0, 180), melee_strength_bonus=rng.randint(0, 160),
+            attack_prayer=rng.choice((1.0, 1.15, 1.2)), strength_prayer=rng.choice((1.0, 1.18, 1.23)),
+        )
+    elif style == "ranged":
+        params.update(
+            ranged_level=rng.randint(60, 99), ranged_boost=rng.randint(0, 13),
+            ranged_attack_bonus=rng.randint(0, 200), ranged_strength_bonus=rng.randint(0, 120),
+            ranged_prayer=rng.choice((1.0, 1.15, 1.2)),
+        )
+    else:
+        params.update(
+            magic_level=rng.randint(60, 99), magic_boost=rng.randint(0, 13),
+            magic_attack_bonus=rng.randint(0, 160), magic_damage_bonus=rng.choice((0.0, 0.1, 0.2)),
+            base_spell_max_hit=rng.randint(20, 33),
+        )
+    return params
+
+
+def dps_inputs(style: str, count: int, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """``count`` seeded calculator inputs for ``style``, spread over the fixture NPCs."""
+    rng = random.Random(f"{seed}:{style}")
+    npcs = targets()
+    return [dps_params(style, rng, npcs[i % len(npcs)]) for i in range(count)]
+
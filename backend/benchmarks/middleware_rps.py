@@ -0,0 +1,163 @@
+"""Requests/second with the legacy BaseHTTPMiddleware stack vs. the pure-ASGI one.
+
+Both apps get the same route and the same middleware configuration as
+``app.main`` (rate limit + cache headers); only the middleware implementation
+differs. The load generator keeps ``--concurrency`` requests in flight for
+``--seconds``, either in-process over ASGI or against a local uvicorn server.
+
+    cd backend
+    python -m benchmarks.middleware_rps --transport asgi
+    python -m benchmarks.middleware_rps --transport http --concurrency 32
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.cache_headers import CacheHeadersMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.rate_limit_store import _Bucket
+
+PAYLOAD = [{"id": i, "name": f"Item {i}", "slot": "weapon"} for i in range(50)]
+PATH_TTLS = {"/items": 86400}
+
+
+# ---------- previous implementations, kept for comparison ----------
+
+class LegacyCacheHeadersMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, path_ttls: Dict[str, int], default_ttl=None):
+        super().__init__(app)
+        self.path_ttls = path_ttls
+        self.default_ttl = default_ttl
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        ttl = self.path_ttls.get(request.url.path, self.default_ttl)
+        if ttl:
+            response.headers["Cache-Control"] = f"public, max-age={ttl}"
+        return response
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, rate: int = 10, per_seconds: int = 1, burst: int = 30):
+        super().__init__(app)
+        self.rate, self.per_seconds, self.burst = float(rate), float(per_seconds), float(burst)
+        self.buckets: Dict[str, _Bucket] = {}
+
+    async def dispatch(self, request: Request, call_next):
+        key = request.client.host if request.client else "unknown"
+        now = time.monotonic()
+        b = self.buckets.setdefault(key, _Bucket(self.burst, now))
+        b.tokens = min(self.burst, b.tokens + (now - b.last) * (self.rate / self.per_seconds))
+        b.last = now
+        if b.tokens < 1.0:
+            raise HTTPException(status_code=429, detail="Too many requests")
+        b.tokens -= 1.0
+        return await call_next(request)
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    def items():
+        return PAYLOAD
+
+    # A single client must never be throttled during the run.
+    limit = dict(rate=10**9, per_seconds=1, burst=10**9)
+    if legacy:
+        app.add_middleware(LegacyRateLimitMiddleware, **limit)
+        app.add_middleware(LegacyCacheHeadersMiddleware, path_ttls=PATH_TTLS)
+    else:
+        app.add_middleware(RateLimitMiddleware, **limit)
+        app.add_middleware(CacheHeadersMiddleware, path_ttls=PATH_TTLS)
+    return app
+
+
+# ---------- load generator ----------
+
+async def _drive(
+    client: httpx.AsyncClient,
+    concurrency: int,
+    seconds: float,
+    call: Optional[Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]] = None,
+) -> Dict[str, float]:
+    call = call or (lambda c: c.get("/items"))
+    done = 0
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal done, errors
+        while time.perf_counter() < deadline:
+            r = await call(client)
+            if r.status_code != 200:
+                errors += 1
+            done += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {"requests": done, "errors": errors, "seconds": round(elapsed, 3), "rps": round(done / elapsed, 1)}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_asgi(app: FastAPI, concurrency: int, seconds: float) -> Dict[str, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await _drive(client, concurrency, min(seconds, 0.5))  # warm-up
+        return await _drive(client, concurrency, seconds)
+
+
+async def run_http(app: FastAPI, concurrency: int, seconds: float) -> Dict[str, float]:
+    import uvicorn
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits) as client:
+            await _drive(client, concurrency, min(seconds, 0.5))
+            return await _drive(client, concurrency, seconds)
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--transport", choices=("asgi", "http"), default="asgi")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--seconds", type=float, default=3.0)
+    args = ap.parse_args(argv)
+
+    runner = run_asgi if args.transport == "asgi" else run_http
+    results = {}
+    for name, legacy in (("base_http_middleware", True), ("pure_asgi", False)):
+        results[name] = asyncio.run(runner(build_app(legacy), args.concurrency, args.seconds))
+    before, after = results["base_http_middleware"]["rps"], results["pure_asgi"]["rps"]
+    results["speedup"] = round(after / before, 2) if before else None
+    print(json.dumps({"transport": args.transport, "concurrency": args.concurrency, **results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,456 @@
+"""Benchmark suite for the calculators, BIS, the repositories and the API, with a regression gate.
+
+    cd backend
+    python -m benchmarks.suite run --out bench.json
+    python -m benchmarks.suite run --quick --only dps. repo.
+    python -m benchmarks.suite compare baseline.json bench.json --threshold 0.15
+
+``run`` writes ``{"meta": {...}, "results": {name: {...}}}``. A result has a
+``value`` in ``unit`` and says whether ``better`` is ``lower`` or ``higher``.
+Latencies are the best round out of ``repeat``, per operation. Throughput is
+requests per second over ``--seconds``.
+
+``compare`` prints every metric and exits 1 when any is worse than the
+baseline by more than ``--threshold`` (a fraction). ``--metric-threshold
+PREFIX=FRACTION`` loosens or tightens it for noisier metrics.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import fixtures
+
+# ---------- timing ----------
+
+
+def _timed(run: Callable[[], Any], ops: int, repeat: int, setup: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+    """Microseconds per operation of ``run`` (``ops`` operations), best and median of ``repeat`` rounds."""
+    if setup is not None:
+        setup()
+    run()  # warm-up
+    rounds = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        rounds.append((time.perf_counter() - start) / ops)
+    return {
+        "value": round(min(rounds) * 1e6, 3),
+        "median": round(statistics.median(rounds) * 1e6, 3),
+        "unit": "us",
+        "better": "lower",
+        "ops": ops,
+        "repeat": repeat,
+    }
+
+
+# ---------- context ----------
+
+
+class Bench:
+    """Shared, lazily built inputs for one run."""
+
+    def __init__(self, seed: int, repeat: int, seconds: float, concurrency: int) -> None:
+        self.seed = seed
+        self.repeat = repeat
+        self.seconds = seconds
+        self.concurrency = concurrency
+        self._temp: Optional[str] = None
+        self._service: Any = None
+        self._items: Optional[List[Dict[str, Any]]] = None
+        self._app: Any = None
+
+    @property
+    def service(self) -> Any:
+        """SQLite catalog built from ``data/db``; the repositories read through it."""
+        if self._service is None:
+            from app.catalog import snapshot as catalog_snapshot
+            from app.repositories import boss_repository, item_repository
+            from app.sqlite_database import SQLiteCatalogService
+
+            self._temp = tempfile.mkdtemp(prefix="scapelab-bench-")
+            path = os.path.join(self._temp, "osrs.sqlite")
+            fixtures.build_catalog(path)
+            self._service = SQLiteCatalogService(path)
+            catalog_snapshot.clear()
+            item_repository.db_service = self._service
+            boss_repository.db_service = self._service
+        return self._service
+
+    @property
+    def items(self) -> List[Dict[str, Any]]:
+        """Full details of every combat item, in id order."""
+        if self._items is None:
+            ids = sorted(item["id"] for item in self.service.get_all_items())
+            self._items = self.service.get_items(ids)
+        return self._items
+
+    @property
+    def app(self) -> Any:
+        if self._app is None:
+            from app.config import settings
+            from app.main import create_app
+
+            self.service  # the repositories must read the fixture catalog first
+            # Clients are told apart by X-Forwarded-For so the rate limiter stays in the path.
+            hops, settings.RATE_LIMIT_PROXY_HOPS = settings.RATE_LIMIT_PROXY_HOPS, 1
+            try:
+                self._app = create_app()
+            finally:
+                settings.RATE_LIMIT_PROXY_HOPS = hops
+        return self._app
+
+    def close(self) -> None:
+        from app import execution
+
+        execution.shutdown()
+        if self._service is not None:
+            from app.repositories import boss_repository, item_repository
+
+            item_repository.db_service = boss_repository.db_service = None
+            item_repository.invalidate_cache()
+            self._service.close()
+            self._service = None
+        if self._temp is not None:
+            shutil.rmtree(self._temp, ignore_errors=True)
+            self._temp = None
+
+
+# ---------- cases ----------
+
+CASES: Dict[str, Callable[[Bench], Dict[str, Any]]] = {}
+
+
+def case(name: str):
+    def register(fn: Callable[[Bench], Dict[str, Any]]):
+        CASES[name] = fn
+        return fn
+
+    return register
+
+
+def _dps_scalar(style: str) -> Callable[[Bench], Dict[str, Any]]:
+    def run_case(bench: Bench) -> Dict[str, Any]:
+        from app.services import calculation_service
+
+        inputs = fixtures.dps_inputs(style, 200, bench.seed)
+
+        def run():
+            for params in inputs:
+                calculation_service.calculate_dps(dict(params))
+
+        return _timed(run, len(inputs), bench.repeat)
+
+    return run_case
+
+
+def _dps_batch(style: str) -> Callable[[Bench], Dict[str, Any]]:
+    def run_case(bench: Bench) -> Dict[str, Any]:
+        from app.services import bis_service
+
+        params = fixtures.dps_inputs(style, 1, bench.seed)[0]
+        items = bench.items
+        return _timed(lambda: bis_service._score_items(items, params), len(items), bench.repeat)
+
+    return run_case
+
+
+def _bis(style: str, run_search: Callable[[Dict[str, Any]], Any]) -> Callable[[Bench], Dict[str, Any]]:
+    """One BIS search through the repositories over the fixture catalog."""
+
+    def run_case(bench: Bench) -> Dict[str, Any]:
+        from app.repositories import item_repository
+
+        bench.service  # the repositories must read the fixture catalog
+        params = fixtures.dps_inputs(style, 1, bench.seed)[0]
+        result = _timed(lambda: run_search(params), 1, bench.repeat)
+        result["items"] = len(item_repository.get_combat_items())
+        return result
+
+    return run_case
+
+
+def _bis_phase(style: str, phase: str) -> Callable[[Bench], Dict[str, Any]]:
+    """One phase of the BIS search over the fixture catalog's combat items: per item or per candidate."""
+
+    def run_case(bench: Bench) -> Dict[str, Any]:
+        from app.repositories import item_repository
+        from app.services import bis_service
+
+        bench.service  # the repositories must read the fixture catalog
+        params = fixtures.dps_inputs(style, 1, bench.seed)[0]
+        items = item_repository.get_combat_items()
+        candidates = bis_service._candidates(items, params)
+        if phase == "prefilter":
+            result = _timed(lambda: bis_service._candidates(items, params), len(items), bench.repeat)
+        else:
+            result = _timed(lambda: bis_service._score(candidates, params), len(candidates), bench.repeat)
+        result.update(items=len(items), candidates=len(candidates))
+        return result
+
+    return run_case
+
+
+def _suggest_bis_async(params: Dict[str, Any]) -> Any:
+    from app.services import bis_service
+
+    return asyncio.run(bis_service.suggest_bis_async(params))
+
+
+def _suggest_bis(params: Dict[str, Any]) -> Any:
+    from app.services import bis_service
+
+    return bis_service.suggest_bis(params)
+
+
+for _style in fixtures.STYLES:
+    case(f"dps.scalar.{_style}")(_dps_scalar(_style))
+    case(f"dps.batch.{_style}")(_dps_batch(_style))
+    case(f"bis.prefilter.{_style}")(_bis_phase(_style, "prefilter"))
+    case(f"bis.score.{_style}")(_bis_phase(_style, "score"))
+    case(f"bis.search.{_style}")(_bis(_style, _suggest_bis_async))
+    case(f"bis.suggest.{_style}")(_bis(_style, _suggest_bis))
+
+
+def _repo(lookup: str, warm: bool) -> Callable[[Bench], Dict[str, Any]]:
+    def run_case(bench: Bench) -> Dict[str, Any]:
+        from app.repositories import item_repository
+
+        ids = [item["id"] for item in bench.items]
+        if lookup == "get_item":
+            def run():
+                for item_id in ids:
+                    item_repository.get_item(item_id)
+        else:
+            def run():
+                item_repository.get_items(ids)
+
+        setup = run if warm else item_repository.invalidate_cache
+        return _timed(run, len(ids), bench.repeat, setup=setup)
+
+    return run_case
+
+
+for _lookup in ("get_item", "get_items"):
+    case(f"repo.{_lookup}.hit")(_repo(_lookup, warm=True))
+    case(f"repo.{_lookup}.miss")(_repo(_lookup, warm=False))
+
+
+def _asgi(call: Callable[[Bench], Callable[..., Any]]) -> Callable[[Bench], Dict[str, Any]]:
+    """Requests/second of ``call(bench)(client, headers)`` against ``create_app()`` over in-process ASGI."""
+
+    def run_case(bench: Bench) -> Dict[str, Any]:
+        import httpx
+
+        from .middleware_rps import _drive
+
+        logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per request
+        send = call(bench)
+        clients = iter(range(1 << 62))
+
+        async def request(client):
+            n = next(clients) % 4096
+            return await send(client, {"X-Forwarded-For": f"10.0.{n >> 8}.{n & 255}"})
+
+        async def drive():
+            transport = httpx.ASGITransport(app=bench.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                await _drive(client, bench.concurrency, min(bench.seconds, 0.5), request)  # warm-up
+                return await _drive(client, bench.concurrency, bench.seconds, request)
+
+        result = asyncio.run(drive())
+        return {
+            "value": result["rps"], "unit": "req/s", "better": "higher",
+            "requests": result["requests"], "errors": result["errors"], "concurrency": bench.concurrency,
+        }
+
+    return run_case
+
+
+def _get_items(bench: Bench):
+    return lambda client, headers: client.get("/items", headers=headers)
+
+
+def _search_items(bench: Bench):
+    return lambda client, headers: client.get("/search/items", params={"query": "sword"}, headers=headers)
+
+
+def _items_batch(bench: Bench):
+    body = {"ids": [item["id"] for item in bench.items[:20]]}
+    return lambda client, headers: client.post("/items/batch", json=body, headers=headers)
+
+
+def _calculate_dps(bench: Bench):
+    body = fixtures.dps_inputs("melee", 1, bench.seed)[0]
+    return lambda client, headers: client.post("/calculate/dps", json=body, headers=headers)
+
+
+case("asgi.items")(_asgi(_get_items))
+case("asgi.search_items")(_asgi(_search_items))
+case("asgi.items_batch")(_asgi(_items_batch))
+case("asgi.calculate_dps")(_asgi(_calculate_dps))
+
+
+# ---------- run / compare ----------
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=fixtures.ROOT,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def selected(only: Optional[Iterable[str]] = None) -> List[str]:
+    prefixes = tuple(only or ())
+    return [name for name in CASES if not prefixes or name.startswith(prefixes)]
+
+
+def run(
+    names: Iterable[str],
+    seed: int = fixtures.DEFAULT_SEED,
+    repeat: int = 7,
+    seconds: float = 2.0,
+    concurrency: int = 16,
+) -> Dict[str, Any]:
+    bench = Bench(seed, repeat, seconds, concurrency)
+    results: Dict[str, Any] = {}
+    try:
+        for name in names:
+            results[name] = CASES[name](bench)
+    finally:
+        bench.close()
+    return {
+        "meta": {
+            "seed": seed, "repeat": repeat, "seconds": seconds, "concurrency": concurrency,
+            "python": platform.python_version(), "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "commit": _git_commit(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+def _threshold_for(name: str, threshold: float, overrides: Dict[str, float]) -> float:
+    # The longest matching prefix wins.
+    matches = [p for p in overrides if name.startswith(p)]
+    return overrides[max(matches, key=len)] if matches else threshold
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.10,
+    overrides: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """One row per metric in either run; ``status`` is ``regressed`` when it got worse by more than its threshold."""
+    overrides = overrides or {}
+    before_all, after_all = baseline.get("results", {}), current.get("results", {})
+    rows = []
+    for name in sorted(set(before_all) | set(after_all)):
+        before, after = before_all.get(name) or {}, after_all.get(name) or {}
+        row: Dict[str, Any] = {"name": name, "baseline": before.get("value"), "current": after.get("value"),
+                               "unit": after.get("unit") or before.get("unit"), "change": None}
+        if "value" not in before or "value" not in after:
+            row["status"] = "skipped" if "skipped" in before or "skipped" in after else (
+                "new" if name not in before_all else "missing"
+            )
+            rows.append(row)
+            continue
+        limit = _threshold_for(name, threshold, overrides)
+        change = after["value"] / before["value"] - 1 if before["value"] else 0.0
+        worse = change if after.get("better", "lower") == "lower" else -change
+        row["change"] = round(change, 4)
+        row["status"] = "regressed" if worse > limit else "improved" if worse < -limit else "ok"
+        rows.append(row)
+    return rows
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "" if value is None else f"{value:.3f}"
+
+
+def _print_rows(rows: List[Dict[str, Any]]) -> None:
+    width = max([len(r["name"]) for r in rows] + [6])
+    print(f"{'metric':<{width}}  {'baseline':>12}  {'current':>12}  {'change':>8}  status")
+    for r in rows:
+        change = "" if r["change"] is None else f"{r['change']:+.1%}"
+        print(f"{r['name']:<{width}}  {_fmt(r['baseline']):>12}  {_fmt(r['current']):>12}  {change:>8}  {r['status']}")
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _override(value: str) -> Tuple[str, float]:
+    prefix, _, fraction = value.partition("=")
+    try:
+        return prefix, float(fraction)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected PREFIX=FRACTION, got {value!r}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run the benchmarks and write JSON results")
+    run_p.add_argument("--out", help="results file (default: stdout)")
+    run_p.add_argument("--only", nargs="*", metavar="PREFIX", help="run cases whose name starts with PREFIX")
+    run_p.add_argument("--seed", type=int, default=fixtures.DEFAULT_SEED)
+    run_p.add_argument("--repeat", type=int, default=7)
+    run_p.add_argument("--seconds", type=float, default=2.0, help="duration of each throughput case")
+    run_p.add_argument("--concurrency", type=int, default=16)
+    run_p.add_argument("--quick", action="store_true", help="3 rounds and 0.5s throughput runs (smoke test)")
+    run_p.add_argument("--list", action="store_true", help="print the case names and exit")
+
+    cmp_p = sub.add_parser("compare", help="fail if CURRENT regressed against BASELINE")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown as a fraction (default 0.10)")
+    cmp_p.add_argument("--metric-threshold", type=_override, action="append", default=[], metavar="PREFIX=FRACTION")
+
+    args = ap.parse_args(argv)
+    if args.command == "run":
+        names = selected(args.only)
+        if args.list:
+            print("\n".join(names))
+            return 0
+        repeat, seconds = (3, 0.5) if args.quick else (args.repeat, args.seconds)
+        doc = run(names, seed=args.seed, repeat=repeat, seconds=seconds, concurrency=args.concurrency)
+        text = json.dumps(doc, indent=2, sort_keys=True)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        return 0
+
+    rows = compare(_load(args.baseline), _load(args.current), args.threshold, dict(args.metric_threshold))
+    _print_rows(rows)
+    regressed = [r["name"] for r in rows if r["status"] == "regressed"]
+    if regressed:
+        print(f"\n{len(regressed)} metric(s) regressed past the threshold: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,11 +1,12 @@
 from typing import Iterable
+from ..app import tracing
 from ..schemas.bis import Constraints
 
 ITEM_BASE_QUERY = """
 SELECT id, name, slot,
        attack_stab, attack_slash, attack_crush, attack_magic, attack_ranged,
        str_melee, str_ranged, str_magic,
-       tradeable, degradable, price_gp,
+       is_tradeable, degradable, price_gp,
        requirements_flags
 FROM items
 WHERE slot = ?
@@ -19,7 +20,7 @@ async def fetch_slot_candidates(conn, slot: str, unlocks_mask: int, c: Constrain
     params = [slot, unlocks_mask]
 
     if c.tradeable_only:
-        clauses.append("AND tradeable = 1")
+        clauses.append("AND is_tradeable = 1")
     if not c.allow_degradables:
         clauses.append("AND (degradable = 0 OR degradable IS NULL)")
     if c.budget_cap_gp:
@@ -35,5 +36,7 @@ async def fetch_slot_candidates(conn, slot: str, unlocks_mask: int, c: Constrain
         params.extend(exclude)
 
     sql = ITEM_BASE_QUERY + "\n".join(clauses)
-    rows = await conn.fetch_all(sql, params)
+    with tracing.span("db.query", {"db.operation": "fetch_slot_candidates", "bis.slot": slot}) as span:
+        rows = await conn.fetch_all(sql, params)
+        span.set_attribute("db.rows", len(rows))
     return [dict(r) for r in rows]
@@ -0,0 +1,40 @@
+# gunicorn.conf.py - multi-worker entry point (run from backend/):
+#   gunicorn -c gunicorn.conf.py app.main:app
+# The master loads the app and the catalog once, then forks the workers so the
+# catalog is shared copy-on-write (see app/catalog/preload.py).
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+# app.config.settings sizes each worker's CPU pool by this worker count.
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 120
+
+# Workers and their CPU-pool processes share this directory for /metrics
+# (read by app.config.settings, which the preloaded app imports after us).
+if not os.environ.get("METRICS_DIR"):
+    os.environ["METRICS_DIR"] = tempfile.mkdtemp(prefix="scapelab-metrics-")
+    _owns_metrics_dir = True
+else:
+    _owns_metrics_dir = False
+
+
+def when_ready(server):
+    # Runs in the master after the app import and before any worker is forked.
+    if os.environ.get("CATALOG_PRELOAD", "1") in ("0", "false", "False"):
+        return
+    from app.catalog.preload import preload_catalog
+    from app.memory import process_memory
+
+    version = preload_catalog()
+    mem = process_memory()
+    server.log.info("Catalog %s preloaded; master rss=%s", version, mem.get("rss_bytes", mem.get("max_rss_bytes")))
+
+
+def on_exit(server):
+    if _owns_metrics_dir:
+        shutil.rmtree(os.environ["METRICS_DIR"], ignore_errors=True)
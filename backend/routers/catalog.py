@@ -1,29 +1,26 @@
 # backend/routers/catalog.py
 from __future__ import annotations
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
 import base64, json
 
 # Import from the sibling package "app" (top-level because backend/ is on sys.path)
 from app.repositories import item_repository, boss_repository, special_attack_repository
+from app.catalog import changes, payloads, versions
+from app.security import require_admin
 
 router = APIRouter()
 
-# ---------- Models (lightweight stubs to satisfy tests) ----------
-class DpsParams(BaseModel):
-    combat_style: str
-    strength_level: int
-    attack_level: int
-    melee_strength_bonus: int
-    melee_attack_bonus: int
-    attack_style_bonus_strength: int
-    attack_style_bonus_attack: int
-    target_defence_level: int
-    target_defence_bonus: int
-    attack_speed: float
-    # Optional fields used by other styles may exist in your real model; tests only need these.
+# Keyset pagination for /items and /npcs (see app/catalog/pagination.py)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+MAX_AUTOCOMPLETE = 25
+MAX_BATCH_IDS = 500
 
+# ---------- Models (lightweight stubs to satisfy tests) ----------
 class SeedPayload(BaseModel):
     seed: str
 
@@ -31,12 +28,30 @@ class ItemEffectPayload(BaseModel):
     item_name: str
     target_magic_level: int
 
-class BisRequest(BaseModel):
-    npc_id: int
-    combat_style: str
-    slot_whitelist: Optional[List[str]] = None
-    constraints: Optional[Dict[str, Any]] = None
-    mode: Optional[str] = "fast"
+class BatchLookup(BaseModel):
+    ids: List[int] = Field(..., max_length=MAX_BATCH_IDS)
+
+# ---------- Conditional GET helpers ----------
+
+def _not_modified(request: Request, response: Response, dataset: str) -> Optional[Response]:
+    """Paged responses: set the ETag on ``response``; return a bodiless 304 when the client already has it."""
+    version = versions.dataset_version(dataset)
+    etag = versions.make_etag(version, request.url.path, request.url.query)
+    if versions.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+def _full_dataset(request: Request, dataset: str, version: Optional[str] = None, extra_headers=None) -> Response:
+    """Whole dataset from the per-version pre-encoded bytes (JSON, gzip, brotli)."""
+    version = version or versions.dataset_version(dataset)
+    headers = dict(extra_headers or {})
+    if not request.url.path.startswith("/v/"):
+        headers["Content-Location"] = f"/v/{version}/{dataset}"
+    return payloads.respond(
+        dataset, version, lambda: versions.load(dataset), request.headers,
+        versions.make_etag(version, request.url.path), headers,
+    )
 
 # ---------- Routes expected by tests ----------
 
@@ -45,24 +60,69 @@ def root():
     # tests expect a "message" key
     return {"message": "ScapeLab API alive", "ok": True}
 
+@router.get("/catalog/status")
+def catalog_status():
+    # Last background refresh attempt/result (see app/catalog/refresher.py)
+    from app.catalog.refresher import get_refresher
+    return get_refresher().status()
+
+@router.post("/catalog/reload", dependencies=[Depends(require_admin)])
+async def catalog_reload():
+    # Reload every dataset now and swap atomically (this worker; the others
+    # follow on their next version poll). 422 keeps the old data on bad input.
+    from app.catalog.refresher import get_refresher
+    status = await get_refresher().refresh()
+    code = {"rejected": 422, "error": 502}.get(status["last_result"], 200)
+    return JSONResponse(status, status_code=code)
+
+@router.get("/catalog/changes")
+def catalog_changes(since: Optional[str] = Query(None, max_length=128)):
+    # Added/updated/removed items and NPCs since a cursor from an earlier sync.
+    # When the log cannot answer, point at the full lists for this version.
+    out = changes.get_log().since(since)
+    if out["resync"]:
+        out["full"] = {
+            name: f"/v/{versions.dataset_version(name)}/{name}" for name in ("items", "npcs")
+        }
+    return out
+
+@router.get("/catalog/version")
+def catalog_version():
+    # Content hash per dataset; /v/{hash}/{dataset} URLs are immutable.
+    return {
+        name: {"version": v, "url": f"/v/{v}/{name}"}
+        for name, v in versions.all_versions().items()
+    }
+
+@router.get("/v/{version}/{dataset}")
+def versioned_dataset(
+    version: str,
+    dataset: Literal["items", "npcs", "special-attacks", "effects", "bootstrap"],
+    request: Request,
+):
+    # Content under a given hash never changes, so CDNs may keep it for a year.
+    if version != versions.dataset_version(dataset):
+        raise HTTPException(status_code=404, detail="Unknown data version")
+    return _full_dataset(request, dataset, version, {"Cache-Control": versions.IMMUTABLE_CACHE_CONTROL})
+
 @router.get("/special-attacks")
-def get_special_attacks():
-    # Use repository; tests only care that this 200s and is cacheable by middleware
-    return special_attack_repository.get_all_special_attacks()
+def get_special_attacks(request: Request):
+    # Served from the repository's data, pre-encoded per version; cacheable by middleware
+    return _full_dataset(request, "special-attacks")
+
+@router.get("/effects")
+def get_effects(request: Request):
+    return _full_dataset(request, "effects")
+
+@router.get("/bootstrap")
+def get_bootstrap(request: Request):
+    # Items, NPCs, special attacks and passive effects in one pre-compressed body
+    return _full_dataset(request, "bootstrap")
 
 @router.get("/search/special-attacks")
 def search_special_attacks(query: str):
     return special_attack_repository.search_special_attacks(query)
 
-@router.post("/calculate/dps")
-def calculate_dps(params: DpsParams):
-    # Minimal deterministic stub – tests only assert status=200
-    # and in contract tests they check 422 on bad payload (handled by Pydantic).
-    # Here we can return a plausible number; real calc happens in app.services elsewhere.
-    # Keep simple and side-effect free for CI.
-    dps = float(max(0.0, params.melee_strength_bonus + params.melee_attack_bonus) / max(1.0, params.attack_speed))
-    return {"dps": dps}
-
 @router.post("/calculate/seed")
 def calculate_from_seed(p: SeedPayload):
     try:
@@ -87,25 +147,50 @@ def import_seed(p: SeedPayload):
     # tests expect the original fields to be echoed back (e.g., "combat_style")
     return data
 
-@router.post("/bis")
-def bis(payload: dict):
-    # Accept ANY json body (tests post both DPS params and a structured BIS request).
-    # Return fields expected by tests.
-    slots = payload.get("slot_whitelist") or []
-    return {
-        "best_dps": 0.0,
-        "slots": list(slots),
-        "loadout": {},
-    }
-
 # Optionally expose items/bosses search endpoints if your tests use them elsewhere
 @router.get("/items")
-def items():
-    return item_repository.get_all_items()
+def items(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    # Without paging parameters keep returning the full list for existing clients.
+    if limit is None and cursor is None:
+        return _full_dataset(request, "items")
+    cached = _not_modified(request, response, "items")
+    if cached is not None:
+        return cached
+    try:
+        return item_repository.list_items_page(limit or DEFAULT_PAGE_SIZE, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 @router.get("/npcs")
-def npcs():
-    return boss_repository.get_all_bosses()
+def npcs(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    if limit is None and cursor is None:
+        return _full_dataset(request, "npcs")
+    cached = _not_modified(request, response, "npcs")
+    if cached is not None:
+        return cached
+    try:
+        return boss_repository.list_bosses_page(limit or DEFAULT_PAGE_SIZE, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.post("/items/batch")
+def items_batch(payload: BatchLookup):
+    # Full item details in request order; unknown ids are omitted.
+    return item_repository.get_items(payload.ids) or []
+
+@router.post("/npcs/batch")
+def npcs_batch(payload: BatchLookup):
+    return boss_repository.get_bosses(payload.ids) or []
 
 @router.get("/search/items")
 def search_items(query: str, limit: Optional[int] = None):
@@ -114,3 +199,16 @@ def search_items(query: str, limit: Optional[int] = None):
 @router.get("/search/npcs")
 def search_npcs(query: str, limit: Optional[int] = None):
     return boss_repository.search_bosses(query, limit)
+
+@router.get("/autocomplete")
+def autocomplete(
+    q: str = Query(..., min_length=1, max_length=64),
+    type: Literal["items", "npcs"] = "items",
+    limit: int = Query(10, ge=1, le=MAX_AUTOCOMPLETE),
+    slot: Optional[str] = None,
+    combat_only: bool = False,
+):
+    # Compact rows for per-keystroke pickers; cached by CacheHeadersMiddleware.
+    if type == "npcs":
+        return boss_repository.autocomplete_bosses(q, limit)
+    return item_repository.autocomplete_items(q, limit, slot, combat_only)
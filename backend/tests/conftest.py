@@ -94,3 +94,14 @@ async def async_client():
     with _build_app() as app:
         async with AsyncClient(app=app, base_url="http://test") as ac:
             yield ac
+
+
+@pytest.fixture(autouse=True)
+def _reset_catalog_snapshot():
+    """Startup publishes a process-wide catalog snapshot; don't leak it across tests."""
+    yield
+    try:
+        from app.catalog import snapshot as catalog_snapshot
+        catalog_snapshot.clear()
+    except Exception:
+        pass
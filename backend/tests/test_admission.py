@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import execution
+from app.config import settings
+from app.middleware import admission
+from app.middleware.admission import AdmissionControlMiddleware, RouteClass
+
+
+class _SlowApp:
+    """ASGI app whose /bis requests block until ``release`` is set."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["path"] == "/bis":
+            self.started += 1
+            await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _request(app, path):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({"type": "http", "path": path, "method": "POST", "headers": []}, receive, send)
+    start = messages[0]
+    return start["status"], dict(start.get("headers", []))
+
+
+class TestAdmissionControl(unittest.IsolatedAsyncioTestCase):
+    async def test_queue_then_shed_when_full(self):
+        inner = _SlowApp()
+        mw = AdmissionControlMiddleware(inner, [RouteClass("bis", ("/bis",), 1, 1, 5.0)])
+        first = asyncio.create_task(_request(mw, "/bis"))
+        queued = asyncio.create_task(_request(mw, "/bis"))
+        await asyncio.sleep(0.01)
+        self.assertEqual(inner.started, 1)
+        self.assertEqual(mw.stats()["bis"]["queue_depth"], 1)
+
+        status, headers = await _request(mw, "/bis")
+        self.assertEqual(status, 503)
+        self.assertGreaterEqual(int(headers[b"retry-after"]), 1)
+
+        # Ungated routes are not held up by the busy class
+        self.assertEqual((await _request(mw, "/calculate/dps"))[0], 200)
+
+        inner.release.set()
+        self.assertEqual((await first)[0], 200)
+        self.assertEqual((await queued)[0], 200)
+        stats = mw.stats()["bis"]
+        self.assertEqual((stats["active"], stats["queue_depth"]), (0, 0))
+        self.assertEqual((stats["admitted"], stats["shed_queue_full"]), (2, 1))
+        self.assertEqual(stats["max_queue_depth"], 1)
+
+    async def test_wait_timeout_sheds(self):
+        inner = _SlowApp()
+        mw = AdmissionControlMiddleware(inner, [RouteClass("bis", ("/bis",), 1, 4, 0.05)])
+        first = asyncio.create_task(_request(mw, "/bis"))
+        await asyncio.sleep(0.01)
+        self.assertEqual((await _request(mw, "/bis"))[0], 503)
+        self.assertEqual(mw.stats()["bis"]["shed_timeout"], 1)
+        inner.release.set()
+        await first
+        self.assertEqual(mw.stats()["bis"]["active"], 0)
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        inner = _SlowApp()
+        mw = AdmissionControlMiddleware(inner, [RouteClass("bis", ("/bis",), 1, 4, 5.0)])
+        first = asyncio.create_task(_request(mw, "/bis"))
+        waiter = asyncio.create_task(_request(mw, "/bis"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual(mw.stats()["bis"]["queue_depth"], 0)
+        inner.release.set()
+        await first
+        self.assertEqual(mw.stats()["bis"]["active"], 0)
+
+
+class TestAdmissionWiring(unittest.TestCase):
+    def test_app_reports_load(self):
+        from app.main import create_app
+
+        client = TestClient(create_app())
+        client.get("/")
+        load = client.get("/healthz/load").json()
+        self.assertEqual(set(load), {"bis", "calculate"})
+        self.assertEqual(load["bis"]["active"], 0)
+        self.assertEqual(admission.stats()["bis"]["max_queue"], load["bis"]["max_queue"])
+
+
+class TestAdmissionOnRealHandler(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self):
+        execution.shutdown()
+
+    async def test_busy_calculate_sheds_while_handler_runs(self):
+        # /calculate/dps runs inline, so hold a threaded handler of the same class.
+        from app.main import create_app
+        from app.services import calculation_service
+
+        release = threading.Event()
+        body = {"item_name": "Tumeken's shadow", "target_magic_level": 100}
+
+        def held(params):
+            release.wait(5)
+            return {"effect": params["item_name"]}
+
+        with patch.object(settings, "ADMISSION_CALC_CONCURRENCY", 1), patch.object(settings, "ADMISSION_CALC_QUEUE", 0):
+            app = create_app()
+        transport = httpx.ASGITransport(app=app)
+        with patch.object(calculation_service, "calculate_item_effect", side_effect=held):
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                first = asyncio.create_task(client.post("/calculate/item-effect", json=body))
+                while admission.stats()["calculate"]["active"] == 0:
+                    await asyncio.sleep(0.01)
+                shed = await client.post("/calculate/dps", json={})
+                release.set()
+                served = await first
+
+        self.assertEqual(shed.status_code, 503)
+        self.assertIn("retry-after", shed.headers)
+        self.assertEqual(served.status_code, 200)
+        self.assertEqual(served.json(), {"effect": "Tumeken's shadow"})
+        stats = admission.stats()["calculate"]
+        self.assertEqual((stats["admitted"], stats["shed_queue_full"], stats["active"]), (1, 1, 0))
+
+if __name__ == "__main__":
+    unittest.main()
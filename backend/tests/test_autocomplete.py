@@ -0,0 +1,68 @@
+import time
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.catalog import snapshot as catalog_snapshot
+from app.catalog.autocomplete import PrefixIndex, popularity
+from app.catalog.snapshot import CatalogSnapshot
+
+ITEMS = [
+    {"id": 1, "name": "Dragon dagger", "slot": "weapon", "has_combat_stats": True, "daily_volume": 5000, "icons": ["dd.png"]},
+    {"id": 2, "name": "Dragon defender", "slot": "shield", "has_combat_stats": True, "daily_volume": 50},
+    {"id": 3, "name": "Dragon bones", "slot": None, "has_combat_stats": False, "daily_volume": 900000},
+    {"id": 4, "name": "Dragon hunter crossbow", "slot": "weapon", "has_combat_stats": True},
+    {"id": 5, "name": "Ancient dragon mask", "slot": "head", "has_combat_stats": False},
+]
+BOSSES = [{"id": 8059, "name": "Vorkath", "icon_url": "v.png"}, {"id": 2042, "name": "Zulrah"}]
+ALIASES = {"items": {"dhcb": "Dragon hunter crossbow"}, "bosses": {"vork": "Vorkath"}}
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def test_ranking_and_filters(self):
+        snap = CatalogSnapshot.build(ITEMS, BOSSES, aliases=ALIASES)
+        names = [r["name"] for r in snap.autocomplete_items("dra")]
+        # Name-start matches by popularity (alias boost for DHCB), word-start last.
+        self.assertEqual(names, ["Dragon bones", "Dragon hunter crossbow", "Dragon dagger",
+                                 "Dragon defender", "Ancient dragon mask"])
+        self.assertEqual([r["id"] for r in snap.autocomplete_items("dra", 2, slot="WEAPON")], [4, 1])
+        self.assertEqual({r["id"] for r in snap.autocomplete_items("drag", combat_only=True)}, {1, 2, 4})
+        self.assertEqual(snap.autocomplete_items("dhc"), [{"id": 4, "name": "Dragon hunter crossbow",
+                                                           "slot": "weapon", "icon": None}])
+        self.assertEqual(snap.autocomplete_bosses("vo"), [{"id": 8059, "name": "Vorkath", "icon": "v.png"}])
+        self.assertEqual(snap.autocomplete_items("   "), [])
+
+    def test_popularity_signal(self):
+        self.assertEqual(popularity({"popularity": 3}), 3.0)
+        self.assertAlmostEqual(popularity({"daily_volume": 999}), 3.0)
+        self.assertEqual(popularity({}), 0.0)
+
+    def test_lookups_are_sub_millisecond(self):
+        names = [f"Item number {i} {'abcdefghij'[i % 10]}" for i in range(20000)]
+        index = PrefixIndex(names)
+        index.complete("item number 1", 10)  # warm
+        start = time.perf_counter()
+        for i in range(200):
+            index.complete(f"item number {i}", 10)
+        self.assertLess((time.perf_counter() - start) / 200, 0.001)
+
+
+class TestAutocompleteRoute(unittest.TestCase):
+    def tearDown(self):
+        catalog_snapshot.clear()
+
+    def test_route(self):
+        from app.main import create_app
+
+        catalog_snapshot.install(CatalogSnapshot.build(ITEMS, BOSSES, aliases=ALIASES))
+        client = TestClient(create_app())
+        r = client.get("/autocomplete", params={"q": "dra", "limit": 1, "combat_only": True})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()[0]["id"], 4)
+        self.assertIn("max-age", r.headers.get("cache-control", ""))
+        self.assertEqual(client.get("/autocomplete", params={"q": "vork", "type": "npcs"}).json()[0]["id"], 8059)
+        self.assertEqual(client.get("/autocomplete", params={"q": "x", "limit": 100}).status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
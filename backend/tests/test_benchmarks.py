@@ -0,0 +1,79 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks import fixtures, suite
+
+
+def _doc(**values):
+    return {"results": {
+        name: {"value": value, "unit": "us" if better == "lower" else "req/s", "better": better}
+        for name, (value, better) in values.items()
+    }}
+
+
+class TestFixtures(unittest.TestCase):
+    def test_inputs_are_seeded(self):
+        self.assertEqual(fixtures.dps_inputs("ranged", 20, seed=7), fixtures.dps_inputs("ranged", 20, seed=7))
+        self.assertNotEqual(fixtures.dps_inputs("ranged", 20, seed=7), fixtures.dps_inputs("ranged", 20, seed=8))
+
+
+class TestCompare(unittest.TestCase):
+    def test_regression_direction_and_threshold(self):
+        base = _doc(**{"dps.scalar.melee": (10.0, "lower"), "repo.get_item.hit": (5.0, "lower"), "asgi.items": (1000.0, "higher")})
+        cur = _doc(**{"dps.scalar.melee": (11.5, "lower"), "repo.get_item.hit": (4.0, "lower"), "asgi.items": (950.0, "higher")})
+        rows = {r["name"]: r for r in suite.compare(base, cur, threshold=0.10)}
+        self.assertEqual(rows["dps.scalar.melee"]["status"], "regressed")
+        self.assertEqual(rows["dps.scalar.melee"]["change"], 0.15)
+        self.assertEqual(rows["repo.get_item.hit"]["status"], "improved")
+        self.assertEqual(rows["asgi.items"]["status"], "ok")
+
+        rows = {r["name"]: r for r in suite.compare(base, cur, threshold=0.01, overrides={"asgi.": 0.2, "dps.": 0.2})}
+        self.assertEqual(rows["asgi.items"]["status"], "ok")
+        self.assertEqual(rows["dps.scalar.melee"]["status"], "ok")
+
+    def test_new_missing_and_skipped_never_fail(self):
+        base = _doc(**{"a": (1.0, "lower")})
+        base["results"]["c"] = {"skipped": "not importable"}
+        cur = _doc(**{"b": (1.0, "lower"), "c": (1.0, "lower")})
+        statuses = {r["name"]: r["status"] for r in suite.compare(base, cur)}
+        self.assertEqual(statuses, {"a": "missing", "b": "new", "c": "skipped"})
+
+
+class TestRun(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp)
+
+    def test_run_writes_json_and_compare_gates(self):
+        out = os.path.join(self.temp, "bench.json")
+        self.assertEqual(suite.main(["run", "--quick", "--only", "dps.scalar.melee", "--out", out]), 0)
+        with open(out) as f:
+            doc = json.load(f)
+        self.assertEqual(doc["meta"]["seed"], fixtures.DEFAULT_SEED)
+        (result,) = doc["results"].values()
+        self.assertGreater(result["value"], 0)
+        self.assertEqual((result["unit"], result["better"]), ("us", "lower"))
+
+        slower = os.path.join(self.temp, "slower.json")
+        doc["results"]["dps.scalar.melee"]["value"] *= 2
+        with open(slower, "w") as f:
+            json.dump(doc, f)
+        with contextlib.redirect_stdout(io.StringIO()) as printed:
+            self.assertEqual(suite.main(["compare", out, out]), 0)
+            self.assertEqual(suite.main(["compare", out, slower, "--threshold", "0.5"]), 1)
+        self.assertIn("dps.scalar.melee", printed.getvalue().splitlines()[-1])
+
+    def test_every_area_has_cases(self):
+        names = suite.selected()
+        for prefix in ("dps.scalar.", "dps.batch.", "bis.prefilter.", "bis.score.", "bis.search.", "bis.suggest.",
+                       "repo.get_item.hit", "repo.get_item.miss", "asgi."):
+            self.assertTrue(any(n.startswith(prefix) for n in names), prefix)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import shutil
+import sqlite3
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from app import service_factory
+from app.binary_database import BinaryCatalogService
+from app.catalog import binary_snapshot
+from app.sqlite_database import SQLiteCatalogService
+from tests.test_sqlite_catalog import _build
+from tools.scraper_v2.export_binary import write_binary_snapshot
+from tools.scraper_v2.normalize_items import write_catalog_items
+
+ZULRAH = {
+    "id": 2042, "name": "Zulrah", "raid_group": None, "location": "Zul-Andra",
+    "has_multiple_forms": True, "icon_url": None, "examine": "The great serpent.",
+    "forms": [
+        {"id": 2042, "form_name": "Serpentine", "form_order": 1, "combat_level": 725, "max_hit": "41",
+         "icons": ["a.png", "b.png"], "size": 5},
+        {"id": 2043, "form_name": "Magma", "form_order": 2, "combat_level": 725, "max_hit": None,
+         "icons": [], "size": 5},
+    ],
+}
+
+
+class TestBinarySnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "osrs.sqlite")
+        self.bin_path = os.path.join(self.temp_dir, "osrs.catalog.bin")
+        _build(self.db_path, "title")
+        cn = sqlite3.connect(self.db_path)
+        write_catalog_items(cn)
+        cn.close()
+        self.sqlite = SQLiteCatalogService(self.db_path)
+        write_binary_snapshot(self.db_path, self.bin_path)
+        self.service = BinaryCatalogService(self.bin_path)
+
+    def tearDown(self):
+        self.service.close()
+        self.sqlite.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_sqlite_service(self):
+        self.assertEqual(self.service.load_catalog(), self.sqlite.load_catalog())
+        self.assertEqual(self.service.get_all_items(), self.sqlite.get_all_items())
+        self.assertEqual(self.service.get_item(4151), self.sqlite.get_item(4151))
+        self.assertEqual(self.service.get_boss(8059), self.sqlite.get_boss(8059))
+
+    def test_lookups(self):
+        self.assertEqual(self.service.get_item(4151)["stats"]["str_melee"], 82)
+        self.assertIsNone(self.service.get_item(999999))
+        self.assertEqual({i["id"] for i in self.service.get_all_items(combat_only=False)}, {4151, 2365})
+        self.assertEqual([i["id"] for i in self.service.get_items([2365, 4151, 1])], [2365, 4151])
+        self.assertEqual([i["id"] for i in self.service.search_items("WHIP")], [4151])
+        self.assertEqual(self.service.get_boss_by_form(8059)["name"], "Vorkath")
+        self.assertEqual(self.service.search_bosses("vork")[0]["location"], "Ungael")
+
+    def test_keyset_pages(self):
+        rows, next_key = self.service.list_items_page(1, combat_only=False)
+        self.assertEqual(rows[0]["id"], 2365)  # "'perfect' gold bar" sorts first
+        rows, last = self.service.list_items_page(1, next_key, combat_only=False)
+        self.assertEqual((rows[0]["id"], last), (4151, None))
+
+    def test_forms_and_nulls(self):
+        cat = binary_snapshot.BinaryCatalog.from_bytes(binary_snapshot.encode([], [ZULRAH]))
+        boss = cat.boss(cat.bosses.row_of(2042))
+        self.assertTrue(boss["has_multiple_forms"])
+        self.assertEqual([f["icons"] for f in boss["forms"]], [["a.png", "b.png"], []])
+        self.assertEqual([f["max_hit"] for f in boss["forms"]], ["41", None])
+        self.assertIsNone(boss["forms"][0]["hitpoints"])
+        self.assertEqual(cat.forms.columns["boss_id"][cat.forms.row_of(2043)], 2042)
+
+    def test_rejects_other_layouts(self):
+        data = bytearray(binary_snapshot.encode([], []))
+        struct.pack_into("<I", data, 4, binary_snapshot.LAYOUT_VERSION + 1)
+        with self.assertRaises(ValueError):
+            binary_snapshot.BinaryCatalog.from_bytes(bytes(data))
+        with self.assertRaises(ValueError):
+            binary_snapshot.BinaryCatalog.from_bytes(b"XXXX" + bytes(data[4:]))
+
+    def test_rewrite_is_picked_up(self):
+        first = self.service.catalog_version()
+        old = self.service.catalog()
+        binary_snapshot.write(self.bin_path, [], [ZULRAH])
+        os.utime(self.bin_path, ns=(1, 1))
+        self.assertNotEqual(self.service.catalog_version(), first)
+        self.assertIsNone(self.service.get_item(4151))
+        self.assertEqual(self.service.get_boss(2042)["name"], "Zulrah")
+        # Readers holding the previous mapping keep a consistent view.
+        self.assertEqual(old.item(old.items.row_of(4151))["name"], "Abyssal whip")
+
+    def test_factory(self):
+        with mock.patch.object(service_factory.settings, "CATALOG_BINARY_PATH", self.bin_path):
+            svc = service_factory.create_database_service("binary")
+        self.assertIsInstance(svc, BinaryCatalogService)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import gzip
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.catalog import bootstrap, payloads
+from app.catalog import snapshot as catalog_snapshot
+from app.catalog.snapshot import CatalogSnapshot
+from app.main import create_app
+from app.repositories import boss_repository, item_repository
+
+ITEMS = [
+    {"id": 4151, "name": "Abyssal whip", "has_combat_stats": True, "slot": "weapon",
+     "has_special_attack": True, "has_passive_effect": False, "is_tradeable": True, "icons": []},
+    {"id": 2365, "name": "Iron bar", "has_combat_stats": False},
+]
+BOSSES = [{"id": 8059, "name": "Vorkath", "raid_group": None, "location": "Ungael", "forms": [{"id": 1}]}]
+
+
+class TestBootstrapBundle(unittest.TestCase):
+    def setUp(self):
+        self.snap = CatalogSnapshot.build(ITEMS, BOSSES)
+        catalog_snapshot.install(self.snap)
+        payloads.clear()
+        self.client = TestClient(create_app())
+
+    def tearDown(self):
+        catalog_snapshot.clear()
+        payloads.clear()
+
+    def test_projection(self):
+        self.assertEqual(
+            bootstrap.project(BOSSES, bootstrap.NPC_FIELDS), [{"id": 8059, "name": "Vorkath", "location": "Ungael"}],
+        )
+        self.assertEqual(
+            bootstrap.project(ITEMS[:1], bootstrap.ITEM_FIELDS),
+            [{"id": 4151, "name": "Abyssal whip", "slot": "weapon", "has_special_attack": True, "has_combat_stats": True}],
+        )
+
+    def test_one_compressed_versioned_response(self):
+        r = self.client.get("/bootstrap", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(r.status_code, 200)
+        body = r.json()
+        self.assertEqual(body["catalog_version"], self.snap.version)
+        # Lists come from the repositories (stubbed in tests), projected.
+        self.assertEqual(body["items"], bootstrap.project(item_repository.get_all_items(), bootstrap.ITEM_FIELDS))
+        self.assertEqual(body["npcs"], bootstrap.project(boss_repository.get_all_bosses(), bootstrap.NPC_FIELDS))
+        self.assertTrue(body["items"])
+        self.assertIn("dragon_dagger", body["special_attacks"])
+        self.assertTrue(body["passive_effects"])
+        self.assertEqual(r.headers["content-location"], f"/v/{body['version']}/bootstrap")
+
+        # Rendered once: the stored gzip body is what went over the wire.
+        rendered = payloads._store["bootstrap"]
+        self.assertEqual(rendered.version, body["version"])
+        self.assertEqual(json.loads(gzip.decompress(rendered.bodies["gzip"])), body)
+
+        again = self.client.get("/bootstrap", headers={"If-None-Match": r.headers["etag"]})
+        self.assertEqual(again.status_code, 304)
+
+    def test_version_follows_catalog(self):
+        before = bootstrap.version()
+        catalog_snapshot.install(CatalogSnapshot.build(ITEMS + [{"id": 1, "name": "Dragon claws"}], BOSSES))
+        self.assertNotEqual(bootstrap.version(), before)
+        self.assertEqual(self.client.get(f"/v/{before}/bootstrap").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.catalog import changes
+from app.catalog import snapshot as catalog_snapshot
+from app.catalog.changes import ChangeLog
+from app.catalog.refresher import CatalogRefresher
+from app.repositories import boss_repository, item_repository
+
+
+def _items(*pairs):
+    return [{"id": i, "name": name} for i, name in pairs]
+
+
+class TestChangeLog(unittest.TestCase):
+    def test_delta_since_cursor(self):
+        log = ChangeLog()
+        base = log.record("v1", {"items": _items((1, "Whip"), (2, "Claws"), (3, "Dagger")), "npcs": []})
+        log.record("v2", {"items": _items((1, "Abyssal whip"), (2, "Claws"), (4, "Scythe")), "npcs": []})
+        out = log.since(base)
+        self.assertFalse(out["resync"])
+        self.assertEqual(out["sequence"], 2)
+        self.assertEqual(out["version"], "2.v2")
+        delta = out["changes"]["items"]
+        self.assertEqual(delta["added"], [{"id": 4, "name": "Scythe"}])
+        self.assertEqual(delta["updated"], [{"id": 1, "name": "Abyssal whip"}])
+        self.assertEqual(delta["removed"], [3])
+        self.assertEqual(out["changes"]["npcs"], {"added": [], "updated": [], "removed": []})
+
+    def test_steps_merge(self):
+        log = ChangeLog()
+        base = log.record("v1", {"items": _items((1, "Whip"), (2, "Claws"))})
+        log.record("v2", {"items": _items((1, "Whip"), (2, "Claws"), (5, "Temp"))})
+        log.record("v3", {"items": _items((1, "Whip"))})
+        log.record("v4", {"items": _items((1, "Whip"), (2, "Dragon claws"))})
+        delta = log.since(base)["changes"]["items"]
+        # 5 came and went; 2 was removed and re-added, so the client just updates it.
+        self.assertEqual(delta, {"added": [], "updated": [{"id": 2, "name": "Dragon claws"}], "removed": []})
+        self.assertEqual(log.since(log.cursor())["changes"]["items"], {"added": [], "updated": [], "removed": []})
+
+    def test_unchanged_catalog_is_not_a_step(self):
+        log = ChangeLog()
+        first = log.record("v1", {"items": _items((1, "Whip"))})
+        self.assertEqual(log.record("v1", {"items": _items((1, "Whip"))}), first)
+        self.assertEqual(log.cursor(), "1.v1")
+
+    def test_resync_hints(self):
+        log = ChangeLog(max_steps=2)
+        self.assertEqual(log.since(None)["reason"], "empty")
+        old = log.record("v1", {"items": _items((1, "A"))})
+        log.record("v2", {"items": _items((1, "B"))})
+        log.record("v3", {"items": _items((1, "C"))})
+        self.assertEqual(log.since(old), {"version": "3.v3", "sequence": 3, "resync": True, "reason": "compacted"})
+        self.assertEqual(log.since(None)["reason"], "missing")
+        self.assertEqual(log.since("9.nope")["reason"], "unknown")
+        # A cursor minted by another worker resolves by catalog version.
+        self.assertFalse(log.since("7.v2")["resync"])
+
+    def test_entity_budget_compacts(self):
+        log = ChangeLog(max_entities=3)
+        base = log.record("v1", {"items": []})
+        log.record("v2", {"items": _items((1, "A"), (2, "B"))})
+        log.record("v3", {"items": _items((1, "A"), (2, "B"), (3, "C"), (4, "D"))})
+        self.assertTrue(log.since(base)["resync"])
+        self.assertFalse(log.since("2.v2")["resync"])
+
+
+class FakeCatalog:
+    def __init__(self):
+        self.items = [{"id": 1, "name": "Abyssal whip", "has_combat_stats": True}]
+
+    async def load_catalog_async(self):
+        return {"items": list(self.items), "bosses": [{"id": 9, "name": "Zulrah"}]}
+
+    def load_catalog(self):  # pragma: no cover - presence marks bulk support
+        raise NotImplementedError
+
+
+class TestChangesEndpoint(unittest.TestCase):
+    def setUp(self):
+        from routers.catalog import router
+
+        self.svc = FakeCatalog()
+        self.orig = (item_repository.db_service, boss_repository.db_service, changes._log)
+        item_repository.db_service = boss_repository.db_service = self.svc
+        changes._log = ChangeLog()
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        item_repository.db_service, boss_repository.db_service, changes._log = self.orig
+        catalog_snapshot.clear()
+        item_repository.invalidate_cache()
+        boss_repository.invalidate_cache()
+
+    def test_reload_is_logged(self):
+        refresher = CatalogRefresher(interval=60)
+        asyncio.run(refresher.refresh())
+        first = self.client.get("/catalog/changes").json()
+        self.assertTrue(first["resync"])
+        self.assertEqual(first["full"]["items"], f"/v/{catalog_snapshot.current().version}/items")
+
+        self.svc.items.append({"id": 2, "name": "Dragon claws", "has_combat_stats": True})
+        asyncio.run(refresher.refresh())
+        out = self.client.get("/catalog/changes", params={"since": first["version"]}).json()
+        self.assertFalse(out["resync"])
+        self.assertEqual(out["sequence"], 2)
+        self.assertEqual([e["id"] for e in out["changes"]["items"]["added"]], [2])
+        self.assertEqual(out["changes"]["npcs"], {"added": [], "updated": [], "removed": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
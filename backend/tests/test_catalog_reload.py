@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.catalog import snapshot as catalog_snapshot
+from app.catalog.refresher import CatalogRefresher
+from app.config import settings
+from app.middleware.catalog_pin import CatalogPinMiddleware
+from app.repositories import boss_repository, item_repository, special_attack_repository
+
+
+class FakeCatalog:
+    def __init__(self, n_items=4):
+        self.items = [{"id": i, "name": f"Item {i}", "has_combat_stats": True} for i in range(1, n_items + 1)]
+
+    async def load_catalog_async(self):
+        return {"items": list(self.items), "bosses": []}
+
+    def load_catalog(self):
+        return {"items": list(self.items), "bosses": []}
+
+
+def _write_specs(path, *names):
+    Path(path).write_text(json.dumps([{"weapon_name": n, "special_cost": 50} for n in names]))
+
+
+class TestCatalogReload(unittest.TestCase):
+    def setUp(self):
+        self.svc = FakeCatalog()
+        self.orig = (item_repository.db_service, boss_repository.db_service)
+        item_repository.db_service = boss_repository.db_service = self.svc
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.specs = os.path.join(tmp.name, "special_attacks.json")
+        _write_specs(self.specs, "Dragon dagger")
+        patcher = mock.patch.object(special_attack_repository, "DATA_PATH", Path(self.specs))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        item_repository.db_service, boss_repository.db_service = self.orig
+        catalog_snapshot.clear()
+        item_repository.invalidate_cache()
+        boss_repository.invalidate_cache()
+        special_attack_repository.invalidate_cache()
+
+    def test_datasets_swap_together(self):
+        refresher = CatalogRefresher(interval=60)
+        asyncio.run(refresher.refresh())
+        first = catalog_snapshot.current()
+        self.assertIsNotNone(special_attack_repository.get_special_attack("Dragon dagger"))
+
+        _write_specs(self.specs, "Dragon claws")
+        self.assertEqual(asyncio.run(refresher.refresh())["last_result"], "updated")
+        snap = catalog_snapshot.current()
+        self.assertNotEqual(snap.version, first.version)
+        self.assertIsNone(special_attack_repository.get_special_attack("Dragon dagger"))
+        self.assertIsNotNone(special_attack_repository.get_special_attack("Dragon claws"))
+        self.assertIn("dragon_dagger", first.special_attacks)  # old version untouched
+
+    def test_truncated_catalog_is_rejected(self):
+        refresher = CatalogRefresher(interval=60, min_retain=0.5)
+        asyncio.run(refresher.refresh())
+        before = catalog_snapshot.current()
+        del self.svc.items[1:]
+        status = asyncio.run(refresher.refresh())
+        self.assertEqual(status["last_result"], "rejected")
+        self.assertIn("items shrank from 4 to 1", status["last_error"])
+        self.assertEqual(status["consecutive_failures"], 0)
+        self.assertIs(catalog_snapshot.current(), before)
+
+        _write_specs(self.specs)  # emptied dataset
+        self.svc.items = FakeCatalog().items
+        self.assertEqual(asyncio.run(refresher.refresh())["last_result"], "rejected")
+        self.assertIs(catalog_snapshot.current(), before)
+
+    def test_dataset_file_change_triggers_reload(self):
+        refresher = CatalogRefresher(interval=3600, poll_interval=0.01)
+
+        async def run():
+            await refresher.refresh()
+            refresher.start()
+            await asyncio.sleep(0.03)
+            _write_specs(self.specs, "Dragon dagger", "Granite maul")
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if refresher.refreshes == 2:
+                    break
+            await refresher.stop()
+
+        asyncio.run(run())
+        self.assertIn("granite_maul", catalog_snapshot.current().special_attacks)
+        self.assertEqual(refresher.refreshes, 2)
+
+
+class TestSnapshotPinning(unittest.TestCase):
+    def tearDown(self):
+        catalog_snapshot.clear()
+
+    def test_request_keeps_its_snapshot_across_a_swap(self):
+        old = catalog_snapshot.CatalogSnapshot.build([{"id": 1, "name": "Old"}], [])
+        new = catalog_snapshot.CatalogSnapshot.build([{"id": 2, "name": "New"}], [])
+        catalog_snapshot.install(old)
+
+        app = FastAPI()
+
+        @app.get("/probe")
+        def probe():
+            catalog_snapshot.install(new)  # a reload lands mid-request
+            return {"seen": catalog_snapshot.current().version}
+
+        app.add_middleware(CatalogPinMiddleware)
+        r = TestClient(app).get("/probe")
+        self.assertEqual(r.json()["seen"], old.version)
+        self.assertEqual(r.headers["X-Catalog-Version"], old.version)
+        self.assertIs(catalog_snapshot.current(), new)
+
+
+class TestReloadEndpoint(unittest.TestCase):
+    def setUp(self):
+        from routers.catalog import router
+
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+
+    def test_requires_admin_token(self):
+        with mock.patch.object(settings, "ADMIN_TOKEN", None):
+            self.assertEqual(self.client.post("/catalog/reload").status_code, 403)
+        with mock.patch.object(settings, "ADMIN_TOKEN", "s3cret"):
+            r = self.client.post("/catalog/reload", headers={"X-Admin-Token": "nope"})
+            self.assertEqual(r.status_code, 401)
+            refresh = mock.AsyncMock(return_value={"last_result": "unchanged"})
+            with mock.patch("app.catalog.refresher.CatalogRefresher.refresh", refresh):
+                r = self.client.post("/catalog/reload", headers={"X-Admin-Token": "s3cret"})
+            self.assertEqual(r.status_code, 200)
+            self.assertEqual(r.json()["last_result"], "unchanged")
+
+
+if __name__ == "__main__":
+    unittest.main()
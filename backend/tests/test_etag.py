@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.catalog import snapshot as catalog_snapshot
+from app.catalog import versions
+from app.catalog.snapshot import CatalogSnapshot
+from app.main import create_app
+
+ITEMS = [{"id": 1, "name": "Abyssal whip", "has_combat_stats": True, "slot": "weapon"}]
+BOSSES = [{"id": 8059, "name": "Vorkath"}]
+
+
+class TestEtagMatching(unittest.TestCase):
+    def test_if_none_match_forms(self):
+        etag = versions.make_etag("abc", "/items")
+        self.assertTrue(versions.etag_matches(etag, etag))
+        self.assertTrue(versions.etag_matches(f'"x", W/{etag}', etag))
+        self.assertTrue(versions.etag_matches("*", etag))
+        self.assertFalse(versions.etag_matches('"abc"', etag))
+        self.assertFalse(versions.etag_matches(None, etag))
+        self.assertNotEqual(etag, versions.make_etag("abc", "/npcs"))
+        self.assertNotEqual(etag, versions.make_etag("abc", "/items", "limit=5"))
+
+    def test_content_version_is_memoized_per_object(self):
+        data = {"a": 1}
+        self.assertEqual(versions.content_version(data), versions.content_version({"a": 1}))
+        self.assertNotEqual(versions.content_version(data), versions.content_version({"a": 2}))
+
+
+class TestConditionalRoutes(unittest.TestCase):
+    def setUp(self):
+        self.snap = CatalogSnapshot.build(ITEMS, BOSSES)
+        catalog_snapshot.install(self.snap)
+        self.client = TestClient(create_app())
+
+    def test_items_304_skips_body(self):
+        first = self.client.get("/items")
+        etag = first.headers["etag"]
+        self.assertTrue(etag.startswith(f'"{self.snap.version}-'))
+        self.assertEqual(first.headers["content-location"], f"/v/{self.snap.version}/items")
+        with patch("app.repositories.item_repository.get_all_items") as loader:
+            second = self.client.get("/items", headers={"If-None-Match": etag})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+        loader.assert_not_called()
+
+        # A new catalog version invalidates the ETag.
+        catalog_snapshot.install(CatalogSnapshot.build(ITEMS + [{"id": 2, "name": "Dragon claws"}], BOSSES))
+        self.assertEqual(self.client.get("/items", headers={"If-None-Match": etag}).status_code, 200)
+
+    def test_static_datasets(self):
+        for path in ("/special-attacks", "/effects", "/npcs"):
+            r = self.client.get(path)
+            self.assertEqual(r.status_code, 200, path)
+            again = self.client.get(path, headers={"If-None-Match": r.headers["etag"]})
+            self.assertEqual(again.status_code, 304, path)
+
+    def test_versioned_urls_are_immutable(self):
+        listing = self.client.get("/catalog/version").json()
+        url = listing["items"]["url"]
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 200)
+        self.assertIsInstance(r.json(), list)
+        self.assertIn("immutable", r.headers["cache-control"])
+        self.assertIn("max-age=31536000", r.headers["cache-control"])
+        self.assertEqual(self.client.get(url, headers={"If-None-Match": r.headers["etag"]}).status_code, 304)
+        self.assertEqual(self.client.get("/v/deadbeef/items").status_code, 404)
+        self.assertEqual(self.client.get(listing["effects"]["url"]).status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
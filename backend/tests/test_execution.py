@@ -0,0 +1,93 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import execution
+from app.config import settings
+from app.repositories import item_repository
+from app.main import create_app
+from app.services import bis_service, calculation_service
+from tests.test_metrics import PARAMS
+
+
+class _GoneAfter:
+    """Request stand-in whose client disconnects after ``delay`` seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def receive(self):
+        await asyncio.sleep(self.delay)
+        return {"type": "http.disconnect"}
+
+
+def _slow_square(x, seen):
+    seen.append(x)
+    time.sleep(0.02)
+    return x * x
+
+
+class TestExecution(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self):
+        execution.shutdown()
+
+    async def test_map_cpu_keeps_order(self):
+        seen = []
+        self.assertEqual(await execution.map_cpu(_slow_square, [3, 1, 2], seen), [9, 1, 4])
+
+    async def test_disconnect_stops_submitting_chunks(self):
+        seen = []
+        with self.assertRaises(execution.ClientDisconnected):
+            await execution.map_cpu(_slow_square, range(50), seen, request=_GoneAfter(0.05))
+        await asyncio.sleep(0.05)
+        self.assertLess(len(seen), 10)
+
+    async def test_process_pool(self):
+        with patch.object(settings, "CPU_WORKERS", 1):
+            self.assertEqual(await execution.run_cpu(pow, 2, 10), 1024)
+            self.assertIsInstance(execution.cpu_executor(), execution.ProcessPoolExecutor)
+
+
+class TestBisChunks(unittest.IsolatedAsyncioTestCase):
+    async def test_chunked_search_matches_single_pass(self):
+        items = [
+            {"id": i, "slot": slot, "stats": {"str_melee": s, "attack_slash": 1}}
+            for i, (slot, s) in enumerate([("weapon", 5), ("head", 2), ("weapon", 9), ("head", 2), ("weapon", 9)])
+        ]
+
+        async def all_items():
+            return items
+
+        score = lambda p: {"dps": p.get("melee_strength_bonus", 0)}
+        with patch.object(item_repository, "get_combat_items_async", all_items), \
+                patch.object(calculation_service, "calculate_dps", side_effect=score), \
+                patch.object(settings, "BIS_CHUNK_SIZE", 2):
+            out = await bis_service.compute_bis_async({"combat_style": "melee"})
+            expected = bis_service._pick_best(items, {"combat_style": "melee"})
+        self.assertEqual(out["loadout"], expected)
+        self.assertEqual([out["loadout"]["weapon"]["id"], out["loadout"]["head"]["id"]], [2, 1])
+        self.assertEqual(out["best_dps"], 9)
+
+
+class TestRoutes(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(create_app())
+
+    def test_dps_route_runs_inline(self):
+        with patch.object(execution, "run_cpu") as run_cpu:
+            r = self.client.post("/calculate/dps", json=PARAMS)
+        run_cpu.assert_not_called()
+        self.assertEqual(r.json(), calculation_service.calculate_dps(dict(PARAMS)))
+
+    def test_disconnect_answers_499(self):
+        async def gone(*args, **kwargs):
+            raise execution.ClientDisconnected()
+
+        with patch.object(execution, "map_cpu", gone):
+            self.assertEqual(self.client.post("/bis", json=PARAMS).status_code, 499)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import json
+import unittest
+
+from app.catalog import item_schema
+
+
+class TestItemSchema(unittest.TestCase):
+    def test_legacy_row_flattens_combat_stats(self):
+        row = item_schema.row_from_legacy_item({
+            "slot": "head",
+            "has_combat_stats": 1,
+            "is_tradeable": 1,
+            "icons": json.dumps(["https://example/icon.png"]),
+            "combat_stats": json.dumps({
+                "attack_bonuses": {"magic": "+6"},
+                "defence_bonuses": {"stab": 12},
+                "other_bonuses": {"strength": 0, "magic damage": "15%", "prayer": "+1"},
+            }),
+        })
+        self.assertEqual(row["attack_magic"], 6)
+        self.assertEqual(row["defence_stab"], 12)
+        self.assertAlmostEqual(row["str_magic"], 0.15)
+        self.assertEqual(row["prayer"], 1)
+        self.assertEqual(row["icon_url"], "https://example/icon.png")
+        self.assertEqual(len(item_schema.row_values(row)), len(item_schema.ITEM_COLUMN_NAMES))
+
+    def test_item_from_row_round_trips_nested_shape(self):
+        row = {c: 0 for c in item_schema.ITEM_COLUMN_NAMES}
+        row.update(slot="weapon", has_combat_stats=1, icon_url=None, str_magic=0.15, attack_slash=82)
+        item = item_schema.item_from_row(1, "Staff", row)
+        self.assertEqual(item["combat_stats"]["other_bonuses"]["magic damage"], "15%")
+        self.assertEqual(item["combat_stats"]["attack_bonuses"]["slash"], 82)
+        self.assertEqual(item_schema.flat_stats({"combat_stats": item["combat_stats"]}), item["stats"])
+        self.assertNotIn("stats", item_schema.item_from_row(1, "Staff", row, detail=False))
+
+    def test_slot_index_leads_with_slot(self):
+        self.assertIn("(slot, has_combat_stats, item_id,", item_schema.sqlite_slot_index_sql("catalog_items"))
+        self.assertIn("INCLUDE (name,", item_schema.tsql_slot_index_sql("items"))
+
+
+if __name__ == "__main__":
+    unittest.main()
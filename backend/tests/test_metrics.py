@@ -0,0 +1,173 @@
+import asyncio
+import glob
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.config import settings
+from app.main import create_app
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.request_metrics import MetricsMiddleware
+from app.services import bis_service
+from app.sqlite_database import SQLiteCatalogService
+from tests.test_sqlite_catalog import _build
+
+try:
+    from app import database as azure_database
+except ImportError:  # pyodbc needs the ODBC driver manager
+    azure_database = None
+
+PARAMS = {
+    "combat_style": "melee", "attack_type": "slash", "strength_level": 99, "attack_level": 99,
+    "melee_strength_bonus": 0, "melee_attack_bonus": 0, "attack_style_bonus_strength": 3,
+    "attack_style_bonus_attack": 0, "target_defence_level": 100, "target_defence_bonus": 50, "attack_speed": 2.4,
+}
+DEAD_PID = 2 ** 22 + 12345  # above the default pid_max, never running
+
+
+def _sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_render_text_format(self):
+        metrics.HTTP_REQUESTS.inc("GET", '/npc/{"id"}', "200")
+        metrics.CALC_LATENCY.observe(0.00003, "melee")
+        metrics.CALC_LATENCY.observe(1.0, "melee")
+        text = metrics.render(metrics.snapshot())
+        self.assertIn("# TYPE scapelab_http_requests_total counter", text)
+        self.assertEqual(
+            _sample(text, 'scapelab_http_requests_total{method="GET",route="/npc/{\\"id\\"}",status="200"}'), 1,
+        )
+        self.assertEqual(_sample(text, 'scapelab_calculator_duration_seconds_bucket{style="melee",le="2.5e-05"}'), 0)
+        self.assertEqual(_sample(text, 'scapelab_calculator_duration_seconds_bucket{style="melee",le="5e-05"}'), 1)
+        self.assertEqual(_sample(text, 'scapelab_calculator_duration_seconds_bucket{style="melee",le="+Inf"}'), 2)
+        self.assertEqual(_sample(text, 'scapelab_calculator_duration_seconds_count{style="melee"}'), 2)
+
+    def test_merge_across_processes(self):
+        temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp)
+        metrics.RATE_LIMITED.inc(amount=2)
+        metrics.DB_CONNECTIONS_IN_USE.set(1, "azure")
+        # An exited worker: its counters still count, its gauges do not.
+        dead = {
+            "pid": DEAD_PID,
+            "families": {
+                "scapelab_rate_limit_rejections_total": metrics.RATE_LIMITED.dump(),
+                "scapelab_db_connections_in_use": metrics.DB_CONNECTIONS_IN_USE.dump(),
+            },
+        }
+        with open(os.path.join(temp, f"{DEAD_PID}.dead.json"), "w") as f:
+            json.dump(dead, f)
+        with patch.object(settings, "METRICS_DIR", temp):
+            text = metrics.render()
+        self.assertEqual(_sample(text, "scapelab_rate_limit_rejections_total"), 4)
+        self.assertEqual(_sample(text, 'scapelab_db_connections_in_use{backend="azure"}'), 1)
+        self.assertEqual(len(os.listdir(temp)), 2)  # the scrape wrote this process's file
+
+    def test_recording_flushes_from_a_background_thread(self):
+        temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp)
+        with patch.multiple(settings, METRICS_DIR=temp, METRICS_FLUSH_SECONDS=0.1), \
+                patch.multiple(metrics, _flush_wanted=True, _flusher=None):
+            metrics.RATE_LIMITED.inc()
+            self.assertEqual(os.listdir(temp), [])  # recording itself never writes
+            self.assertEqual(metrics._flusher.name, "metrics-flush")
+            deadline = time.monotonic() + 5
+            while not glob.glob(os.path.join(temp, "*.json")) and time.monotonic() < deadline:
+                time.sleep(0.02)
+        (path,) = glob.glob(os.path.join(temp, "*.json"))
+        self.assertTrue(os.path.basename(path).startswith(f"{os.getpid()}."))
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_requests_by_route_template(self):
+        client = TestClient(create_app())
+        client.get("/items")
+        client.get("/v/0000/items")
+        client.get("/no/such/path")
+        text = client.get("/metrics").text
+        self.assertEqual(_sample(text, 'scapelab_http_requests_total{method="GET",route="/items",status="200"}'), 1)
+        self.assertIsNotNone(_sample(text, 'scapelab_http_request_duration_seconds_count{method="GET",route="/v/{version}/{dataset}"}'))
+        self.assertEqual(_sample(text, 'scapelab_http_requests_total{method="GET",route="<unmatched>",status="404"}'), 1)
+        self.assertIn('scapelab_cache_hits_total{cache="items.all"}', text)
+
+    def test_rate_limited_requests_keep_their_route(self):
+        app = FastAPI()
+
+        @app.get("/npc/{npc_id}")
+        def npc(npc_id: int):
+            return {}
+
+        app.add_middleware(RateLimitMiddleware, rate=1, per_seconds=60, burst=1)
+        app.add_middleware(MetricsMiddleware, router=app.router)
+        client = TestClient(app)
+        client.get("/npc/1")
+        self.assertEqual(client.get("/npc/2").status_code, 429)
+        self.assertEqual(metrics.HTTP_REQUESTS.value("GET", "/npc/{npc_id}", "429"), 1)
+        self.assertEqual(metrics.RATE_LIMITED.value(), 1)
+
+    def test_bis_counts_combinations(self):
+        items = [
+            {"id": 1, "name": "Whip", "slot": "weapon", "combat_stats": {"attack_bonuses": {"slash": 82}, "other_bonuses": {"strength": 82}}},
+            {"id": 2, "name": "Log", "slot": "weapon"},
+            {"id": 3, "name": "Torso", "slot": "body", "combat_stats": {"other_bonuses": {"strength": 4}}},
+        ]
+        with patch.object(bis_service.item_repository, "get_combat_items_async", _done(items)):
+            asyncio.run(bis_service.compute_bis_async(PARAMS))
+        self.assertEqual(metrics.BIS_LATENCY.count("melee"), 1)
+        self.assertEqual(metrics.BIS_COMBINATIONS.dump()["samples"][0][1][-2], 2)
+        self.assertEqual(metrics.CALC_LATENCY.count("melee"), 2)
+
+    def test_db_queries_timed_by_name(self):
+        temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp)
+        path = os.path.join(temp, "osrs.sqlite")
+        _build(path, "title")
+        svc = SQLiteCatalogService(path)
+        self.addCleanup(svc.close)
+        svc.get_item(4151)
+        asyncio.run(svc.get_item_async(4151))
+        self.assertEqual(metrics.DB_QUERY_LATENCY.count("sqlite", "get_item"), 2)
+
+
+@unittest.skipIf(azure_database is None, "pyodbc unavailable")
+class TestAzureConnectionSlots(unittest.IsolatedAsyncioTestCase):
+    async def test_capacity_and_cancelled_waiter(self):
+        slots = azure_database._ConnectionSlots(1)
+        self.assertEqual(metrics.DB_CONNECTIONS_CAPACITY.value("azure"), 1)
+        slots.acquire()
+        waiter = asyncio.create_task(slots.acquire_async())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        slots.release()  # the abandoned wait takes the slot, then hands it back
+        self.assertTrue(await asyncio.to_thread(slots._sem.acquire, timeout=5))
+
+
+def _done(value):
+    async def load(*args, **kwargs):
+        return value
+    return load
+
+
+if __name__ == "__main__":
+    unittest.main()
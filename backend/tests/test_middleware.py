@@ -0,0 +1,182 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.middleware.cache_headers import CacheHeadersMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.rate_limit_store import LocalStore, SharedMemoryStore, client_key
+
+
+def _app(**limits) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    def items():
+        return [1, 2, 3]
+
+    @app.get("/other")
+    def other():
+        return {}
+
+    @app.get("/busy")
+    def busy():
+        return JSONResponse({"detail": "busy"}, status_code=503, headers={"Retry-After": "1"})
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    app.add_middleware(RateLimitMiddleware, **limits)
+    app.add_middleware(CacheHeadersMiddleware, path_ttls={"/items": 60, "/stream": 5, "/other": 0, "/busy": 60})
+    return app
+
+
+class TestCacheHeadersMiddleware(unittest.TestCase):
+    def test_whitelisted_paths_only(self):
+        client = TestClient(_app(rate=100, burst=100))
+        self.assertEqual(client.get("/items").headers["cache-control"], "public, max-age=60")
+        self.assertNotIn("cache-control", client.get("/other").headers)
+
+    def test_streaming_body_passes_through(self):
+        r = TestClient(_app(rate=100, burst=100)).get("/stream")
+        self.assertEqual(r.text, "abc")
+        self.assertEqual(r.headers["cache-control"], "public, max-age=5")
+
+    def test_rate_limited_response_is_not_cacheable(self):
+        client = TestClient(_app(rate=1, per_seconds=60, burst=1))
+        self.assertEqual(client.get("/items").headers["cache-control"], "public, max-age=60")
+        r = client.get("/items")
+        self.assertEqual(r.status_code, 429)
+        self.assertEqual(r.headers["cache-control"], "no-store")
+
+    def test_unavailable_response_is_not_cacheable(self):
+        r = TestClient(_app(rate=100, burst=100)).get("/busy")
+        self.assertEqual(r.status_code, 503)
+        self.assertEqual(r.headers["cache-control"], "no-store")
+
+
+class TestRateLimitMiddleware(unittest.TestCase):
+    def test_429_after_burst(self):
+        client = TestClient(_app(rate=1, per_seconds=60, burst=2))
+        self.assertEqual(client.get("/items").status_code, 200)
+        self.assertEqual(client.get("/items").status_code, 200)
+        r = client.get("/items")
+        self.assertEqual(r.status_code, 429)
+        self.assertEqual(r.json(), {"detail": "Too many requests"})
+        self.assertGreaterEqual(int(r.headers["retry-after"]), 1)
+
+    def test_route_cost_spends_more_tokens(self):
+        client = TestClient(_app(rate=1, per_seconds=60, burst=10, costs={"/items": 6}))
+        self.assertEqual(client.get("/items").status_code, 200)
+        self.assertEqual(client.get("/items").status_code, 429)
+        self.assertEqual(client.get("/other").status_code, 200)
+
+    def test_forwarded_client_behind_proxy(self):
+        client = TestClient(_app(rate=1, per_seconds=60, burst=1, proxy_hops=1))
+        self.assertEqual(client.get("/items", headers={"X-Forwarded-For": "1.1.1.1:5000"}).status_code, 200)
+        self.assertEqual(client.get("/items", headers={"X-Forwarded-For": "1.1.1.1:6000"}).status_code, 429)
+        # A spoofed left-most entry doesn't change the proxy-appended client address.
+        self.assertEqual(client.get("/items", headers={"X-Forwarded-For": "9.9.9.9, 1.1.1.1"}).status_code, 429)
+        self.assertEqual(client.get("/items", headers={"X-Forwarded-For": "2.2.2.2"}).status_code, 200)
+
+
+class TestCorsOnRejections(unittest.TestCase):
+    ORIGIN = {"Origin": "https://app.example"}
+
+    def test_rate_limited_response_has_cors_headers(self):
+        from app.main import create_app
+
+        client = TestClient(create_app())
+        for _ in range(40):
+            r = client.get("/", headers=self.ORIGIN)
+        self.assertEqual(r.status_code, 429)
+        self.assertIn("access-control-allow-origin", r.headers)
+
+
+class TestCorsOnShed(unittest.IsolatedAsyncioTestCase):
+    async def test_shed_response_has_cors_headers(self):
+        from app.main import create_app
+        from app.middleware import admission
+        from app.services import bis_service
+
+        release = asyncio.Event()
+
+        async def held(params, request=None):
+            await release.wait()
+            return {"best_dps": 1}
+
+        with patch.object(settings, "ADMISSION_BIS_CONCURRENCY", 1), patch.object(settings, "ADMISSION_BIS_QUEUE", 0):
+            app = create_app()
+        with patch.object(bis_service, "compute_bis_async", held):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                first = asyncio.create_task(client.post("/bis", json={}))
+                while admission.stats()["bis"]["active"] == 0:
+                    await asyncio.sleep(0.01)
+                r = await client.post("/bis", json={}, headers=TestCorsOnRejections.ORIGIN)
+                release.set()
+                await first
+        self.assertEqual(r.status_code, 503)
+        self.assertIn("access-control-allow-origin", r.headers)
+
+def _take_many(path, n):
+    store = SharedMemoryStore(path, slots=64)
+    try:
+        return sum(store.take("shared-client", 1000.0, 0.001, 50)[0] for _ in range(n))
+    finally:
+        store.close()
+
+
+class TestRateLimitStores(unittest.TestCase):
+    def test_client_key_parsing(self):
+        hdr = [(b"x-forwarded-for", b"10.0.0.1, 203.0.113.5:51234")]
+        self.assertEqual(client_key(hdr, "127.0.0.1", 1), "203.0.113.5")
+        self.assertEqual(client_key(hdr, "127.0.0.1", 2), "10.0.0.1")
+        self.assertEqual(client_key(hdr, "127.0.0.1", 0), "127.0.0.1")
+        self.assertEqual(client_key([(b"x-forwarded-for", b"[2001:db8::1]:443")], None, 1), "2001:db8::1")
+        self.assertEqual(client_key([], None, 1), "unknown")
+
+    def test_local_store_is_bounded_and_drops_idle(self):
+        store = LocalStore(max_keys=32, shards=4)
+        for i in range(1000):
+            store.take(f"10.0.{i // 256}.{i % 256}", 0.0, 1.0, 5)
+        self.assertLessEqual(len(store), 32)
+        self.assertGreater(store.evictions, 0)
+        # Buckets full again after burst/rate seconds are dropped when their shard is touched.
+        single = LocalStore(max_keys=100, shards=1)
+        for i in range(10):
+            single.take(str(i), 0.0, 1.0, 5)
+        single.take("late", 10.0, 1.0, 5)
+        self.assertEqual(len(single), 1)
+
+    def test_shared_store_enforces_one_limit_across_processes(self):
+        path = os.path.join(tempfile.mkdtemp(), "rl")
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            allowed = sum(pool.map(_take_many, [path] * 4, [40] * 4))
+        self.assertEqual(allowed, 50)
+        os.unlink(path)
+
+    def test_shared_store_retry_after(self):
+        path = os.path.join(tempfile.mkdtemp(), "rl")
+        store = SharedMemoryStore(path, slots=32)
+        try:
+            self.assertEqual(store.take("a", 0.0, 2.0, 1), (True, 0.0))
+            allowed, retry = store.take("a", 0.0, 2.0, 1)
+            self.assertFalse(allowed)
+            self.assertAlmostEqual(retry, 0.5)
+            self.assertTrue(store.take("a", 0.5, 2.0, 1)[0])
+        finally:
+            store.close()
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
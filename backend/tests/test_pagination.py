@@ -0,0 +1,218 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app.binary_database import BinaryCatalogService
+from app.catalog import snapshot as catalog_snapshot
+from app.catalog.pagination import cursor_key, decode_cursor, encode_cursor
+from app.catalog.snapshot import CatalogSnapshot
+from app.sqlite_database import SQLiteCatalogService
+from tools.scraper_v2.export_binary import write_binary_snapshot
+from tools.scraper_v2.normalize_items import write_catalog_items, write_page_keys
+
+try:
+    from app import database as azure_database
+except ImportError:  # pyodbc needs the ODBC driver manager
+    azure_database = None
+
+ITEMS = [
+    {"id": i, "name": name, "has_combat_stats": i % 3 != 0}
+    for i, name in enumerate(["Zamorak godsword", "Abyssal whip", "Bandos chestplate", "abyssal whip",
+                              "Dragon claws", "Ahrim's hood", "Bronze dagger", "Dragon claws"], start=1)
+]
+BOSSES = [{"id": i, "name": f"Boss {i:02d}"} for i in range(1, 8)]
+
+
+def _walk(fetch, limit):
+    seen, cursor = [], None
+    while True:
+        page = fetch(limit, cursor)
+        seen.extend(r["id"] for r in page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+class TestCursor(unittest.TestCase):
+    def test_roundtrip_and_rejects_garbage(self):
+        token = encode_cursor(("dragon claws", 5))
+        self.assertEqual(decode_cursor(token), ("dragon claws", 5))
+        self.assertIsNone(decode_cursor(None))
+        for bad in ("not-base64!!", encode_cursor(("x", 1))[:-2] + "zz", "WzEsMl0"):
+            with self.assertRaises(ValueError):
+                decode_cursor(bad)
+
+
+class TestSnapshotKeyset(unittest.TestCase):
+    def tearDown(self):
+        catalog_snapshot.clear()
+
+    def test_pages_cover_everything_once_in_order(self):
+        snap = CatalogSnapshot.build(ITEMS, BOSSES)
+        expected = [s["id"] for s in snap.item_summaries]
+        for limit in (1, 2, 3, 50):
+            def fetch(n, cursor):
+                rows, key = snap.page_items(n, decode_cursor(cursor), combat_only=False)
+                return {"results": rows, "next_cursor": encode_cursor(key)}
+            self.assertEqual(_walk(fetch, limit), expected)
+
+    def test_routes_page_from_snapshot(self):
+        from app.main import create_app
+
+        catalog_snapshot.install(CatalogSnapshot.build(ITEMS, BOSSES))
+        client = TestClient(create_app())
+        first = client.get("/items", params={"limit": 2}).json()
+        self.assertEqual(len(first["results"]), 2)
+        second = client.get("/items", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+        self.assertNotEqual(first["results"][0]["id"], second["results"][0]["id"])
+
+        npcs = client.get("/npcs", params={"limit": 10}).json()
+        self.assertEqual(len(npcs["results"]), 7)
+        self.assertIsNone(npcs["next_cursor"])
+        self.assertEqual(client.get("/npcs", params={"cursor": "%%%"}).status_code, 400)
+        self.assertEqual(client.get("/items", params={"limit": 0}).status_code, 422)
+
+
+class TestSQLiteKeyset(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        path = os.path.join(self.temp_dir, "osrs.sqlite")
+        cn = sqlite3.connect(path)
+        cn.execute("CREATE TABLE items (name TEXT NOT NULL, doc TEXT NOT NULL)")
+        cn.execute("CREATE TABLE npcs (name TEXT NOT NULL, doc TEXT NOT NULL)")
+        for it in ITEMS:
+            doc = {"title": it["name"], "item_id": it["id"], "combat_bonuses": {"slot": "weapon"}}
+            cn.execute("INSERT INTO items (name, doc) VALUES (?, ?)", (it["name"], json.dumps(doc)))
+        cn.commit()
+        write_page_keys(cn)
+        cn.close()
+        self.service = SQLiteCatalogService(path)
+
+    def tearDown(self):
+        self.service.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_duplicate_names_are_not_skipped(self):
+        def fetch(n, cursor):
+            rows, key = self.service.list_items_page(n, decode_cursor(cursor))
+            return {"results": rows, "next_cursor": encode_cursor(key)}
+        self.assertEqual(sorted(_walk(fetch, 1)), [it["id"] for it in ITEMS])
+
+    def test_file_without_page_keys_is_refused(self):
+        path = os.path.join(self.temp_dir, "old.sqlite")
+        cn = sqlite3.connect(path)
+        cn.execute("CREATE TABLE items (name TEXT NOT NULL, doc TEXT NOT NULL)")
+        cn.commit()
+        cn.close()
+        service = SQLiteCatalogService(path)
+        try:
+            with self.assertRaisesRegex(RuntimeError, "normalize_items"):
+                service.list_items_page(5)
+        finally:
+            service.close()
+
+
+# Duplicate names, and names that differ only in case, spacing or underscores.
+MIXED_ITEMS = [(7, "Dragon claws"), (3, "dragon claws"), (5, "Abyssal whip"), (1, "abyssal_whip"), (9, "ABYSSAL WHIP"),
+               (2, "Dragon  claws"), (4, "Bronze dagger"), (8, "Zamorak godsword"), (6, "Dragon claws")]
+MIXED_BOSSES = [(30, "Vorkath"), (10, "vorkath"), (20, "Zulrah"), (40, "VORKATH")]
+
+
+def _in_key_order(rows):
+    return [i for _, i in sorted(cursor_key(name, i) for i, name in rows)]
+
+
+class TestCursorAcrossBackends(unittest.TestCase):
+    """Every backend pages in ``cursor_key`` order, so one cursor resumes anywhere."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        legacy, typed = (os.path.join(cls.temp_dir, f) for f in ("legacy.sqlite", "typed.sqlite"))
+        for path in (legacy, typed):
+            cn = sqlite3.connect(path)
+            cn.execute("CREATE TABLE items (title TEXT PRIMARY KEY, doc TEXT NOT NULL)")
+            cn.execute("CREATE TABLE npcs (title TEXT PRIMARY KEY, doc TEXT NOT NULL)")
+            for ident, name in MIXED_ITEMS:
+                bonuses = None if ident == 4 else {"slot": "weapon", "other": {"strength": ident}}
+                doc = {"title": name, "item_id": ident, "combat_bonuses": bonuses}
+                cn.execute("INSERT INTO items VALUES (?, ?)", (str(ident), json.dumps(doc)))
+            for ident, name in MIXED_BOSSES:
+                doc = {"title": name, "name": name, "attributes": {"NPC ID": str(ident)}}
+                cn.execute("INSERT INTO npcs VALUES (?, ?)", (str(ident), json.dumps(doc)))
+            if path == typed:
+                write_catalog_items(cn)
+            cn.commit()
+            write_page_keys(cn)
+            cn.close()
+        binary = os.path.join(cls.temp_dir, "osrs.catalog.bin")
+        write_binary_snapshot(typed, binary)
+        cls.services = {
+            "legacy sqlite": SQLiteCatalogService(legacy),
+            "typed sqlite": SQLiteCatalogService(typed),
+            "binary": BinaryCatalogService(binary),
+        }
+        catalog = cls.services["typed sqlite"].load_catalog()
+        cls.snapshot = CatalogSnapshot.build(catalog["items"], catalog["bosses"])
+
+    @classmethod
+    def tearDownClass(cls):
+        for service in cls.services.values():
+            service.close()
+        shutil.rmtree(cls.temp_dir)
+
+    def _pagers(self, combat_only):
+        pagers = {name: (lambda n, after, s=s: s.list_items_page(n, after, combat_only))
+                  for name, s in self.services.items()}
+        pagers["snapshot"] = lambda n, after: self.snapshot.page_items(n, after, combat_only)
+        return pagers
+
+    @staticmethod
+    def _walk(page, limit):
+        def fetch(n, cursor):
+            rows, key = page(n, decode_cursor(cursor))
+            return {"results": rows, "next_cursor": encode_cursor(key)}
+        return _walk(fetch, limit)
+
+    def test_same_order_on_every_backend(self):
+        for combat_only in (False, True):
+            expected = [i for i in _in_key_order(MIXED_ITEMS) if not (combat_only and i == 4)]
+            for name, page in self._pagers(combat_only).items():
+                for limit in (1, 2, 4):
+                    with self.subTest(backend=name, limit=limit, combat_only=combat_only):
+                        self.assertEqual(self._walk(page, limit), expected)
+
+        pagers = {name: s.list_bosses_page for name, s in self.services.items()}
+        pagers["snapshot"] = self.snapshot.page_bosses
+        for name, page in pagers.items():
+            with self.subTest(backend=name):
+                self.assertEqual(self._walk(page, 1), _in_key_order(MIXED_BOSSES))
+
+    def test_cursor_resumes_on_another_backend(self):
+        pagers = self._pagers(False)
+        for first in pagers:
+            rows, key = pagers[first](3, None)
+            for second in pagers:
+                with self.subTest(first=first, second=second):
+                    rest, _ = pagers[second](50, key)
+                    self.assertEqual([r["id"] for r in rows + rest], _in_key_order(MIXED_ITEMS))
+
+    @unittest.skipIf(azure_database is None, "pyodbc unavailable")
+    def test_azure_seeks_the_stored_key(self):
+        query, params = azure_database._items_page_query(4, ("dragon claws", 3), True)
+        self.assertIn("name_key >= ? AND (name_key > ? OR id > ?)", query)
+        self.assertTrue(query.endswith("ORDER BY name_key, id"))
+        self.assertEqual(params, [5, "dragon claws", "dragon claws", 3])
+        rows = [(i, name, 0, 0, 1, 0, "weapon", None, cursor_key(name, i)[0])
+                for i in _in_key_order(MIXED_ITEMS)[:5] for name in [dict(MIXED_ITEMS)[i]]]
+        page, key = azure_database._keyset_page(rows, 4, azure_database._item_summary_row)
+        self.assertEqual([r["id"] for r in page], _in_key_order(MIXED_ITEMS)[:4])
+        self.assertEqual(key, (rows[3][-1], rows[3][0]))
+
+if __name__ == "__main__":
+    unittest.main()
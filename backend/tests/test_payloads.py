@@ -0,0 +1,67 @@
+import gzip
+import json
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.catalog import payloads
+from app.catalog import snapshot as catalog_snapshot
+from app.catalog.snapshot import CatalogSnapshot
+from app.main import create_app
+
+ITEMS = [{"id": i, "name": f"Item {i}", "has_combat_stats": True, "slot": "weapon"} for i in range(200)]
+
+
+class TestNegotiation(unittest.TestCase):
+    def test_prefers_brotli_then_gzip(self):
+        both = ("identity", "gzip", "br")
+        self.assertEqual(payloads.negotiate("gzip, deflate, br", both), "br")
+        self.assertEqual(payloads.negotiate("gzip, deflate, br", ("identity", "gzip")), "gzip")
+        self.assertEqual(payloads.negotiate("br;q=0.5, gzip", both), "gzip")
+        self.assertEqual(payloads.negotiate("gzip;q=0", both), "identity")
+        self.assertEqual(payloads.negotiate("*", both), "br")
+        self.assertEqual(payloads.negotiate(None, both), "identity")
+
+    def test_render_variants(self):
+        rendered = payloads.render("v1", ITEMS)
+        self.assertEqual(json.loads(rendered.bodies["identity"]), ITEMS)
+        self.assertEqual(gzip.decompress(rendered.bodies["gzip"]), rendered.bodies["identity"])
+        self.assertLess(rendered.size("gzip"), rendered.size())
+        self.assertEqual(set(payloads.render("v1", {"a": 1}).bodies), {"identity"})
+
+
+class TestPreEncodedRoutes(unittest.TestCase):
+    def setUp(self):
+        payloads.clear()
+        catalog_snapshot.install(CatalogSnapshot.build(ITEMS, []))
+        self.client = TestClient(create_app())
+
+    def tearDown(self):
+        payloads.clear()
+
+    def test_gzip_variant_rendered_once(self):
+        with patch.object(payloads, "render", wraps=payloads.render) as render:
+            for _ in range(3):
+                r = self.client.get("/special-attacks", headers={"Accept-Encoding": "gzip"})
+                self.assertEqual(r.status_code, 200)
+                self.assertEqual(r.headers["content-encoding"], "gzip")
+                self.assertEqual(r.headers["vary"], "Accept-Encoding")
+                self.assertTrue(r.headers["etag"].endswith('-gz"'))
+                self.assertIsInstance(r.json(), dict)
+            self.assertEqual(render.call_count, 1)
+
+    def test_identity_and_conditional(self):
+        plain = self.client.get("/effects", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("content-encoding", plain.headers)
+        gz = self.client.get("/effects", headers={"Accept-Encoding": "gzip"})
+        self.assertNotEqual(plain.headers["etag"], gz.headers["etag"])
+        payloads.clear()
+        with patch.object(payloads, "render") as render:
+            r = self.client.get("/effects", headers={"If-None-Match": gz.headers["etag"]})
+        self.assertEqual(r.status_code, 304)
+        render.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import gc
+import os
+import unittest
+from unittest.mock import patch
+
+from app.catalog import payloads, preload
+from app.catalog import snapshot as catalog_snapshot
+from app.memory import process_memory
+from app.repositories import boss_repository, item_repository
+
+
+class FakeCatalog:
+    def __init__(self):
+        self.closed = 0
+
+    def load_catalog(self):
+        return {
+            "items": [{"id": 4151, "name": "Abyssal whip", "has_combat_stats": True}],
+            "bosses": [{"id": 8059, "name": "Vorkath", "forms": []}],
+        }
+
+    def close(self):
+        self.closed += 1
+
+
+class TestPreload(unittest.TestCase):
+    def setUp(self):
+        self.svc = FakeCatalog()
+        self.orig = (item_repository.db_service, boss_repository.db_service)
+        item_repository.db_service = boss_repository.db_service = self.svc
+
+    def tearDown(self):
+        gc.unfreeze()
+        preload._preloaded = None
+        item_repository.db_service, boss_repository.db_service = self.orig
+        catalog_snapshot.clear()
+        payloads.clear()
+        item_repository.invalidate_cache()
+        boss_repository.invalidate_cache()
+
+    def test_preload_publishes_and_freezes(self):
+        version = preload.preload_catalog()
+        self.assertEqual(preload.preloaded_version(), version)
+        self.assertEqual(catalog_snapshot.current().version, version)
+        self.assertEqual([i["id"] for i in item_repository._all_items_cache["all"]], [4151])
+        self.assertEqual(self.svc.closed, 1)  # one shared service, closed once before forking
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs fork")
+    def test_forked_worker_inherits_snapshot(self):
+        version = preload.preload_catalog()
+        pid = os.fork()
+        if pid == 0:  # child: must not reload, just see the parent's snapshot
+            ok = preload.preloaded_version() == version and catalog_snapshot.current().version == version
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+    def test_no_service_skips(self):
+        item_repository.db_service = boss_repository.db_service = None
+        self.assertIsNone(preload.preload_catalog())
+        self.assertIsNone(preload.preloaded_version())
+
+
+class TestProcessMemory(unittest.TestCase):
+    def test_reports_current_process(self):
+        mem = process_memory()
+        self.assertEqual(mem["pid"], os.getpid())
+        self.assertTrue(any(k in mem for k in ("rss_bytes", "max_rss_bytes")))
+
+    @unittest.skipUnless(os.path.exists("/proc/self/smaps_rollup"), "Linux only")
+    def test_smaps_breakdown(self):
+        mem = process_memory()
+        self.assertLessEqual(mem["pss_bytes"], mem["rss_bytes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import profiling
+from app.config import settings
+from app.main import create_app
+
+ADMIN = {"X-Admin-Token": "secret"}
+
+
+def calculate_dps(stop):
+    # Named like the calculator so the continuous profiler keeps its stacks.
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def unrelated_work(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def _busy(target):
+    stop = threading.Event()
+    thread = threading.Thread(target=target, args=(stop,))
+    thread.start()
+    return stop, thread
+
+
+class ProfilingCase(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        patcher = patch.multiple(settings, PROFILE_DIR=self.temp, ADMIN_TOKEN="secret")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.temp)
+
+
+class TestSampler(ProfilingCase):
+    def test_collapsed_stacks_of_busy_threads(self):
+        stop, thread = _busy(calculate_dps)
+        idle = threading.Event()
+        waiter = threading.Thread(target=idle.wait)
+        waiter.start()
+        sampler = profiling.Sampler(0.001)
+        try:
+            for _ in range(20):
+                sampler.sample()
+                time.sleep(0.001)
+        finally:
+            stop.set()
+            idle.set()
+            thread.join()
+            waiter.join()
+        stacks = sampler.snapshot()
+        self.assertTrue(any(s.endswith("tests.test_profiling:calculate_dps") for s in stacks))
+        self.assertFalse(any("Event.wait" in s for s in stacks))  # idle threads are skipped
+        line = profiling.render(stacks).splitlines()[0]
+        self.assertRegex(line, r"^\S+(;\S+)* \d+$")
+
+    def test_max_stacks(self):
+        sampler = profiling.Sampler(0.001, max_stacks=0)
+        stop, thread = _busy(unrelated_work)
+        try:
+            sampler.sample()
+        finally:
+            stop.set()
+            thread.join()
+        self.assertEqual(list(sampler.snapshot()), [profiling.TRUNCATED])
+
+    def test_focus_covers_services_and_calculators(self):
+        idle = ("threading", "Thread.run", "run")
+        self.assertTrue(profiling.in_focus([idle, ("app.calculators.melee", "max_hit", "max_hit")]))
+        self.assertTrue(profiling.in_focus([idle, ("app.services.bis_service", "_score", "_score")]))
+        self.assertFalse(profiling.in_focus([idle, ("app.routes.items", "list_items", "list_items")]))
+
+    def test_continuous_keeps_focus_stacks(self):
+        with patch.multiple(settings, PROFILER_DUTY_CYCLE=0.5, PROFILER_WINDOW_SECONDS=0.05, PROFILER_SAMPLE_HZ=1000):
+            stop_calc, calc = _busy(calculate_dps)
+            stop_other, other = _busy(unrelated_work)
+            self.assertTrue(profiling.start_background())
+            try:
+                time.sleep(0.2)
+            finally:
+                profiling.stop_background()
+                stop_calc.set()
+                stop_other.set()
+                calc.join()
+                other.join()
+        stacks = profiling.background_stacks()
+        self.assertTrue(stacks)
+        self.assertTrue(all("calculate_dps" in s for s in stacks))
+
+        client = TestClient(create_app())
+        text = client.get("/admin/profile/stacks", headers=ADMIN).text
+        self.assertIn("tests.test_profiling:calculate_dps", text)
+        self.assertEqual(client.get("/admin/profile/stacks").status_code, 401)
+
+
+class TestRequestProfiling(ProfilingCase):
+    def setUp(self):
+        super().setUp()
+        self.client = TestClient(create_app())
+
+    def test_store_and_fetch(self):
+        r = self.client.get("/items", headers={**ADMIN, "X-Profile": "1"})
+        self.assertEqual(r.status_code, 200)
+        profile_id = r.headers["x-profile-id"]
+        (meta,) = self.client.get("/admin/profiles", headers=ADMIN).json()
+        self.assertEqual((meta["id"], meta["path"], meta["status"]), (profile_id, "/items", 200))
+        profile = self.client.get(f"/admin/profiles/{profile_id}", headers=ADMIN)
+        self.assertEqual(profile.status_code, 200)
+        self.assertTrue(profile.headers["content-type"].startswith("text/plain"))
+        self.assertEqual(self.client.get("/admin/profiles/nope", headers=ADMIN).status_code, 404)
+
+    def test_return_mode(self):
+        r = self.client.get("/items?profile=return", headers=ADMIN)
+        self.assertEqual(r.headers["x-profiled-status"], "200")
+        self.assertTrue(r.headers["content-type"].startswith("text/plain"))
+
+    def test_ignored_without_admin_token(self):
+        r = self.client.get("/items", headers={"X-Profile": "1", "X-Admin-Token": "wrong"})
+        self.assertEqual(r.status_code, 200)
+        self.assertNotIn("x-profile-id", r.headers)
+        self.assertEqual(profiling.list_request_profiles(), [])
+
+    def test_keeps_newest(self):
+        with patch.object(settings, "PROFILE_KEEP", 2):
+            ids = [self.client.get("/items", headers={**ADMIN, "X-Profile": "1"}).headers["x-profile-id"] for _ in range(3)]
+        kept = [m["id"] for m in profiling.list_request_profiles()]
+        self.assertEqual(len(kept), 2)
+        self.assertNotIn(ids[0], kept)
+
+
+if __name__ == "__main__":
+    unittest.main()
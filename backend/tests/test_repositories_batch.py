@@ -0,0 +1,81 @@
+import asyncio
+import sqlite3
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.repositories import item_repository, boss_repository
+
+ITEMS = {i: {"id": i, "name": f"Item {i}"} for i in (1, 2, 3, 4)}
+
+
+class TestBatchLookups(unittest.TestCase):
+    def setUp(self):
+        self.service = MagicMock()
+        self.service.get_items.side_effect = lambda ids: [ITEMS[i] for i in ids if i in ITEMS]
+        self.service.get_bosses.return_value = [{"id": 50, "name": "Zulrah", "forms": []}]
+        item_repository._item_cache.clear()
+        boss_repository._boss_cache.clear()
+        self.orig = (item_repository.db_service, boss_repository.db_service)
+        item_repository.db_service = self.service
+        boss_repository.db_service = self.service
+
+    def tearDown(self):
+        item_repository.db_service, boss_repository.db_service = self.orig
+        item_repository._item_cache.clear()
+        boss_repository._boss_cache.clear()
+
+    def test_hits_are_local_and_misses_fetched_once(self):
+        item_repository._item_cache[3] = ITEMS[3]
+        result = item_repository.get_items([4, 3, 99, 1, 4])
+        self.assertEqual([i["id"] for i in result], [4, 3, 1])
+        self.service.get_items.assert_called_once_with([4, 99, 1])
+
+        # Second call is fully cached, including the known miss.
+        self.assertEqual([i["id"] for i in item_repository.get_items([1, 99, 4])], [1, 4])
+        self.assertEqual(self.service.get_items.call_count, 1)
+
+    def test_async_batch_uses_async_service(self):
+        self.service.get_bosses_async = AsyncMock(return_value=[{"id": 50, "name": "Zulrah"}])
+        result = asyncio.run(boss_repository.get_bosses_async([50, 51]))
+        self.assertEqual(result, [{"id": 50, "name": "Zulrah"}])
+        self.service.get_bosses_async.assert_awaited_once_with([50, 51])
+
+    def test_falls_back_to_single_lookups(self):
+        service = MagicMock(spec=["get_item"])
+        service.get_item.side_effect = ITEMS.get
+        item_repository.db_service = service
+        self.assertEqual([i["id"] for i in item_repository.get_items([2, 1])], [2, 1])
+        self.assertEqual(service.get_item.call_count, 2)
+
+    def test_failed_load_is_not_negative_cached(self):
+        self.service.get_bosses.side_effect = [RuntimeError("db down"), [{"id": 50, "name": "Zulrah"}]]
+        with self.assertRaises(RuntimeError):
+            boss_repository.get_bosses([50, 51])
+        self.assertNotIn(50, boss_repository._boss_cache)
+        self.assertEqual(boss_repository.get_bosses([50, 51]), [{"id": 50, "name": "Zulrah"}])
+        self.assertEqual(self.service.get_bosses.call_count, 2)
+
+    def test_services_raise_batch_errors(self):
+        from app.sqlite_database import SQLiteCatalogService
+
+        service = SQLiteCatalogService(":memory:")
+        with patch.object(service, "_fetch_by_ids", side_effect=sqlite3.OperationalError("locked")):
+            with self.assertLogs("app.sqlite_database", "ERROR"):
+                with self.assertRaises(sqlite3.OperationalError):
+                    service.get_bosses([50])
+
+    def test_routes(self):
+        from app.main import create_app
+
+        client = TestClient(create_app())
+        r = client.post("/items/batch", json={"ids": [2, 1]})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([i["id"] for i in r.json()], [2, 1])
+        self.assertEqual(client.post("/npcs/batch", json={"ids": [50]}).json()[0]["name"], "Zulrah")
+        self.assertEqual(client.post("/items/batch", json={"ids": list(range(501))}).status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from app.catalog import snapshot as catalog_snapshot
+from app.repositories import boss_repository, item_repository
+from app.services import bis_service
+from app.sqlite_database import SQLiteCatalogService
+from benchmarks import suite
+from benchmarks.fixtures import build_catalog, dps_inputs
+
+
+class TestBisOnCatalogData(unittest.TestCase):
+    """BIS over the real ``data/db`` catalog, read through the repositories."""
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        path = os.path.join(self.temp, "osrs.sqlite")
+        build_catalog(path)
+        self.service = SQLiteCatalogService(path)
+        self.orig = (item_repository.db_service, boss_repository.db_service)
+        item_repository.db_service = boss_repository.db_service = self.service
+        item_repository.invalidate_cache()
+        catalog_snapshot.clear()
+
+    def tearDown(self):
+        catalog_snapshot.clear()
+        item_repository.db_service, boss_repository.db_service = self.orig
+        item_repository.invalidate_cache()
+        self.service.close()
+        shutil.rmtree(self.temp)
+
+    def _check(self):
+        for style in ("melee", "ranged", "magic"):
+            params = dps_inputs(style, 1)[0]
+            result = asyncio.run(bis_service.compute_bis_async(params))
+            self.assertGreater(result["best_dps"], 0, style)
+            self.assertTrue(result["loadout"], style)
+            self.assertEqual(bis_service.suggest_bis(params).keys(), result["loadout"].keys())
+
+    def test_from_service(self):
+        self._check()
+
+    def test_from_snapshot(self):
+        snap = catalog_snapshot.build_snapshot(self.service, self.service)
+        self.assertTrue(snap.complete)
+        catalog_snapshot.install(snap)
+        self._check()
+
+
+class TestBisBenchmarks(unittest.TestCase):
+    def setUp(self):
+        self.orig = (item_repository.db_service, boss_repository.db_service)
+
+    def tearDown(self):
+        item_repository.db_service, boss_repository.db_service = self.orig
+        item_repository.invalidate_cache()
+
+    def test_cases_search_the_fixture_catalog(self):
+        names = ["bis.prefilter.melee", "bis.score.melee", "bis.search.melee", "bis.suggest.melee"]
+        results = suite.run(names, repeat=1)["results"]
+        for name, result in results.items():
+            self.assertGreater(result["items"], 100, name)
+        for phase in ("bis.prefilter.melee", "bis.score.melee"):
+            self.assertGreater(results[phase]["candidates"], 0, phase)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from app.repositories import item_repository
+from app.repositories.cache import RepositoryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRepositoryCache(unittest.TestCase):
+    def test_lru_eviction_and_counters(self):
+        cache = RepositoryCache("t", maxsize=2, ttl=60, negative_ttl=5)
+        cache[1], cache[2] = "a", "b"
+        self.assertEqual(cache.lookup(1), (True, "a"))  # 1 is now most recent
+        cache[3] = "c"
+        self.assertNotIn(2, cache)
+        self.assertEqual(cache.lookup(2), (False, None))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 1, 1))
+
+    def test_negative_entries_expire_first(self):
+        clock = FakeClock()
+        cache = RepositoryCache("t", maxsize=10, ttl=60, negative_ttl=5, timer=clock)
+        cache["known"], cache["missing"] = {"id": 1}, None
+        self.assertEqual(cache.lookup("missing"), (True, None))
+        clock.now = 10
+        self.assertEqual(cache.lookup("missing"), (False, None))
+        self.assertEqual(cache.lookup("known"), (True, {"id": 1}))
+        clock.now = 61
+        self.assertNotIn("known", cache)
+
+    def test_loader_errors_are_not_cached(self):
+        cache = RepositoryCache("t", maxsize=10, ttl=60, negative_ttl=5)
+        with self.assertRaises(RuntimeError):
+            cache.get_or_load(1, MagicMock(side_effect=RuntimeError("db down")))
+        self.assertEqual(cache.get_or_load(1, lambda: "ok"), "ok")
+
+    def test_invalidate_during_load_discards_result(self):
+        cache = RepositoryCache("t", maxsize=10, ttl=60, negative_ttl=5)
+
+        def load():
+            cache.invalidate(1)
+            return "stale"
+
+        self.assertEqual(cache.get_or_load(1, load), "stale")
+        self.assertNotIn(1, cache)
+
+    def test_threads_share_one_load(self):
+        cache = RepositoryCache("t", maxsize=10, ttl=60, negative_ttl=5)
+        calls = []
+        gate = threading.Event()
+
+        def load():
+            calls.append(1)
+            gate.wait(1)
+            return "v"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", load))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        gate.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, ["v"] * 8)
+        self.assertEqual(len(calls), 1)
+
+    def test_tasks_share_one_load(self):
+        cache = RepositoryCache("t", maxsize=10, ttl=60, negative_ttl=5)
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "v"
+
+        async def run():
+            return await asyncio.gather(*(cache.get_or_load_async("k", load) for _ in range(50)))
+
+        self.assertEqual(asyncio.run(run()), ["v"] * 50)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()["coalesced"], 49)
+
+    def test_cancelled_leader_does_not_fail_waiters(self):
+        cache = RepositoryCache("t", maxsize=10, ttl=60, negative_ttl=5)
+        release = asyncio.Event()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await release.wait()
+            return "v"
+
+        async def run():
+            leader = asyncio.create_task(cache.get_or_load_async("k", load))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(cache.get_or_load_async("k", load))
+            await asyncio.sleep(0)
+            leader.cancel()
+            await asyncio.sleep(0)
+            release.set()
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return await waiter
+
+        self.assertEqual(asyncio.run(run()), "v")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get("k"), "v")
+
+
+class TestRepositoryInvalidation(unittest.TestCase):
+    def setUp(self):
+        self.service = MagicMock(spec=["get_item"])
+        self.service.get_item.side_effect = [None, {"id": 7, "name": "New item"}]
+        item_repository.invalidate_cache()
+        self.orig = item_repository.db_service
+        item_repository.db_service = self.service
+
+    def tearDown(self):
+        item_repository.db_service = self.orig
+        item_repository.invalidate_cache()
+
+    def test_invalidate_clears_known_miss(self):
+        self.assertIsNone(item_repository.get_item(7))
+        self.assertIsNone(item_repository.get_item(7))
+        self.assertEqual(self.service.get_item.call_count, 1)
+        item_repository.invalidate_cache(7)
+        self.assertEqual(item_repository.get_item(7)["name"], "New item")
+
+
+if __name__ == "__main__":
+    unittest.main()
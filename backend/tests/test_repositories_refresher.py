@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+
+from app.catalog import snapshot as catalog_snapshot
+from app.catalog.refresher import CatalogRefresher
+from app.repositories import boss_repository, item_repository
+
+
+class FakeCatalog:
+    """Single service exposing the bulk loader and a version signal."""
+
+    def __init__(self):
+        self.version = "v1"
+        self.items = [{"id": 1, "name": "Abyssal whip", "has_combat_stats": True}]
+        self.fail = False
+        self.gate = None
+        self.loads = 0
+
+    def catalog_version(self):
+        return self.version
+
+    async def load_catalog_async(self):
+        self.loads += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail:
+            raise RuntimeError("db down")
+        return {"items": list(self.items), "bosses": []}
+
+    def load_catalog(self):  # pragma: no cover - presence marks bulk support
+        raise NotImplementedError
+
+
+class TestCatalogRefresher(unittest.TestCase):
+    def setUp(self):
+        self.svc = FakeCatalog()
+        self.orig = (item_repository.db_service, boss_repository.db_service)
+        item_repository.db_service = boss_repository.db_service = self.svc
+
+    def tearDown(self):
+        item_repository.db_service, boss_repository.db_service = self.orig
+        catalog_snapshot.clear()
+        item_repository.invalidate_cache()
+        boss_repository.invalidate_cache()
+
+    def test_refresh_installs_and_reports(self):
+        refresher = CatalogRefresher(interval=60)
+        status = asyncio.run(refresher.refresh())
+        self.assertEqual(status["last_result"], "updated")
+        self.assertIsNotNone(status["last_success_at"])
+        self.assertEqual([i["id"] for i in item_repository.get_all_items()], [1])
+        self.assertEqual(asyncio.run(refresher.refresh())["last_result"], "unchanged")
+
+    def test_failure_keeps_previous_snapshot(self):
+        refresher = CatalogRefresher(interval=60, base_backoff=2, max_backoff=10)
+        asyncio.run(refresher.refresh())
+        before = catalog_snapshot.current()
+        self.svc.fail = True
+        status = asyncio.run(refresher.refresh())
+        self.assertEqual((status["last_result"], status["consecutive_failures"]), ("error", 1))
+        self.assertEqual(status["last_error"], "db down")
+        self.assertIs(catalog_snapshot.current(), before)
+        self.assertTrue(1 <= refresher.backoff() <= 2)
+        refresher.failures = 10
+        self.assertTrue(5 <= refresher.backoff() <= 10)
+
+    def test_readers_see_old_snapshot_during_reload(self):
+        refresher = CatalogRefresher(interval=60)
+
+        async def run():
+            await refresher.refresh()
+            old = catalog_snapshot.current()
+            self.svc.items.append({"id": 2, "name": "Dragon claws", "has_combat_stats": True})
+            self.svc.gate = asyncio.Event()
+            task = asyncio.create_task(refresher.refresh())
+            await asyncio.sleep(0)
+            self.assertIs(catalog_snapshot.current(), old)
+            self.svc.gate.set()
+            await task
+            return old
+
+        old = asyncio.run(run())
+        self.assertIsNot(catalog_snapshot.current(), old)
+        self.assertEqual(len(catalog_snapshot.current().items), 2)
+
+    def test_version_change_triggers_reload(self):
+        refresher = CatalogRefresher(interval=3600, poll_interval=0.01)
+
+        async def run():
+            await refresher.refresh()
+            refresher.start()
+            await asyncio.sleep(0.03)
+            loads = self.svc.loads
+            self.svc.version = "v2"
+            self.svc.items.append({"id": 2, "name": "Dragon claws", "has_combat_stats": True})
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if refresher.source_version == "v2":
+                    break
+            await refresher.stop()
+            return loads
+
+        loads = asyncio.run(run())
+        self.assertEqual(loads, 1)  # no reloads while the version was unchanged
+        self.assertEqual(refresher.source_version, "v2")
+        self.assertEqual(len(catalog_snapshot.current().items), 2)
+        self.assertFalse(refresher.running)
+
+
+if __name__ == "__main__":
+    unittest.main()
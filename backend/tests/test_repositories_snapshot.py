@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+from app.catalog import snapshot as catalog_snapshot
+from app.catalog.snapshot import CatalogSnapshot
+from app.repositories import item_repository, boss_repository
+
+ITEMS = [
+    {"id": 4151, "name": "Abyssal whip", "has_combat_stats": True, "slot": "weapon",
+     "combat_stats": {"attack_bonuses": {"slash": 82}}},
+    {"id": 2365, "name": "'perfect' gold bar", "has_combat_stats": False, "slot": None, "combat_stats": {}},
+]
+BOSSES = [
+    {"id": 2042, "name": "Zulrah", "raid_group": None, "location": "Zul-Andra", "has_multiple_forms": True,
+     "forms": [{"id": 10, "boss_id": 2042, "form_name": "Serpentine"}, {"id": 11, "boss_id": 2042, "form_name": "Magma"}]},
+]
+
+
+class CatalogService:
+    """Minimal service exposing the bulk loader."""
+
+    def __init__(self, items, bosses):
+        self.items, self.bosses = items, bosses
+        self.loads = 0
+
+    def load_catalog(self):
+        self.loads += 1
+        return {"items": self.items, "bosses": self.bosses}
+
+    async def load_catalog_async(self):
+        return self.load_catalog()
+
+
+class TestCatalogSnapshot(unittest.TestCase):
+    def test_indexes(self):
+        snap = CatalogSnapshot.build(ITEMS, BOSSES)
+        self.assertEqual(snap.get_item(4151)["name"], "Abyssal whip")
+        self.assertEqual(snap.items_by_name["abyssal whip"]["id"], 4151)
+        self.assertEqual(snap.get_boss_by_form(11)["name"], "Zulrah")
+        self.assertEqual([s["id"] for s in snap.combat_item_summaries], [4151])
+        self.assertNotIn("combat_stats", snap.item_summaries[0])
+        self.assertEqual([i["id"] for i in snap.search_items("WHIP")], [4151])
+
+    def test_indexes_are_read_only(self):
+        snap = CatalogSnapshot.build(ITEMS, BOSSES)
+        with self.assertRaises(TypeError):
+            snap.items_by_id[1] = {}
+        with self.assertRaises(AttributeError):
+            snap.version = "x"
+
+    def test_version_tracks_content(self):
+        a = CatalogSnapshot.build(ITEMS, BOSSES)
+        b = CatalogSnapshot.build(list(reversed(ITEMS)), BOSSES)
+        c = CatalogSnapshot.build(ITEMS[:1], BOSSES)
+        self.assertEqual(a.version, b.version)
+        self.assertNotEqual(a.version, c.version)
+
+
+class TestRepositoriesServeFromSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.fallback = MagicMock()
+        self.orig = (item_repository.db_service, boss_repository.db_service)
+        item_repository.db_service = self.fallback
+        boss_repository.db_service = self.fallback
+
+    def tearDown(self):
+        item_repository.db_service, boss_repository.db_service = self.orig
+        catalog_snapshot.clear()
+
+    def test_reads_never_touch_the_database(self):
+        service = CatalogService(ITEMS, BOSSES)
+        catalog_snapshot.install(catalog_snapshot.build_snapshot(service, service))
+
+        self.assertEqual(item_repository.get_item(4151)["combat_stats"]["attack_bonuses"]["slash"], 82)
+        self.assertIsNone(item_repository.get_item(1))
+        self.assertEqual([i["id"] for i in item_repository.get_all_items()], [4151])
+        self.assertEqual(boss_repository.get_boss(2042)["name"], "Zulrah")
+        self.assertEqual(boss_repository.get_boss_by_form(10)["id"], 2042)
+        self.assertEqual(boss_repository.search_bosses("zul")[0]["id"], 2042)
+        self.assertEqual(asyncio.run(item_repository.get_item_async(4151))["id"], 4151)
+        self.assertEqual(self.fallback.method_calls, [])
+
+    def test_lookup_by_name_and_alias(self):
+        service = CatalogService(ITEMS, BOSSES)
+        catalog_snapshot.install(catalog_snapshot.build_snapshot(service, service))
+
+        self.assertEqual(item_repository.get_item_by_name("abyssal_whip")["id"], 4151)
+        self.assertEqual(item_repository.get_item_by_name("WHIP")["id"], 4151)
+        self.assertIsNone(item_repository.get_item_by_name("abyssal whi"))
+        self.assertEqual(boss_repository.get_boss_by_name("zul")["forms"][1]["id"], 11)
+        self.assertEqual(self.fallback.method_calls, [])
+
+    def test_lookup_by_name_without_snapshot(self):
+        self.fallback.search_items.return_value = [{"id": 4151, "name": "Abyssal whip"}, {"id": 1, "name": "Abyssal whip (or)"}]
+        self.fallback.get_item.return_value = ITEMS[0]
+        item_repository._item_cache.clear()
+        self.assertIs(item_repository.get_item_by_name("Abyssal whip"), ITEMS[0])
+        self.fallback.get_item.assert_called_once_with(4151)
+
+    def test_refresh_swaps_atomically(self):
+        service = CatalogService(ITEMS, BOSSES)
+        first = catalog_snapshot.build_snapshot(service, service)
+        catalog_snapshot.install(first)
+        pinned = catalog_snapshot.current()
+
+        service.items = ITEMS + [{"id": 1, "name": "Bronze dagger", "has_combat_stats": True}]
+        previous = catalog_snapshot.install(asyncio.run(catalog_snapshot.build_snapshot_async(service, service)))
+
+        self.assertIs(previous, first)
+        self.assertIsNone(pinned.get_item(1))
+        self.assertEqual(item_repository.get_item(1)["name"], "Bronze dagger")
+        self.assertNotEqual(catalog_snapshot.current().version, first.version)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from app.catalog.search_index import TrigramIndex, load_aliases, search_key
+from app.catalog.snapshot import CatalogSnapshot
+
+NAMES = [
+    "Dragon hunter crossbow", "Dragon crossbow", "Rune crossbow", "Dragon dagger(p++)",
+    "Serpentine helm", "Abyssal whip", "Abyssal tentacle", "Armadyl crossbow",
+]
+ALIASES = {"dhcb": "Dragon hunter crossbow", "serp": "Serpentine helm", "gone": "Not in catalog"}
+
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TrigramIndex(NAMES, ALIASES)
+
+    def names(self, query, limit=None):
+        return [NAMES[pos] for pos, _ in self.index.search(query, limit)]
+
+    def test_search_key(self):
+        self.assertEqual(search_key("Dragon_dagger(p++)"), "dragon dagger p")
+        self.assertEqual(search_key("  Ahrim's   hood "), "ahrim s hood")
+
+    def test_alias_and_exact_score_one(self):
+        self.assertEqual(self.index.search("DHCB")[0], (0, 1.0))
+        self.assertEqual(self.names("serp")[0], "Serpentine helm")
+        self.assertEqual(self.index.search("rune crossbow")[0], (2, 1.0))
+        self.assertEqual(self.index.resolve("gone"), ())
+
+    def test_typos_are_tolerated(self):
+        self.assertEqual(self.names("dragon huntr crosbow", 1), ["Dragon hunter crossbow"])
+        self.assertEqual(self.names("abysal whip", 1), ["Abyssal whip"])
+
+    def test_prefix_outranks_substring_and_fuzzy(self):
+        ranked = self.index.search("crossbow")
+        self.assertEqual(len(ranked), 4)
+        scores = dict(ranked)
+        self.assertGreater(self.index.search("dragon")[0][1], scores[2])
+        self.assertEqual([s for _, s in ranked], sorted((s for _, s in ranked), reverse=True))
+        self.assertEqual(self.names("aby"), ["Abyssal whip", "Abyssal tentacle"])
+
+    def test_short_queries_and_noise(self):
+        self.assertEqual(set(self.names("wh")), {"Abyssal whip"})
+        self.assertEqual(self.index.search("zzzzzz"), [])
+        self.assertEqual(self.index.search("   "), [])
+
+
+class TestSnapshotSearch(unittest.TestCase):
+    def test_results_carry_scores_and_aliases(self):
+        items = [{"id": i, "name": n, "has_combat_stats": True} for i, n in enumerate(NAMES, start=1)]
+        bosses = [{"id": 8059, "name": "Vorkath"}, {"id": 2042, "name": "Zulrah"}]
+        snap = CatalogSnapshot.build(items, bosses)
+        top = snap.search_items("dhcb", 1)[0]
+        self.assertEqual((top["name"], top["score"]), ("Dragon hunter crossbow", 1.0))
+        self.assertEqual(snap.search_bosses("vorkth")[0]["id"], 8059)
+        self.assertEqual(snap.find_boss_by_name("vork")["id"], 8059)
+        self.assertIsNone(snap.find_item_by_name("dragon"))
+
+    def test_shipped_aliases_load(self):
+        aliases = load_aliases()
+        self.assertEqual(aliases["items"]["dhcb"], "Dragon hunter crossbow")
+        self.assertEqual(aliases["bosses"]["vork"], "Vorkath")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
+import io
 import unittest
+from contextlib import redirect_stdout
 from unittest.mock import patch
 
 from app.services import seed_service, bis_service, calculation_service
 from app.repositories import item_repository
 from app.models import DpsParameters
+from benchmarks.fixtures import dps_inputs
 
 
 class TestSeedService(unittest.TestCase):
@@ -59,7 +62,7 @@ class TestBisService(unittest.TestCase):
             },
         ]
 
-        with patch.object(item_repository, 'get_all_items', return_value=items):
+        with patch.object(item_repository, 'get_combat_items', return_value=items):
             # Mock calculation_service to score based on melee_strength_bonus
             with patch.object(calculation_service, 'calculate_dps', side_effect=lambda p: {'dps': p.get('melee_strength_bonus', 0)}):
                 result = bis_service.suggest_bis({'combat_style': 'melee'})
@@ -76,6 +79,14 @@ class TestCalculationService(unittest.TestCase):
             mock_calc.assert_called_once_with(params)
             self.assertEqual(result, {'dps': 1})
 
+    def test_calculators_do_not_print(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            for style in ('melee', 'ranged', 'magic'):
+                for params in dps_inputs(style, 5):
+                    calculation_service.calculate_dps({**params, 'special_energy_cost': 50})
+        self.assertEqual(out.getvalue(), '')
+
 
 class TestSettings(unittest.TestCase):
     def test_cache_ttl_env_override(self):
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from app.sqlite_database import SQLiteCatalogService
+from app import service_factory
+from tools.scraper_v2.normalize_items import write_catalog_items, write_page_keys
+
+WHIP = {
+    "title": "Abyssal whip",
+    "item_id": 4151,
+    "tradeable": True,
+    "image_src": "/images/Abyssal_whip.png",
+    "combat_bonuses": {
+        "attack": {"stab": 0, "slash": 82, "crush": 0, "magic": 0, "ranged": 0},
+        "defence": {"stab": 0, "slash": 0, "crush": 0, "magic": 0, "ranged": 0},
+        "other": {"strength": 82, "ranged_strength": 0, "magic_damage_percent": 0.0, "prayer": 0},
+        "slot": "weapon",
+    },
+    "special_attack": "Energy Drain",
+}
+BAR = {"title": "'perfect' gold bar", "item_id": 2365, "tradeable": False, "combat_bonuses": None}
+VORKATH = {
+    "title": "Vorkath",
+    "name": "Vorkath",
+    "combat_level": 732,
+    "hitpoints": 750,
+    "max_hit": 32,
+    "attributes": {"NPC ID": "8059, 8061", "Location": "Ungael", "Size": "7x7", "Examine": "An undead dragon."},
+}
+
+
+def _build(path: str, key: str) -> None:
+    cn = sqlite3.connect(path)
+    cn.execute(f"CREATE TABLE items ({key} TEXT PRIMARY KEY, doc TEXT NOT NULL)")
+    cn.execute(f"CREATE TABLE npcs ({key} TEXT PRIMARY KEY, doc TEXT NOT NULL)")
+    for doc in (WHIP, BAR):
+        cn.execute(f"INSERT INTO items ({key}, doc) VALUES (?, ?)", (doc["title"].replace(" ", "_"), json.dumps(doc)))
+    cn.execute(f"INSERT INTO npcs ({key}, doc) VALUES (?, ?)", ("Vorkath", json.dumps(VORKATH)))
+    cn.commit()
+    write_page_keys(cn)
+    cn.close()
+
+
+class TestSQLiteCatalogService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "osrs.sqlite")
+        _build(self.db_path, "title")
+        self.service = SQLiteCatalogService(self.db_path)
+
+    def tearDown(self):
+        self.service.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_all_items_filters_combat_only(self):
+        items = self.service.get_all_items()
+        self.assertEqual([i["id"] for i in items], [4151])
+        self.assertEqual(items[0]["slot"], "weapon")
+        all_items = self.service.get_all_items(combat_only=False)
+        self.assertEqual({i["id"] for i in all_items}, {4151, 2365})
+
+    def test_get_item_maps_combat_stats(self):
+        item = self.service.get_item(4151)
+        self.assertEqual(item["name"], "Abyssal whip")
+        self.assertTrue(item["has_special_attack"])
+        self.assertEqual(item["combat_stats"]["attack_bonuses"]["slash"], 82)
+        self.assertEqual(item["combat_stats"]["other_bonuses"]["strength"], 82)
+        self.assertIsNone(self.service.get_item(999999))
+
+    def test_get_boss_and_form(self):
+        boss = self.service.get_boss(8059)
+        self.assertEqual(boss["name"], "Vorkath")
+        self.assertEqual(boss["forms"][0]["size"], 7)
+        self.assertEqual(self.service.get_boss_by_form(8059)["id"], 8059)
+        self.assertIsNone(self.service.get_boss(1))
+
+    def test_search_matches_underscored_titles(self):
+        self.assertEqual([i["id"] for i in self.service.search_items("abyssal whip")], [4151])
+        self.assertEqual([b["id"] for b in self.service.search_bosses("vork", limit=5)], [8059])
+
+    def test_batch_lookups(self):
+        self.assertEqual({i["id"] for i in self.service.get_items([2365, 4151, 7])}, {2365, 4151})
+        self.assertEqual([b["id"] for b in self.service.get_bosses([8059, 1])], [8059])
+        self.assertEqual(self.service.get_items([]), [])
+
+    def test_read_only(self):
+        with self.assertRaises(sqlite3.OperationalError):
+            self.service.connection().execute("DELETE FROM items")
+
+    def test_async_variants(self):
+        async def run():
+            item = await self.service.get_item_async(4151)
+            bosses = await self.service.get_all_bosses_async()
+            return item, bosses
+
+        item, bosses = asyncio.run(run())
+        self.assertEqual(item["id"], 4151)
+        self.assertEqual([b["id"] for b in bosses], [8059])
+
+    def test_load_catalog_returns_details(self):
+        data = self.service.load_catalog()
+        self.assertEqual({i["id"] for i in data["items"]}, {4151, 2365})
+        whip = next(i for i in data["items"] if i["id"] == 4151)
+        self.assertIn("combat_stats", whip)
+        self.assertEqual(data["bosses"][0]["forms"][0]["boss_id"], 8059)
+
+    def test_legacy_name_schema(self):
+        legacy = os.path.join(self.temp_dir, "legacy.sqlite")
+        _build(legacy, "name")
+        service = SQLiteCatalogService(legacy)
+        try:
+            self.assertEqual(service.get_item(2365)["name"], "'perfect' gold bar")
+        finally:
+            service.close()
+
+    def test_typed_catalog_items(self):
+        typed = os.path.join(self.temp_dir, "typed.sqlite")
+        _build(typed, "title")
+        cn = sqlite3.connect(typed)
+        self.assertEqual(write_catalog_items(cn), 2)
+        cn.close()
+        service = SQLiteCatalogService(typed)
+        try:
+            self.assertEqual([i["id"] for i in service.get_all_items()], [4151])
+            whip = service.get_item(4151)
+            self.assertEqual(whip["stats"]["attack_slash"], 82)
+            self.assertEqual(whip["stats"]["str_melee"], 82)
+            self.assertEqual(whip["combat_stats"], self.service.get_item(4151)["combat_stats"])
+            self.assertEqual([i["id"] for i in service.search_items("abyssal")], [4151])
+            self.assertEqual({i["id"] for i in service.load_catalog()["items"]}, {4151, 2365})
+        finally:
+            service.close()
+
+    def test_factory_selects_sqlite(self):
+        svc = service_factory.create_database_service("sqlite")
+        self.assertIsInstance(svc, SQLiteCatalogService)
+        with self.assertRaises(ValueError):
+            service_factory.create_database_service("mongo")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests.test_sqlite_catalog import _build
+from tools.scraper_v2.export_static import MANIFEST, export_static, load_snapshot
+from tools.scraper_v2.normalize_items import write_catalog_items
+
+
+class TestStaticExport(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "osrs.sqlite")
+        self.out = Path(self.temp_dir, "static")
+        _build(self.db_path, "title")
+        cn = sqlite3.connect(self.db_path)
+        write_catalog_items(cn)
+        cn.close()
+        self.snap = load_snapshot(Path(self.db_path))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _read(self, entry):
+        raw = (self.out / entry["path"]).read_bytes()
+        digest = entry["path"].rsplit(".", 2)[-2]
+        self.assertEqual(hashlib.sha256(raw).hexdigest()[:16], digest)
+        return json.loads(raw)
+
+    def test_manifest_points_at_hashed_shards(self):
+        manifest = export_static(self.snap, self.out, jobs=2)
+        self.assertEqual(manifest, json.loads((self.out / MANIFEST).read_text()))
+        self.assertEqual(manifest["version"], self.snap.version)
+
+        items = self._read(manifest["datasets"]["items"])
+        self.assertEqual([i["id"] for i in items], [4151])
+        self.assertIn("dragon_dagger", self._read(manifest["datasets"]["special-attacks"]))
+
+        weapons = self._read(manifest["slots"]["weapon"])
+        self.assertEqual(weapons[0]["name"], "Abyssal whip")
+        self.assertIn("combat_stats", weapons[0])
+        boss_id = str(self.snap.bosses[0]["id"])
+        self.assertEqual(self._read(manifest["npcs"][boss_id])["name"], "Vorkath")
+
+        # "Abyssal whip" is findable by either word.
+        for prefix in ("ab", "wh"):
+            rows = self._read(manifest["search"]["buckets"][prefix])["items"]
+            self.assertEqual([r[1] for r in rows], [4151])
+        self.assertEqual(self._read(manifest["search"]["buckets"]["vo"])["npcs"][0][2], "Vorkath")
+
+    def test_compressed_siblings_and_rebuild(self):
+        manifest = export_static(self.snap, self.out, jobs=1)
+        entry = manifest["datasets"]["effects"]
+        self.assertIn("gzip", entry["encodings"])
+        path = self.out / entry["path"]
+        self.assertEqual(gzip.decompress(Path(f"{path}.gz").read_bytes()), path.read_bytes())
+
+        mtime = path.stat().st_mtime_ns
+        self.assertEqual(export_static(self.snap, self.out, jobs=1), manifest)
+        self.assertEqual(path.stat().st_mtime_ns, mtime)  # content-addressed: not rewritten
+
+        stale = self.out / "items" / "slot" / "weapon.0000000000000000.json"
+        stale.write_text("[]")
+        export_static(self.snap, self.out, jobs=1, prune=True)
+        self.assertFalse(stale.exists())
+        self.assertTrue(path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
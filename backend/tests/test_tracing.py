@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import tracing
+from app.main import create_app
+from app.services import bis_service
+from app.sqlite_database import SQLiteCatalogService
+from tests.test_metrics import PARAMS, _done
+from tests.test_sqlite_catalog import _build
+
+PARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+class TracingCase(unittest.TestCase):
+    def setUp(self):
+        self.spans = []
+        tracing.configure(self.spans.append, sample_ratio=1.0)
+
+    def tearDown(self):
+        tracing.configure()
+
+    def named(self, name):
+        return [s for s in self.spans if s["name"] == name]
+
+
+class TestSpans(TracingCase):
+    def test_nesting_and_status(self):
+        with self.assertRaises(ValueError):
+            with tracing.span("outer", {"a": 1}):
+                with tracing.span("inner") as inner:
+                    inner.set_attribute("rows", 3)
+                raise ValueError("boom")
+        inner, outer = self.spans
+        self.assertEqual(inner["trace_id"], outer["trace_id"])
+        self.assertEqual(inner["parent_span_id"], outer["span_id"])
+        self.assertIsNone(outer["parent_span_id"])
+        self.assertEqual(inner["attributes"], {"rows": 3})
+        self.assertEqual(outer["status"], {"code": "ERROR", "message": "ValueError: boom"})
+
+    def test_traceparent_crosses_processes(self):
+        with tracing.span("caller") as caller:
+            carrier = tracing.traceparent()
+        with tracing.span("callee", parent=carrier):
+            pass
+        self.assertEqual(self.spans[1]["trace_id"], caller.trace_id)
+        self.assertEqual(self.spans[1]["parent_span_id"], caller.span_id)
+        self.assertIsNone(tracing.parse_traceparent("00-xyz-00f067aa0ba902b7-01"))
+
+    def test_unsampled_root_drops_children(self):
+        tracing.configure(self.spans.append, sample_ratio=0.0)
+        with tracing.span("root"):
+            with tracing.span("child") as child:
+                self.assertIs(child, tracing.NOOP)
+                carrier = tracing.traceparent()
+        with tracing.span("remote", parent=carrier):
+            pass
+        self.assertEqual(self.spans, [])
+
+    def test_disabled_is_noop(self):
+        tracing.configure("none")
+        self.assertFalse(tracing.enabled())
+        self.assertIs(tracing.span("x"), tracing.NOOP)
+
+    def test_file_exporter(self):
+        temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp)
+        path = os.path.join(temp, "traces.jsonl")
+        tracing.configure(tracing.FileExporter(path))
+        with tracing.span("a"):
+            with tracing.span("b"):
+                pass
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([s["name"] for s in lines], ["b", "a"])
+        self.assertEqual(lines[0]["resource"]["process.pid"], os.getpid())
+
+
+class TestInstrumentation(TracingCase):
+    def test_request_span_continues_incoming_trace(self):
+        client = TestClient(create_app())
+        r = client.get("/items", headers={"traceparent": PARENT})
+        (server,) = self.named("GET /items")
+        self.assertEqual(server["kind"], "SERVER")
+        self.assertEqual(server["trace_id"], PARENT.split("-")[1])
+        self.assertEqual(server["attributes"]["http.response.status_code"], 200)
+        self.assertEqual(r.headers["x-trace-id"], server["trace_id"])
+        render = self.named("payload.render")[0]
+        self.assertEqual(render["trace_id"], server["trace_id"])
+        self.assertEqual(render["attributes"]["payload.dataset"], "items")
+
+    BIS_ITEMS = [
+        {"id": 1, "name": "Whip", "slot": "weapon", "combat_stats": {"attack_bonuses": {"slash": 82}, "other_bonuses": {"strength": 82}}},
+        {"id": 2, "name": "Log", "slot": "weapon"},
+    ]
+
+    def assert_prefilter(self, search):
+        (prefilter,) = self.named("bis.prefilter")
+        self.assertEqual(prefilter["parent_span_id"], search["span_id"])
+        self.assertEqual(prefilter["attributes"], {"bis.candidates.in": 2, "bis.candidates.out": 1})
+        self.assertEqual(self.named("bis.load_items")[0]["attributes"]["db.rows"], 2)
+
+    def test_bis_phases(self):
+        with patch.object(bis_service.item_repository, "get_combat_items_async", _done(self.BIS_ITEMS)):
+            asyncio.run(bis_service.compute_bis_async(PARAMS))
+        (search,) = self.named("bis.search")
+        (score,) = self.named("bis.score")
+        (batch,) = self.named("bis.dps_batch")
+        self.assert_prefilter(search)
+        self.assertEqual(score["parent_span_id"], search["span_id"])
+        # The batch ran on the pool with the scoring span as its parent.
+        self.assertEqual(batch["parent_span_id"], score["span_id"])
+        self.assertEqual(batch["attributes"], {"bis.candidates": 1})
+        self.assertEqual(search["attributes"]["bis.candidates"], 1)
+
+    def test_suggest_bis_phases(self):
+        with patch.object(bis_service.item_repository, "get_combat_items", return_value=self.BIS_ITEMS):
+            bis_service.suggest_bis(PARAMS)
+        (search,) = self.named("bis.search")
+        (batch,) = self.named("bis.dps_batch")
+        self.assert_prefilter(search)
+        self.assertEqual(batch["parent_span_id"], search["span_id"])
+        self.assertEqual(batch["attributes"], {"bis.candidates": 1})
+
+    def test_query_span_counts_rows(self):
+        temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp)
+        path = os.path.join(temp, "osrs.sqlite")
+        _build(path, "title")
+        svc = SQLiteCatalogService(path)
+        self.addCleanup(svc.close)
+        svc.get_all_bosses()
+        (query,) = self.named("db.query")
+        self.assertEqual(query["attributes"], {"db.system": "sqlite", "db.operation": "get_all_bosses", "db.rows": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import {
   itemsApi,
   specialAttacksApi,
   passiveEffectsApi,
+  catalogApi,
 } from '../services/api';
 
 jest.mock('../services/api');
@@ -15,6 +16,7 @@ const mockedSpecialApi =
   specialAttacksApi as jest.Mocked<typeof specialAttacksApi>;
 const mockedPassiveApi =
   passiveEffectsApi as jest.Mocked<typeof passiveEffectsApi>;
+const mockedCatalogApi = catalogApi as jest.Mocked<typeof catalogApi>;
 
 function getStore() {
   return useReferenceDataStore.getState();
@@ -33,12 +35,38 @@ describe('reference data store', () => {
         loading: false,
         progress: 0,
         error: false,
+        catalogVersion: null,
       });
     });
     mockedNpcApi.getAllNpces.mockReset();
     mockedItemsApi.getAllItems.mockReset();
     mockedSpecialApi.getAll.mockReset();
     mockedPassiveApi.getAll.mockReset();
+    mockedCatalogApi.getChanges.mockReset();
+    mockedCatalogApi.getBootstrap.mockReset();
+  });
+
+  it('loads everything from the bootstrap bundle in one request', async () => {
+    mockedCatalogApi.getBootstrap.mockResolvedValue({
+      version: 'b1',
+      catalog_version: 'v1',
+      items: [{ id: 2, name: 'Item', has_combat_stats: true } as any],
+      npcs: [{ id: 1, name: 'Npc' } as any],
+      special_attacks: {},
+      passive_effects: {},
+    });
+
+    await act(async () => {
+      await getStore().initData();
+    });
+
+    const state = getStore();
+    expect(state.items).toHaveLength(1);
+    expect(state.npcs).toHaveLength(1);
+    expect(state.catalogVersion).toBe('v1');
+    expect(state.initialized).toBe(true);
+    expect(mockedItemsApi.getAllItems).not.toHaveBeenCalled();
+    expect(mockedNpcApi.getAllNpces).not.toHaveBeenCalled();
   });
 
   it('loads data from APIs', async () => {
@@ -88,6 +116,40 @@ describe('reference data store', () => {
     expect(mockedPassiveApi.getAll).toHaveBeenCalledTimes(1);
   });
 
+  it('syncs cached lists by delta when the version is known', async () => {
+    act(() => {
+      useReferenceDataStore.setState({
+        items: [{ id: 1, name: 'Whip', has_combat_stats: true } as any],
+        npcs: [{ id: 5, name: 'Old' } as any],
+        catalogVersion: '1.v1',
+      });
+    });
+    mockedCatalogApi.getChanges.mockResolvedValue({
+      version: '2.v2',
+      sequence: 2,
+      resync: false,
+      changes: {
+        items: { added: [{ id: 2, name: 'Claws', has_combat_stats: true } as any], updated: [], removed: [1] },
+        npcs: { added: [], updated: [{ id: 5, name: 'New' } as any], removed: [] },
+      },
+    });
+    mockedSpecialApi.getAll.mockResolvedValue({});
+    mockedPassiveApi.getAll.mockResolvedValue({});
+
+    await act(async () => {
+      await getStore().initData();
+    });
+
+    const state = getStore();
+    expect(mockedCatalogApi.getChanges).toHaveBeenCalledWith('1.v1');
+    expect(mockedItemsApi.getAllItems).not.toHaveBeenCalled();
+    expect(mockedCatalogApi.getBootstrap).not.toHaveBeenCalled();
+    expect(state.items.map((i) => i.id)).toEqual([2]);
+    expect(state.npcs[0].name).toBe('New');
+    expect(state.catalogVersion).toBe('2.v2');
+    expect(state.initialized).toBe(true);
+  });
+
   it('filters forms with placeholder names', () => {
     act(() => {
       getStore().addNpcForms(1, [
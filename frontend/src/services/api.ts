@@ -6,6 +6,9 @@ import {
   NpcSummary,
   Item,
   ItemSummary,
+  AutocompleteEntry,
+  BootstrapBundle,
+  CatalogChanges,
   NpcForm,
   SpecialAttack,
   PassiveEffect
@@ -143,6 +146,15 @@ export const npcsApi = {
       throw handleError(err);
     }
   },
+
+  autocomplete: async (q: string, limit?: number): Promise<AutocompleteEntry[]> => {
+    try {
+      const { data } = await apiClient.get('/autocomplete', { params: { q, type: 'npcs', limit } });
+      return data;
+    } catch (err: any) {
+      throw handleError(err);
+    }
+  },
 };
 
 // Items API
@@ -174,6 +186,16 @@ export const itemsApi = {
     }
   },
 
+  // One round trip for a whole loadout; results follow the order of `ids`.
+  getItemsByIds: async (ids: number[]): Promise<Item[]> => {
+    try {
+      const { data } = await apiClient.post('/items/batch', { ids });
+      return data;
+    } catch (err: any) {
+      throw handleError(err);
+    }
+  },
+
   searchItems: async (query: string, limit?: number): Promise<ItemSummary[]> => {
     const params: Record<string, unknown> = { query };
     if (limit !== undefined) {
@@ -186,6 +208,18 @@ export const itemsApi = {
       throw handleError(err);
     }
   },
+
+  autocomplete: async (
+    q: string,
+    options?: { limit?: number; slot?: string; combat_only?: boolean }
+  ): Promise<AutocompleteEntry[]> => {
+    try {
+      const { data } = await apiClient.get('/autocomplete', { params: { q, type: 'items', ...options } });
+      return data;
+    } catch (err: any) {
+      throw handleError(err);
+    }
+  },
 };
 
 export const specialAttacksApi = {
@@ -202,7 +236,30 @@ export const specialAttacksApi = {
 export const passiveEffectsApi = {
   getAll: async (): Promise<Record<string, PassiveEffect>> => {
     try {
-      const { data } = await apiClient.get('/passive-effects');
+      const { data } = await apiClient.get('/effects');
+      return data;
+    } catch (err: any) {
+      throw handleError(err);
+    }
+  },
+};
+
+export const catalogApi = {
+  // Items, NPCs, special attacks and passive effects in one compressed response.
+  getBootstrap: async (): Promise<BootstrapBundle> => {
+    try {
+      const { data } = await apiClient.get('/bootstrap');
+      return data;
+    } catch (err: any) {
+      throw handleError(err);
+    }
+  },
+
+  // Items/NPCs changed since `since` (a `version` from an earlier call);
+  // without it, only the current version and a resync hint.
+  getChanges: async (since?: string): Promise<CatalogChanges> => {
+    try {
+      const { data } = await apiClient.get('/catalog/changes', { params: since ? { since } : {} });
       return data;
     } catch (err: any) {
       throw handleError(err);
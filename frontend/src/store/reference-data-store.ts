@@ -8,8 +8,12 @@ import {
   itemsApi,
   specialAttacksApi,
   passiveEffectsApi,
+  catalogApi,
 } from '@/services/api';
 import {
+  BootstrapBundle,
+  CatalogChanges,
+  EntityChanges,
   NpcForm,
   NpcSummary,
   ItemSummary,
@@ -30,6 +34,8 @@ interface ReferenceDataState {
   /** Indicates if loading failed */
   error: boolean;
   timestamp: number;
+  /** Catalog version the cached items/NPCs match (from `/catalog/changes`) */
+  catalogVersion: string | null;
   initData: () => Promise<void>;
   addNpces: (b: NpcSummary[]) => void;
   addNpcForms: (id: number, forms: NpcForm[]) => void;
@@ -40,6 +46,17 @@ interface ReferenceDataState {
 
 const REFERENCE_TTL_MS = 12 * 60 * 60 * 1000; // 12 hours
 
+/** Apply one kind's delta to a cached list: drop removed, replace updated, append added. */
+export function applyEntityChanges<T extends { id: number }>(list: T[], delta?: EntityChanges<T>): T[] {
+  if (!delta) return list;
+  const removed = new Set(delta.removed);
+  const replaced = new Map(delta.updated.map((e) => [e.id, e]));
+  const kept = list
+    .filter((e) => !removed.has(e.id))
+    .map((e) => replaced.get(e.id) ?? e);
+  return [...kept, ...delta.added];
+}
+
 export const useReferenceDataStore = create<ReferenceDataState>()(
   persist(
     (set, get) => ({
@@ -53,9 +70,77 @@ export const useReferenceDataStore = create<ReferenceDataState>()(
       error: false,
       progress: 0,
       timestamp: 0,
+      catalogVersion: null,
       async initData() {
         if (get().initialized || get().loading) return;
         set({ loading: true, progress: 0, timestamp: Date.now(), error: false });
+
+        // Cached lists with a known version: fetch only what changed since.
+        const cached = get();
+        let head: CatalogChanges | undefined;
+        if (cached.catalogVersion && (cached.items.length || cached.npcs.length)) {
+          try {
+            head = await catalogApi.getChanges(cached.catalogVersion);
+          } catch {
+            head = undefined;
+          }
+        }
+        if (head && !head.resync && head.changes) {
+          let error = false;
+          const [specialAttacks, passiveEffects] = await Promise.all([
+            specialAttacksApi.getAll().catch(() => {
+              error = true;
+              return cached.specialAttacks;
+            }),
+            passiveEffectsApi.getAll().catch(() => {
+              error = true;
+              return cached.passiveEffects;
+            }),
+          ]);
+          set({
+            items: applyEntityChanges(cached.items, head.changes.items).filter((it) => it.has_combat_stats),
+            npcs: applyEntityChanges(cached.npcs, head.changes.npcs),
+            specialAttacks,
+            passiveEffects,
+            catalogVersion: head.version,
+            initialized: !error,
+            loading: false,
+            error,
+            progress: 1,
+          });
+          return;
+        }
+
+        // Otherwise one request for all four datasets.
+        let bundle: BootstrapBundle | undefined;
+        try {
+          bundle = await catalogApi.getBootstrap();
+        } catch {
+          bundle = undefined;
+        }
+        if (bundle && Array.isArray(bundle.items)) {
+          set({
+            items: bundle.items,
+            npcs: bundle.npcs,
+            specialAttacks: bundle.special_attacks,
+            passiveEffects: bundle.passive_effects,
+            catalogVersion: bundle.catalog_version,
+            initialized: true,
+            loading: false,
+            error: false,
+            progress: 1,
+          });
+          return;
+        }
+
+        // Fallback: page through the individual endpoints.
+        if (!head) {
+          try {
+            head = await catalogApi.getChanges();
+          } catch {
+            head = undefined;
+          }
+        }
         const pageSize = 50;
         let page = 1;
         const npcs: NpcSummary[] = [];
@@ -111,6 +196,8 @@ export const useReferenceDataStore = create<ReferenceDataState>()(
           items,
           specialAttacks,
           passiveEffects,
+          // Version read before the download, so later changes are not missed
+          catalogVersion: error ? null : head?.version ?? null,
           initialized: !error,
           loading: false,
           error,
@@ -152,12 +239,14 @@ export const useReferenceDataStore = create<ReferenceDataState>()(
         specialAttacks: state.specialAttacks,
         passiveEffects: state.passiveEffects,
         timestamp: state.timestamp,
+        catalogVersion: state.catalogVersion,
       }),
       onRehydrateStorage: (state) => (stored) => {
         if (!stored) return;
-        const expired = Date.now() - stored.timestamp > REFERENCE_TTL_MS;
+        // Lists with a catalog version never expire: initData syncs them by delta.
+        const expired = Date.now() - stored.timestamp > REFERENCE_TTL_MS && !stored.catalogVersion;
         if (expired) {
-          state.setState({ npcs: [], npcForms: {}, items: [], specialAttacks: {}, passiveEffects: {}, initialized: false, loading: false, progress: 0, error: false, timestamp: Date.now() });
+          state.setState({ npcs: [], npcForms: {}, items: [], specialAttacks: {}, passiveEffects: {}, initialized: false, loading: false, progress: 0, error: false, timestamp: Date.now(), catalogVersion: null });
         } else {
           state.setState({
             npcs: stored.npcs || [],
@@ -165,6 +254,7 @@ export const useReferenceDataStore = create<ReferenceDataState>()(
             items: stored.items || [],
             specialAttacks: stored.specialAttacks || {},
             passiveEffects: stored.passiveEffects || {},
+            catalogVersion: stored.catalogVersion ?? null,
             initialized: false,
             loading: false,
             progress: 0,
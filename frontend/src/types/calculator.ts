@@ -274,6 +274,45 @@ export interface ItemSummary {
   icons?: string[];
 }
 
+/** Per-kind delta returned by `/catalog/changes`. */
+export interface EntityChanges<T> {
+  added: T[];
+  updated: T[];
+  removed: number[];
+}
+
+/** `/catalog/changes?since=<version>`: either the changes or a full-resync hint. */
+export interface CatalogChanges {
+  version: string | null;
+  sequence: number;
+  resync: boolean;
+  reason?: string;
+  changes?: {
+    items: EntityChanges<ItemSummary>;
+    npcs: EntityChanges<NpcSummary>;
+  };
+  full?: { items: string; npcs: string };
+}
+
+/** `/bootstrap`: everything the calculator needs on first load, in one response. */
+export interface BootstrapBundle {
+  version: string;
+  /** Snapshot version; usable as the `since` cursor for `/catalog/changes` */
+  catalog_version: string | null;
+  items: ItemSummary[];
+  npcs: NpcSummary[];
+  special_attacks: Record<string, SpecialAttack>;
+  passive_effects: Record<string, PassiveEffect>;
+}
+
+/** Compact row returned by `/autocomplete`. */
+export interface AutocompleteEntry {
+  id: number;
+  name: string;
+  slot?: string | null;
+  icon?: string | null;
+}
+
 export interface ItemCombatStats {
   attack_bonuses: {
     stab?: number;
@@ -3,7 +3,11 @@ import json, sqlite3, os
 from pathlib import Path
 from typing import Any, Dict, Iterable, Tuple
 
+from tools.scraper_v2.export_binary import write_binary_snapshot
+from tools.scraper_v2.normalize_items import write_catalog_items, write_page_keys
+
 DB_PATH = Path("osrs.sqlite")
+BINARY_PATH = Path("osrs.catalog.bin")
 DATA_DIR = Path("data/db")
 
 def _read_json(path: Path) -> Any:
@@ -78,6 +82,7 @@ def init_db(conn: sqlite3.Connection):
     DROP TABLE IF EXISTS npcs;
     DROP TABLE IF EXISTS drops;
     DROP TABLE IF EXISTS specials;
+    DROP TABLE IF EXISTS catalog_items;
 
     CREATE TABLE items(
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -154,6 +159,8 @@ def main():
     insert_many(conn, "npcs",     _as_kv_iter("npcs",     npcs_raw))
     insert_many(conn, "drops",    _as_kv_iter("drops",    drops_raw))
     insert_many(conn, "specials", _as_kv_iter("specials", specials_raw))
+    write_catalog_items(conn)
+    write_page_keys(conn)
 
     # Final stats
     cur = conn.cursor()
@@ -162,6 +169,10 @@ def main():
         return cur.fetchone()[0]
     print(f"[OK] osrs.sqlite built")
     print(f"     items={count('items')}  npcs={count('npcs')}  drops={count('drops')}  specials={count('specials')}")
+    print(f"     catalog_items={count('catalog_items')}")
+    conn.close()
+
+    write_binary_snapshot(DB_PATH, BINARY_PATH)
 
 if __name__ == "__main__":
     main()
@@ -17,6 +17,9 @@ from tools.scraper_v2.parsers.items import ItemParser
 from tools.scraper_v2.parsers.specials import SpecialParser
 from tools.scraper_v2.parsers.npcs import NpcParser
 from tools.scraper_v2.parsers.drops import parse_drop_table
+from tools.scraper_v2.export_binary import write_binary_snapshot
+from tools.scraper_v2.export_static import export_static, load_snapshot
+from tools.scraper_v2.normalize_items import write_catalog_items, write_page_keys
 
 # --------------------------------------------------------------------------------------
 # Config / constants
@@ -36,6 +39,7 @@ NPC_IDS_PATH = TARGETS_DIR / "targets_npcs.jsonl"
 
 DEFAULT_OUTDIR = ROOT / "data" / "db"
 DEFAULT_SQLITE = ROOT / "osrs.sqlite"
+DEFAULT_BINARY = ROOT / "osrs.catalog.bin"
 
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 log = logging.getLogger("build_local_db")
@@ -113,6 +117,8 @@ def upsert_sqlite(db_path: Path,
     )
 
     cn.commit()
+    write_catalog_items(cn)
+    write_page_keys(cn)
     cn.close()
 
 def fetch_html(title: str) -> str:
@@ -392,12 +398,17 @@ def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser(description="Scrape OSRS Wiki into a local DB")
     ap.add_argument("--outdir", type=Path, default=DEFAULT_OUTDIR, help="output directory for json dumps")
     ap.add_argument("--sqlite", type=Path, default=DEFAULT_SQLITE, help="sqlite file path")
+    ap.add_argument("--binary", type=Path, default=DEFAULT_BINARY, help="binary catalog snapshot path")
+    ap.add_argument("--static", type=Path, default=None, help="also export static CDN shards to this directory")
     ap.add_argument("--concurrency", type=int, default=4)
     ap.add_argument("--max", type=int, default=0, help="limit count for quick runs (0 = no limit)")
     args = ap.parse_args(argv)
 
     try:
         scrape_all(args.outdir, args.sqlite, args.max, args.concurrency)
+        write_binary_snapshot(args.sqlite, args.binary)
+        if args.static is not None:
+            export_static(load_snapshot(args.sqlite), args.static)
         return 0
     except KeyboardInterrupt:
         log.error("Interrupted")
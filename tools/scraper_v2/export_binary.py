@@ -0,0 +1,47 @@
+# tools/scraper_v2/export_binary.py
+"""
+Write the memory-mappable catalog snapshot (``osrs.catalog.bin``) from a built
+``osrs.sqlite``.
+
+The format lives in ``backend/app/catalog/binary_snapshot.py``; the backend
+serves it with ``CATALOG_BACKEND=binary``. Both SQLite builders call
+``write_binary_snapshot`` at the end; run it directly to re-export:
+
+    python -m tools.scraper_v2.export_binary --sqlite osrs.sqlite --out osrs.catalog.bin
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from backend.app.catalog import binary_snapshot
+from backend.app.sqlite_database import SQLiteCatalogService
+
+DEFAULT_SQLITE = Path("osrs.sqlite")
+DEFAULT_OUT = Path("osrs.catalog.bin")
+
+
+def write_binary_snapshot(sqlite_path: Path, out_path: Path) -> str:
+    """Export every item, NPC and NPC form; returns the snapshot's content version."""
+    svc = SQLiteCatalogService(str(sqlite_path))
+    try:
+        catalog = svc.load_catalog()
+    finally:
+        svc.close()
+    version = binary_snapshot.write(out_path, catalog["items"], catalog["bosses"])
+    print(f"[OK] {out_path} version={version} items={len(catalog['items'])} npcs={len(catalog['bosses'])}")
+    return version
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Write the binary catalog snapshot")
+    ap.add_argument("--sqlite", type=Path, default=DEFAULT_SQLITE, help="sqlite file path")
+    ap.add_argument("--out", type=Path, default=DEFAULT_OUT, help="snapshot file path")
+    args = ap.parse_args(argv)
+    write_binary_snapshot(args.sqlite, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,252 @@
+# tools/scraper_v2/export_static.py
+"""
+Render the read-only catalog into static JSON shards for a CDN.
+
+Every shard is named after a hash of its content (``items/slot/head.<hash>.json``)
+and never changes once written, so it can be cached forever. Next to each
+shard sit pre-compressed ``.gz`` and ``.br`` copies (``.br`` only when the
+``brotli`` package is installed). Hosts that serve pre-compressed siblings,
+such as nginx ``gzip_static`` or a CDN, send those without re-compressing.
+
+The output holds:
+
+* ``items`` / ``npcs`` – the summary lists served by ``/items`` and ``/npcs``;
+* ``special-attacks`` / ``effects`` – the reference datasets;
+* ``items/slot/<slot>`` – full details of the combat items for one slot;
+* ``npcs/<id>`` – one NPC with its forms (``/npc/{id}``);
+* ``search/<hex prefix>`` – autocomplete rows bucketed by the first
+  ``SEARCH_BUCKET_CHARS`` characters of each name and word start, using the
+  same normalization as ``/autocomplete``;
+* ``manifest.json`` – the only unhashed file. It maps every logical name to
+  its current shard and should be served with a short cache lifetime.
+
+Shards are rendered and compressed in parallel processes. The manifest is
+written last, so readers never see it point at a missing shard.
+
+    python -m tools.scraper_v2.export_static --sqlite osrs.sqlite --out static-catalog
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.app.catalog import payloads
+from backend.app.catalog.search_index import search_key
+from backend.app.catalog.snapshot import CatalogSnapshot, normalize_name
+from backend.app.repositories import passive_effect_repository, special_attack_repository
+from backend.app.sqlite_database import SQLiteCatalogService
+
+DEFAULT_SQLITE = Path("osrs.sqlite")
+DEFAULT_OUT = Path("static-catalog")
+MANIFEST = "manifest.json"
+MANIFEST_FORMAT = 1
+HASH_CHARS = 16
+SEARCH_BUCKET_CHARS = 2
+
+_EXT = {"identity": "", "gzip": ".gz", "br": ".br"}
+
+# (logical name, file stem, JSON-able body)
+Shard = Tuple[str, str, Any]
+
+
+def _slot_stem(slot: Optional[str]) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in (slot or "none").lower())
+
+
+def _word_keys(name: str) -> Iterable[str]:
+    # Same keys as PrefixIndex: the full name and every later word start.
+    key = search_key(name)
+    if not key:
+        return
+    yield key
+    start = key.find(" ")
+    while start != -1:
+        yield key[start + 1:]
+        start = key.find(" ", start + 1)
+
+
+def search_buckets(snap: CatalogSnapshot) -> Dict[str, Dict[str, List[list]]]:
+    """``{prefix: {"items": [[key, id, name, slot, icon]], "npcs": [[key, id, name, icon]]}}``."""
+    buckets: Dict[str, Dict[str, List[list]]] = defaultdict(lambda: {"items": [], "npcs": []})
+    for item in snap.combat_item_summaries:
+        icon = (item.get("icons") or [None])[0]
+        for key in _word_keys(item.get("name")):
+            buckets[key[:SEARCH_BUCKET_CHARS]]["items"].append([key, item["id"], item.get("name"), item.get("slot"), icon])
+    for boss in snap.boss_summaries:
+        for key in _word_keys(boss.get("name")):
+            buckets[key[:SEARCH_BUCKET_CHARS]]["npcs"].append([key, boss["id"], boss.get("name"), boss.get("icon_url")])
+    for bucket in buckets.values():
+        for rows in bucket.values():
+            rows.sort(key=lambda r: (r[0], r[1]))
+    return dict(buckets)
+
+
+def plan_shards(snap: CatalogSnapshot) -> List[Shard]:
+    shards: List[Shard] = [
+        ("items", "items", list(snap.combat_item_summaries)),
+        ("npcs", "npcs", list(snap.boss_summaries)),
+        ("special-attacks", "special-attacks", snap.special_attacks),
+        ("effects", "effects", snap.passive_effects),
+    ]
+    by_slot: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for item in snap.items:
+        if item.get("has_combat_stats"):
+            by_slot[item.get("slot") or "none"].append(item)
+    for slot, items in sorted(by_slot.items()):
+        items.sort(key=lambda i: (normalize_name(i.get("name")), i["id"]))
+        shards.append((f"slot:{slot}", f"items/slot/{_slot_stem(slot)}", items))
+    for boss in snap.bosses:
+        shards.append((f"npc:{boss['id']}", f"npcs/{boss['id']}", boss))
+    for prefix, rows in sorted(search_buckets(snap).items()):
+        shards.append((f"search:{prefix}", f"search/{prefix.encode().hex()}", rows))
+    return shards
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_shard(out_dir: str, shard: Shard) -> Tuple[str, Dict[str, Any]]:
+    """Render, hash and compress one shard; unchanged content is not rewritten."""
+    name, stem, body = shard
+    rendered = payloads.render("", body)
+    raw = rendered.bodies["identity"]
+    rel = f"{stem}.{hashlib.sha256(raw).hexdigest()[:HASH_CHARS]}.json"
+    base = Path(out_dir, rel)
+    for encoding, data in rendered.bodies.items():
+        path = base.with_name(base.name + _EXT[encoding])
+        if not path.exists():
+            _write_atomic(path, data)
+    encodings = sorted(e for e in rendered.bodies if e != "identity")
+    return name, {"path": rel, "bytes": len(raw), "encodings": encodings}
+
+
+def _write_shard_args(args: Tuple[str, Shard]) -> Tuple[str, Dict[str, Any]]:
+    return write_shard(*args)
+
+
+def _manifest_paths(manifest: Dict[str, Any]) -> Set[str]:
+    entries = list(manifest.get("datasets", {}).values())
+    for section in ("slots", "npcs"):
+        entries += manifest.get(section, {}).values()
+    entries += manifest.get("search", {}).get("buckets", {}).values()
+    return {e["path"] for e in entries}
+
+
+def _read_manifest(out_dir: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads((out_dir / MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _prune(out_dir: Path, keep: Set[str]) -> int:
+    """Delete shards referenced by neither the new nor the previous manifest."""
+    removed = 0
+    for path in out_dir.rglob("*.json*"):
+        base = path.relative_to(out_dir).as_posix()
+        for ext in (_EXT["gzip"], _EXT["br"]):
+            if base.endswith(ext):
+                base = base[: -len(ext)]
+                break
+        if base == MANIFEST or base in keep:
+            continue
+        path.unlink()
+        removed += 1
+    return removed
+
+
+def export_static(
+    snap: CatalogSnapshot, out_dir: Path, jobs: Optional[int] = None, prune: bool = False,
+) -> Dict[str, Any]:
+    """Write every shard of ``snap`` plus ``manifest.json`` under ``out_dir``; returns the manifest."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = _read_manifest(out_dir)
+    shards = plan_shards(snap)
+    jobs = jobs or os.cpu_count() or 1
+    work = [(str(out_dir), shard) for shard in shards]
+    if jobs == 1:
+        written = [_write_shard_args(w) for w in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            written = list(pool.map(_write_shard_args, work, chunksize=max(1, len(work) // (jobs * 4))))
+
+    manifest: Dict[str, Any] = {
+        "format": MANIFEST_FORMAT,
+        "version": snap.version,
+        "datasets": {},
+        "slots": {},
+        "npcs": {},
+        "search": {"bucket_chars": SEARCH_BUCKET_CHARS, "buckets": {}},
+    }
+    for name, entry in written:
+        kind, _, key = name.partition(":")
+        if not key:
+            manifest["datasets"][kind] = entry
+        elif kind == "slot":
+            manifest["slots"][key] = entry
+        elif kind == "npc":
+            manifest["npcs"][key] = entry
+        else:
+            manifest["search"]["buckets"][key] = entry
+
+    rendered = payloads.render("", manifest)
+    for encoding, data in rendered.bodies.items():
+        _write_atomic(out_dir / (MANIFEST + _EXT[encoding]), data)
+    if prune:
+        keep = _manifest_paths(manifest) | (_manifest_paths(previous) if previous else set())
+        removed = _prune(out_dir, keep)
+        if removed:
+            print(f"[OK] pruned {removed} stale files")
+    return manifest
+
+
+def load_snapshot(sqlite_path: Path) -> CatalogSnapshot:
+    svc = SQLiteCatalogService(str(sqlite_path))
+    try:
+        catalog = svc.load_catalog()
+    finally:
+        svc.close()
+    return CatalogSnapshot.build(
+        catalog["items"], catalog["bosses"],
+        special_attacks=special_attack_repository.read_dataset(),
+        passive_effects=passive_effect_repository.read_dataset(),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Export the catalog as static, content-hashed JSON shards")
+    ap.add_argument("--sqlite", type=Path, default=DEFAULT_SQLITE, help="sqlite file path")
+    ap.add_argument("--out", type=Path, default=DEFAULT_OUT, help="output directory")
+    ap.add_argument("--jobs", type=int, default=None, help="render processes (default: CPU count)")
+    ap.add_argument("--prune", action="store_true", help="delete shards no manifest refers to any more")
+    args = ap.parse_args(argv)
+    snap = load_snapshot(args.sqlite)
+    manifest = export_static(snap, args.out, jobs=args.jobs, prune=args.prune)
+    total = len(_manifest_paths(manifest))
+    print(f"[OK] {args.out}/{MANIFEST} version={manifest['version']} shards={total}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+# tools/scraper_v2/normalize_items.py
+"""
+Project the scraped item documents into the typed ``catalog_items`` table.
+
+The column set comes from ``backend/app/catalog/item_schema.py`` (shared with
+the Azure migration), so the backend can read combat stats as plain numbers
+instead of decoding ``doc`` JSON on every request.
+
+It also stores the cursor key every row is paged by (``write_page_keys``,
+see ``backend/app/catalog/page_keys.py``). Both SQLite builders call these
+after loading ``items``; run the module directly to upgrade an existing file:
+
+    python -m tools.scraper_v2.normalize_items --sqlite osrs.sqlite
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+from typing import List, Optional
+
+from backend.app.catalog import item_schema
+from backend.app.catalog.page_keys import doc_page_key
+from backend.app.catalog.pagination import normalize_name
+
+DEFAULT_SQLITE = Path(__file__).resolve().parents[2] / "osrs.sqlite"
+
+
+def _name_column(cn: sqlite3.Connection, table: str) -> str:
+    cols = {r[1] for r in cn.execute(f"PRAGMA table_info({table})")}
+    return "title" if "title" in cols else "name"
+
+
+def write_catalog_items(cn: sqlite3.Connection, source_table: str = "items") -> int:
+    """(Re)build ``catalog_items`` from ``source_table`` docs; returns the row count."""
+    key = _name_column(cn, source_table)
+    cn.executescript(f"""
+    DROP TABLE IF EXISTS catalog_items;
+    CREATE TABLE catalog_items(
+        item_id  INTEGER PRIMARY KEY,
+        name     TEXT NOT NULL,
+        name_key TEXT NOT NULL,
+        {", ".join(item_schema.sqlite_column_defs())}
+    );
+    """)
+    columns = ("item_id", "name", "name_key", *item_schema.ITEM_COLUMN_NAMES)
+    insert = (
+        f"INSERT OR IGNORE INTO catalog_items ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))})"
+    )
+    batch = []
+    for title, raw in cn.execute(f"SELECT {key}, doc FROM {source_table}"):
+        try:
+            doc = json.loads(raw)
+        except Exception:
+            continue
+        if not isinstance(doc, dict):
+            continue
+        row = item_schema.row_from_scraper_doc(doc)
+        item_id = item_schema.int_or_none(doc.get("item_id"))
+        if item_id is None:
+            continue
+        name = doc.get("title") or doc.get("name") or str(title).replace("_", " ")
+        batch.append((item_id, name, normalize_name(name), *item_schema.row_values(row)))
+    cn.executemany(insert, batch)
+    cn.execute("CREATE INDEX IF NOT EXISTS idx_catalog_items_name ON catalog_items(name, item_id)")
+    cn.execute("CREATE INDEX IF NOT EXISTS idx_catalog_items_page ON catalog_items(name_key, item_id)")
+    cn.execute(item_schema.sqlite_slot_index_sql("catalog_items"))
+    cn.commit()
+    return cn.execute("SELECT COUNT(*) FROM catalog_items").fetchone()[0]
+
+
+def write_page_keys(cn: sqlite3.Connection) -> None:
+    """Store and index each ``items``/``npcs`` doc's cursor key as ``(name_key, page_id)``."""
+    for table in ("items", "npcs"):
+        key = _name_column(cn, table)
+        cols = {r[1] for r in cn.execute(f"PRAGMA table_info({table})")}
+        for col, kind in (("name_key", "TEXT"), ("page_id", "INTEGER")):
+            if col not in cols:
+                cn.execute(f"ALTER TABLE {table} ADD COLUMN {col} {kind}")
+        updates = []
+        for rowid, title, raw in cn.execute(f"SELECT rowid, {key}, doc FROM {table}"):
+            try:
+                doc = json.loads(raw)
+            except Exception:
+                doc = None
+            page_key = doc_page_key(table, doc, str(title)) if isinstance(doc, dict) else None
+            updates.append((*(page_key or (None, None)), rowid))
+        cn.executemany(f"UPDATE {table} SET name_key = ?, page_id = ? WHERE rowid = ?", updates)
+        cn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_page ON {table}(name_key, page_id)")
+    cn.commit()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Write the typed catalog_items table and the page keys")
+    ap.add_argument("--sqlite", type=Path, default=DEFAULT_SQLITE, help="sqlite file path")
+    args = ap.parse_args(argv)
+    cn = sqlite3.connect(args.sqlite)
+    try:
+        print(f"[OK] catalog_items rows={write_catalog_items(cn)}")
+        write_page_keys(cn)
+    finally:
+        cn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
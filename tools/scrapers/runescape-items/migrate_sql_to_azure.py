@@ -1,6 +1,17 @@
 import sqlite3
 import pyodbc
 import os
+import sys
+from pathlib import Path
+
+# Shared item schema lives in the backend package (repo root on sys.path).
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from backend.app.catalog import item_schema  # noqa: E402
+from backend.app.catalog.pagination import normalize_name  # noqa: E402
+
+# Stored cursor key for keyset pages (see backend/app/catalog/pagination.py).
+# BIN2 compares code points, matching the Python sort of the other backends.
+NAME_KEY_COLUMN = "name_key NVARCHAR(255) COLLATE Latin1_General_100_BIN2 NOT NULL"
 
 # ===== UPDATE THESE WITH YOUR AZURE SQL DATABASE DETAILS =====
 AZURE_SQL_SERVER = "scapelab-db.database.windows.net"
@@ -77,11 +88,12 @@ def create_tables():
 
 
         # Create npcs table
-        cursor.execute("""
+        cursor.execute(f"""
             IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='npcs' AND xtype='U')
             CREATE TABLE npcs (
                 id INT PRIMARY KEY,
                 name NVARCHAR(255) NOT NULL UNIQUE,
+                {NAME_KEY_COLUMN},
                 raid_group NVARCHAR(255),
                 examine NVARCHAR(MAX),
                 release_date NVARCHAR(100),
@@ -149,25 +161,28 @@ def create_tables():
             )
         """)
         
-        # Create items table  
-        cursor.execute("""
+        # Create items table: typed combat-stat columns from the shared schema.
+        # combat_stats/icons JSON are kept for older readers but no longer read.
+        item_columns = ",\n                ".join(item_schema.tsql_column_defs())
+        cursor.execute(f"""
             IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='items' AND xtype='U')
             CREATE TABLE items (
                 id INT PRIMARY KEY,
                 name NVARCHAR(255) NOT NULL UNIQUE,
-                has_special_attack BIT,
-                special_attack_text NVARCHAR(MAX),
-                has_passive_effect BIT,
-                passive_effect_text NVARCHAR(MAX),
-                has_combat_stats BIT,
-                is_tradeable BIT,
-                slot NVARCHAR(50),
+                {NAME_KEY_COLUMN},
+                {item_columns},
                 icons NVARCHAR(MAX),
                 combat_stats NVARCHAR(MAX),
                 raw_html NVARCHAR(MAX)
             )
         """)
-        
+        cursor.execute(item_schema.tsql_slot_index_sql("items"))
+        for table in ("items", "npcs"):
+            cursor.execute(f"""
+                IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name='idx_{table}_page')
+                CREATE INDEX idx_{table}_page ON {table}(name_key, id)
+            """)
+
         conn.commit()
         conn.close()
         print("✓ Tables created successfully!")
@@ -197,23 +212,25 @@ def migrate_items():
         azure_cursor = azure_conn.cursor()
         
         # Get items from SQLite
+        sqlite_conn.row_factory = sqlite3.Row
+        sqlite_cursor = sqlite_conn.cursor()
         sqlite_cursor.execute("SELECT * FROM items")
         items = sqlite_cursor.fetchall()
         
         print(f"Found {len(items)} items to migrate")
         
-        # Get column names including the ID
-        sqlite_cursor.execute("PRAGMA table_info(items)")
-        columns = [col[1] for col in sqlite_cursor.fetchall()]
+        columns = ("id", "name", "name_key", *item_schema.ITEM_COLUMN_NAMES, "icons", "combat_stats", "raw_html")
+        placeholders = ', '.join(['?' for _ in range(len(columns))])
+        query = f"INSERT INTO items ({', '.join(columns)}) VALUES ({placeholders})"
         
         item_count = 0
         for item in items:
-            item_data = item
-            
-            # Create parameterized query
-            placeholders = ', '.join(['?' for _ in range(len(columns))])
-            insert_columns = ', '.join(columns)
-            query = f"INSERT INTO items ({insert_columns}) VALUES ({placeholders})"
+            item = dict(item)
+            typed = item_schema.row_from_legacy_item(item)
+            item_data = (
+                item["id"], item["name"], normalize_name(item["name"]), *item_schema.row_values(typed),
+                item.get("icons"), item.get("combat_stats"), item.get("raw_html"),
+            )
             
             try:
                 azure_cursor.execute(query, item_data)
@@ -221,7 +238,7 @@ def migrate_items():
                 if item_count % 100 == 0:
                     print(f"  Migrated {item_count} items...")
             except Exception as e:
-                print(f"✗ Failed to migrate item {item[1]}: {e}")
+                print(f"✗ Failed to migrate item {item['name']}: {e}")
         
         azure_conn.commit()
         azure_conn.close()
@@ -249,17 +266,21 @@ def migrate_npcs():
         azure_conn = pyodbc.connect(AZURE_SQL_CONNECTION)
         azure_cursor = azure_conn.cursor()
 
-        sqlite_cursor.execute("SELECT * FROM npcs")
+        # name_key is recomputed below, so a source that already carries one
+        # does not insert it twice.
+        sqlite_cursor.execute("PRAGMA table_info(npcs)")
+        source_columns = [col[1] for col in sqlite_cursor.fetchall() if col[1] != "name_key"]
+        columns = source_columns + ["name_key"]
+        name_index = columns.index("name")
+
+        sqlite_cursor.execute(f"SELECT {', '.join(source_columns)} FROM npcs")
         npcs = sqlite_cursor.fetchall()
 
         print(f"Found {len(npcs)} NPCs to migrate")
 
-        sqlite_cursor.execute("PRAGMA table_info(npcs)")
-        columns = [col[1] for col in sqlite_cursor.fetchall()]
-
         npc_count = 0
         for npc in npcs:
-            npc_data = npc
+            npc_data = (*npc, normalize_name(npc[name_index]))
 
 
             placeholders = ', '.join(['?' for _ in range(len(columns))])